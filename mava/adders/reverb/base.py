@@ -15,7 +15,6 @@
 
 """Adders that use Reverb (github.com/deepmind/reverb) as a backend."""
 
-import copy
 from typing import (
     Any,
     Callable,
@@ -25,6 +24,7 @@ from typing import (
     Mapping,
     NamedTuple,
     Optional,
+    Sequence,
     Tuple,
     Union,
 )
@@ -114,6 +114,92 @@ def get_trajectory_net_agents(
     return agents, agents_per_network
 
 
+def stack_agents(
+    value: Dict[str, Any],
+    agent_net_keys: Dict[str, str],
+    stack_fn: Callable[[Sequence[Any]], Any] = np.stack,
+) -> Dict[str, Any]:
+    """Stack the values of the agents that use the same network.
+
+    Args:
+        value: dictionary {agent: nested value}.
+        agent_net_keys: network key of each agent.
+        stack_fn: function that stacks leaves along a new leading axis.
+
+    Returns:
+        dictionary {network key: nested value}, with the values of the agents
+        of each network stacked in sorted agent order.
+    """
+    agents_per_network: Dict[str, List[str]] = {}
+    for agent in sort_str_num(value.keys()):
+        agents_per_network.setdefault(agent_net_keys[agent], []).append(agent)
+    return {
+        net_key: tree.map_structure(
+            lambda *leaves: stack_fn(leaves),
+            *[value[agent] for agent in agents_per_network[net_key]],
+        )
+        for net_key in sort_str_num(agents_per_network)
+    }
+
+
+def unstack_agents(
+    value: Dict[str, Any], agent_net_keys: Dict[str, str], axis: int = 0
+) -> Dict[str, Any]:
+    """Split values stacked by stack_agents back into per agent values.
+
+    Args:
+        value: dictionary {network key: nested value}.
+        agent_net_keys: network key of each agent.
+        axis: axis along which the agents are stacked.
+
+    Returns:
+        dictionary {agent: nested value}.
+    """
+    agents_per_network: Dict[str, List[str]] = {}
+    for agent in sort_str_num(agent_net_keys.keys()):
+        agents_per_network.setdefault(agent_net_keys[agent], []).append(agent)
+
+    unstacked = {}
+    for net_key, agents in agents_per_network.items():
+        for i, agent in enumerate(agents):
+            index = (slice(None),) * axis + (i,)
+            unstacked[agent] = tree.map_structure(
+                lambda x, index=index: x[index], value[net_key]
+            )
+    return unstacked
+
+
+def select_agents(
+    trajectory: Union[Trajectory, mava_types.Transition],
+    agent_mapping: List[Tuple[str, str]],
+) -> Union[Trajectory, mava_types.Transition]:
+    """Create a trajectory with a subset of the agents of another one.
+
+    Args:
+        trajectory: Step or Transition with per agent dictionaries.
+        agent_mapping: list of (new agent, trajectory agent) pairs.
+
+    Returns:
+        a trajectory of the same type, with the experience of each trajectory
+        agent under its new agent key. Extras that are not per agent are kept
+        as they are.
+    """
+    source_agent = agent_mapping[0][1]
+
+    def select(value: Any) -> Any:
+        if type(value) is dict and source_agent in value:
+            return {agent: value[source] for agent, source in agent_mapping}
+        return value
+
+    fields = {}
+    for name, value in trajectory._asdict().items():
+        if name in ("extras", "next_extras") and type(value) is dict:
+            fields[name] = {key: select(extra) for key, extra in value.items()}
+        else:
+            fields[name] = select(value)
+    return type(trajectory)(**fields)
+
+
 class ReverbParallelAdder(ReverbAdder, ParallelAdder):
     """Base reverb class."""
 
@@ -126,6 +212,8 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
         priority_fns: Optional[PriorityFnMapping] = None,
         get_signature_timeout_ms: int = 300_000,
         use_next_extras: bool = True,
+        stacked_agent_net_keys: Optional[Dict[str, str]] = None,
+        chunk_lengths: Optional[Dict[str, Optional[int]]] = None,
     ):
         """Reverb Base Adder.
 
@@ -144,6 +232,15 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
                 signature. Defaults to 300_000.
             use_next_extras (bool, optional): Whether to use extras or not. Defaults to
                 True.
+            stacked_agent_net_keys (Optional[Dict[str, str]], optional): Network key
+                of each agent. If given, the agents that use the same network are
+                written as one tensor with a leading agent axis, keyed by the
+                network. Defaults to None.
+            chunk_lengths (Optional[Dict[str, Optional[int]]], optional): Chunk
+                length of the columns under each field path, e.g. "observations" or
+                "extras/policy_info". The longest matching path is used. A chunk
+                length of None lets reverb auto tune the chunk length, which is the
+                default for fields without an entry. Defaults to None.
         """
         super().__init__(
             client=client,
@@ -154,8 +251,99 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
             get_signature_timeout_ms=get_signature_timeout_ms,
         )
         self._use_next_extras = use_next_extras
+        self._stacked_agent_net_keys = stacked_agent_net_keys
+        self._chunk_lengths = chunk_lengths or {}
+        # Writer whose columns were configured, and its configured fields.
+        self._configured_writer: Any = None
+        self._configured_fields: set = set()
+        # Items to create for each combination of agents and their networks.
+        self._routing_plans: Dict[
+            Tuple[Tuple[str, ...], Tuple[int, ...]],
+            List[Tuple[str, List[Tuple[str, str]]]],
+        ] = {}
+        # Network int keys of the agents in the current episode.
+        self._episode_net_ids: Optional[Tuple[int, ...]] = None
+
+    def _trajectory_net_ids(
+        self, trajectory: Union[Trajectory, mava_types.Transition]
+    ) -> Tuple[int, ...]:
+        """Get the network int key of each agent in a trajectory.
+
+        The network keys are sampled once per episode, so the ones recorded by
+        add_first are used when available. Otherwise they are read back from
+        the trajectory's network_int_keys extras.
+
+        Args:
+            trajectory: Trajectory to be written to the reverb tables.
+
+        Returns:
+            the network int keys in the sorted order of the agents.
+        """
+        if self._episode_net_ids is not None:
+            return self._episode_net_ids
+
+        traj_extras = trajectory.extras["network_int_keys"]
+        net_ids = []
+        for agent in sort_str_num(trajectory.actions.keys()):
+            arr = traj_extras[agent].numpy()
+            if type(trajectory) == Step:
+                # Sequential adder case.
+                arr = arr[0]
+            net_ids.append(int(arr))
+        return tuple(net_ids)
+
+    def _routing_plan(
+        self,
+        trajectory: Union[Trajectory, mava_types.Transition],
+        net_ids: Tuple[int, ...],
+    ) -> List[Tuple[str, List[Tuple[str, str]]]]:
+        """Get the items to create for a combination of agent networks.
+
+        Each table represents experience used by one of the trainers. A table
+        gets one item for every group of agents that matches the networks in
+        its table_network_config entry. Agents are taken greedily in sorted
+        order, and every table starts from all the agents of the trajectory,
+        so a table may get several items, or none, from one trajectory.
+
+        Plans only depend on the agents and the networks they use, so they are
+        computed once per combination of agents and networks and then reused.
+
+        Args:
+            trajectory: Trajectory to be written to the reverb tables.
+            net_ids: network int key of each agent, in sorted agent order.
 
-    def write_experience_to_tables(  # noqa
+        Returns:
+            a list of (table, agent mapping) pairs, one for each item. The
+            agent mapping is a list of (item agent, trajectory agent) pairs.
+        """
+        plan_key = (tuple(sort_str_num(trajectory.actions.keys())), net_ids)
+        plan = self._routing_plans.get(plan_key)
+        if plan is not None:
+            return plan
+
+        trajectory_net_keys = {
+            agent: self._net_ids_to_keys[net_id]
+            for agent, net_id in zip(plan_key[0], net_ids)
+        }
+        agents, agents_per_network = get_trajectory_net_agents(
+            trajectory, trajectory_net_keys
+        )
+
+        plan = []
+        for table, table_net_keys in self._table_network_config.items():
+            # Each table pops agents from its own copy of the agent lists.
+            remaining = {
+                net_key: list(net_agents)
+                for net_key, net_agents in agents_per_network.items()
+            }
+            while all(remaining.get(net_key) for net_key in table_net_keys):
+                item_agents = [remaining[net_key].pop(0) for net_key in table_net_keys]
+                plan.append((table, list(zip(agents, item_agents))))
+
+        self._routing_plans[plan_key] = plan
+        return plan
+
+    def write_experience_to_tables(
         self,
         trajectory: Union[Trajectory, mava_types.Transition],
         table_priorities: Dict[str, Any],
@@ -178,180 +366,37 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
             # is specified. If it is not the write_experience_to_tables
             # function defaults back to just writing the entire
             # trajectory to one default table.
-
-            # Get the networks use by each agent by
-            # converting the network_int_keys to strings.
-            traj_extras = trajectory.extras["network_int_keys"]
-            trajectory_net_keys = {}
-            agents = sort_str_num(trajectory.actions.keys())
-            for agent in agents:
-                arr = traj_extras[agent].numpy()
-                if type(trajectory) == Step:
-                    # Sequential adder case.
-                    trajectory_net_keys[agent] = self._net_ids_to_keys[arr[0]]
-                else:
-                    # Transition adder case.
-                    trajectory_net_keys[agent] = self._net_ids_to_keys[arr]
-
-            # Get a list of the agents and mapping from net_keys to all
-            # agents using that network.
-            agents, trajectory_nets_agent = get_trajectory_net_agents(
-                trajectory=trajectory, trajectory_net_keys=trajectory_net_keys
-            )
-
-            # Flag to check if all experience was used
-            created_item = False
-
-            # In this loop we go through every table one by one.
-            # We check for each table if the experience contains
-            # the correct networks for that trainer. If it does
-            # we add to the table a subset of the trajectory's agents
-            # which only contains the networks combination that the
-            # trainer is interested in. Note that a table might
-            # find multiple copies of the correct network combination
-            # and therefore might write more than once to a table
-            # for a given experience. The table might also not
-            # write at all for a given trajectory. The created_item
-            # flag checks that at least one table used some of the
-            # experience in the trajectory.
-            for table, priority in table_priorities.items():
-                # Copy the original trajectory_nets_agent as we are going to pop
-                # form it for each table. Therefore each table starts with
-                # a fresh copy of all the agents and removes agents as it
-                # pushes the experience to its table.
-                trajectory_dict_copy = copy.deepcopy(trajectory_nets_agent)
-
-                # While the networks are in the data keep creating tables
-                # Each training example can therefore create multiple items
-                is_in_entry = True
-                while is_in_entry:
-                    # Go through all the networks in the table specification.
-                    # Now check if every network in this table specification is used
-                    # atleast once by the remaining agents in the trajectory.
-                    # Pop the agents from the trajectory, that uses the required
-                    # networks and add them to item_agents. If all the
-                    # networks was found item_agents will be written
-                    # to the table. So basically we try to find a group of
-                    # agents that matches the network specification of the table.
-                    # We do this until the table cannot find a match in the remaining
-                    # agents and therefore exists the and gives another table a chance
-                    # to find a matches.
-                    item_agents = []
-                    for net_key in self._table_network_config[table]:
-                        if (
-                            net_key in trajectory_dict_copy
-                            and len(trajectory_dict_copy[net_key]) > 0
-                        ):
-                            item_agents.append(trajectory_dict_copy[net_key].pop(0))
-                        else:
-                            is_in_entry = False
-                            break
-
-                    if is_in_entry:
-                        # Write the subset of the trajectory experience to
-                        # the table. The below code creates a new Step/Transition
-                        # with only the agents with the correct network combination
-                        # in order. This new Step/Transition is then written to
-                        # the table.
-                        created_item = True
-
-                        # Create new empty transition
-                        if type(trajectory) == Step:
-                            # Create a new sequence trajectory
-                            soe = trajectory.start_of_episode  # type: ignore
-                            new_trajectory = Step(  # type: ignore
-                                {},
-                                {},
-                                {},
-                                {},
-                                start_of_episode=soe,
-                                extras={},
-                            )
-                        else:
-                            # Create a new transition trajectory
-                            new_trajectory = mava_types.Transition(  # type: ignore
-                                {}, {}, {}, {}, {}, {}, {}
-                            )
-
-                        # Initialise empty extras
-                        for key in trajectory.extras.keys():
-                            new_trajectory.extras[key] = {}
-
-                            if type(trajectory) == mava_types.Transition:
-                                new_trajectory.next_extras[key] = {}  # type: ignore
-
-                        # Go through each of the agents in item_agents and add them
-                        # to the new trajectory in the correct spot based on their
-                        # networks.
-                        for a_i in range(len(item_agents)):
-                            # Write the agent to the new trajectory.
-                            cur_agent = item_agents[a_i]
-                            want_agent = agents[a_i]
-                            new_trajectory.observations[
-                                want_agent
-                            ] = trajectory.observations[cur_agent]
-                            new_trajectory.actions[want_agent] = trajectory.actions[
-                                cur_agent
-                            ]
-                            new_trajectory.rewards[want_agent] = trajectory.rewards[
-                                cur_agent
-                            ]
-                            new_trajectory.discounts[want_agent] = trajectory.discounts[
-                                cur_agent
-                            ]
-
-                            if type(trajectory) == mava_types.Transition:
-                                new_trajectory.next_observations[  # type: ignore
-                                    want_agent
-                                ] = trajectory.next_observations[  # type: ignore
-                                    cur_agent
-                                ]  # type: ignore
-
-                            # Write this agent to the extras of the new trajectory.
-                            for key in trajectory.extras.keys():
-                                if (
-                                    type(trajectory.extras[key]) is dict
-                                    and cur_agent in trajectory.extras[key]
-                                ):
-                                    new_trajectory.extras[key][
-                                        want_agent
-                                    ] = trajectory.extras[key][cur_agent]
-                                else:
-                                    # TODO: (dries) Only actually need to do this once
-                                    # and not per agent. Maybe fix this in the future.
-                                    new_trajectory.extras[key] = trajectory.extras[key]
-                                if type(trajectory) == mava_types.Transition:
-                                    ext = trajectory.next_extras[key]  # type: ignore
-                                    if (
-                                        type(ext) is dict  # type: ignore
-                                        and cur_agent in ext  # type: ignore
-                                    ):
-                                        new_trajectory.next_extras[key][  # type: ignore
-                                            want_agent
-                                        ] = trajectory.next_extras[  # type: ignore
-                                            key
-                                        ][  # type: ignore
-                                            cur_agent
-                                        ]  # type: ignore
-                                    else:
-                                        # TODO: (dries) Only actually need to
-                                        # do this once and not per agent. Maybe
-                                        # fix this in the future.
-                                        new_trajectory.next_extras[  # type: ignore
-                                            key
-                                        ] = trajectory.next_extras[  # type: ignore
-                                            key
-                                        ]  # type: ignore
-
-                        # Write the new_trajectory to the table.
-                        self._writer.create_item(
-                            table=table, priority=priority, trajectory=new_trajectory
-                        )
-            if not created_item:
+            if self._stacked_agent_net_keys is not None:
+                # Agents are stacked by network, so a table gets all the agents
+                # of the networks it trains.
+                plan = [
+                    (table, [(net_key, net_key) for net_key in sort_str_num(set(nets))])
+                    for table, nets in self._table_network_config.items()
+                    if set(nets).issubset(trajectory.actions.keys())
+                ]
+            else:
+                plan = self._routing_plan(
+                    trajectory, self._trajectory_net_ids(trajectory)
+                )
+            items = [
+                (table, agent_mapping)
+                for table, agent_mapping in plan
+                if table in table_priorities
+            ]
+            if not items:
                 raise EOFError(
                     "This experience was not used by any trainer: ",
                     trajectory.actions.keys(),
                 )
+
+            # Write a subset of the trajectory's agents, renamed to the first
+            # agent keys, for every item in the plan.
+            for table, agent_mapping in items:
+                self._writer.create_item(
+                    table=table,
+                    priority=table_priorities[table],
+                    trajectory=select_agents(trajectory, agent_mapping),
+                )
         else:
             # Default setting (deprecate this) with only one table. In this setting
             # we write the entire trajectory to that table.
@@ -363,6 +408,91 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
         # Flush the writer.
         self._writer.flush(self._max_in_flight_items)
 
+    def _chunk_length_field(self, path: str) -> Optional[str]:
+        """Get the longest field path in chunk_lengths that contains a column.
+
+        Args:
+            path: path of the column, e.g. "observations/agent_0/observation".
+
+        Returns:
+            the field path, or None if the column has no entry.
+        """
+        for field_path in sorted(self._chunk_lengths, key=len, reverse=True):
+            if path == field_path or path.startswith(field_path + "/"):
+                return field_path
+        return None
+
+    def _column_chunk_length(self, path: str, value: Any) -> Optional[int]:
+        """Get the chunk length of a column.
+
+        Args:
+            path: path of the column, e.g. "observations/agent_0/observation".
+            value: first value appended to the column.
+
+        Returns:
+            the chunk length, or None to keep the writer's auto tuned one.
+        """
+        field_path = self._chunk_length_field(path)
+        return None if field_path is None else self._chunk_lengths[field_path]
+
+    def _append(self, step: Dict[str, Any], partial_step: bool = False) -> None:
+        """Append a step to the writer, configuring the chunks of new columns.
+
+        Columns are configured before their first value is appended, once per
+        writer.
+
+        Args:
+            step: dictionary of step fields.
+            partial_step: whether more data of this step follows. Defaults to
+                False.
+        """
+        writer = self._writer
+        if writer is not self._configured_writer:
+            self._configured_writer = writer
+            self._configured_fields = set()
+
+        for name in step.keys() - self._configured_fields:
+            for path, value in tree.flatten_with_path(step[name]):
+                column_path = (name, *path)
+                chunk_length = self._column_chunk_length(
+                    "/".join(str(key) for key in column_path), value
+                )
+                if chunk_length is not None:
+                    writer.configure(
+                        column_path,
+                        num_keep_alive_refs=self._max_sequence_length,
+                        max_chunk_length=min(chunk_length, self._max_sequence_length),
+                    )
+            self._configured_fields.add(name)
+
+        writer.append(step, partial_step=partial_step)
+
+    def _stack_step(self, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Stack the per agent fields of a step by network, if enabled.
+
+        Args:
+            step: dictionary of step fields, with per agent dictionaries.
+
+        Returns:
+            the step, with per agent dictionaries keyed by network instead.
+        """
+        if self._stacked_agent_net_keys is None:
+            return step
+
+        def stack(value: Any) -> Any:
+            agent_net_keys = self._stacked_agent_net_keys
+            if isinstance(value, dict) and value.keys() == agent_net_keys.keys():
+                return stack_agents(value, agent_net_keys)
+            return value
+
+        stacked = {}
+        for name, value in step.items():
+            if name == "extras" and isinstance(value, dict):
+                stacked[name] = {key: stack(extra) for key, extra in value.items()}
+            else:
+                stacked[name] = stack(value)
+        return stacked
+
     def add_first(
         self, timestep: dm_env.TimeStep, extras: Dict[str, mava_types.NestedArray] = {}
     ) -> None:
@@ -382,9 +512,17 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
 
         if self._use_next_extras:
             add_dict["extras"] = extras
-        self._writer.append(
-            add_dict,
-            partial_step=True,
+        self._append(self._stack_step(add_dict), partial_step=True)
+
+        # The network keys are fixed for the episode, so keep them on the host
+        # instead of reading them back from the written columns.
+        net_int_keys = (
+            extras.get("network_int_keys") if isinstance(extras, dict) else None
+        )
+        self._episode_net_ids = (
+            tuple(int(net_int_keys[agent]) for agent in sort_str_num(net_int_keys))
+            if isinstance(net_int_keys, dict)
+            else None
         )
 
         self._add_first_called = True
@@ -411,7 +549,8 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
         if not self._use_next_extras:
             current_step["extras"] = next_extras
 
-        self._writer.append(current_step)
+        current_step = self._stack_step(current_step)
+        self._append(current_step)
 
         # Record the next observation and write.
         next_step = dict(
@@ -421,10 +560,7 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
 
         if self._use_next_extras:
             next_step["extras"] = next_extras
-        self._writer.append(
-            next_step,
-            partial_step=True,
-        )
+        self._append(self._stack_step(next_step), partial_step=True)
 
         self._write()
 
@@ -433,6 +569,6 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
             # TODO(acme): remove this when fields are no longer expected to be
             # of equal length on the learner side.
             dummy_step = tree.map_structure(np.zeros_like, current_step)
-            self._writer.append(dummy_step)
+            self._append(dummy_step)
             self._write_last()
             self.reset()
@@ -23,6 +23,7 @@ This implements adders which add sequences or partial trajectories.
 import operator
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import reverb
 import tensorflow as tf
 import tree
@@ -34,6 +35,9 @@ from mava.adders.reverb import base
 from mava.adders.reverb.base import ReverbParallelAdder
 from mava.adders.reverb.utils import trajectory_signature
 
+# Largest chunk, in bytes per column, picked by auto_chunk_length.
+_MAX_AUTO_CHUNK_BYTES = 1 << 20
+
 
 class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
     """An adder which adds sequences of fixed length."""
@@ -51,6 +55,9 @@ class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
         max_in_flight_items: int = 2,
         end_of_episode_behavior: Optional[EndBehavior] = EndBehavior.ZERO_PAD,
         use_next_extras: bool = True,
+        stacked_agent_net_keys: Optional[Dict[str, str]] = None,
+        chunk_lengths: Optional[Dict[str, Optional[int]]] = None,
+        auto_chunk_length: bool = False,
     ):
         """Makes a SequenceAdder instance.
 
@@ -82,6 +89,15 @@ class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
             sequences on env reset. In this case 'pad_end_of_episode' is not used.
           use_next_extras: If true extras will be processed the same way observations
           are processed. If false extras will be processed as actions are processed.
+          stacked_agent_net_keys: Network key of each agent. If given, the agents
+            that use the same network are written as one tensor with a leading
+            agent axis, keyed by the network.
+          chunk_lengths: Chunk length of the columns under each field path, e.g.
+            "observations" or "extras/policy_info". A chunk length of None lets
+            reverb auto tune it. See `ReverbParallelAdder`.
+          auto_chunk_length: If true, columns without an entry in chunk_lengths
+            get chunks of `period` steps, the steps added between two items,
+            shortened so that a chunk holds at most 1 MiB per column.
         """
         ReverbParallelAdder.__init__(
             self,
@@ -93,6 +109,8 @@ class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
             priority_fns=priority_fns,
             max_in_flight_items=max_in_flight_items,
             use_next_extras=use_next_extras,
+            stacked_agent_net_keys=stacked_agent_net_keys,
+            chunk_lengths=chunk_lengths,
         )
 
         self._period = period
@@ -100,6 +118,26 @@ class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
         self._sequence_length = sequence_length
         self._end_of_episode_behavior = end_of_episode_behavior
         self._table_network_config = table_network_config
+        self._auto_chunk_length = auto_chunk_length
+
+    def _column_chunk_length(self, path: str, value: Any) -> Optional[int]:
+        """Get the chunk length of a column.
+
+        Creating an item sends the chunks of its steps, so with auto_chunk_length
+        chunks span the `period` steps written between two items. Large values,
+        e.g. image observations, get shorter chunks.
+
+        Args:
+            path: path of the column, e.g. "observations/agent_0/observation".
+            value: first value appended to the column.
+
+        Returns:
+            the chunk length, or None to keep the writer's auto tuned one.
+        """
+        if not self._auto_chunk_length or self._chunk_length_field(path) is not None:
+            return super()._column_chunk_length(path, value)
+        step_bytes = max(np.asarray(value).nbytes, 1)
+        return max(1, min(self._period, _MAX_AUTO_CHUNK_BYTES // step_bytes))
 
     def _maybe_create_item(
         self, sequence_length: int, *, end_of_episode: bool = False, force: bool = False
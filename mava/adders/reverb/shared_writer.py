@@ -0,0 +1,496 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A trajectory writer shared by the adders of several experience streams."""
+
+import collections
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import tree
+
+_OPEN_STEP = object()
+
+
+class _Step:
+    """Complete step of a stream and the row of the shared writer holding it."""
+
+    def __init__(self, data: Dict[str, Any]):
+        """Initialise the step.
+
+        Args:
+            data: dictionary of step fields.
+        """
+        self.data = data
+        self.row: Optional[int] = None
+
+
+class SharedTrajectoryWriter:
+    """Multiplexes several experience streams over a single trajectory writer.
+
+    An executor that steps several environments needs one adder per
+    environment. Each adder normally opens its own `reverb.TrajectoryWriter`,
+    and with it its own stream to the server. Adders created with a client from
+    `stream_client` instead write through a per stream view of one shared
+    writer.
+
+    Every row of the shared writer holds a step of each stream, under the
+    stream's own key, e.g. `stream_0`. A stream's steps are in consecutive rows,
+    so its items are built from contiguous slices of the shared history, like
+    the items of a writer of its own. A row is complete once every stream that
+    is mid episode appended its step to it. Streams that are ahead, e.g. while
+    they pad the end of an episode, queue their steps and the items that
+    reference them until earlier rows are complete. Once a stream is more than
+    `max_lag_factor` times the steps it keeps alive ahead, rows are completed
+    without the streams that fall behind, which append their recent steps
+    again. Episode boundaries, padding and priorities are handled by the
+    adders as usual. Flushes are batched over the streams.
+    """
+
+    def __init__(self, client: Any, num_streams: int, max_lag_factor: int = 4):
+        """Initialise the shared writer.
+
+        Args:
+            client: reverb client, or in-process replay buffer, that creates the
+                shared writer.
+            num_streams: number of streams that write through the shared writer.
+            max_lag_factor: number of times the steps a stream keeps alive that
+                it can queue before rows are completed without the streams
+                that fall behind. Defaults to 4.
+        """
+        self._client = client
+        self._num_streams = num_streams
+        self._max_lag_factor = max_lag_factor
+        self._writer: Any = None
+        self._streams: List[StreamTrajectoryWriter] = []
+        self._num_rows = 0
+        # Indices of the streams with a step in the open row.
+        self._open_row: Set[int] = set()
+
+    def stream_client(self) -> "StreamClient":
+        """Create a client for the adder of a new stream.
+
+        Returns:
+            a client whose trajectory writer is a view of the shared writer.
+        """
+        return StreamClient(self)
+
+    def _add_stream(
+        self, stream_writer: "StreamTrajectoryWriter", num_keep_alive_refs: int
+    ) -> int:
+        """Add a stream, creating the shared writer on first use.
+
+        Streams keep their steps in separate columns, so the shared writer keeps
+        as many rows alive as a stream keeps steps.
+
+        Args:
+            stream_writer: view of the new stream.
+            num_keep_alive_refs: number of steps the stream keeps alive.
+
+        Returns:
+            index of the stream.
+        """
+        if self._writer is None:
+            self._writer = self._client.trajectory_writer(
+                num_keep_alive_refs=num_keep_alive_refs
+            )
+        self._streams.append(stream_writer)
+        return len(self._streams) - 1
+
+    def _advance(self, force: bool = False) -> None:
+        """Append the queued steps of the streams and complete their rows.
+
+        Items are created as soon as the rows of their steps are complete.
+
+        Args:
+            force: whether to complete rows without the streams that are mid
+                episode, e.g. when the writer is closed. Defaults to False.
+        """
+        while True:
+            for stream in self._streams:
+                if stream._queue and stream._index not in self._open_row:
+                    step = stream._queue.popleft()
+                    self._writer.append({stream._key: step.data}, partial_step=True)
+                    step.row = self._num_rows
+                    self._open_row.add(stream._index)
+            if not self._open_row:
+                return
+
+            lagging = [
+                stream
+                for stream in self._streams
+                if stream._in_episode and stream._index not in self._open_row
+            ]
+            too_far_ahead = any(
+                len(stream._queue) > self._max_lag_factor * stream._num_keep_alive_refs
+                for stream in self._streams
+            )
+            if lagging and not force and not too_far_ahead:
+                return
+
+            self._writer.append({})
+            self._num_rows += 1
+            self._open_row = set()
+            for stream in self._streams:
+                stream._create_items()
+            if not force:
+                for stream in lagging:
+                    stream._restart()
+
+    def flush(
+        self, block_until_num_items: int = 0, timeout_ms: Optional[int] = None
+    ) -> None:
+        """Send the pending items of all the streams.
+
+        Items whose rows are not complete yet are sent once they are.
+
+        Args:
+            block_until_num_items: number of in flight items allowed per stream.
+            timeout_ms: timeout of the flush. Defaults to None.
+        """
+        if self._writer is not None:
+            self._writer.flush(
+                block_until_num_items * self._num_streams, timeout_ms=timeout_ms
+            )
+
+    def close(self) -> None:
+        """Complete the open rows, then flush and close the shared writer."""
+        if self._writer is not None:
+            self._advance(force=True)
+            self._writer.flush()
+            self._writer.close()
+            self._writer = None
+
+
+class StreamClient:
+    """Client of one stream of a `SharedTrajectoryWriter`."""
+
+    def __init__(self, shared_writer: SharedTrajectoryWriter):
+        """Initialise the client.
+
+        Args:
+            shared_writer: writer shared by the streams.
+        """
+        self._shared_writer = shared_writer
+        self._stream_writer: Optional[StreamTrajectoryWriter] = None
+
+    def trajectory_writer(
+        self, num_keep_alive_refs: int, **kwargs: Any
+    ) -> "StreamTrajectoryWriter":
+        """Get the trajectory writer of the stream.
+
+        Adders create a new writer after some episodes. The stream keeps a single
+        view, so the shared writer is never recreated.
+
+        Args:
+            num_keep_alive_refs: number of recent steps of the stream kept alive.
+            kwargs: other arguments of `reverb.Client.trajectory_writer`, unused.
+
+        Returns:
+            the stream's view of the shared writer.
+        """
+        if self._stream_writer is None:
+            self._stream_writer = StreamTrajectoryWriter(
+                self._shared_writer, num_keep_alive_refs
+            )
+        return self._stream_writer
+
+
+class _StreamColumn:
+    """History of one column, restricted to the steps of a stream."""
+
+    def __init__(self, stream_writer: "StreamTrajectoryWriter", field: str, leaf: int):
+        """Initialise the column.
+
+        Args:
+            stream_writer: view of the stream.
+            field: name of the step field holding the column.
+            leaf: index of the column in the flattened field.
+        """
+        self._stream_writer = stream_writer
+        self._field = field
+        self._leaf = leaf
+
+    def __len__(self) -> int:
+        """Number of steps of the stream."""
+        return len(self._stream_writer._steps)
+
+    def __getitem__(self, key: Union[int, slice]) -> "_StreamSlice":
+        """Select steps of the stream, with list indexing semantics."""
+        steps = self._stream_writer._steps[key]
+        if isinstance(key, int):
+            steps = [steps]
+        if any(step is _OPEN_STEP for step in steps):
+            raise ValueError("The open step of a stream can not be referenced.")
+        return _StreamSlice(
+            self._stream_writer, self._field, self._leaf, steps, isinstance(key, int)
+        )
+
+
+class _StreamSlice:
+    """Column of the steps of a stream, referenced by an item.
+
+    The steps are turned into a column of the shared writer once their rows are
+    complete.
+    """
+
+    def __init__(
+        self,
+        stream_writer: "StreamTrajectoryWriter",
+        field: str,
+        leaf: int,
+        steps: List[_Step],
+        squeeze: bool,
+    ):
+        """Initialise the column.
+
+        Args:
+            stream_writer: view of the stream.
+            field: name of the step field holding the column.
+            leaf: index of the column in the flattened field.
+            steps: referenced steps.
+            squeeze: whether the column holds a single step without a step
+                dimension.
+        """
+        if not steps:
+            raise ValueError("Trajectory columns must reference at least one step.")
+        self._stream_writer = stream_writer
+        self._field = field
+        self._leaf = leaf
+        self._steps = steps
+        self.is_squeezed = squeeze
+
+    def __len__(self) -> int:
+        """Number of referenced steps."""
+        return len(self._steps)
+
+    def numpy(self) -> np.ndarray:
+        """Stack the values of the referenced steps.
+
+        Returns:
+            the stacked values, or the single value of a squeezed column.
+        """
+        values = [
+            np.asarray(tree.flatten(step.data[self._field])[self._leaf])
+            for step in self._steps
+        ]
+        return values[0] if self.is_squeezed else np.stack(values)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the referenced values."""
+        return self.numpy().shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Dtype of the referenced values."""
+        return self.numpy().dtype
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the rows of all the referenced steps are complete."""
+        num_rows = self._stream_writer._shared_writer._num_rows
+        return all(step.row is not None and step.row < num_rows for step in self._steps)
+
+    def resolve(self, writer: Any) -> Any:
+        """Get the column of the shared writer's history holding the steps.
+
+        Args:
+            writer: the shared trajectory writer.
+
+        Returns:
+            the column, sliced relative to the end of the history so that only
+            the most recent, kept alive rows are referenced.
+        """
+        first_row = self._steps[0].row
+        rows = [step.row for step in self._steps]
+        if rows != list(range(first_row, first_row + len(rows))):
+            raise RuntimeError(f"Steps of a stream are not in consecutive rows: {rows}")
+
+        history = writer.history[self._stream_writer._key][self._field]
+        column = tree.flatten(history)[self._leaf]
+        start = first_row - len(column)
+        if self.is_squeezed:
+            return column[start]
+        stop = start + len(rows)
+        return column[start : stop if stop < 0 else None]
+
+
+class StreamTrajectoryWriter:
+    """View of a `SharedTrajectoryWriter` with the interface of a trajectory writer.
+
+    Partial steps are kept until the step is complete, so a stream only ever
+    appends complete steps to the shared writer.
+    """
+
+    def __init__(self, shared_writer: SharedTrajectoryWriter, num_keep_alive_refs: int):
+        """Initialise the view.
+
+        Args:
+            shared_writer: writer shared by the streams.
+            num_keep_alive_refs: number of recent steps of the stream kept alive.
+        """
+        self._shared_writer = shared_writer
+        self._num_keep_alive_refs = num_keep_alive_refs
+        self._index = shared_writer._add_stream(self, num_keep_alive_refs)
+        self._key = f"stream_{self._index}"
+        # Recent steps of the stream, followed by _OPEN_STEP while a step is
+        # partially appended.
+        self._steps: List[Any] = []
+        self._open_step: Dict[str, Any] = {}
+        self._episode_steps = 0
+        # A value of each appended field, which structures the history.
+        self._fields: Dict[str, Any] = {}
+        # Complete steps that are not in a row of the shared writer yet.
+        self._queue: Deque[_Step] = collections.deque()
+        # Items waiting for the rows of their steps: (table, priority, trajectory).
+        self._items: Deque[Tuple[str, float, Any]] = collections.deque()
+        # Whether rows wait for the steps of the stream.
+        self._in_episode = False
+
+    @property
+    def history(self) -> Any:
+        """History columns of the stream, structured like the appended data."""
+        if not self._fields:
+            raise RuntimeError("history can not be accessed before append is called.")
+        return {
+            field: tree.unflatten_as(
+                value,
+                [
+                    _StreamColumn(self, field, leaf)
+                    for leaf in range(len(tree.flatten(value)))
+                ],
+            )
+            for field, value in self._fields.items()
+        }
+
+    @property
+    def episode_steps(self) -> int:
+        """Number of completed steps since the last `end_episode` call."""
+        return self._episode_steps
+
+    def configure(
+        self,
+        path: Tuple[Any, ...],
+        *,
+        num_keep_alive_refs: int,
+        max_chunk_length: Optional[int],
+    ) -> None:
+        """Configure the chunks of a column of the stream.
+
+        Args:
+            path: path of the column.
+            num_keep_alive_refs: number of recent steps of the stream kept alive.
+            max_chunk_length: chunk length of the stream's steps.
+        """
+        self._shared_writer._writer.configure(
+            (self._key, *path),
+            num_keep_alive_refs=num_keep_alive_refs,
+            max_chunk_length=max_chunk_length,
+        )
+
+    def append(self, data: Dict[str, Any], *, partial_step: bool = False) -> None:
+        """Append the data of a step, or part of it if `partial_step` is set.
+
+        Args:
+            data: dictionary of step fields.
+            partial_step: whether more data of this step follows. Defaults to
+                False.
+        """
+        for field, value in data.items():
+            self._fields.setdefault(field, value)
+        if self._open_step:
+            self._steps.pop()
+        self._open_step = {**self._open_step, **data}
+        if partial_step:
+            self._steps.append(_OPEN_STEP)
+            return
+
+        step = _Step(self._open_step)
+        self._open_step = {}
+        self._steps.append(step)
+        if len(self._steps) > self._num_keep_alive_refs:
+            del self._steps[0]
+        self._episode_steps += 1
+        self._in_episode = True
+        self._queue.append(step)
+        self._shared_writer._advance()
+
+    def create_item(self, table: str, priority: float, trajectory: Any) -> None:
+        """Create an item from history columns of the stream.
+
+        The item is created once the rows of its steps are complete.
+
+        Args:
+            table: name of the table.
+            priority: priority of the item.
+            trajectory: nested structure of columns taken from `history`.
+        """
+        self._items.append((table, priority, trajectory))
+        self._create_items()
+
+    def _create_items(self) -> None:
+        """Create the items whose rows are complete, in order."""
+        while self._items and all(
+            column.is_complete for column in tree.flatten(self._items[0][2])
+        ):
+            table, priority, trajectory = self._items.popleft()
+            writer = self._shared_writer._writer
+            writer.create_item(
+                table,
+                priority,
+                tree.map_structure(lambda column: column.resolve(writer), trajectory),
+            )
+
+    def _restart(self) -> None:
+        """Queue the recent steps again, as a row was completed without them."""
+        steps = [step for step in self._steps if step is not _OPEN_STEP]
+        for step in steps:
+            step.row = None
+        self._queue.extend(steps)
+
+    def flush(
+        self, block_until_num_items: int = 0, timeout_ms: Optional[int] = None
+    ) -> None:
+        """Send pending items, for all the streams.
+
+        Args:
+            block_until_num_items: number of in flight items allowed per stream.
+            timeout_ms: timeout of the flush. Defaults to None.
+        """
+        self._shared_writer.flush(block_until_num_items, timeout_ms=timeout_ms)
+
+    def end_episode(
+        self, clear_buffers: bool = True, timeout_ms: Optional[int] = None
+    ) -> None:
+        """Start a new episode in the stream.
+
+        The shared writer keeps running, as the other streams are mid episode.
+        Rows no longer wait for the stream until it appends the steps of the
+        next episode.
+
+        Args:
+            clear_buffers: whether to clear the stream's history. Defaults to True.
+            timeout_ms: unused. Defaults to None.
+        """
+        if clear_buffers:
+            self._steps = []
+            self._open_step = {}
+            self._in_episode = False
+        self._episode_steps = 0
+        self._shared_writer._advance()
+
+    def close(self) -> None:
+        """Streams share the writer, which is closed by `SharedTrajectoryWriter`."""
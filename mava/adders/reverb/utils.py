@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Sequence
 
 import tensorflow as tf
 import tree
@@ -45,6 +45,38 @@ def final_step_like(
     )
 
 
+def stack_agent_specs(spec: Any, agent_net_keys: Dict[str, str]) -> Any:
+    """Stack the specs of the agents that use the same network.
+
+    This gives the specs of the items written by adders with
+    stacked_agent_net_keys set.
+
+    Args:
+        spec: nested dictionaries with per agent specs, e.g. agent environment
+            specs or extras specs.
+        agent_net_keys: network key of each agent.
+
+    Returns:
+        the specs, with per agent specs replaced by one spec per network with a
+        leading agent dimension.
+    """
+    if not isinstance(spec, dict):
+        return spec
+    if spec and spec.keys() == agent_net_keys.keys():
+
+        def stack(leaves: Sequence[specs.Array]) -> specs.Array:
+            return specs.Array(
+                shape=(len(leaves), *leaves[0].shape),
+                dtype=leaves[0].dtype,
+                name=leaves[0].name,
+            )
+
+        return base.stack_agents(spec, agent_net_keys, stack_fn=stack)
+    return {
+        key: stack_agent_specs(value, agent_net_keys) for key, value in spec.items()
+    }
+
+
 def trajectory_signature(
     ma_environment_spec: mava_specs.MAEnvironmentSpec,
     sequence_length: Optional[int] = None,
@@ -310,6 +310,11 @@ class Callback(ABC):
         """End of trainer step."""
         pass
 
+    # END
+    def on_training_end(self, trainer: SystemTrainer) -> None:
+        """Trainer stops running."""
+        pass
+
     ###############################
     # system parameter server hooks
     ###############################
@@ -73,3 +73,9 @@ class TrainerHookMixin(ABC):
         """End of trainer step."""
         for callback in self.callbacks:
             callback.on_training_step_end(self)
+
+    # END
+    def on_training_end(self) -> None:
+        """Trainer stops running."""
+        for callback in self.callbacks:
+            callback.on_training_end(self)
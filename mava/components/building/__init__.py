@@ -21,12 +21,13 @@ from mava.components.building.adders import (
     UniformAdderPriority,
 )
 from mava.components.building.best_checkpointer import BestCheckpointer
-from mava.components.building.data_server import OnPolicyDataServer
+from mava.components.building.data_server import InProcessDataServer, OnPolicyDataServer
 from mava.components.building.datasets import TrajectoryDataset, TransitionDataset
 from mava.components.building.distributor import Distributor
 from mava.components.building.environments import (
     EnvironmentSpec,
     ParallelExecutorEnvironmentLoop,
+    VectorisedParallelExecutorEnvironmentLoop,
 )
 from mava.components.building.extras_spec import ExtrasSpec
 from mava.components.building.loggers import Logger
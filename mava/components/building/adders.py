@@ -17,7 +17,7 @@
 import abc
 from dataclasses import dataclass
 from types import SimpleNamespace
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type
 
 from mava import specs
 from mava.adders import reverb as reverb_adders
@@ -35,6 +35,9 @@ class Adder(Component):
     def on_building_executor_adder(self, builder: SystemBuilder) -> None:
         """Create the executor adder.
 
+        Also stores `adder_factory`, a function that creates another adder of
+        the same kind on a given data server client.
+
         Args:
             builder: SystemBuilder.
 
@@ -152,7 +155,7 @@ class ParallelTransitionAdder(Adder):
         self.config = config
 
     def on_building_executor_adder(self, builder: SystemBuilder) -> None:
-        """Create a ParallelNStepTransitionAdder.
+        """Create a ParallelNStepTransitionAdder and its adder factory.
 
         Args:
             builder: SystemBuilder.
@@ -161,16 +164,19 @@ class ParallelTransitionAdder(Adder):
             None.
         """
 
-        adder = reverb_adders.ParallelNStepTransitionAdder(
-            priority_fns=builder.store.priority_fns,
-            client=builder.store.data_server_client,  # Created by builder
-            net_ids_to_keys=builder.store.unique_net_keys,
-            n_step=self.config.n_step,
-            table_network_config=builder.store.table_network_config,
-            discount=self.config.discount,
-        )
+        def adder_factory(client: Any) -> reverb_adders.ParallelNStepTransitionAdder:
+            return reverb_adders.ParallelNStepTransitionAdder(
+                priority_fns=builder.store.priority_fns,
+                client=client,
+                net_ids_to_keys=builder.store.unique_net_keys,
+                n_step=self.config.n_step,
+                table_network_config=builder.store.table_network_config,
+                discount=self.config.discount,
+            )
 
-        builder.store.adder = adder
+        builder.store.adder_factory = adder_factory
+        # Created by builder
+        builder.store.adder = adder_factory(builder.store.data_server_client)
 
 
 class UniformAdderPriority(AdderPriority):
@@ -225,6 +231,9 @@ class ParallelSequenceAdderConfig:
     sequence_length: int = 20
     period: int = 10
     use_next_extras: bool = False
+    stack_agents: bool = False
+    chunk_lengths: Optional[Dict[str, Optional[int]]] = None
+    auto_chunk_length: bool = False
 
 
 class ParallelSequenceAdder(Adder):
@@ -250,7 +259,7 @@ class ParallelSequenceAdder(Adder):
         builder.store.sequence_length = self.config.sequence_length
 
     def on_building_executor_adder(self, builder: SystemBuilder) -> None:
-        """Create a ParallelSequenceAdder.
+        """Create a ParallelSequenceAdder and its adder factory.
 
         Args:
             builder: SystemBuilder.
@@ -258,17 +267,26 @@ class ParallelSequenceAdder(Adder):
         Returns:
             None.
         """
-        adder = reverb_adders.ParallelSequenceAdder(
-            priority_fns=builder.store.priority_fns,
-            client=builder.store.data_server_client,  # Created by builder
-            net_ids_to_keys=builder.store.unique_net_keys,
-            sequence_length=self.config.sequence_length,
-            table_network_config=builder.store.table_network_config,
-            period=self.config.period,
-            use_next_extras=self.config.use_next_extras,
-        )
-
-        builder.store.adder = adder
+
+        def adder_factory(client: Any) -> reverb_adders.ParallelSequenceAdder:
+            return reverb_adders.ParallelSequenceAdder(
+                priority_fns=builder.store.priority_fns,
+                client=client,
+                net_ids_to_keys=builder.store.unique_net_keys,
+                sequence_length=self.config.sequence_length,
+                table_network_config=builder.store.table_network_config,
+                period=self.config.period,
+                use_next_extras=self.config.use_next_extras,
+                stacked_agent_net_keys=builder.store.agent_net_keys
+                if self.config.stack_agents
+                else None,
+                chunk_lengths=self.config.chunk_lengths,
+                auto_chunk_length=self.config.auto_chunk_length,
+            )
+
+        builder.store.adder_factory = adder_factory
+        # Created by builder
+        builder.store.adder = adder_factory(builder.store.data_server_client)
 
 
 class ParallelSequenceAdderSignature(AdderSignature):
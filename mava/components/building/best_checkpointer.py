@@ -1,12 +1,13 @@
 import logging
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from optax import Params
 
 from mava.components.component import Component
 from mava.core_jax import SystemBuilder, SystemParameterServer
+from mava.systems.parameter_server import COUNTER_SHARD
 from mava.utils.lp_utils import termination_fn
 
 
@@ -60,7 +61,10 @@ class BestCheckpointer(Component):
 
     def on_parameter_server_init(self, server: SystemParameterServer) -> None:
         """Adding checkpointing parameters to parameter server"""
-        if self.config.checkpoint_best_perf:
+        if (
+            self.config.checkpoint_best_perf
+            and server.store.parameter_server_shard == COUNTER_SHARD
+        ):
             # Store the best network in the parameter server just in
             # the case of checkpointing the best performance
             server.store.parameters.update(
@@ -107,6 +111,14 @@ class BestCheckpointer(Component):
 
         return params
 
+    def executor_parameters(self, builder: SystemBuilder) -> List[str]:
+        """Networks the evaluator stores in and restores from the best checkpoint"""
+        if builder.store.is_evaluator and (
+            self.config.checkpoint_best_perf or self.config.absolute_metric
+        ):
+            return ["policy_network", "critic_network"]
+        return []
+
     @staticmethod
     def name() -> str:
         """Returns the name of the component"""
@@ -16,12 +16,14 @@
 """Commonly used replay table components for system builders"""
 import abc
 import copy
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import reverb
 
 from mava import specs
+from mava.adders.reverb.utils import stack_agent_specs
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.adders import AdderSignature
@@ -29,6 +31,7 @@ from mava.components.building.environments import EnvironmentSpec
 from mava.components.building.reverb_components import RateLimiter, Remover, Sampler
 from mava.components.building.system_init import BaseSystemInit
 from mava.core_jax import SystemBuilder
+from mava.systems.replay_buffer import RingBufferTable
 from mava.utils import enums
 from mava.utils.builder_utils import convert_specs
 from mava.utils.sort_utils import sort_str_num
@@ -101,10 +104,74 @@ class DataServer(Component):
                 builder.store.extras_spec,
                 num_networks,
             )
+            if (
+                hasattr(builder.store.global_config, "stack_agents")
+                and builder.store.global_config.stack_agents
+            ):
+                env_specs, extras_specs = self._stack_agent_specs(
+                    table_key, env_specs, extras_specs, builder
+                )
             table = self.table(table_key, env_specs, extras_specs, builder)
             data_tables.append(table)
         return data_tables
 
+    @staticmethod
+    def _stack_agent_specs(
+        table_key: str,
+        environment_specs: specs.MAEnvironmentSpec,
+        extras_specs: Dict[str, Any],
+        builder: SystemBuilder,
+    ) -> Tuple[specs.MAEnvironmentSpec, Dict[str, Any]]:
+        """Stack the specs of a table's agents that use the same network.
+
+        Stacked agents can not be split between tables, so every table must
+        train all the agents of its networks, with fixed agent networks.
+
+        Args:
+            table_key: Identifier for table.
+            environment_specs: Environment specs of the table's agents.
+            extras_specs: Other specs of the table's agents.
+            builder: SystemBuilder.
+
+        Returns:
+            The environment and extras specs, keyed by network.
+        """
+        table_net_keys = builder.store.table_network_config[table_key]
+        agent_net_keys = builder.store.agent_net_keys
+        if (
+            builder.store.global_config.network_sampling_setup
+            != enums.NetworkSampler.fixed_agent_networks
+        ):
+            raise ValueError(
+                "Stacking agents requires the fixed_agent_networks sampler setting."
+            )
+        if Counter(table_net_keys) != Counter(
+            net_key for net_key in agent_net_keys.values() if net_key in table_net_keys
+        ):
+            raise ValueError(
+                f"Table {table_key} must use all the agents of its networks "
+                f"{table_net_keys} to stack agents."
+            )
+
+        table_agent_net_keys = dict(
+            zip(environment_specs.get_agent_ids(), table_net_keys)
+        )
+        environment_specs.set_agent_environment_specs(
+            stack_agent_specs(
+                environment_specs.get_agent_environment_specs(), table_agent_net_keys
+            )
+        )
+        environment_specs.set_agent_ids(
+            list(environment_specs.get_agent_environment_specs().keys())
+        )
+        if environment_specs.get_extras_specs() is not None:
+            environment_specs.set_extras_specs(
+                stack_agent_specs(
+                    environment_specs.get_extras_specs(), table_agent_net_keys
+                )
+            )
+        return environment_specs, stack_agent_specs(extras_specs, table_agent_net_keys)
+
     @abc.abstractmethod
     def table(
         self,
@@ -284,3 +351,89 @@ class OnPolicyDataServer(DataServer):
             signature=signature,
         )
         return table
+
+
+@dataclass
+class InProcessDataServerConfig:
+    max_size: int = 1000
+    sampler: enums.ReplaySampler = enums.ReplaySampler.queue
+    priority_exponent: float = 1.0
+    min_size_to_sample: int = 1
+    max_times_sampled: int = 0
+    sampler_seed: Optional[int] = None
+
+
+class InProcessDataServer(DataServer):
+    def __init__(
+        self,
+        config: InProcessDataServerConfig = InProcessDataServerConfig(),
+    ) -> None:
+        """Component creates an in-process data server.
+
+        The tables are numpy ring buffers that executors and trainers in the
+        same process share directly, without a reverb server, gRPC or
+        serialisation. Only single process systems are supported.
+
+        Args:
+            config: InProcessDataServerConfig.
+        """
+
+        self.config = config
+
+    def table(
+        self,
+        table_key: str,
+        environment_specs: specs.MAEnvironmentSpec,
+        extras_specs: Dict[str, Any],
+        builder: SystemBuilder,
+    ) -> RingBufferTable:
+        """Create InProcessDataServer table.
+
+        Args:
+            table_key: Identifier for table.
+            environment_specs: Environment specs.
+            extras_specs: Other specs.
+            builder: SystemBuilder.
+
+        Returns:
+            A new ring buffer table.
+        """
+        if hasattr(builder.store.global_config, "sequence_length"):
+            signature = builder.store.adder_signature_fn(
+                environment_specs,
+                builder.store.global_config.sequence_length,
+                extras_specs,
+            )
+        else:
+            signature = builder.store.adder_signature_fn(
+                environment_specs, extras_specs
+            )
+        table = RingBufferTable(
+            name=table_key,
+            max_size=self.config.max_size,
+            sampler=self.config.sampler,
+            priority_exponent=self.config.priority_exponent,
+            min_size_to_sample=self.config.min_size_to_sample,
+            max_times_sampled=self.config.max_times_sampled,
+            signature=signature,
+            seed=self.config.sampler_seed,
+        )
+        return table
+
+    def on_building_data_server(self, builder: SystemBuilder) -> None:
+        """Create a ring buffer table for each trainer and load into store.
+
+        Args:
+            builder: SystemBuilder
+
+        Raises:
+            ValueError: if the system is multi-process.
+
+        Returns:
+            None.
+        """
+        if builder.store.global_config.multi_process:
+            raise ValueError(
+                "The in-process data server only supports single process systems."
+            )
+        super().on_building_data_server(builder)
@@ -16,7 +16,7 @@
 """Commonly used dataset components for system builders"""
 import abc
 from dataclasses import dataclass
-from typing import Any, Callable, List, Optional, Type
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Type
 
 import reverb
 from acme import datasets
@@ -24,6 +24,8 @@ from acme import datasets
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.core_jax import SystemBuilder
+from mava.systems.replay_buffer import ReplayBuffer
+from mava.utils.dataset_utils import DLPackIterator, PrefetchIterator, device_put_sample
 
 Transform = Callable[[reverb.ReplaySample], reverb.ReplaySample]
 
@@ -125,6 +127,8 @@ class TrajectoryDatasetConfig:
     max_samples_per_stream: int = -1
     rate_limiter_timeout_ms: int = -1
     get_signature_timeout_secs: Optional[int] = None
+    prefetch_buffer_size: int = 0
+    dlpack_handoff: bool = False
     # max_samples: int = -1
     # dataset_name: str = "trajectory_dataset"
 
@@ -144,7 +148,14 @@ class TrajectoryDataset(TrainerDataset):
     def on_building_trainer_dataset(self, builder: SystemBuilder) -> None:
         """Build a trajectory dataset and save it to the store.
 
-        Automatically adds a batch dimension to the dataset.
+        Automatically adds a batch dimension to the dataset. If
+        `prefetch_buffer_size` is positive, the next batches are sampled and
+        transferred to device on a background thread while the trainer steps.
+        If `dlpack_handoff` is set, batches are handed from TensorFlow to JAX
+        through DLPack instead of being converted to numpy first, and then
+        moved to the default device, on the prefetch thread if there is one.
+        The bytes copied on the way are logged by the trainer step. Systems
+        using an in-process `ReplayBuffer` sample its tables directly.
 
         Args:
             builder: SystemBuilder.
@@ -153,6 +164,35 @@ class TrajectoryDataset(TrainerDataset):
             None.
         """
         builder.store.epoch_batch_size = self.config.epoch_batch_size
+        if isinstance(builder.store.data_server_client, ReplayBuffer):
+            # Sample the in-process tables directly, already batched.
+            dataset_iterator = builder.store.data_server_client.as_iterator(
+                builder.store.trainer_id, self.config.epoch_batch_size
+            )
+            transform = device_put_sample
+        else:
+            dataset_iterator, transform = self._reverb_iterator(builder)
+
+        if self.config.prefetch_buffer_size > 0:
+            dataset_iterator = PrefetchIterator(
+                dataset_iterator,
+                buffer_size=self.config.prefetch_buffer_size,
+                transform=transform,
+            )
+
+        builder.store.dataset_iterator = dataset_iterator
+
+    def _reverb_iterator(
+        self, builder: SystemBuilder
+    ) -> Tuple[Iterator[Any], Optional[Transform]]:
+        """Create an iterator over batches of the trainer's reverb table.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            the iterator and the transform that moves its batches to device.
+        """
         dataset = reverb.TrajectoryDataset.from_table_signature(
             server_address=builder.store.data_server_client.server_address,
             table=builder.store.trainer_id,
@@ -167,4 +207,6 @@ class TrajectoryDataset(TrainerDataset):
         # Add batch dimension.
         dataset = dataset.batch(self.config.epoch_batch_size, drop_remainder=True)
 
-        builder.store.dataset_iterator = dataset.as_numpy_iterator()
+        if self.config.dlpack_handoff:
+            return DLPackIterator(dataset), None
+        return dataset.as_numpy_iterator(), device_put_sample
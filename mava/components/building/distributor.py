@@ -29,6 +29,7 @@ from mava.systems.launcher import Launcher, NodeType
 @dataclass
 class DistributorConfig:
     num_executors: int = 1
+    num_parameter_servers: int = 1
     multi_process: bool = True
     nodes_on_gpu: Union[List[str], str] = "trainer"
     run_evaluator: bool = True
@@ -48,13 +49,20 @@ class Distributor(Component):
         """
         if isinstance(config.nodes_on_gpu, str):
             config.nodes_on_gpu = [config.nodes_on_gpu]
+        if config.num_parameter_servers > 1 and not config.multi_process:
+            raise ValueError(
+                "A sharded parameter server can only be used in multi process "
+                "systems."
+            )
         self.config = config
 
     def on_building_program_nodes(self, builder: SystemBuilder) -> None:
         """Create nodes for the program and save the program in the store.
 
         Create data server, parameter server, executor, trainer, and evaluator nodes.
-        Handles both single-process and multi-process.
+        Handles both single-process and multi-process. With more than one
+        parameter server, the parameters are sharded by network key over the
+        parameter server nodes.
 
         Args:
             builder: SystemBuilder.
@@ -104,11 +112,24 @@ class Distributor(Component):
         )
 
         # variable server node
-        parameter_server = builder.store.program.add(
-            builder.parameter_server,
-            node_type=NodeType.courier,
-            name="parameter_server",
-        )
+        if self.config.num_parameter_servers == 1:
+            parameter_server = builder.store.program.add(
+                builder.parameter_server,
+                node_type=NodeType.courier,
+                name="parameter_server",
+            )
+        else:
+            # One node per shard. Executors and trainers get the list of shards
+            # and route their requests to the shards holding the parameters.
+            parameter_server = [
+                builder.store.program.add(
+                    builder.parameter_server,
+                    [shard_id, self.config.num_parameter_servers],
+                    node_type=NodeType.courier,
+                    name="parameter_server",
+                )
+                for shard_id in range(self.config.num_parameter_servers)
+            ]
 
         # executor nodes
         for executor_id in range(self.config.num_executors):
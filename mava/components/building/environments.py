@@ -15,24 +15,30 @@
 
 """Execution components for system builders"""
 import abc
+import functools
 import os
 from dataclasses import dataclass
-from typing import Callable, List, Optional, Tuple, Type, Union
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
 
 import acme
 
 from mava import specs
+from mava.adders.reverb.shared_writer import SharedTrajectoryWriter
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.loggers import Logger
 from mava.core_jax import SystemBuilder
-from mava.environment_loop import ParallelEnvironmentLoop
+from mava.environment_loop import (
+    ParallelEnvironmentLoop,
+    VectorisedParallelEnvironmentLoop,
+)
 from mava.utils.sort_utils import sort_str_num
 from mava.wrappers.environment_loop_wrappers import (
     DetailedPerAgentStatistics,
     EnvironmentLoopStatisticsBase,
     MonitorParallelEnvironmentLoop,
 )
+from mava.wrappers.subprocess_env import SubprocessEnvWrapper
 
 
 @dataclass
@@ -238,3 +244,150 @@ class MonitorExecutorEnvironmentLoop(ExecutorEnvironmentLoop):
             )
 
         builder.store.system_executor = executor_environment_loop
+
+
+def _make_environment(
+    environment_factory: Callable[..., Tuple[acme.core.Worker, Dict]],
+    evaluation: bool,
+) -> acme.core.Worker:
+    """Create an environment from the system environment factory.
+
+    Module level so it can be sent to environment subprocesses.
+    """
+    return environment_factory(evaluation=evaluation)[0]
+
+
+@dataclass
+class VectorisedExecutorEnvironmentLoopConfig(ExecutorEnvironmentLoopConfig):
+    num_executor_environments: int = 4
+    subprocess_environments: bool = False
+    shared_trajectory_writer: bool = False
+
+
+class VectorisedParallelExecutorEnvironmentLoop(ExecutorEnvironmentLoop):
+    def __init__(
+        self,
+        config: VectorisedExecutorEnvironmentLoopConfig = VectorisedExecutorEnvironmentLoopConfig(),  # noqa
+    ):
+        """Component creates an executor loop over several environment copies.
+
+        Every executor steps num_executor_environments environments with a single
+        batched action selection call. The evaluator keeps a single environment.
+        With subprocess_environments, every executor environment runs in its own
+        subprocess and is stepped asynchronously. With shared_trajectory_writer,
+        the adders of all the environments write through a single trajectory
+        writer, instead of opening one stream to the data server each.
+
+        Args:
+            config: VectorisedExecutorEnvironmentLoopConfig.
+        """
+        super().__init__(config=config)
+        self.config = config
+
+    def on_building_executor_start(self, builder: SystemBuilder) -> None:
+        """Store the number of environments the executor acts in.
+
+        This is read by the action selection components to batch over
+        environments and must be set before the executor is created.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        builder.store.num_executor_environments = (
+            1 if builder.store.is_evaluator else self.config.num_executor_environments
+        )
+
+        # With a shared writer, the adders are built on clients of its streams,
+        # starting with the executor's own adder.
+        builder.store.shared_trajectory_writer = None
+        if (
+            self.config.shared_trajectory_writer
+            and builder.store.num_executor_environments > 1
+            and builder.store.data_server_client is not None
+        ):
+            builder.store.shared_trajectory_writer = SharedTrajectoryWriter(
+                builder.store.data_server_client,
+                num_streams=builder.store.num_executor_environments,
+            )
+            builder.store.data_server_client = (
+                builder.store.shared_trajectory_writer.stream_client()
+            )
+
+    def on_building_executor_environment(self, builder: SystemBuilder) -> None:
+        """Create and store the executor environments from the factory in config.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        environment_factory = functools.partial(
+            _make_environment,
+            builder.store.global_config.environment_factory,
+            builder.store.is_evaluator,
+        )
+        if self.config.subprocess_environments and not builder.store.is_evaluator:
+            builder.store.executor_environments = [
+                SubprocessEnvWrapper(environment_factory)
+                for _ in range(builder.store.num_executor_environments)
+            ]
+        else:
+            builder.store.executor_environments = [
+                environment_factory()
+                for _ in range(builder.store.num_executor_environments)
+            ]
+        builder.store.executor_environment = builder.store.executor_environments[0]
+
+    def on_building_executor_environment_loop(self, builder: SystemBuilder) -> None:
+        """Create and store a vectorised parallel environment loop.
+
+        Every environment gets its own adder, created with the adder
+        component's `adder_factory`. With shared_trajectory_writer, the adders
+        are created with clients of the same shared writer, which the loop
+        closes when it stops.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        if builder.store.num_executor_environments == 1:
+            executor_environment_loop = ParallelEnvironmentLoop(
+                environment=builder.store.executor_environment,
+                executor=builder.store.executor,
+                logger=builder.store.executor_logger,
+                should_update=self.config.should_update,
+            )
+        else:
+            adders = None
+            shared_writer = builder.store.shared_trajectory_writer
+            if builder.store.adder:
+                adders = [builder.store.adder] + [
+                    builder.store.adder_factory(
+                        shared_writer.stream_client()
+                        if shared_writer
+                        else builder.store.data_server_client
+                    )
+                    for _ in range(builder.store.num_executor_environments - 1)
+                ]
+
+            executor_environment_loop = VectorisedParallelEnvironmentLoop(
+                environments=builder.store.executor_environments,
+                executor=builder.store.executor,
+                adders=adders,
+                logger=builder.store.executor_logger,
+                should_update=self.config.should_update,
+                shared_writer=shared_writer,
+            )
+        del builder.store.executor_logger
+
+        if self.config.executor_stats_wrapper_class:
+            executor_environment_loop = self.config.executor_stats_wrapper_class(
+                executor_environment_loop
+            )
+        builder.store.system_executor = executor_environment_loop
@@ -15,16 +15,18 @@
 
 """Parameter client for system builders"""
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple, Type
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 
 import numpy as np
 
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.best_checkpointer import BestCheckpointer
+from mava.components.training.base import TrainingStateParameters
 from mava.components.training.trainer import BaseTrainerInit
 from mava.core_jax import SystemBuilder
 from mava.systems import ParameterClient
+from mava.utils.parameter_codec import ParameterCodec
 
 
 class BaseParameterClient(Component):
@@ -69,6 +71,13 @@ class BaseParameterClient(Component):
 @dataclass
 class ExecutorParameterClientConfig:
     executor_parameter_update_period: int = 200
+    executor_versioned_get: bool = False
+    executor_parameter_codec: Optional[ParameterCodec] = None
+    executor_used_networks_only: bool = False
+    executor_add_flush_count: int = 1
+    executor_add_flush_seconds: float = 1.0
+    executor_subscribe: bool = False
+    executor_subscribe_timeout: float = 10.0
 
 
 class ExecutorParameterClient(BaseParameterClient):
@@ -88,7 +97,23 @@ class ExecutorParameterClient(BaseParameterClient):
         """Create and store the executor parameter client.
 
         Gets network parameters from store and registers them for tracking.
-        Also works for the evaluator.
+        Also works for the evaluator. With `executor_versioned_get`, only the
+        parameters that changed since the last update are sent by the server.
+        If `executor_parameter_codec` is set, the server encodes them with it,
+        e.g. quantised and compressed. Network parameters are held in flat
+        buffers that fetched values are copied into. With
+        `executor_used_networks_only`, only the networks that the components of
+        the system declare in `executor_parameters` are fetched, e.g. critics are
+        not fetched by executors that only act with their policies.
+        Count increments are sent in batches of `executor_add_flush_count`
+        episodes, or after `executor_add_flush_seconds`. With
+        `executor_subscribe`, executors in a multi process system subscribe to
+        their parameters instead of fetching them every
+        `executor_parameter_update_period` steps, and pick up new network
+        parameters as soon as a trainer set them, along with the counts and
+        the other parameters they fetch. The trainer step that
+        produced each policy is fetched too and stored, by network key, in
+        `builder.store.policy_trainer_steps`.
 
         Args:
             builder: SystemBuilder.
@@ -99,19 +124,34 @@ class ExecutorParameterClient(BaseParameterClient):
         # and hence set_keys is empty
         set_keys: List[str] = []
         get_keys: List[str] = []
+        # Subscriptions are answered when the network parameters change.
+        network_param_keys: List[str] = []
 
+        network_names = self._executor_network_names(builder)
         for agent_net_key in builder.store.networks.keys():
-            policy_param_key = f"policy_network-{agent_net_key}"
-            params[policy_param_key] = builder.store.networks[
-                agent_net_key
-            ].policy_params
-            get_keys.append(policy_param_key)
-
-            critic_param_key = f"critic_network-{agent_net_key}"
-            params[critic_param_key] = builder.store.networks[
-                agent_net_key
-            ].critic_params
-            get_keys.append(critic_param_key)
+            if "policy_network" in network_names:
+                policy_param_key = f"policy_network-{agent_net_key}"
+                params[policy_param_key] = builder.store.networks[
+                    agent_net_key
+                ].policy_params
+                get_keys.append(policy_param_key)
+                network_param_keys.append(policy_param_key)
+
+            if "critic_network" in network_names:
+                critic_param_key = f"critic_network-{agent_net_key}"
+                params[critic_param_key] = builder.store.networks[
+                    agent_net_key
+                ].critic_params
+                get_keys.append(critic_param_key)
+                network_param_keys.append(critic_param_key)
+
+        # Trainer step that produced each policy, to measure the policy lag.
+        builder.store.policy_trainer_steps = {}
+        for agent_net_key in builder.store.networks.keys():
+            name = f"policy_trainer_steps-{agent_net_key}"
+            params[name] = np.array(0, dtype=np.int32)
+            get_keys.append(name)
+            builder.store.policy_trainer_steps[agent_net_key] = params[name]
 
         # Create observations' normalisation parameters
         params["norm_params"] = builder.store.norm_params
@@ -141,6 +181,15 @@ class ExecutorParameterClient(BaseParameterClient):
                 get_keys=get_keys,
                 set_keys=set_keys,
                 update_period=self.config.executor_parameter_update_period,
+                versioned_get=self.config.executor_versioned_get,
+                codec=self.config.executor_parameter_codec,
+                flat_layout=True,
+                network_keys=list(builder.store.networks.keys()),
+                add_flush_count=self.config.executor_add_flush_count,
+                add_flush_seconds=self.config.executor_add_flush_seconds,
+                subscribe=self.config.executor_subscribe,
+                subscribe_timeout=self.config.executor_subscribe_timeout,
+                subscribe_keys=network_param_keys,
             )
 
             # Make sure not to use a random policy after checkpoint restoration by
@@ -149,6 +198,24 @@ class ExecutorParameterClient(BaseParameterClient):
 
         builder.store.executor_parameter_client = parameter_client
 
+    def _executor_network_names(self, builder: SystemBuilder) -> Set[str]:
+        """Names of the networks whose parameters the executor fetches.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            set of network names, e.g. "policy_network".
+        """
+        if not self.config.executor_used_networks_only:
+            return {"policy_network", "critic_network"}
+
+        network_names: Set[str] = set()
+        for component in builder.callbacks:
+            if isinstance(component, Component):
+                network_names.update(component.executor_parameters(builder))
+        return network_names
+
     @staticmethod
     def name() -> str:
         """Static method that returns component name."""
@@ -158,6 +225,8 @@ class ExecutorParameterClient(BaseParameterClient):
 @dataclass
 class TrainerParameterClientConfig:
     trainer_parameter_update_period: int = 5
+    trainer_add_flush_count: int = 1
+    trainer_add_flush_seconds: float = 1.0
 
 
 class TrainerParameterClient(BaseParameterClient):
@@ -176,13 +245,20 @@ class TrainerParameterClient(BaseParameterClient):
     def on_building_trainer_parameter_client(self, builder: SystemBuilder) -> None:
         """Create and store the trainer parameter client.
 
-        Gets network parameters from store and registers them for tracking.
+        Registers the network parameters, optimiser states and normalisation
+        parameters for tracking. These are read from the trainer's training
+        state holder, so parameters updated by a training step are sent
+        without being copied back into the networks.
+        Count increments are sent in batches of `trainer_add_flush_count`
+        steps, or after `trainer_add_flush_seconds`. The policies this trainer
+        sets are sent with the trainer step that produced them, whose parameter
+        names are stored in `builder.store.trainer_policy_trainer_steps`.
 
         Args:
             builder: SystemBuilder.
         """
         # Create parameter client
-        params: Dict[str, Any] = {}
+        state_names: List[str] = []
         set_keys: List[str] = []
         get_keys: List[str] = []
         # TODO (dries): Only add the networks this trainer is working with.
@@ -190,12 +266,8 @@ class TrainerParameterClient(BaseParameterClient):
         trainer_networks = builder.store.trainer_networks[builder.store.trainer_id]
 
         for net_key in builder.store.networks.keys():
-            params[f"policy_network-{net_key}"] = builder.store.networks[
-                net_key
-            ].policy_params
-            params[f"critic_network-{net_key}"] = builder.store.networks[
-                net_key
-            ].critic_params
+            state_names.append(f"policy_network-{net_key}")
+            state_names.append(f"critic_network-{net_key}")
 
             if net_key in set(trainer_networks):
                 set_keys.append(f"policy_network-{net_key}")
@@ -204,23 +276,35 @@ class TrainerParameterClient(BaseParameterClient):
                 get_keys.append(f"policy_network-{net_key}")
                 get_keys.append(f"critic_network-{net_key}")
 
-            params[f"policy_opt_state-{net_key}"] = builder.store.policy_opt_states[
-                net_key
-            ]
-            params[f"critic_opt_state-{net_key}"] = builder.store.critic_opt_states[
-                net_key
-            ]
+            state_names.append(f"policy_opt_state-{net_key}")
+            state_names.append(f"critic_opt_state-{net_key}")
             set_keys.append(f"policy_opt_state-{net_key}")
             set_keys.append(f"critic_opt_state-{net_key}")
 
         # Add observations' normalisation parameters
-        params["norm_params"] = builder.store.norm_params
+        state_names.append("norm_params")
         set_keys.append("norm_params")
 
-        count_names, params = self._set_up_count_parameters(params=params)
+        count_names, count_params = self._set_up_count_parameters(params={})
 
         get_keys.extend(count_names)
-        builder.store.trainer_counts = {name: params[name] for name in count_names}
+        builder.store.trainer_counts = count_params
+
+        # Trainer step that produced the policies this trainer sets.
+        policy_trainer_steps = {
+            f"policy_trainer_steps-{net_key}": np.array(0, dtype=np.int32)
+            for net_key in builder.store.networks.keys()
+            if net_key in set(trainer_networks)
+        }
+        set_keys.extend(policy_trainer_steps)
+        builder.store.trainer_policy_trainer_steps = list(policy_trainer_steps)
+
+        params = TrainingStateParameters(
+            holder=builder.store.training_state,
+            state_names=state_names,
+            parameters={**count_params, **policy_trainer_steps},
+            published_names=set_keys,
+        )
 
         # Create parameter client
         parameter_client = None
@@ -232,6 +316,9 @@ class TrainerParameterClient(BaseParameterClient):
                 get_keys=get_keys,
                 set_keys=set_keys,
                 update_period=self.config.trainer_parameter_update_period,
+                network_keys=list(builder.store.networks.keys()),
+                add_flush_count=self.config.trainer_add_flush_count,
+                add_flush_seconds=self.config.trainer_add_flush_seconds,
             )
 
             # Get all the initial parameters
@@ -19,6 +19,7 @@ import abc
 from typing import Any, List, Type
 
 from mava.callbacks import Callback
+from mava.core_jax import SystemBuilder
 
 
 class Component(Callback):
@@ -45,3 +46,16 @@ class Component(Callback):
             List of required component classes.
         """
         return []
+
+    def executor_parameters(self, builder: SystemBuilder) -> List[str]:
+        """Networks whose parameters executors need for this Component to function.
+
+        Executor and evaluator parameter clients only fetch these networks.
+
+        Args:
+            builder: SystemBuilder of the executor or evaluator.
+
+        Returns:
+            List of network names, e.g. "policy_network", without network keys.
+        """
+        return []
@@ -16,10 +16,11 @@
 """Execution components for system builders"""
 
 import abc
-from types import SimpleNamespace
-from typing import Any, Dict, List, Tuple, Type
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple, Type
 
 import jax
+import jax.numpy as jnp
 from acme.jax import networks as networks_lib
 from acme.jax import utils
 
@@ -29,21 +30,106 @@ from mava.components.building.networks import Networks
 from mava.components.building.system_init import BaseSystemInit
 from mava.components.normalisation import ObservationNormalisation
 from mava.components.training.trainer import BaseTrainerInit
-from mava.core_jax import SystemExecutor
+from mava.core_jax import SystemBuilder, SystemExecutor
 from mava.types import NestedArray
 from mava.utils.jax_training_utils import executor_normalize_observation
 
 
+@dataclass
+class ExecutorSelectActionConfig:
+    vectorise_agent_action_selection: bool = False
+
+
+def group_agents_by_network(agent_net_keys: Dict[str, str]) -> Dict[str, List[str]]:
+    """Group the agents that share a network.
+
+    Args:
+        agent_net_keys: mapping from agent to network key.
+
+    Returns:
+        mapping from network key to the (ordered) list of agents using it.
+    """
+    network_agents: Dict[str, List[str]] = {}
+    for agent, net_key in agent_net_keys.items():
+        network_agents.setdefault(net_key, []).append(agent)
+    return network_agents
+
+
+def stack_agent_values(values: List[NestedArray]) -> NestedArray:
+    """Stack a list of per agent values along a new leading agent axis.
+
+    Args:
+        values: nested arrays with identical structure, one per agent.
+
+    Returns:
+        single nested array with a leading agent dimension.
+    """
+    return jax.tree_util.tree_map(lambda *x: jnp.stack(x), *values)
+
+
+def unstack_agent_values(
+    stacked_values: NestedArray, agents: List[str]
+) -> Dict[str, NestedArray]:
+    """Split a nested array with a leading agent axis into per agent values.
+
+    Args:
+        stacked_values: nested array with a leading agent dimension.
+        agents: agents in the order in which they were stacked.
+
+    Returns:
+        dictionary mapping each agent to its slice of the stacked values.
+    """
+    return {
+        agent: jax.tree_util.tree_map(lambda x, i=i: x[i], stacked_values)
+        for i, agent in enumerate(agents)
+    }
+
+
+def vmap_over_environments(select_actions_fn: Callable) -> Callable:
+    """Make a select actions function act on a leading environment axis.
+
+    The observations (and policy states for recurrent executors) have a leading
+    environment axis while the parameters are shared by all environments. Each
+    environment gets its own action key. The size of the environment axis can
+    change between calls, e.g. when only the environments that finished
+    stepping select actions.
+
+    Args:
+        select_actions_fn: function taking observations, parameters, optional
+            policy states and a key, and returning the key as its last output.
+
+    Returns:
+        select actions function over all the environments.
+    """
+
+    def batched_select_actions(
+        observations: Dict[str, NestedArray],
+        current_params: Dict[str, NestedArray],
+        *args: Any,
+    ) -> Tuple:
+        """Select actions for all the agents in all the environments."""
+        *policy_states, base_key = args
+        num_environments = jax.tree_util.tree_leaves(observations)[0].shape[0]
+        keys = jax.random.split(base_key, num_environments + 1)
+        in_axes = (0, None) + (0,) * len(policy_states) + (0,)
+        outputs = jax.vmap(select_actions_fn, in_axes=in_axes)(
+            observations, current_params, *policy_states, keys[1:]
+        )
+        return (*outputs[:-1], keys[0])
+
+    return batched_select_actions
+
+
 class ExecutorSelectAction(Component):
     @abc.abstractmethod
     def __init__(
         self,
-        config: SimpleNamespace = SimpleNamespace(),
+        config: ExecutorSelectActionConfig = ExecutorSelectActionConfig(),
     ):
         """Component defines hooks to override for executor action selection.
 
         Args:
-            config: SimpleNamespace.
+            config: ExecutorSelectActionConfig.
         """
         self.config = config
 
@@ -71,16 +157,33 @@ class ExecutorSelectAction(Component):
         """
         return [BaseTrainerInit, BaseSystemInit, Networks]
 
+    def executor_parameters(self, builder: SystemBuilder) -> List[str]:
+        """Networks whose parameters executors need for this Component to function.
+
+        Actions are only selected with the policy networks.
+
+        Args:
+            builder: SystemBuilder of the executor or evaluator.
+
+        Returns:
+            List of network names.
+        """
+        return ["policy_network"]
+
 
 class FeedforwardExecutorSelectAction(ExecutorSelectAction):
     def __init__(
         self,
-        config: SimpleNamespace = SimpleNamespace(),
+        config: ExecutorSelectActionConfig = ExecutorSelectActionConfig(),
     ):
         """Component defines hooks for the executor selecting actions.
 
+        If vectorise_agent_action_selection is set, agents that share a network
+        are batched together and acted for with a single vmapped forward pass,
+        instead of unrolling a forward pass per agent inside the jitted function.
+
         Args:
-            config: SimpleNamespace.
+            config: ExecutorSelectActionConfig.
         """
         self.config = config
 
@@ -187,18 +290,84 @@ class FeedforwardExecutorSelectAction(ExecutorSelectAction):
                 )
             return actions_info, policies_info, base_key
 
-        executor.store.select_actions_fn = jax.jit(select_actions)
+        def select_actions_vectorised(
+            observations: Dict[str, NestedArray],
+            current_params: Dict[str, NestedArray],
+            base_key: networks_lib.PRNGKey,
+        ) -> Tuple[
+            Dict[str, NestedArray], Dict[str, NestedArray], networks_lib.PRNGKey
+        ]:
+            """Select actions with one vmap per network - this is jitted below.
+
+            Args:
+                observations : The observations for all the agents.
+                current_params : The parameters for all the agents.
+                base_key : A JAX prng_key.
+
+            Returns:
+                action info, policy info and new prng key.
+            """
+            actions_info, policies_info = {}, {}
+            for net_key, agents in group_agents_by_network(agent_net_keys).items():
+                agents = [agent for agent in agents if agent in observations]
+                if not agents:
+                    continue
+
+                stacked_observations = stack_agent_values(
+                    [observations[agent] for agent in agents]
+                )
+                # One action key per agent, keep the first key for future splits.
+                keys = jax.random.split(base_key, len(agents) + 1)
+                base_key, action_keys = keys[0], keys[1:]
+
+                network = networks[net_key]
+                params = current_params[net_key]
+
+                def agent_select_action(
+                    observation: NestedArray, action_key: networks_lib.PRNGKey
+                ) -> Tuple[NestedArray, NestedArray]:
+                    """Action selection for a single agent of this network."""
+                    action_info, policy_info, _ = select_action(
+                        observation=observation,
+                        current_params=params,
+                        network=network,
+                        base_key=action_key,
+                    )
+                    return action_info, policy_info
+
+                stacked_actions, stacked_policies = jax.vmap(agent_select_action)(
+                    stacked_observations, action_keys
+                )
+                actions_info.update(unstack_agent_values(stacked_actions, agents))
+                policies_info.update(unstack_agent_values(stacked_policies, agents))
+            return actions_info, policies_info, base_key
+
+        select_actions_fn = (
+            select_actions_vectorised
+            if self.config.vectorise_agent_action_selection
+            else select_actions
+        )
+        # Vectorised environment loops pass observations of several environments.
+        num_environments = getattr(executor.store, "num_executor_environments", 1)
+        if num_environments > 1:
+            select_actions_fn = vmap_over_environments(select_actions_fn)
+        executor.store.select_actions_fn = jax.jit(select_actions_fn)
 
 
 class RecurrentExecutorSelectAction(ExecutorSelectAction):
     def __init__(
         self,
-        config: SimpleNamespace = SimpleNamespace(),
+        config: ExecutorSelectActionConfig = ExecutorSelectActionConfig(),
     ):
         """Component defines hooks for the executor selecting actions.
 
+        If vectorise_agent_action_selection is set, the recurrent states of
+        agents that share a network are stacked and a single vmapped recurrent
+        step is taken per network. The per agent policy states in the store
+        keep the same layout in both modes.
+
         Args:
-            config: SimpleNamespace.
+            config: ExecutorSelectActionConfig.
         """
         self.config = config
 
@@ -324,4 +493,86 @@ class RecurrentExecutorSelectAction(ExecutorSelectAction):
                 )
             return actions_info, policies_info, new_policy_states, base_key
 
-        executor.store.select_actions_fn = jax.jit(select_actions)
+        def select_actions_vectorised(
+            observations: Dict[str, NestedArray],
+            current_params: Dict[str, NestedArray],
+            policy_states: Dict[str, NestedArray],
+            base_key: networks_lib.PRNGKey,
+        ) -> Tuple[
+            Dict[str, NestedArray],
+            NestedArray,
+            Dict[str, NestedArray],
+            networks_lib.PRNGKey,
+        ]:
+            """Select actions with one vmap per network - this is jitted below.
+
+            The recurrent states of all the agents using the same network are
+            stacked so that a single recurrent step is taken for the whole group.
+
+            Args:
+                observations : The observations for all the agents.
+                current_params : The parameters for all the agents.
+                policy_states : The recurrent states for all the agents.
+                base_key : A JAX prng_key.
+
+            Returns:
+                action info, policy info, new policy states and new prng key.
+            """
+            actions_info, policies_info, new_policy_states = {}, {}, {}
+            for net_key, agents in group_agents_by_network(agent_net_keys).items():
+                agents = [agent for agent in agents if agent in observations]
+                if not agents:
+                    continue
+
+                stacked_observations = stack_agent_values(
+                    [observations[agent] for agent in agents]
+                )
+                stacked_policy_states = stack_agent_values(
+                    [policy_states[agent] for agent in agents]
+                )
+                # One action key per agent, keep the first key for future splits.
+                keys = jax.random.split(base_key, len(agents) + 1)
+                base_key, action_keys = keys[0], keys[1:]
+
+                network = networks[net_key]
+                params = current_params[net_key]
+
+                def agent_select_action(
+                    observation: NestedArray,
+                    policy_state: NestedArray,
+                    action_key: networks_lib.PRNGKey,
+                ) -> Tuple[NestedArray, NestedArray, NestedArray]:
+                    """Action selection for a single agent of this network."""
+                    action_info, policy_info, policy_state, _ = select_action(
+                        observation=observation,
+                        current_params=params,
+                        policy_state=policy_state,
+                        network=network,
+                        base_key=action_key,
+                    )
+                    return action_info, policy_info, policy_state
+
+                (
+                    stacked_actions,
+                    stacked_policies,
+                    stacked_new_policy_states,
+                ) = jax.vmap(agent_select_action)(
+                    stacked_observations, stacked_policy_states, action_keys
+                )
+                actions_info.update(unstack_agent_values(stacked_actions, agents))
+                policies_info.update(unstack_agent_values(stacked_policies, agents))
+                new_policy_states.update(
+                    unstack_agent_values(stacked_new_policy_states, agents)
+                )
+            return actions_info, policies_info, new_policy_states, base_key
+
+        select_actions_fn = (
+            select_actions_vectorised
+            if self.config.vectorise_agent_action_selection
+            else select_actions
+        )
+        # Vectorised environment loops pass observations of several environments.
+        num_environments = getattr(executor.store, "num_executor_environments", 1)
+        if num_environments > 1:
+            select_actions_fn = vmap_over_environments(select_actions_fn)
+        executor.store.select_actions_fn = jax.jit(select_actions_fn)
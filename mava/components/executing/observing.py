@@ -20,6 +20,8 @@ import copy
 from types import SimpleNamespace
 from typing import Any, Dict, List, Type
 
+import numpy as np
+
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.adders import Adder
@@ -142,11 +144,19 @@ class FeedforwardExecutorObserve(ExecutorObserve):
         adder_actions: Dict[str, Any] = {}
         # executor.store.next_extras set by Executor
         executor.store.next_extras["policy_info"] = {}
+        # Trainer step that produced the policy of each agent, to measure the
+        # policy lag of the experience.
+        executor.store.next_extras["policy_trainer_steps"] = {}
         for agent in actions_info.keys():
             adder_actions[agent] = {
                 "actions_info": actions_info[agent],
             }
             executor.store.next_extras["policy_info"][agent] = policies_info[agent]
+            executor.store.next_extras["policy_trainer_steps"][agent] = np.array(
+                executor.store.policy_trainer_steps[
+                    executor.store.agent_net_keys[agent]
+                ]
+            )
 
         executor.store.next_extras[
             "network_int_keys"
@@ -239,11 +249,19 @@ class RecurrentExecutorObserve(FeedforwardExecutorObserve):
         adder_actions: Dict[str, Any] = {}
         # executor.store.next_extras set by Executor
         executor.store.next_extras["policy_info"] = {}
+        # Trainer step that produced the policy of each agent, to measure the
+        # policy lag of the experience.
+        executor.store.next_extras["policy_trainer_steps"] = {}
         for agent in actions_info.keys():
             adder_actions[agent] = {
                 "actions_info": actions_info[agent],
             }
             executor.store.next_extras["policy_info"][agent] = policies_info[agent]
+            executor.store.next_extras["policy_trainer_steps"][agent] = np.array(
+                executor.store.policy_trainer_steps[
+                    executor.store.agent_net_keys[agent]
+                ]
+            )
 
         executor.store.next_extras[
             "network_int_keys"
@@ -49,9 +49,7 @@ class ObservationNormalisation(BaseNormalisation):
     def on_training_utility_fns(self, trainer: SystemTrainer) -> None:
         """Initialises observation normalisation function"""
         if self.config.normalise_observations:
-            observation_stats = trainer.store.norm_params[
-                constants.OBS_NORM_STATE_DICT_KEY
-            ]
+            observation_stats = trainer.store.training_state.state.observation_stats
 
             obs_shape = list(observation_stats.values())[0]["mean"].shape
             norm_axes = construct_norm_axes_list(
@@ -65,8 +63,12 @@ class ObservationNormalisation(BaseNormalisation):
             )
 
     def on_parameter_server_init(self, server: SystemParameterServer) -> None:
-        """Stores the normalisation parameters in the parameter server"""
-        server.store.parameters["norm_params"] = server.store.norm_params
+        """Stores the normalisation parameters in the parameter server shard of them"""
+        # Imported here, as mava.systems imports the normalisation components.
+        from mava.systems.parameter_server import holds_parameter
+
+        if holds_parameter(server.store, "norm_params"):
+            server.store.parameters["norm_params"] = server.store.norm_params
 
     @staticmethod
     def name() -> str:
@@ -46,8 +46,12 @@ class ValueNormalisation(BaseNormalisation):
             trainer.store.target_running_stats_fn = compute_running_mean_var_count
 
     def on_parameter_server_init(self, server: SystemParameterServer) -> None:
-        """Stores the normalisation parameters in the parameter server"""
-        server.store.parameters["norm_params"] = server.store.norm_params
+        """Stores the normalisation parameters in the parameter server shard of them"""
+        # Imported here, as mava.systems imports the normalisation components.
+        from mava.systems.parameter_server import holds_parameter
+
+        if holds_parameter(server.store, "norm_params"):
+            server.store.parameters["norm_params"] = server.store.norm_params
 
     @staticmethod
     def name() -> str:
@@ -22,6 +22,7 @@ from mava.components.training.losses import (
     SquaredErrorValueLoss,
 )
 from mava.components.training.model_updating import MAPGEpochUpdate, MAPGMinibatchUpdate
+from mava.components.training.priorities import TrainerPriorities
 from mava.components.training.step import DefaultTrainerStep, MAPGWithTrustRegionStep
 from mava.components.training.trainer import (
     BaseTrainerInit,
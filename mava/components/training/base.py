@@ -16,10 +16,14 @@
 """Base Trainer components."""
 
 import abc
-from typing import Any, Dict, NamedTuple
+from typing import Any, Dict, Iterator, MutableMapping, NamedTuple, Optional
 
+import jax
+import jax.numpy as jnp
+import numpy as np
 import optax
 
+from mava import constants
 from mava.components import Component
 from mava.core_jax import SystemTrainer
 
@@ -52,6 +56,169 @@ class TrainingState(NamedTuple):
     observation_stats: Any
 
 
+class TrainingStateHolder:
+    """Mutable container that owns the training state of a trainer.
+
+    A training step computes a new TrainingState pytree and replaces the held
+    state with a single reference swap, instead of writing every parameter
+    back into the nested dictionaries of the networks. Readers, e.g. the
+    trainer parameter client, look the parameters up in the holder.
+
+    When `donated` is set, training steps donate the device buffers of the
+    held state to XLA, so they are invalid once the next step runs.
+    """
+
+    def __init__(self, state: TrainingState, donated: bool = False) -> None:
+        """Initialise the holder.
+
+        Args:
+            state: initial training state.
+            donated: whether training steps donate the buffers of the held
+                state. Defaults to False.
+        """
+        self.state = state
+        self.donated = donated
+
+    def swap(self, state: TrainingState) -> TrainingState:
+        """Replace the held training state.
+
+        Args:
+            state: new training state.
+
+        Returns:
+            the previous training state.
+        """
+        previous_state, self.state = self.state, state
+        return previous_state
+
+
+def _copy_to_host(value: Any) -> Any:
+    """Copy a device array to a numpy array, leaving other values as they are."""
+    if isinstance(value, jnp.ndarray):
+        return np.array(value)
+    return value
+
+
+class TrainingStateParameters(MutableMapping[str, Any]):
+    """Named trainer parameters that live in a TrainingStateHolder.
+
+    Network parameters, optimiser states and normalisation parameters are
+    resolved from the current training state on every access, using the
+    parameter names of the parameter server (e.g. `policy_network-{net_key}`).
+    Other parameters, such as counts, are stored in the mapping itself.
+
+    Parameters that are published to other processes are copied to host
+    memory on access when the holder donates its buffers, so a later training
+    step can not invalidate the published values.
+    """
+
+    # Parameter name prefix -> TrainingState field keyed by network.
+    _network_fields = {
+        "policy_network": "policy_params",
+        "critic_network": "critic_params",
+        "policy_opt_state": "policy_opt_states",
+        "critic_opt_state": "critic_opt_states",
+    }
+    _norm_params_key = "norm_params"
+
+    def __init__(
+        self,
+        holder: TrainingStateHolder,
+        state_names: Any,
+        parameters: Optional[Dict[str, Any]] = None,
+        published_names: Any = (),
+    ) -> None:
+        """Initialise the mapping.
+
+        Args:
+            holder: holder of the training state.
+            state_names: names of the parameters that are read from the holder.
+            parameters: other parameters. Defaults to None.
+            published_names: names of the state parameters that are sent to
+                the parameter server. Defaults to no parameters.
+        """
+        self._holder = holder
+        # Ordered, with constant time membership checks.
+        self._state_names = dict.fromkeys(state_names)
+        self._published_names = set(published_names)
+        self._parameters = dict(parameters) if parameters else {}
+
+    def _field(self, name: str) -> Any:
+        """TrainingState field and network key of a state parameter name."""
+        prefix, net_key = name.split("-", 1)
+        return self._network_fields[prefix], net_key
+
+    def __getitem__(self, name: str) -> Any:
+        """Get a parameter.
+
+        Args:
+            name: parameter name.
+
+        Returns:
+            the parameter value.
+        """
+        if name not in self._state_names:
+            return self._parameters[name]
+        state = self._holder.state
+        if name == self._norm_params_key:
+            value = {
+                constants.VALUES_NORM_STATE_DICT_KEY: state.target_value_stats,
+                constants.OBS_NORM_STATE_DICT_KEY: state.observation_stats,
+            }
+        else:
+            field, net_key = self._field(name)
+            value = getattr(state, field)[net_key]
+
+        if self._holder.donated and name in self._published_names:
+            value = jax.tree_util.tree_map(_copy_to_host, value)
+        return value
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        """Set a parameter, swapping in a new training state for state parameters.
+
+        Args:
+            name: parameter name.
+            value: new parameter value.
+        """
+        if name not in self._state_names:
+            self._parameters[name] = value
+            return
+        state = self._holder.state
+        if name == self._norm_params_key:
+            self._holder.swap(
+                state._replace(
+                    target_value_stats=value[constants.VALUES_NORM_STATE_DICT_KEY],
+                    observation_stats=value[constants.OBS_NORM_STATE_DICT_KEY],
+                )
+            )
+            return
+        field, net_key = self._field(name)
+        self._holder.swap(
+            state._replace(**{field: {**getattr(state, field), net_key: value}})
+        )
+
+    def __delitem__(self, name: str) -> None:
+        """Remove a parameter that is not part of the training state.
+
+        Args:
+            name: parameter name.
+        """
+        if name in self._state_names:
+            raise TypeError(
+                f"{name} is part of the training state and can not be removed."
+            )
+        del self._parameters[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the parameter names."""
+        yield from self._state_names
+        yield from self._parameters
+
+    def __len__(self) -> int:
+        """Number of parameters."""
+        return len(self._state_names) + len(self._parameters)
+
+
 class Utility(Component):
     @abc.abstractmethod
     def on_training_utility_fns(self, trainer: SystemTrainer) -> None:
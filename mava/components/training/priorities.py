@@ -0,0 +1,146 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Trainer components for replay item priorities."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Type
+
+import jax.numpy as jnp
+
+from mava.callbacks import Callback
+from mava.components.building.reverb_components import PrioritySampler
+from mava.components.training.base import Utility
+from mava.core_jax import SystemTrainer
+from mava.utils.priority_utils import AsyncPriorityUpdater
+
+
+@dataclass
+class TrainerPrioritiesConfig:
+    priority_max_weight: float = 0.9
+    min_priority: float = 1e-6
+    max_pending_priority_updates: int = 8
+
+
+class TrainerPriorities(Utility):
+    def __init__(
+        self,
+        config: TrainerPrioritiesConfig = TrainerPrioritiesConfig(),
+    ):
+        """Component writes priorities computed by the trainer to the data server.
+
+        The priority of a sampled sequence mixes the maximum and the mean
+        absolute advantage over its steps and agents, weighted by
+        `priority_max_weight`. Priorities are computed in the SGD step and
+        written back to the trainer's table asynchronously.
+
+        Args:
+            config: TrainerPrioritiesConfig.
+        """
+        self.config = config
+
+    def on_training_utility_fns(self, trainer: SystemTrainer) -> None:
+        """Create and store the priority function.
+
+        Args:
+            trainer: SystemTrainer.
+
+        Returns:
+            None.
+        """
+
+        def priority_fn(advantages: Dict[str, jnp.ndarray]) -> jnp.ndarray:
+            """Compute the priorities of a batch of sequences.
+
+            Args:
+                advantages: advantages of each agent, of shape [B, T].
+
+            Returns:
+                priorities of shape [B].
+            """
+            abs_advantages = jnp.abs(
+                jnp.concatenate(
+                    [
+                        jnp.reshape(value, (value.shape[0], -1))
+                        for value in advantages.values()
+                    ],
+                    axis=1,
+                )
+            )
+            weight = self.config.priority_max_weight
+            priorities = weight * jnp.max(abs_advantages, axis=1) + (
+                1 - weight
+            ) * jnp.mean(abs_advantages, axis=1)
+            return jnp.maximum(priorities, self.config.min_priority)
+
+        trainer.store.priority_fn = priority_fn
+
+    def on_training_init_end(self, trainer: SystemTrainer) -> None:
+        """Create the updater that writes priorities to the trainer's table.
+
+        Args:
+            trainer: SystemTrainer.
+
+        Returns:
+            None.
+        """
+        trainer.store.priority_updater = AsyncPriorityUpdater(
+            trainer.store.data_server_client,
+            table=trainer.store.trainer_id,
+            max_pending_updates=self.config.max_pending_priority_updates,
+        )
+        trainer.store.sample_priorities = None
+
+    def on_training_step_end(self, trainer: SystemTrainer) -> None:
+        """Queue the priorities of the last sample.
+
+        Args:
+            trainer: SystemTrainer.
+
+        Returns:
+            None.
+        """
+        if trainer.store.sample_priorities is None:
+            return
+        keys, priorities = trainer.store.sample_priorities
+        trainer.store.priority_updater.update(keys, priorities)
+        trainer.store.sample_priorities = None
+
+    def on_training_end(self, trainer: SystemTrainer) -> None:
+        """Write the queued priorities and stop the updater.
+
+        Args:
+            trainer: SystemTrainer.
+
+        Returns:
+            None.
+        """
+        trainer.store.priority_updater.close()
+
+    @staticmethod
+    def name() -> str:
+        """Static method that returns component name."""
+        return "trainer_priorities"
+
+    @staticmethod
+    def required_components() -> List[Type[Callback]]:
+        """List of other Components required in the system for this Component to function.
+
+        PrioritySampler required to sample items by priority.
+
+        Returns:
+            List of required component classes.
+        """
+        return [PrioritySampler]
@@ -17,10 +17,11 @@
 import abc
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 import optax
 import reverb
 import tree
@@ -29,7 +30,7 @@ from jax import jit
 
 import mava.components.building.adders  # To avoid circular imports
 import mava.components.training.model_updating  # To avoid circular imports
-from mava import constants
+from mava.adders.reverb.base import unstack_agents
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.datasets import TrainerDataset, TrajectoryDataset
@@ -39,6 +40,7 @@ from mava.components.building.parameter_client import TrainerParameterClient
 from mava.components.normalisation import ObservationNormalisation, ValueNormalisation
 from mava.components.training.advantage_estimation import GAE
 from mava.components.training.base import Batch, TrainingState
+from mava.components.training.priorities import TrainerPriorities
 from mava.components.training.trainer import BaseTrainerInit
 from mava.core_jax import SystemTrainer
 from mava.utils.jax_training_utils import denormalize, normalize
@@ -74,8 +76,8 @@ class TrainerStep(Component):
 
         TrajectoryDataset required to set up trainer.store.dataset_iterator.
         Step required to set up trainer.store.step_fn.
-        TrainerParameterClient required to set up trainer.store.trainer_parameter_client
-        and trainer.store.trainer_counts.
+        TrainerParameterClient required to set up trainer.store.trainer_parameter_client,
+        trainer.store.trainer_counts and trainer.store.trainer_policy_trainer_steps.
         Logger required to set up trainer.store.trainer_logger.
 
         Returns:
@@ -131,15 +133,88 @@ class DefaultTrainerStep(TrainerStep):
             {"trainer_steps": 1, "trainer_walltime": elapsed_time},
         )
 
+        # The trainer counts, including the increments not sent yet.
+        counts = trainer.store.trainer_parameter_client.local_counts(
+            trainer.store.trainer_counts
+        )
+
+        # Tag the policies this trainer sets with the step that produced them.
+        policy_trainer_steps = np.array(counts["trainer_steps"], dtype=np.int32)
+        trainer.store.trainer_parameter_client.set_local(
+            {
+                name: policy_trainer_steps
+                for name in trainer.store.trainer_policy_trainer_steps
+            }
+        )
+
         # Update the variable source and the trainer.
         trainer.store.trainer_parameter_client.set_and_get_async()
 
-        # Add the trainer counts.
-        results.update(trainer.store.trainer_counts)
+        results.update(counts)
+        results.update(self._policy_lag(sample, counts["trainer_steps"]))
+        results.update(self._dataset_bytes_copied(trainer))
 
         # Write to the loggers.
         trainer.store.trainer_logger.write({**results})
 
+    @staticmethod
+    def _policy_lag(sample: Any, trainer_steps: Any) -> Dict[str, float]:
+        """Statistics of the policy lag of the sampled experience.
+
+        The policy lag of a step is the number of trainer steps between the
+        policy that the executor acted with and the current one. Steps tagged
+        with trainer step 0, i.e. zero padding and steps of the initial
+        policies, are left out.
+
+        Args:
+            sample: sample of experience.
+            trainer_steps: current trainer steps.
+
+        Returns:
+            dictionary with the mean, minimum and maximum policy lag, or an empty
+            dictionary if the experience is not tagged.
+        """
+        extras = getattr(getattr(sample, "data", None), "extras", None)
+        if not isinstance(extras, dict) or "policy_trainer_steps" not in extras:
+            return {}
+
+        policy_trainer_steps = np.concatenate(
+            [
+                np.ravel(np.asarray(steps))
+                for steps in tree.flatten(extras["policy_trainer_steps"])
+            ]
+        )
+        policy_trainer_steps = policy_trainer_steps[policy_trainer_steps > 0]
+        if not policy_trainer_steps.size:
+            return {}
+
+        lag = np.asarray(trainer_steps).reshape(()) - policy_trainer_steps
+        return {
+            "policy_lag_mean": float(np.mean(lag)),
+            "policy_lag_min": float(np.min(lag)),
+            "policy_lag_max": float(np.max(lag)),
+        }
+
+    @staticmethod
+    def _dataset_bytes_copied(trainer: SystemTrainer) -> Dict[str, int]:
+        """Number of bytes the dataset copied for the batch of this step.
+
+        Datasets that hand batches over with DLPack count the bytes they copy
+        on their way to the device. Prefetching iterators keep the count with
+        each batch, so it is attributed to the step that trains on the batch.
+
+        Args:
+            trainer: SystemTrainer.
+
+        Returns:
+            the number of bytes to log, or no values if the dataset does not
+            count them.
+        """
+        bytes_copied = getattr(trainer.store.dataset_iterator, "bytes_copied", None)
+        if bytes_copied is None:
+            return {}
+        return {"dataset_bytes_copied": bytes_copied}
+
 
 class Step(Component):
     @abc.abstractmethod
@@ -160,9 +235,9 @@ class Step(Component):
         """List of other Components required in the system for this Component to function.
 
         TrainerDataset required for config epoch_batch_size.
-        BaseTrainerInit required to set up trainer.store.networks and
-        trainer.store.trainer_agent_net_keys
-        Networks required to set up trainer.store.base_key.
+        BaseTrainerInit required to set up trainer.store.networks,
+        trainer.store.trainer_agent_net_keys and trainer.store.training_state.
+        Networks required to set up the random key of the training state.
 
         Returns:
             List of required component classes.
@@ -177,6 +252,7 @@ class Step(Component):
 @dataclass
 class MAPGWithTrustRegionStepConfig:
     discount: float = 0.99
+    donate_training_state: bool = True
 
 
 class MAPGWithTrustRegionStep(Step):
@@ -195,6 +271,10 @@ class MAPGWithTrustRegionStep(Step):
     def on_training_step_fn(self, trainer: SystemTrainer) -> None:
         """Define and store the SGD step function for MAPGWithTrustRegion.
 
+        If `donate_training_state` is set, the training state passed to the
+        SGD step is donated, so XLA updates the parameters and optimiser
+        states in place instead of keeping the old and new state alive.
+
         Args:
             trainer: SystemTrainer.
 
@@ -202,10 +282,9 @@ class MAPGWithTrustRegionStep(Step):
             None.
         """
 
-        @jit
         def sgd_step(
             states: TrainingState, sample: reverb.ReplaySample
-        ) -> Tuple[TrainingState, Dict[str, jnp.ndarray]]:
+        ) -> Tuple[TrainingState, Dict[str, jnp.ndarray], Optional[jnp.ndarray]]:
             """Performs a minibatch SGD step.
 
             Args:
@@ -213,7 +292,8 @@ class MAPGWithTrustRegionStep(Step):
                 sample: Reverb sample.
 
             Returns:
-                Tuple[new state, metrics].
+                Tuple[new state, metrics, priorities of the sampled items or
+                None without TrainerPriorities].
             """
 
             # Extract the data.
@@ -227,6 +307,22 @@ class MAPGWithTrustRegionStep(Step):
                 data.extras,
             )
 
+            if getattr(trainer.store.global_config, "stack_agents", False):
+                # Agents that share a network are stacked along the axis after
+                # the batch and time axes.
+                stacked_net_keys = trainer.store.trainer_agent_net_keys
+                observations, actions, rewards, termination = (
+                    unstack_agents(value, stacked_net_keys, axis=2)
+                    for value in (observations, actions, rewards, termination)
+                )
+                extras = {
+                    key: unstack_agents(value, stacked_net_keys, axis=2)
+                    if isinstance(value, dict)
+                    and set(stacked_net_keys.values()) == value.keys()
+                    else value
+                    for key, value in extras.items()
+                }
+
             # Perform observation normalization if neccesary before proceeding
             observation_stats = states.observation_stats
             if (
@@ -337,6 +433,13 @@ class MAPGWithTrustRegionStep(Step):
                 behavior_values=behavior_values,
             )
 
+            # Priorities of the sampled sequences, for the data server.
+            priorities = (
+                trainer.store.priority_fn(advantages)
+                if trainer.has(TrainerPriorities)
+                else None
+            )
+
             agent_0_t_vals = list(target_values.values())[0]
             assert len(agent_0_t_vals) > 1
             batch_size = agent_0_t_vals.shape[0]
@@ -403,110 +506,45 @@ class MAPGWithTrustRegionStep(Step):
                 target_value_stats=target_value_stats,
                 observation_stats=observation_stats,
             )
-            return new_states, metrics
+            return new_states, metrics, priorities
+
+        training_state = trainer.store.training_state
+        if self.config.donate_training_state:
+            sgd_step = jit(sgd_step, donate_argnums=(0,))
+            # The initial state shares its buffers with the networks, so the
+            # step gets its own copy to donate.
+            training_state.swap(jax.tree_util.tree_map(jnp.array, training_state.state))
+            training_state.donated = True
+        else:
+            sgd_step = jit(sgd_step)
 
         def step(sample: reverb.ReplaySample) -> Tuple[Dict[str, jnp.ndarray]]:
             """Step over the reverb sample and update the parameters / optimiser states.
 
+            The new training state replaces the one in the trainer's training
+            state holder with a single reference swap. With TrainerPriorities,
+            the keys and new priorities of the sampled items are stored for
+            the priority updater.
+
             Args:
                 sample: Reverb sample.
 
             Returns:
                 Metrics from SGD step.
             """
+            training_state = trainer.store.training_state
+            states = training_state.state
 
             # Repeat training for the given number of epoch, taking a random
             # permutation for every epoch.
-            networks = trainer.store.networks
-            policy_params = {
-                net_key: networks[net_key].policy_params for net_key in networks.keys()
-            }
-            critic_params = {
-                net_key: networks[net_key].critic_params for net_key in networks.keys()
-            }
-            policy_opt_states = trainer.store.policy_opt_states
-            critic_opt_states = trainer.store.critic_opt_states
-
-            _, random_key = jax.random.split(trainer.store.base_key)
-
-            target_value_stats = trainer.store.norm_params[
-                constants.VALUES_NORM_STATE_DICT_KEY
-            ]
-
-            observation_stats = trainer.store.norm_params[
-                constants.OBS_NORM_STATE_DICT_KEY
-            ]
+            _, random_key = jax.random.split(states.random_key)
 
-            states = TrainingState(
-                policy_params=policy_params,
-                critic_params=critic_params,
-                policy_opt_states=policy_opt_states,
-                critic_opt_states=critic_opt_states,
-                random_key=random_key,
-                target_value_stats=target_value_stats,
-                observation_stats=observation_stats,
+            new_states, metrics, priorities = sgd_step(
+                states._replace(random_key=random_key), sample
             )
-
-            new_states, metrics = sgd_step(states, sample)
-
-            # Set the new variables
-            # TODO (dries): key is probably not being store correctly.
-            # The variable client might lose reference to it when checkpointing.
-            # We also need to add the optimiser and random_key to the variable
-            # server.
-            trainer.store.base_key = new_states.random_key
-
-            # These updates must remain separate for loops since the policy and critic
-            # networks could have different layers.
-            networks = trainer.store.networks
-
-            policy_params = {
-                net_key: networks[net_key].policy_params for net_key in networks.keys()
-            }
-            for net_key in policy_params.keys():
-                # The for loop below is needed to not lose the param reference.
-                net_params = trainer.store.networks[net_key].policy_params
-                for param_key in net_params.keys():
-                    net_params[param_key] = new_states.policy_params[net_key][param_key]
-
-                # Update the policy optimiser
-                # The opt_states need to be wrapped in a dict so as not to lose
-                # the reference.
-
-                trainer.store.policy_opt_states[net_key][
-                    constants.OPT_STATE_DICT_KEY
-                ] = new_states.policy_opt_states[net_key][constants.OPT_STATE_DICT_KEY]
-            critic_params = {
-                net_key: networks[net_key].critic_params for net_key in networks.keys()
-            }
-            for net_key in critic_params.keys():
-                # The for loop below is needed to not lose the param reference.
-                net_params = trainer.store.networks[net_key].critic_params
-                for param_key in net_params.keys():
-                    net_params[param_key] = new_states.critic_params[net_key][param_key]
-
-                # Update the critic optimiser
-                # The opt_states need to be wrapped in a dict so as not to lose
-                # the reference.
-                trainer.store.critic_opt_states[net_key][
-                    constants.OPT_STATE_DICT_KEY
-                ] = new_states.critic_opt_states[net_key][constants.OPT_STATE_DICT_KEY]
-
-            # Update the observation normalization parameters
-            obs_norm_key = constants.OBS_NORM_STATE_DICT_KEY
-            for agent in trainer.store.trainer_agent_net_keys.keys():
-                for param_key in new_states.observation_stats[agent].keys():
-                    trainer.store.norm_params[obs_norm_key][agent][
-                        param_key
-                    ] = new_states.observation_stats[agent][param_key]
-
-            # update the running target stats
-            values_norm_key = constants.VALUES_NORM_STATE_DICT_KEY
-            for agent in trainer.store.trainer_agent_net_keys.keys():
-                for param_key in new_states.target_value_stats[agent].keys():
-                    trainer.store.norm_params[values_norm_key][agent][
-                        param_key
-                    ] = new_states.target_value_stats[agent][param_key]
+            training_state.swap(new_states)
+            if priorities is not None:
+                trainer.store.sample_priorities = (sample.info.key, priorities)
 
             return metrics
 
@@ -27,6 +27,7 @@ from mava.components.building.environments import EnvironmentSpec
 from mava.components.building.networks import Networks
 from mava.components.building.optimisers import Optimisers
 from mava.components.building.system_init import BaseSystemInit
+from mava.components.training.base import TrainingState, TrainingStateHolder
 from mava.core_jax import SystemBuilder, SystemTrainer
 from mava.utils.sort_utils import sort_str_num
 
@@ -94,6 +95,44 @@ class BaseTrainerInit(Component):
                 )
             }  # pytype: disable=attribute-error
 
+    def on_building_trainer_start(self, builder: SystemBuilder) -> None:
+        """Create the holder of the trainer's training state.
+
+        The training state starts from the initial network parameters,
+        optimiser states and normalisation parameters. Training steps swap in
+        new states, and the trainer parameter client reads from the holder.
+        The initial values are then removed from the store and the networks,
+        since training steps do not update them, so stale reads fail.
+
+        Args:
+            builder: SystemBuilder.
+        """
+        networks = builder.store.networks
+        norm_params = builder.store.norm_params
+        builder.store.training_state = TrainingStateHolder(
+            TrainingState(
+                policy_params={
+                    net_key: networks[net_key].policy_params for net_key in networks
+                },
+                critic_params={
+                    net_key: networks[net_key].critic_params for net_key in networks
+                },
+                policy_opt_states=builder.store.policy_opt_states,
+                critic_opt_states=builder.store.critic_opt_states,
+                random_key=builder.store.base_key,
+                target_value_stats=norm_params[constants.VALUES_NORM_STATE_DICT_KEY],
+                observation_stats=norm_params[constants.OBS_NORM_STATE_DICT_KEY],
+            )
+        )
+
+        for network in networks.values():
+            del network.policy_params
+            del network.critic_params
+        del builder.store.policy_opt_states
+        del builder.store.critic_opt_states
+        del builder.store.norm_params
+        del builder.store.base_key
+
     def on_training_utility_fns(self, trainer: SystemTrainer) -> None:
         """Set up and store trainer agents.
 
@@ -13,9 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import time
 import warnings
-from typing import List, Type, Union
+from typing import Any, Dict, List, Type, Union
 
 from acme.jax import savers as acme_savers
 from chex import dataclass
@@ -35,6 +36,7 @@ from mava.wrappers import SaveableWrapper
 class CheckpointerConfig:
     checkpoint_minute_interval: float = 5
     restore_best_net: Union[str, None] = None
+    checkpoint_in_background: bool = False
 
 
 class Checkpointer(Component):
@@ -54,19 +56,32 @@ class Checkpointer(Component):
         Returns:
             None.
         """
+        restore_best_net = self.config.restore_best_net is not None
+        sharded = server.store.num_parameter_servers > 1
+        if restore_best_net and sharded:
+            raise ValueError(
+                "Restoring the best network is not supported with a sharded "
+                "parameter server."
+            )
+
         saveable_parameters = SaveableWrapper(server.store.parameters)
-        old_trainer_steps = server.store.parameters["trainer_steps"].copy()
+        if restore_best_net:
+            old_trainer_steps = server.store.parameters["trainer_steps"].copy()
         server.store.system_checkpointer = acme_savers.Checkpointer(
             object_to_save=saveable_parameters,  # must be type saveable
             directory=server.store.experiment_path,
+            # Each shard checkpoints the parameters it holds.
+            subdirectory=f"parameter_server_{server.store.parameter_server_shard}"
+            if sharded
+            else "default",
             add_uid=False,
             time_delta_minutes=0,
         )
 
         # Check if the checkpointer restored the network parameters
         # and if the user wants the network with the best performance.
-        if (old_trainer_steps != server.store.parameters["trainer_steps"]) and (
-            self.config.restore_best_net is not None
+        if restore_best_net and (
+            old_trainer_steps != server.store.parameters["trainer_steps"]
         ):
             normalisation = (
                 server.has(ObservationNormalisation)
@@ -83,6 +98,8 @@ class Checkpointer(Component):
                 )
             update_to_best_net(server, self.config.restore_best_net)
 
+        server.store.checkpoint_saveable = saveable_parameters
+        server.store.checkpoint_thread = None
         server.store.last_checkpoint_time = time.time()
         server.store.checkpoint_minute_interval = self.config.checkpoint_minute_interval
 
@@ -91,6 +108,12 @@ class Checkpointer(Component):
     ) -> None:
         """Intermittently checkpoint the server parameters.
 
+        A snapshot of the parameters is checkpointed, so the parameters lock
+        is only held while the snapshot is taken and requests are handled
+        while the checkpoint is written. With `checkpoint_in_background`, the
+        snapshot is written by a background thread, so the run loop does not
+        wait for it either.
+
         Args:
             server: SystemParameterServer.
 
@@ -101,9 +124,72 @@ class Checkpointer(Component):
             time.time() - server.store.last_checkpoint_time
             > self.config.checkpoint_minute_interval * 60 + 1
         ):
-            server.store.system_checkpointer.save()
+            if not self.config.checkpoint_in_background:
+                self._save_snapshot(server, self._snapshot(server))
+            elif not self._save_in_background(server):
+                # The previous checkpoint is still being written.
+                return
             server.store.last_checkpoint_time = time.time()
 
+    @staticmethod
+    def _snapshot(server: SystemParameterServer) -> Dict[str, Any]:
+        """Take a snapshot of the server parameters.
+
+        Parameters are replaced, never changed in place, when they are set or
+        added to, so a shallow copy of the parameters taken while holding the
+        parameters lock for reading is a consistent snapshot.
+
+        Args:
+            server: SystemParameterServer.
+
+        Returns:
+            the snapshot.
+        """
+        with server.parameters_lock.read():  # type: ignore
+            return dict(server.store.parameters)
+
+    @staticmethod
+    def _save_snapshot(server: SystemParameterServer, snapshot: Dict[str, Any]) -> None:
+        """Write a snapshot of the server parameters.
+
+        Args:
+            server: SystemParameterServer.
+            snapshot: snapshot of the parameters.
+
+        Returns:
+            None.
+        """
+        saveable = server.store.checkpoint_saveable
+        saveable.state = snapshot
+        try:
+            server.store.system_checkpointer.save()
+        finally:
+            # Restore into the server parameters again.
+            saveable.state = server.store.parameters
+
+    def _save_in_background(self, server: SystemParameterServer) -> bool:
+        """Write a snapshot of the server parameters in a background thread.
+
+        Args:
+            server: SystemParameterServer.
+
+        Returns:
+            whether a write was started, i.e. the previous one was done.
+        """
+        thread = server.store.checkpoint_thread
+        if thread is not None and thread.is_alive():
+            return False
+
+        snapshot = self._snapshot(server)
+        server.store.checkpoint_thread = threading.Thread(
+            target=self._save_snapshot,
+            args=(server, snapshot),
+            name="checkpoint_writer",
+            daemon=True,
+        )
+        server.store.checkpoint_thread.start()
+        return True
+
     @staticmethod
     def name() -> str:
         """Static method that returns component name."""
@@ -24,6 +24,7 @@ from mava.callbacks import Callback
 from mava.components.building.networks import Networks
 from mava.components.component import Component
 from mava.core_jax import SystemParameterServer
+from mava.systems.parameter_server import COUNTER_SHARD, NOT_MODIFIED, holds_parameter
 from mava.utils.lp_utils import termination_fn
 
 
@@ -51,13 +52,13 @@ class ParameterServer(Component):
     # Get
     @abc.abstractmethod
     def on_parameter_server_get_parameters(self, server: SystemParameterServer) -> None:
-        """Fetch the parameters from the server specified in the store."""
+        """Fetch the parameters from the server specified in the request."""
         pass
 
     # Set
     @abc.abstractmethod
     def on_parameter_server_set_parameters(self, server: SystemParameterServer) -> None:
-        """Set the parameters in the server to the values specified in the store."""
+        """Set the parameters in the server to the values specified in the request."""
         pass
 
     # Add
@@ -65,7 +66,7 @@ class ParameterServer(Component):
     def on_parameter_server_add_to_parameters(
         self, server: SystemParameterServer
     ) -> None:
-        """Increment the server parameters by the amount specified in the store."""
+        """Increment the server parameters by the amount specified in the request."""
         pass
 
     @staticmethod
@@ -106,6 +107,9 @@ class DefaultParameterServer(ParameterServer):
     def on_parameter_server_init_start(self, server: SystemParameterServer) -> None:
         """Register parameters and network params to track.
 
+        With a sharded parameter server, only the parameters held by this shard
+        are registered.
+
         Args:
             server: SystemParameterServer.
         """
@@ -139,6 +143,10 @@ class DefaultParameterServer(ParameterServer):
             server.store.parameters[
                 f"critic_opt_state-{agent_net_key}"
             ] = server.store.critic_opt_states[agent_net_key]
+            # Trainer step that produced the policy, set by the trainers.
+            server.store.parameters[f"policy_trainer_steps-{agent_net_key}"] = np.array(
+                0, dtype=np.int32
+            )
 
         server.store.experiment_path = self.config.experiment_path
 
@@ -148,9 +156,22 @@ class DefaultParameterServer(ParameterServer):
         # Interrupt the system in case all the executors failed
         server.store.parameters["num_executor_failed"] = 0
 
+        server.store.parameters = {
+            name: value
+            for name, value in server.store.parameters.items()
+            if holds_parameter(server.store, name)
+        }
+
+        # Version of each parameter, incremented whenever it is set or added to.
+        # Parameters without an entry are at version 0.
+        server.store.parameter_versions = {}
+
     # Get
     def on_parameter_server_get_parameters(self, server: SystemParameterServer) -> None:
-        """Fetch the parameters from the server specified in the store.
+        """Fetch the parameters from the server specified in the request.
+
+        When the request carries the versions the caller already has, parameters
+        that did not change since are returned as NOT_MODIFIED.
 
         Args:
             server: SystemParameterServer.
@@ -158,16 +179,33 @@ class DefaultParameterServer(ParameterServer):
         Returns:
             None.
         """
-        # server.store._param_names set by Parameter Server
-        names: Union[str, Sequence[str]] = server.store._param_names
+        # server.request.param_names set by Parameter Server
+        names: Union[str, Sequence[str]] = server.request.param_names
+        # Versions the caller already has, only set by get_parameters_if_newer.
+        known_versions: Optional[Dict[str, int]] = getattr(
+            server.request, "param_versions", None
+        )
 
         if type(names) == str:
             get_params = server.store.parameters[names]  # type: ignore
         else:
             get_params = {}
+            versions = {}
             for var_key in names:
-                get_params[var_key] = server.store.parameters[var_key]
-        server.store.get_parameters = get_params
+                versions[var_key] = server.store.parameter_versions.get(var_key, 0)
+                if (
+                    known_versions is not None
+                    and known_versions.get(var_key) == versions[var_key]
+                ):
+                    get_params[var_key] = NOT_MODIFIED
+                else:
+                    get_params[var_key] = server.store.parameters[var_key]
+            server.request.get_parameter_versions = versions
+        server.request.get_parameters = get_params
+
+        # The termination flags are only held by the counter shard.
+        if server.store.parameter_server_shard != COUNTER_SHARD:
+            return
 
         # Interrupt the system flag
         if server.store.parameters["terminate"]:
@@ -179,7 +217,7 @@ class DefaultParameterServer(ParameterServer):
 
     # Set
     def on_parameter_server_set_parameters(self, server: SystemParameterServer) -> None:
-        """Set the parameters in the server to the values specified in the store.
+        """Set the parameters in the server to the values specified in the request.
 
         Args:
             server: SystemParameterServer.
@@ -187,8 +225,8 @@ class DefaultParameterServer(ParameterServer):
         Returns:
             None.
         """
-        # server.store._set_params set by Parameter Server
-        params: Dict[str, Any] = server.store._set_params
+        # server.request.set_params set by Parameter Server
+        params: Dict[str, Any] = server.request.set_params
         names = params.keys()
 
         for var_key in names:
@@ -200,12 +238,13 @@ class DefaultParameterServer(ParameterServer):
                 #     server.store.parameters[var_key][var_i].assign(params[var_key][var_i])
             else:
                 server.store.parameters[var_key] = params[var_key]
+            self._increment_version(server, var_key)
 
     # Add
     def on_parameter_server_add_to_parameters(
         self, server: SystemParameterServer
     ) -> None:
-        """Increment the server parameters by the amount specified in the store.
+        """Increment the server parameters by the amount specified in the request.
 
         Args:
             server: SystemParameterServer.
@@ -213,10 +252,31 @@ class DefaultParameterServer(ParameterServer):
         Returns:
             None.
         """
-        # server.store._add_to_params set by Parameter Server
-        params: Dict[str, Any] = server.store._add_to_params
+        # server.request.add_to_params set by Parameter Server
+        params: Dict[str, Any] = server.request.add_to_params
         names = params.keys()
 
         for var_key in names:
             assert var_key in server.store.parameters
-            server.store.parameters[var_key] += params[var_key]
+            # Add to a copy instead of the value itself, so earlier references,
+            # e.g. checkpoint snapshots, keep their value.
+            value = server.store.parameters[var_key]
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            value += params[var_key]
+            server.store.parameters[var_key] = value
+            self._increment_version(server, var_key)
+
+    @staticmethod
+    def _increment_version(server: SystemParameterServer, name: str) -> None:
+        """Mark a parameter as changed.
+
+        Args:
+            server: SystemParameterServer.
+            name: name of the changed parameter.
+
+        Returns:
+            None.
+        """
+        versions: Dict[str, int] = server.store.parameter_versions
+        versions[name] = versions.get(name, 0) + 1
@@ -25,6 +25,7 @@ from mava.callbacks import Callback
 from mava.components.component import Component
 from mava.components.updating.parameter_server import ParameterServer
 from mava.core_jax import SystemParameterServer
+from mava.systems.parameter_server import holds_parameter
 from mava.utils.lp_utils import termination_fn
 from mava.utils.training_utils import check_count_condition
 
@@ -103,9 +104,14 @@ class CountConditionTerminator(Terminator):
         ):
             return
 
+        if self.config.termination_condition is None:
+            return
+        # The counts are only held by one shard of a sharded parameter server.
+        if not holds_parameter(parameter_server.store, self.termination_key):
+            return
+
         if (
-            self.config.termination_condition is not None
-            and parameter_server.store.parameters[self.termination_key]
+            parameter_server.store.parameters[self.termination_key]
             > self.termination_value
         ):
             logging.exception(
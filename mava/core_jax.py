@@ -17,6 +17,7 @@
 """Core Mava interfaces for Jax systems."""
 
 import abc
+import threading
 from types import SimpleNamespace
 from typing import Any, Dict, List, Sequence, Tuple, Type, Union
 
@@ -105,9 +106,13 @@ class SystemBuilder(BaseSystemComponent):
         """
 
     @abc.abstractmethod
-    def parameter_server(self) -> Any:
+    def parameter_server(self, shard_id: int = 0, num_shards: int = 1) -> Any:
         """Parameter server to store and serve system network parameters.
 
+        Args:
+            shard_id : index of the parameter server shard.
+            num_shards : number of parameter server shards.
+
         Returns:
             System parameter server
         """
@@ -203,6 +208,36 @@ class SystemParameterServer(BaseSystemComponent):
         """System parameter server init"""
         super().__init__()
 
+        # State of the requests being handled, local to the handling thread.
+        self._requests = threading.local()
+
+    @property
+    def request(self) -> SimpleNamespace:
+        """State of the request handled by the current thread.
+
+        Hooks read the arguments of a request from, and write its results to,
+        this namespace instead of the shared store, so concurrent requests do
+        not overwrite each other's state.
+
+        Returns:
+            request state
+        """
+        if not hasattr(self._requests, "state"):
+            self._requests.state = SimpleNamespace()
+        return self._requests.state
+
+    def new_request(self, **fields: Any) -> SimpleNamespace:
+        """Start handling a request in the current thread.
+
+        Args:
+            fields : initial fields of the request state, e.g. its arguments
+
+        Returns:
+            request state
+        """
+        self._requests.state = SimpleNamespace(**fields)
+        return self._requests.state
+
     @abc.abstractmethod
     def get_parameters(
         self, names: Union[str, Sequence[str]]
@@ -14,11 +14,12 @@
 # limitations under the License.
 
 """A simple multi-agent-system-environment training loop."""
+import collections
 import copy
 import logging
 import time
 import warnings
-from typing import Any, Dict, Tuple
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 import acme
 import dm_env
@@ -425,6 +426,8 @@ class ParallelEnvironmentLoop(acme.core.Worker):
                 step_executor()
 
             except Exception as e:
+                # Send the counts of the finished episodes before stopping.
+                self._executor.store.executor_parameter_client.flush_adds()
                 if self._executor._evaluator:
                     logging.exception(
                         f"{e}: Experiment terminated due to an error on the evaluator."
@@ -439,3 +442,339 @@ class ParallelEnvironmentLoop(acme.core.Worker):
                     )
                 self._executor.force_update()
                 break
+
+
+class VectorisedParallelEnvironmentLoop(ParallelEnvironmentLoop):
+    """A parallel MARL environment loop over several copies of an environment.
+
+    The observations of all environments are stacked along a leading environment
+    axis and passed to a single `select_actions` call, so the executor does one
+    jitted forward pass per step for all environments. Environments that finish
+    an episode are reset straight away while the others keep running. Each
+    environment is its own experience stream: the executor state that is kept
+    per episode (adder, sampled networks and recurrent states) is swapped in
+    before the executor observes that environment and swapped out afterwards.
+
+    `run_episode` steps all the environments until one of them finishes an
+    episode and returns the results of that episode, so the loop can be used as
+    a drop-in replacement for `ParallelEnvironmentLoop`. The executor's
+    `select_actions_fn` must accept observations with a leading environment
+    axis, see `num_executor_environments` in the action selection components.
+
+    Environments that support `step_async` and `step_wait` (see
+    `SubprocessEnvWrapper`) are stepped asynchronously: actions are selected
+    for the environments that are ready and their next step is dispatched while
+    the other environments are still simulating.
+    """
+
+    # Executor store entries that are tracked separately for every environment.
+    _stream_store_keys = (
+        "adder",
+        "agent_net_keys",
+        "network_int_keys_extras",
+        "policy_states",
+    )
+
+    def __init__(
+        self,
+        environments: Sequence[dm_env.Environment],
+        executor: mava.core.Executor,
+        adders: Optional[Sequence[Any]] = None,
+        counter: counting.Counter = None,
+        logger: loggers.Logger = None,
+        should_update: bool = True,
+        label: str = "parallel_environment_loop",
+        shared_writer: Optional[Any] = None,
+    ):
+        """Vectorised parallel environment loop init
+
+        Args:
+            environments: copies of the same environment.
+            executor: a Mava executor.
+            adders: optional adder per environment. Defaults to None, in which
+                case the executor's adder is shared by all environments.
+            counter: an optional counter. Defaults to None.
+            logger: an optional counter. Defaults to None.
+            should_update: should update. Defaults to True.
+            label: optional label. Defaults to "parallel_environment_loop".
+            shared_writer: optional `SharedTrajectoryWriter` the adders write
+                through. It is closed when the loop stops. Defaults to None.
+        """
+        # The first environment is used for the specs and extra statistics.
+        super().__init__(
+            environment=environments[0],
+            executor=executor,
+            counter=counter,
+            logger=logger,
+            should_update=should_update,
+            label=label,
+        )
+        self._environments = list(environments)
+        self._num_environments = len(self._environments)
+        self._shared_writer = shared_writer
+
+        if adders is not None and len(adders) != self._num_environments:
+            raise ValueError(
+                f"Expected one adder per environment ({self._num_environments}),"
+                f" got {len(adders)}."
+            )
+
+        store = self._executor.store
+        self._streams: List[Dict[str, Any]] = []
+        for env_index in range(self._num_environments):
+            stream = {
+                key: getattr(store, key)
+                for key in self._stream_store_keys
+                if hasattr(store, key)
+            }
+            if adders is not None:
+                stream["adder"] = adders[env_index]
+            self._streams.append(stream)
+
+        # Per environment episode book-keeping. The environments are only reset
+        # on the first call to run_episode.
+        self._timesteps: Optional[List[dm_env.TimeStep]] = None
+        self._episode_steps = [0] * self._num_environments
+        self._episode_returns: List[Dict[str, Any]] = [
+            {} for _ in range(self._num_environments)
+        ]
+        self._episode_start_times = [0.0] * self._num_environments
+        self._completed_episodes: Deque[
+            Tuple[Dict[str, Any], int, float]
+        ] = collections.deque()
+
+        # Environments that run in subprocesses are stepped asynchronously.
+        self._step_asynchronously = all(
+            hasattr(environment, "step_async") for environment in self._environments
+        )
+        # Actions and policy info of the steps that are still in flight.
+        self._pending_steps: Dict[int, Tuple[Any, Any]] = {}
+
+    def _load_stream(self, env_index: int) -> None:
+        """Make the executor act on the stream of the given environment."""
+        for key, value in self._streams[env_index].items():
+            setattr(self._executor.store, key, value)
+
+    def _save_stream(self, env_index: int) -> None:
+        """Save the executor state of the given environment's stream."""
+        store = self._executor.store
+        for key in self._stream_store_keys:
+            if hasattr(store, key):
+                self._streams[env_index][key] = getattr(store, key)
+
+    def _reset_environment(self, env_index: int) -> dm_env.TimeStep:
+        """Reset one environment and start a new episode in its stream.
+
+        Args:
+            env_index: index of the environment to reset.
+
+        Returns:
+            the first timestep of the new episode.
+        """
+        timestep = self._environments[env_index].reset()
+
+        if type(timestep) == tuple:
+            timestep, env_extras = timestep
+        else:
+            env_extras = {}
+
+        self._load_stream(env_index)
+        self._executor.observe_first(timestep, extras=env_extras)
+        self._save_stream(env_index)
+
+        self._episode_steps[env_index] = 0
+        self._episode_start_times[env_index] = time.time()
+        self._episode_returns[env_index] = {
+            agent: generate_zeros_from_spec(spec)
+            for agent, spec in self._environments[env_index].reward_spec().items()
+        }
+        return timestep
+
+    def _get_actions(
+        self,
+        timesteps: List[dm_env.TimeStep],
+        env_indices: Sequence[int],
+    ) -> Any:
+        """Select actions for several environments in a single executor call.
+
+        Only the given environments are read, the observations of environments
+        that are still stepping may be overwritten while they step.
+
+        Args:
+            timesteps: current timestep of every environment.
+            env_indices: environments to select actions for.
+
+        Returns:
+            actions info and policy info, stacked along an environment axis in
+            the order of env_indices.
+        """
+        observations = jax.tree_util.tree_map(
+            lambda *x: np.stack(x),
+            *[timesteps[env_index].observation for env_index in env_indices],
+        )
+
+        # Recurrent executors carry a state per environment.
+        stacked_policy_states = "policy_states" in self._streams[0]
+        if stacked_policy_states:
+            self._executor.store.policy_states = jax.tree_util.tree_map(
+                lambda *x: jnp.stack(x),
+                *[
+                    self._streams[env_index]["policy_states"]
+                    for env_index in env_indices
+                ],
+            )
+
+        actions = self._executor.select_actions(observations)
+
+        if stacked_policy_states:
+            policy_states = self._executor.store.policy_states
+            for position, env_index in enumerate(env_indices):
+                self._streams[env_index]["policy_states"] = jax.tree_util.tree_map(
+                    lambda x: x[position], policy_states
+                )
+
+        # A single device to host transfer for all the environments.
+        return jax.tree_util.tree_map(np.asarray, actions)
+
+    def _wait_for_steps(self) -> List[int]:
+        """Wait for at least one of the dispatched steps to finish.
+
+        Returns:
+            indices of the environments whose step can be observed.
+        """
+        pending = sorted(self._pending_steps)
+        if not self._step_asynchronously:
+            return pending
+
+        # Imported here since the wrappers package imports this module.
+        from mava.wrappers.subprocess_env import wait_for_environments
+
+        ready = wait_for_environments(
+            [self._environments[env_index] for env_index in pending]
+        )
+        return [pending[index] for index in ready]
+
+    def _observe_step(self, env_index: int) -> None:
+        """Finish the step of one environment and observe it in its stream.
+
+        Args:
+            env_index: index of the environment.
+        """
+        env_actions, env_policies = self._pending_steps.pop(env_index)
+        environment = self._environments[env_index]
+        if self._step_asynchronously:
+            timestep = environment.step_wait()
+        else:
+            timestep = environment.step(env_actions)
+
+        if type(timestep) == tuple:
+            timestep, env_extras = timestep
+        else:
+            env_extras = {}
+
+        # Observe using the stream of this environment.
+        self._load_stream(env_index)
+        self._executor.store.actions_info = env_actions
+        self._executor.store.policies_info = env_policies
+        self._executor.observe(
+            (env_actions, env_policies),
+            next_timestep=timestep,
+            next_extras=env_extras,
+        )
+        self._save_stream(env_index)
+
+        # Book-keeping.
+        rewards = timestep.reward
+        self._episode_steps[env_index] += 1
+        self._compute_step_statistics(rewards)
+        episode_returns = self._episode_returns[env_index]
+        for agent, reward in rewards.items():
+            episode_returns[agent] = episode_returns[agent] + reward
+
+        if timestep.last():
+            self._completed_episodes.append(
+                (
+                    episode_returns,
+                    self._episode_steps[env_index],
+                    self._episode_start_times[env_index],
+                )
+            )
+            timestep = self._reset_environment(env_index)
+
+        self._timesteps[env_index] = timestep  # type: ignore
+
+    def run_episode(self) -> loggers.LoggingData:
+        """Run until one of the environments finishes an episode.
+
+        All the ready environments are stepped together. Environments that
+        finish an episode are reset and keep running on the next call.
+
+        Returns:
+            An instance of `loggers.LoggingData` for the finished episode.
+        """
+        if self._timesteps is None:
+            self._timesteps = [
+                self._reset_environment(env_index)
+                for env_index in range(self._num_environments)
+            ]
+
+        while not self._completed_episodes:
+            # Select actions for, and step, the environments that are not busy.
+            ready = [
+                env_index
+                for env_index in range(self._num_environments)
+                if env_index not in self._pending_steps
+            ]
+            actions_info, policies_info = self._get_actions(self._timesteps, ready)
+
+            for position, env_index in enumerate(ready):
+                env_actions = jax.tree_util.tree_map(
+                    lambda x: x[position], actions_info
+                )
+                env_policies = jax.tree_util.tree_map(
+                    lambda x: x[position], policies_info
+                )
+                self._pending_steps[env_index] = (env_actions, env_policies)
+                if self._step_asynchronously:
+                    self._environments[env_index].step_async(env_actions)
+
+            # Update once per environment step, as in ParallelEnvironmentLoop,
+            # so the executor's update period counts environment steps.
+            for env_index in self._wait_for_steps():
+                self._observe_step(env_index)
+                if self._should_update:
+                    self._executor.update()
+
+        episode_returns, episode_steps, start_time = self._completed_episodes.popleft()
+
+        self._compute_episode_statistics(
+            episode_returns,
+            episode_steps,
+            start_time,
+        )
+        if self._get_running_stats():
+            return self._get_running_stats()
+        else:
+            counts = self.record_counts(episode_steps)
+
+            # Collect the results and combine with counts.
+            steps_per_second = episode_steps / (time.time() - start_time)
+            result = {
+                "episode_length": episode_steps,
+                "mean_episode_return": np.mean(list(episode_returns.values())),
+                "steps_per_second": steps_per_second,
+            }
+            result.update(counts)
+            return result
+
+    def run(self) -> None:  # pragma: no cover
+        """Run the environment loop, closing the shared writer once it stops."""
+        try:
+            super().run()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the shared trajectory writer, sending the experience it holds."""
+        if self._shared_writer is not None:
+            self._shared_writer.close()
@@ -110,6 +110,14 @@ class MAEnvironmentSpec:
         """
         self._agent_environment_specs = agent_environment_specs
 
+    def set_agent_ids(self, agent_ids: List[str]) -> None:
+        """Set agent ids, e.g. after the agent environment specs were rekeyed
+
+        Returns:
+            None
+        """
+        self._keys = list(sort_str_num(agent_ids))
+
     def get_agent_type_specs(self) -> Dict[str, EnvironmentSpec]:
         """Get environment specs for all agent types
 
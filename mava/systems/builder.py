@@ -77,9 +77,13 @@ class Builder(SystemBuilder, BuilderHookMixin):
 
         return self.store.data_tables
 
-    def parameter_server(self) -> Any:
+    def parameter_server(self, shard_id: int = 0, num_shards: int = 1) -> Any:
         """Parameter server to store and serve system network parameters.
 
+        Args:
+            shard_id : index of the parameter server shard.
+            num_shards : number of parameter server shards.
+
         Returns:
             System parameter server.
         """
@@ -99,6 +103,8 @@ class Builder(SystemBuilder, BuilderHookMixin):
         return ParameterServer(
             store=self.store,
             components=self.callbacks,
+            shard_id=shard_id,
+            num_shards=num_shards,
         )
 
     def executor(
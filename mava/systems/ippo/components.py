@@ -27,7 +27,7 @@ class ExtrasLogProbSpec(ExtrasSpec):
         self,
         config: SimpleNamespace = SimpleNamespace(),
     ):
-        """Class that adds log probs to the extras spec
+        """Class that adds log probs and policy trainer steps to the extras spec
 
         Args:
             config : SimpleNamespace
@@ -45,13 +45,17 @@ class ExtrasLogProbSpec(ExtrasSpec):
 
         """
         agent_specs = builder.store.ma_environment_spec.get_agent_environment_specs()
-        builder.store.extras_spec = {"policy_info": {}}
+        builder.store.extras_spec = {"policy_info": {}, "policy_trainer_steps": {}}
 
         for agent, _ in agent_specs.items():
             # Make dummy log_probs
             builder.store.extras_spec["policy_info"][agent] = np.ones(
                 shape=(), dtype=np.float32
             )
+            # Trainer step that produced the policy used by the agent
+            builder.store.extras_spec["policy_trainer_steps"][agent] = np.zeros(
+                shape=(), dtype=np.int32
+            )
 
         # Add the networks keys to extras.
         net_spec = self.get_network_keys(
@@ -19,6 +19,7 @@ from typing import Any, Dict, List, Optional, Union
 import launchpad as lp
 import reverb
 
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
 from mava.utils import lp_utils
 from mava.utils.builder_utils import copy_node_fn
 
@@ -140,7 +141,14 @@ class Launcher:
 
             node_fn = copy_node_fn(node_fn)
             process = node_fn(*arguments)
-            if node_type == lp.ReverbNode:
+            if (
+                node_type == lp.ReverbNode
+                and process
+                and all(isinstance(table, RingBufferTable) for table in process)
+            ):
+                # In-process tables are used directly, without a reverb server.
+                process = ReplayBuffer(process)
+            elif node_type == lp.ReverbNode:
                 # Assigning server to self to keep it alive.
                 self._replay_server = reverb.Server(process, port=None)
                 process = reverb.Client(f"localhost:{self._replay_server.port}")
@@ -214,13 +222,14 @@ class Launcher:
                     print(f"Episode {episode} completed.")
                     episode += 1
 
-                # if the queue has less than epoch_batch_size samples in it we skip
-                # the trainer to ensure that the trainer won't hang
+                # if the queue has less than epoch_batch_size samples in it and
+                # no batch was prefetched from it we skip the trainer to ensure
+                # that the trainer won't hang
                 if (
-                    data_server.server_info()["trainer_0"].current_size
+                    getattr(trainer.store.dataset_iterator, "num_ready", 0) > 0
+                    or data_server.server_info()["trainer_0"].current_size
                     >= trainer.store.global_config.epoch_batch_size
-                    and step % self._single_process_trainer_period == 0
-                ):
+                ) and step % self._single_process_trainer_period == 0:
                     _ = trainer.step()  # logging done in trainer
                     print("Performed trainer step.")
                 if step % self._single_process_evaluator_period == 0:
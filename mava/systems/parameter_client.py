@@ -15,34 +15,324 @@
 
 """Parameter client for Jax system. Adapted from Deepmind's Acme library"""
 
+import logging
+import threading
+import time
 from concurrent import futures
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import jax
 import numpy as np
 
-from mava.systems.parameter_server import ParameterServer
+from mava.systems.parameter_server import NOT_MODIFIED, ParameterServer, parameter_shard
 from mava.utils.done_future import DoneFuture
+from mava.utils.parameter_codec import ParameterCodec
 from mava.utils.sort_utils import sort_str_num
 
 
+class FlatParameter:
+    """A nested dictionary of arrays whose leaves share one flat buffer.
+
+    The leaves of the dictionary are replaced, in place, by views into a
+    contiguous buffer. Copying a new value into the buffer therefore updates
+    every holder of the dictionary, without replacing any of its leaves.
+    """
+
+    def __init__(self, value: Dict[str, Any]) -> None:
+        """Move the leaves of a nested dictionary into one flat buffer.
+
+        Args:
+            value: nested dictionary of arrays of one dtype. Its leaves are
+                replaced by views into the buffer.
+        """
+        leaves, self._treedef = jax.tree_util.tree_flatten(value)
+        self._shapes = [np.shape(leaf) for leaf in leaves]
+        self.buffer = np.concatenate([np.ravel(leaf) for leaf in leaves])
+
+        views = []
+        offset = 0
+        for shape in self._shapes:
+            size = int(np.prod(shape))
+            views.append(self.buffer[offset : offset + size].reshape(shape))
+            offset += size
+        self._set_leaves(value, iter(views))
+
+    @staticmethod
+    def is_supported(value: Any) -> bool:
+        """Whether a value can be held in a flat buffer.
+
+        Args:
+            value: a parameter value.
+
+        Returns:
+            whether the value is a nested dictionary of arrays that all have
+            the same dtype.
+        """
+        dtypes = set()
+
+        def only_arrays(node: Any) -> bool:
+            """Whether all the leaves of a node are arrays."""
+            if isinstance(node, dict):
+                return all(only_arrays(child) for child in node.values())
+            if isinstance(node, (np.ndarray, jax.numpy.ndarray)):
+                dtypes.add(node.dtype)
+                return True
+            return False
+
+        return isinstance(value, dict) and only_arrays(value) and len(dtypes) == 1
+
+    @staticmethod
+    def _set_leaves(value: Dict[str, Any], leaves: Iterator[np.ndarray]) -> None:
+        """Replace the leaves of a nested dictionary in flattening order."""
+        for key in sorted(value.keys()):
+            if isinstance(value[key], dict):
+                FlatParameter._set_leaves(value[key], leaves)
+            else:
+                value[key] = next(leaves)
+
+    def copy_from(self, new_value: Dict[str, Any]) -> None:
+        """Copy a value with the same structure into the buffer.
+
+        Args:
+            new_value: nested dictionary of arrays.
+        """
+        leaves = self._treedef.flatten_up_to(new_value)
+        np.concatenate([np.ravel(leaf) for leaf in leaves], out=self.buffer)
+
+
+def _gather(
+    shard_futures: List[futures.Future], combine: Callable[[List[Any]], Any]
+) -> futures.Future:
+    """Combine the results of shard futures into a single future.
+
+    Args:
+        shard_futures: futures of the requests to the shards.
+        combine: function that combines the results of the shard requests.
+
+    Returns:
+        future holding the combined result, set once all shard futures are done.
+    """
+    result: futures.Future = futures.Future()
+    if not shard_futures:
+        result.set_result(combine([]))
+        return result
+    lock = threading.Lock()
+    remaining = [len(shard_futures)]
+
+    def on_done(_: futures.Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            result.set_result(combine([future.result() for future in shard_futures]))
+        except Exception as e:
+            result.set_exception(e)
+
+    for future in shard_futures:
+        future.add_done_callback(on_done)
+    return result
+
+
+def _merge(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the dictionaries returned by the shards."""
+    merged: Dict[str, Any] = {}
+    for result in results:
+        merged.update(result)
+    return merged
+
+
+def _merge_versioned(
+    results: List[Tuple[Dict[str, Any], Dict[str, int]]]
+) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Merge the parameters and versions returned by versioned shard gets."""
+    parameters = _merge([result[0] for result in results])
+    versions = _merge([result[1] for result in results])
+    return parameters, versions
+
+
+class ShardedParameterServer:
+    """Routes parameter server requests to the shards that hold the parameters.
+
+    Exposes the same methods as a parameter server, and a `futures` attribute
+    when the shards are launchpad nodes. Requests are split by shard with
+    `parameter_shard` and the shard results are merged.
+    """
+
+    def __init__(
+        self, shards: Sequence[ParameterServer], network_keys: Sequence[str]
+    ) -> None:
+        """Initialise the sharded parameter server.
+
+        Args:
+            shards: parameter server shards, in shard order.
+            network_keys: keys of all the networks in the system.
+        """
+        self.shards = list(shards)
+        self._network_keys = list(network_keys)
+        self.futures = _ShardedFutures(self)
+
+    def shard(self, name: str) -> int:
+        """Get the index of the shard that holds a parameter."""
+        return parameter_shard(name, self._network_keys, len(self.shards))
+
+    def split(self, names: Iterable[str]) -> Dict[int, List[str]]:
+        """Group parameter names by shard.
+
+        Args:
+            names: names of parameters.
+
+        Returns:
+            dictionary {shard index: names of the parameters it holds}.
+        """
+        names_by_shard: Dict[int, List[str]] = {}
+        for name in names:
+            names_by_shard.setdefault(self.shard(name), []).append(name)
+        return names_by_shard
+
+    def split_values(self, params: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """Group parameter values by shard."""
+        return {
+            shard: {name: params[name] for name in names}
+            for shard, names in self.split(params.keys()).items()
+        }
+
+    def get_parameters(self, names: Union[str, Iterable[str]], **kwargs: Any) -> Any:
+        """Get parameters from the shards that hold them."""
+        if isinstance(names, str):
+            return self.shards[self.shard(names)].get_parameters(names, **kwargs)
+        return _merge(
+            [
+                self.shards[shard].get_parameters(shard_names, **kwargs)
+                for shard, shard_names in self.split(names).items()
+            ]
+        )
+
+    def get_parameters_if_newer(
+        self, names: Iterable[str], versions: Dict[str, int], **kwargs: Any
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Get the parameters that changed from the shards that hold them."""
+        return _merge_versioned(
+            [
+                self.shards[shard].get_parameters_if_newer(
+                    shard_names,
+                    {n: versions[n] for n in shard_names if n in versions},
+                    **kwargs,
+                )
+                for shard, shard_names in self.split(names).items()
+            ]
+        )
+
+    def set_parameters(self, set_params: Dict[str, Any]) -> None:
+        """Set parameters in the shards that hold them."""
+        for shard, params in self.split_values(set_params).items():
+            self.shards[shard].set_parameters(params)
+
+    def add_to_parameters(self, add_to_params: Dict[str, Any]) -> None:
+        """Add to parameters in the shards that hold them."""
+        for shard, params in self.split_values(add_to_params).items():
+            self.shards[shard].add_to_parameters(params)
+
+
+class _ShardedFutures:
+    """Asynchronous requests to the shards of a sharded parameter server."""
+
+    def __init__(self, server: ShardedParameterServer) -> None:
+        """Initialise the futures interface of a sharded parameter server."""
+        self._server = server
+
+    def get_parameters(
+        self, names: Union[str, Iterable[str]], **kwargs: Any
+    ) -> futures.Future:
+        """Get parameters from the shards that hold them."""
+        shards = self._server.shards
+        if isinstance(names, str):
+            return shards[self._server.shard(names)].futures.get_parameters(
+                names, **kwargs
+            )
+        return _gather(
+            [
+                shards[shard].futures.get_parameters(shard_names, **kwargs)
+                for shard, shard_names in self._server.split(names).items()
+            ],
+            _merge,
+        )
+
+    def get_parameters_if_newer(
+        self, names: Iterable[str], versions: Dict[str, int], **kwargs: Any
+    ) -> futures.Future:
+        """Get the parameters that changed from the shards that hold them."""
+        return _gather(
+            [
+                self._server.shards[shard].futures.get_parameters_if_newer(
+                    shard_names,
+                    {n: versions[n] for n in shard_names if n in versions},
+                    **kwargs,
+                )
+                for shard, shard_names in self._server.split(names).items()
+            ],
+            _merge_versioned,
+        )
+
+    def set_parameters(self, set_params: Dict[str, Any]) -> futures.Future:
+        """Set parameters in the shards that hold them."""
+        return _gather(
+            [
+                self._server.shards[shard].futures.set_parameters(params)
+                for shard, params in self._server.split_values(set_params).items()
+            ],
+            lambda _: None,
+        )
+
+    def add_to_parameters(self, add_to_params: Dict[str, Any]) -> futures.Future:
+        """Add to parameters in the shards that hold them."""
+        return _gather(
+            [
+                self._server.shards[shard].futures.add_to_parameters(params)
+                for shard, params in self._server.split_values(add_to_params).items()
+            ],
+            lambda _: None,
+        )
+
+
 class ParameterClient:
     """A parameter client for updating parameters from a remote server."""
 
     def __init__(
         self,
-        server: ParameterServer,
+        server: Union[ParameterServer, Sequence[ParameterServer]],
         parameters: Dict[str, Any],
         multi_process: bool,
         get_keys: Optional[List[str]] = None,
         set_keys: Optional[List[str]] = None,
         update_period: int = 1,
         devices: Dict[str, Optional[Union[str, jax.xla.Device]]] = {},
+        versioned_get: bool = False,
+        codec: Optional[ParameterCodec] = None,
+        flat_layout: bool = False,
+        network_keys: Sequence[str] = (),
+        add_flush_count: int = 1,
+        add_flush_seconds: float = 0.0,
+        subscribe: bool = False,
+        subscribe_timeout: float = 10.0,
+        subscribe_keys: Optional[List[str]] = None,
     ):
         """Initialise the parameter client.
 
         Args:
-            server: the system parameter server.
+            server: the system parameter server, or the list of its shards for
+                a sharded parameter server.
             parameters: parameters that the client tracks.
             multi_process: wheter or not to make async calls to the server, server must
                 be a launchpad node for this to work.
@@ -50,7 +340,45 @@ class ParameterClient:
             set_keys: names of parameters to set in the server.
             update_period: number of calls between syncs with the server.
             devices: dictionary {parameter name: device} defining devices for params.
+            versioned_get: whether to only fetch the get parameters that changed
+                since the last fetch, using the server's parameter versions.
+            codec: codec the server uses to encode the get parameters for
+                transport. Defaults to None, i.e. no encoding.
+            flat_layout: whether to hold the get parameters that are nested
+                dictionaries of arrays in flat buffers, so that fetched values
+                are copied into them in one pass. The leaves of these parameters
+                are replaced by views into the buffers.
+            network_keys: keys of all the networks in the system, used to route
+                requests to the shards of a sharded parameter server.
+            add_flush_count: number of `add_async` calls whose increments are
+                accumulated before they are sent in one request.
+            add_flush_seconds: seconds after which accumulated increments are
+                sent, even if fewer than `add_flush_count` calls were made.
+            subscribe: whether to subscribe to the get parameters instead of
+                fetching them every `update_period` calls. The client keeps a
+                request open that the server answers once the parameters were
+                set, so new values are picked up as soon as they exist. Requires
+                `versioned_get`. Only used with `multi_process`, since the open
+                request would block a single process.
+            subscribe_timeout: maximum number of seconds the server holds a
+                subscription request before answering it without changes.
+            subscribe_keys: names of the get parameters whose changes answer
+                a subscription request, e.g. the network parameters. The other
+                get parameters are fetched along with them. Defaults to None,
+                i.e. all the get parameters.
         """
+        if isinstance(server, (list, tuple)):
+            server = ShardedParameterServer(server, network_keys)
+
+        self._subscribe = subscribe and multi_process
+        if self._subscribe and not versioned_get:
+            raise ValueError("Parameter subscriptions require versioned_get.")
+        if self._subscribe and isinstance(server, ShardedParameterServer):
+            raise ValueError(
+                "Parameter subscriptions are not supported with a sharded "
+                "parameter server."
+            )
+
         self._all_keys = sort_str_num(list(parameters.keys()))
         # TODO (dries): Is the below change correct?
         self._get_keys = get_keys if get_keys is not None else []
@@ -71,7 +399,26 @@ class ParameterClient:
             for key, device in self._devices.items():
                 self._devices[key] = jax.devices(device)[0]  # type: ignore
 
-        self._request = lambda: server.get_parameters(self._get_keys)
+        # Get parameters held in flat buffers, by name.
+        self._flat_parameters: Dict[str, FlatParameter] = {}
+        if flat_layout and not self._devices:
+            for key in self._get_keys:
+                if FlatParameter.is_supported(parameters[key]):
+                    self._flat_parameters[key] = FlatParameter(parameters[key])
+
+        self._versioned_get = versioned_get
+        # Server version of the local value of each get parameter.
+        self._versions: Dict[str, int] = {}
+        self._codec = codec
+        get_kwargs = {"codec": codec} if codec is not None else {}
+
+        # Get requests take the names of the parameters to fetch.
+        if versioned_get:
+            self._request = lambda keys: server.get_parameters_if_newer(
+                keys, dict(self._versions), **get_kwargs
+            )
+        else:
+            self._request = lambda keys: server.get_parameters(keys, **get_kwargs)
         self._request_all = lambda: server.get_parameters(self._all_keys)
 
         self._adjust = lambda: server.set_parameters(
@@ -80,19 +427,38 @@ class ParameterClient:
         self._adjust_param = lambda params: server.set_parameters(params)
 
         self._add = lambda params: server.add_to_parameters(params)
+        # Increments accumulated by add_async that were not sent yet.
         self._async_add_buffer: Dict[str, Any] = {}
+        self._num_buffered_adds = 0
+        self._add_flush_count = add_flush_count
+        self._add_flush_seconds = add_flush_seconds
+        self._last_add_time = time.time()
 
         # parameter server only has `futures` attribute if it is a launchpad node
         # and it is only a launchpad node if we are running in multiprocess
         if multi_process:
-            self._async_request = lambda: server.futures.get_parameters(self._get_keys)  # type: ignore # noqa
+            if versioned_get:
+                self._async_request = lambda keys: server.futures.get_parameters_if_newer(  # type: ignore # noqa
+                    keys, dict(self._versions), **get_kwargs
+                )
+            else:
+                self._async_request = lambda keys: server.futures.get_parameters(  # type: ignore # noqa
+                    keys, **get_kwargs
+                )
             self._async_adjust = lambda: server.futures.set_parameters(  # type: ignore
                 {key: self._parameters[key] for key in self._set_keys},
             )
             self._async_adjust_param = lambda params: server.futures.set_parameters(params)  # type: ignore # noqa
             self._async_add = lambda params: server.futures.add_to_parameters(params)  # type: ignore # noqa
+            self._async_subscribe = lambda: server.futures.get_parameters_when_newer(  # type: ignore # noqa
+                self._get_keys,
+                dict(self._versions),
+                subscribe_timeout,
+                watch=subscribe_keys,
+                **get_kwargs,
+            )
         else:
-            self._async_request = lambda: DoneFuture(self._request())
+            self._async_request = lambda keys: DoneFuture(self._request(keys))
             self._async_adjust = lambda: DoneFuture(self._adjust())
             self._async_adjust_param = lambda params: DoneFuture(
                 self._adjust_param(params)
@@ -115,7 +481,7 @@ class ParameterClient:
         self._server.set_parameters(
             {key: self._parameters[key] for key in self._set_keys},
         )
-        self._copy(self._server.get_parameters(self._get_keys))
+        self._copy_response(self._request(self._get_keys))
 
     def _async_adjust_and_request(
         self,
@@ -136,18 +502,27 @@ class ParameterClient:
             {key: self._parameters[key] for key in self._set_keys},
         )
         # Get all parameters in _get_keys that we didn't set above with _set_keys
-        get_keys = set(self._get_keys) - set(self._set_keys)
-        get_future = self._server.futures.get_parameters(get_keys)  # type: ignore
-        get_future.add_done_callback(lambda ctx: self._copy(ctx.result()))
+        set_keys = set(self._set_keys)
+        get_future = self._async_request(
+            [key for key in self._get_keys if key not in set_keys]
+        )
+        get_future.add_done_callback(lambda ctx: self._copy_response(ctx.result()))
 
         return set_future, get_future
 
     def get_async(self) -> None:
         """Asynchronously updates the parameters with the latest copy from server.
 
+        With `subscribe`, the parameters are instead copied as soon as the
+        server answers the open subscription request.
+
         Returns:
             None.
         """
+        if self._subscribe:
+            self._get_subscribed_async()
+            return
+
         # Track the number of calls (we only update periodically).
         if self._get_call_counter < self._update_period:
             self._get_call_counter += 1
@@ -156,14 +531,27 @@ class ParameterClient:
         if period_reached and self._get_future is None:
             # The update period has been reached and no request has been sent yet, so
             # making an asynchronous request now.
-            self._get_future = self._async_request()
+            self._get_future = self._async_request(self._get_keys)
             self._get_call_counter = 0
 
         if self._get_future is not None and self._get_future.done():
             # The active request is done so copy the result and remove the future.\
-            self._copy(self._get_future.result())
+            self._copy_response(self._get_future.result())
             self._get_future = None
 
+    def _get_subscribed_async(self) -> None:
+        """Copy the parameters of an answered subscription request and open a new one.
+
+        Returns:
+            None.
+        """
+        if self._get_future is not None and self._get_future.done():
+            self._copy_response(self._get_future.result())
+            self._get_future = None
+
+        if self._get_future is None:
+            self._get_future = self._async_subscribe()
+
     def set_async(self, params: Optional[Dict[str, Any]] = None) -> None:
         """Asynchronously updates server with the set parameters.
 
@@ -191,9 +579,19 @@ class ParameterClient:
     def set_and_get_async(self) -> None:
         """Asynchronously updates server and gets from server.
 
+        With `subscribe`, the set parameters are sent every `update_period`
+        calls and the get parameters are copied as soon as the server answers
+        the open subscription request.
+
         Returns:
             None.
         """
+        if self._subscribe:
+            if self._set_keys:
+                self.set_async()
+            self._get_subscribed_async()
+            return
+
         # Track the number of calls (we only update periodically).
         if self._set_get_call_counter < self._update_period:
             self._set_get_call_counter += 1
@@ -214,35 +612,95 @@ class ParameterClient:
     def add_async(self, params: Dict[str, Any]) -> None:
         """Asynchronously adds to server parameters.
 
+        Increments are accumulated locally and sent in one request once
+        `add_flush_count` calls were accumulated or `add_flush_seconds` passed
+        since the last request, and the previous request is done.
+
+        Args:
+            params: dictionary {param name: value to add to param}.
+
         Returns:
             None.
         """
-        if self._add_future is not None and self._add_future.done():
+        for name, value in params.items():
+            if name in self._async_add_buffer:
+                self._async_add_buffer[name] = self._async_add_buffer[name] + value
+            else:
+                self._async_add_buffer[name] = value
+        self._num_buffered_adds += 1
+
+        if self._add_future is not None:
+            if not self._add_future.done():
+                # The previous request is still running, keep accumulating.
+                return
             self._add_future = None
 
-        names = params.keys()
-        if self._add_future is None:
-            # The update period has been reached and no request has been sent yet, so
-            # making an asynchronous request now.
-            if not self._async_add_buffer:
-                self._add_future = self._async_add(params)
-            else:
-                for name in names:
-                    self._async_add_buffer[name] += params[name]
+        if (
+            self._num_buffered_adds >= self._add_flush_count
+            or time.time() - self._last_add_time >= self._add_flush_seconds
+        ):
+            self._add_future = self._async_add(self._async_add_buffer)
+            self._async_add_buffer = {}
+            self._num_buffered_adds = 0
+            self._last_add_time = time.time()
 
-                self._add_future = self._async_add(self._async_add_buffer)
-                self._async_add_buffer = {}
+    def flush_adds(self) -> None:
+        """Send the increments accumulated by `add_async`. Wait for completion.
+
+        Returns:
+            None.
+        """
+        if self._add_future is not None:
+            self._add_future.result()
+            self._add_future = None
+        if self._async_add_buffer:
+            self._add(self._async_add_buffer)
+            self._async_add_buffer = {}
+            self._num_buffered_adds = 0
+            self._last_add_time = time.time()
+
+    def __del__(self) -> None:
+        """Send the increments that were not sent yet before the client goes away."""
+        if not hasattr(self, "_add_future"):
+            # The client was not fully initialised.
             return
-        else:
-            # The trainers is going to fast to keep up! Adding
-            # all the values up and only writing them when the
-            # process is ready.
-            if self._async_add_buffer:
-                for name in names:
-                    self._async_add_buffer[name] += params[name]
-            else:
-                for name in names:
-                    self._async_add_buffer[name] = params[name]
+        try:
+            self.flush_adds()
+        except Exception as e:
+            logging.warning(f"Could not send the pending parameter increments: {e}")
+
+    def local_counts(self, names: Iterable[str]) -> Dict[str, Any]:
+        """Read counters without a request to the server.
+
+        The values are eventually consistent: the values last fetched from the
+        server plus the increments of this client that were not sent yet.
+
+        Args:
+            names: names of the counter parameters.
+
+        Returns:
+            dictionary {param name: local value}.
+        """
+        return {
+            name: self._parameters[name] + self._async_add_buffer[name]
+            if name in self._async_add_buffer
+            else self._parameters[name]
+            for name in names
+        }
+
+    def set_local(self, params: Dict[str, Any]) -> None:
+        """Update parameters without a request to the server.
+
+        Set parameters among them are sent with the next set request.
+
+        Args:
+            params: dictionary {param name: new value}.
+
+        Returns:
+            None.
+        """
+        for name, value in params.items():
+            self._parameters[name] = value
 
     def add_and_wait(self, params: Dict[str, Any]) -> None:
         """Add to the given parameters in the server. Wait for completion.
@@ -267,7 +725,7 @@ class ParameterClient:
         Returns:
             None.
         """
-        self._copy(self._request())
+        self._copy_response(self._request(self._get_keys))
 
     def get_all_and_wait(self) -> None:
         """Update all parameters from server. Wait for completion.
@@ -294,6 +752,34 @@ class ParameterClient:
         else:
             self._adjust_param(params)
 
+    def _copy_response(self, response: Any) -> None:
+        """Copy the parameters of a get request to the existing ones.
+
+        Args:
+            response: parameters returned by the server. For versioned gets,
+                the parameters with NOT_MODIFIED for the unchanged ones and
+                their current versions.
+
+        Returns:
+            None.
+        """
+        if self._versioned_get:
+            new_parameters, versions = response
+        else:
+            new_parameters, versions = response, {}
+
+        if self._codec is not None:
+            new_parameters = self._codec.decode(new_parameters)
+
+        self._copy(
+            {
+                key: value
+                for key, value in new_parameters.items()
+                if value is not NOT_MODIFIED
+            }
+        )
+        self._versions.update(versions)
+
     # TODO(Dries/Arnu): this needs a bit of a cleanup
     def _copy(self, new_parameters: Dict[str, Any]) -> None:
         """Copy the given new parameters to the existing ones.
@@ -305,7 +791,9 @@ class ParameterClient:
             None.
         """
         for key in new_parameters.keys():
-            if isinstance(new_parameters[key], dict):
+            if key in self._flat_parameters:
+                self._flat_parameters[key].copy_from(new_parameters[key])
+            elif isinstance(new_parameters[key], dict):
                 for type1_key in new_parameters[key].keys():
                     # Check if nested dictionary
                     if isinstance(new_parameters[key][type1_key], dict):
@@ -337,16 +825,13 @@ class ParameterClient:
                         new_parameters[key], self._devices[key]  # type: ignore
                     )
                 else:
-                    # Note (dries): These in-place operators are used instead
-                    # of direct assignment to not lose reference to the numpy
-                    # array.
-
-                    self._parameters[key] *= 0
+                    # Note (dries): Copy in place instead of assigning, to not
+                    # lose reference to the numpy array.
                     # Remove last dim of numpy array if needed
                     if new_parameters[key].shape != self._parameters[key].shape:
-                        self._parameters[key] += new_parameters[key][0]
+                        np.copyto(self._parameters[key], new_parameters[key][0])
                     else:
-                        self._parameters[key] += new_parameters[key]
+                        np.copyto(self._parameters[key], new_parameters[key])
             elif isinstance(new_parameters[key], tuple):
                 for i in range(len(self._parameters[key])):
                     if self._devices:
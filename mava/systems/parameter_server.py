@@ -16,31 +16,106 @@
 """Jax systems parameter server."""
 
 
+import threading
+import time
+from enum import Enum
 from types import SimpleNamespace
-from typing import Any, Dict, List, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from mava.callbacks import Callback, ParameterServerHookMixin
 from mava.core_jax import SystemParameterServer
+from mava.utils.parameter_codec import ParameterCodec
+from mava.utils.read_write_lock import ReadWriteLock
+from mava.utils.sort_utils import sort_str_num
 from mava.utils.training_utils import non_blocking_sleep
 
 
+class _NotModified(Enum):
+    """Marker for parameters that did not change since the known version."""
+
+    token = 0
+
+
+# Returned by get_parameters_if_newer instead of parameters that did not change.
+# Enum members keep their identity when pickled, so clients can compare it with
+# `is` after a remote call.
+NOT_MODIFIED = _NotModified.token
+
+# Shard of a sharded parameter server that holds the parameters that do not
+# belong to a network, e.g. the counts and the termination flags.
+COUNTER_SHARD = 0
+
+
+def parameter_shard(name: str, network_keys: Sequence[str], num_shards: int) -> int:
+    """Get the parameter server shard that holds a parameter.
+
+    Network parameters and optimiser states, named "<name>-<network key>", are
+    spread over the shards by network key. All other parameters are held by
+    COUNTER_SHARD.
+
+    Args:
+        name: name of the parameter.
+        network_keys: keys of all the networks in the system.
+        num_shards: number of parameter server shards.
+
+    Returns:
+        index of the shard that holds the parameter.
+    """
+    network_key = name.split("-", 1)[-1]
+    if num_shards > 1 and "-" in name and network_key in network_keys:
+        return sort_str_num(list(network_keys)).index(network_key) % num_shards
+    return COUNTER_SHARD
+
+
+def holds_parameter(store: Any, name: str) -> bool:
+    """Whether a parameter server shard holds a parameter.
+
+    Args:
+        store: store of the parameter server shard.
+        name: name of the parameter.
+
+    Returns:
+        whether the parameter belongs to the shard.
+    """
+    return (
+        parameter_shard(name, store.agents_net_keys, store.num_parameter_servers)
+        == store.parameter_server_shard
+    )
+
+
 class ParameterServer(SystemParameterServer, ParameterServerHookMixin):
     def __init__(
         self,
         store: SimpleNamespace,
         components: List[Callback],
+        shard_id: int = COUNTER_SHARD,
+        num_shards: int = 1,
     ) -> None:
         """Initialise the parameter server.
 
         Args:
             store: builder store.
             components: components in the system.
+            shard_id: index of this server among the parameter server shards.
+            num_shards: number of parameter server shards. Each shard only holds
+                the parameters assigned to it by `parameter_shard`.
         """
         super().__init__()
 
         self.store = store
         self.callbacks = components
 
+        self.store.parameter_server_shard = shard_id
+        self.store.num_parameter_servers = num_shards
+
+        # Guards store.parameters. Requests that only read the parameters hold
+        # it together, while requests that change them hold it alone.
+        self.parameters_lock = ReadWriteLock()
+        # Notified when parameters are set, e.g. by a trainer, to answer the
+        # requests waiting in get_parameters_when_newer.
+        self._parameters_set = threading.Condition()
+        self._num_parameter_sets = 0
+
         self.on_parameter_server_init_start()
 
         self.on_parameter_server_init()
@@ -49,24 +124,137 @@ class ParameterServer(SystemParameterServer, ParameterServerHookMixin):
 
         self.on_parameter_server_init_end()
 
-    def get_parameters(self, names: Union[str, Sequence[str]]) -> Any:
+    def get_parameters(
+        self,
+        names: Union[str, Sequence[str]],
+        codec: Optional[ParameterCodec] = None,
+    ) -> Any:
         """Get parameters from the parameter server.
 
         Args:
             names: names of the parameters to get.
+            codec: codec used to encode the parameters for transport. Defaults
+                to None, i.e. the parameters are sent as they are.
 
         Returns:
             The parameters that were requested.
         """
-        self.store._param_names = names
+        request = self.new_request(param_names=names, get_parameters=None)
+
+        with self.parameters_lock.read():
+            self.on_parameter_server_get_parameters_start()
 
-        self.on_parameter_server_get_parameters_start()
+            self.on_parameter_server_get_parameters()
 
-        self.on_parameter_server_get_parameters()
+            self.on_parameter_server_get_parameters_end()
 
-        self.on_parameter_server_get_parameters_end()
+            return self._encode(request.get_parameters, codec)
+
+    def get_parameters_if_newer(
+        self,
+        names: Sequence[str],
+        versions: Dict[str, int],
+        codec: Optional[ParameterCodec] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Get the parameters that changed since the given versions.
 
-        return self.store.get_parameters
+        Parameters whose version matches the one given are returned as
+        NOT_MODIFIED instead of their value, so unchanged parameters are not
+        sent again.
+
+        Args:
+            names: names of the parameters to get.
+            versions: dictionary {parameter name: version} of the parameter
+                values the caller already has.
+            codec: codec used to encode the parameters for transport. Defaults
+                to None, i.e. the parameters are sent as they are.
+
+        Returns:
+            The requested parameters, with NOT_MODIFIED for unchanged ones, and
+            the current versions of the requested parameters.
+        """
+        request = self.new_request(
+            param_names=names,
+            param_versions=versions,
+            get_parameters=None,
+            # Servers without versioned parameters return every value.
+            get_parameter_versions={},
+        )
+
+        with self.parameters_lock.read():
+            self.on_parameter_server_get_parameters_start()
+
+            self.on_parameter_server_get_parameters()
+
+            self.on_parameter_server_get_parameters_end()
+
+            return (
+                self._encode(request.get_parameters, codec),
+                request.get_parameter_versions,
+            )
+
+    def get_parameters_when_newer(
+        self,
+        names: Sequence[str],
+        versions: Dict[str, int],
+        timeout: float,
+        codec: Optional[ParameterCodec] = None,
+        watch: Optional[Sequence[str]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Wait until parameters changed since the given versions, then get them.
+
+        This lets clients subscribe to parameters: instead of polling them
+        periodically, a client keeps one of these requests open and the server
+        answers it as soon as a set_parameters request changed one of them.
+        Every open request occupies a request handling thread of the server
+        until it is answered, at the latest after `timeout`.
+
+        Args:
+            names: names of the parameters to get.
+            versions: dictionary {parameter name: version} of the parameter
+                values the caller already has.
+            timeout: maximum number of seconds to wait for a change.
+            codec: codec used to encode the parameters for transport. Defaults
+                to None, i.e. the parameters are sent as they are.
+            watch: names of the requested parameters whose changes answer the
+                request, e.g. the network parameters, so that counters that
+                change with every episode do not. The other parameters are
+                returned along with them. Defaults to None, i.e. all of them.
+
+        Returns:
+            The requested parameters, with NOT_MODIFIED for unchanged ones, and
+            the current versions of the requested parameters. Parameters are
+            all NOT_MODIFIED if none changed before the timeout.
+        """
+        watched = names if watch is None else watch
+        deadline = time.time() + timeout
+        while True:
+            with self._parameters_set:
+                num_parameter_sets = self._num_parameter_sets
+            parameters, new_versions = self.get_parameters_if_newer(
+                names, versions, codec
+            )
+            # Servers without versioned parameters always return every value.
+            changed = not new_versions or any(
+                versions.get(name) != new_versions[name]
+                for name in watched
+                if name in new_versions
+            )
+            remaining = deadline - time.time()
+            if changed or remaining <= 0:
+                return parameters, new_versions
+            with self._parameters_set:
+                self._parameters_set.wait_for(
+                    lambda: self._num_parameter_sets != num_parameter_sets,
+                    timeout=remaining,
+                )
+
+    @staticmethod
+    def _encode(parameters: Any, codec: Optional[ParameterCodec]) -> Any:
+        """Encode requested parameters with the codec of the request, if any."""
+        if codec is None or not isinstance(parameters, dict):
+            return parameters
+        return codec.encode(parameters)
 
     def set_parameters(self, set_params: Dict[str, Any]) -> None:
         """Set parameters in the parameter server.
@@ -77,13 +265,18 @@ class ParameterServer(SystemParameterServer, ParameterServerHookMixin):
         Returns:
             None.
         """
-        self.store._set_params = set_params
+        self.new_request(set_params=set_params)
+
+        with self.parameters_lock.write():
+            self.on_parameter_server_set_parameters_start()
 
-        self.on_parameter_server_set_parameters_start()
+            self.on_parameter_server_set_parameters()
 
-        self.on_parameter_server_set_parameters()
+            self.on_parameter_server_set_parameters_end()
 
-        self.on_parameter_server_set_parameters_end()
+        with self._parameters_set:
+            self._num_parameter_sets += 1
+            self._parameters_set.notify_all()
 
     def add_to_parameters(self, add_to_params: Dict[str, Any]) -> None:
         """Add to the parameters in the parameter server.
@@ -94,13 +287,14 @@ class ParameterServer(SystemParameterServer, ParameterServerHookMixin):
         Returns:
             None.
         """
-        self.store._add_to_params = add_to_params
+        self.new_request(add_to_params=add_to_params)
 
-        self.on_parameter_server_add_to_parameters_start()
+        with self.parameters_lock.write():
+            self.on_parameter_server_add_to_parameters_start()
 
-        self.on_parameter_server_add_to_parameters()
+            self.on_parameter_server_add_to_parameters()
 
-        self.on_parameter_server_add_to_parameters_end()
+            self.on_parameter_server_add_to_parameters_end()
 
     def step(self) -> None:
         """Single step of the parameter server.
@@ -116,11 +310,15 @@ class ParameterServer(SystemParameterServer, ParameterServerHookMixin):
 
         self.on_parameter_server_run_loop_start()
 
+        # Checkpointers only hold the parameters lock to snapshot the
+        # parameters, so requests are not blocked while a checkpoint is saved.
         self.on_parameter_server_run_loop_checkpoint()
 
         self.on_parameter_server_run_loop()
 
-        self.on_parameter_server_run_loop_termination()
+        # The termination conditions read the parameters.
+        with self.parameters_lock.read():
+            self.on_parameter_server_run_loop_termination()
 
         self.on_parameter_server_run_loop_end()
 
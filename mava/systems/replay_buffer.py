@@ -0,0 +1,654 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process replay buffer that can replace the reverb data server."""
+import itertools
+import threading
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import reverb
+import tree
+
+from mava.utils.enums import ReplaySampler
+
+
+class TableInfo(NamedTuple):
+    """Information about an in-process replay table."""
+
+    name: str
+    sampler: ReplaySampler
+    max_size: int
+    current_size: int
+    max_times_sampled: int
+    num_inserts: int
+    num_samples: int
+    signature: Any
+
+
+class RingBufferTable:
+    """Replay table that stores items in preallocated numpy ring buffers.
+
+    Every leaf of the item structure is stored in one array of shape
+    `[max_size, *leaf_shape]`, allocated when the first item is inserted.
+    Items are sampled in insertion order (queue), uniformly or in proportion
+    to their priority. All methods are thread safe. Since the storage is
+    preallocated, all items must have the same structure and shapes.
+
+    Once the ring buffer is full, queue tables block inserts until items are
+    sampled, while the other tables overwrite their oldest item. Items that
+    reach `max_times_sampled` free their slot, which is reused when the ring
+    wraps around.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        sampler: ReplaySampler = ReplaySampler.uniform,
+        priority_exponent: float = 1.0,
+        min_size_to_sample: int = 1,
+        max_times_sampled: int = 0,
+        signature: Any = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initialise the table.
+
+        Args:
+            name: name of the table.
+            max_size: maximum number of items in the table.
+            sampler: how items are selected for sampling. Defaults to uniform.
+            priority_exponent: exponent applied to the priorities by the
+                prioritised sampler. Defaults to 1.0.
+            min_size_to_sample: sample calls block until the table holds at
+                least this many items. Defaults to 1.
+            max_times_sampled: items are removed after being sampled this many
+                times, 0 means never. Queue items are always sampled once.
+                Defaults to 0.
+            signature: signature of the items, reported by `info`. Defaults to
+                None.
+            seed: seed of the random sampler. Defaults to None.
+        """
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}.")
+        self.name = name
+        self._max_size = max_size
+        self._sampler = sampler
+        self._priority_exponent = priority_exponent
+        self._min_size_to_sample = max(min_size_to_sample, 1)
+        self._max_times_sampled = (
+            1 if sampler == ReplaySampler.queue else max_times_sampled
+        )
+        self._signature = signature
+        self._rng = np.random.default_rng(seed)
+
+        self._storage: Any = None
+        self._keys = np.zeros(max_size, dtype=np.uint64)
+        self._priorities = np.zeros(max_size, dtype=np.float64)
+        self._times_sampled = np.zeros(max_size, dtype=np.int32)
+        self._occupied = np.zeros(max_size, dtype=bool)
+        self._slots: Dict[int, int] = {}
+        self._key_counter = itertools.count(1)
+
+        # Slot of the oldest item and total number of items.
+        self._head = 0
+        self._size = 0
+        self._num_inserts = 0
+        self._num_samples = 0
+        self._condition = threading.Condition()
+
+    def info(self) -> TableInfo:
+        """Information about the table.
+
+        Returns:
+            the current table information.
+        """
+        with self._condition:
+            return TableInfo(
+                name=self.name,
+                sampler=self._sampler,
+                max_size=self._max_size,
+                current_size=self._size,
+                max_times_sampled=self._max_times_sampled,
+                num_inserts=self._num_inserts,
+                num_samples=self._num_samples,
+                signature=self._signature,
+            )
+
+    def _wait_for(self, predicate: Any, timeout: Optional[float]) -> None:
+        """Wait on the table condition, raising TimeoutError on timeout."""
+        if not self._condition.wait_for(predicate, timeout=timeout):
+            raise TimeoutError(f"Timed out waiting for replay table {self.name}.")
+
+    def _free(self, slots: np.ndarray) -> None:
+        """Remove the items in the given slots."""
+        for slot in slots:
+            del self._slots[int(self._keys[slot])]
+        self._occupied[slots] = False
+        self._size -= len(slots)
+
+    def insert(
+        self, item: Any, priority: float = 1.0, timeout: Optional[float] = None
+    ) -> int:
+        """Copy an item into the table.
+
+        Args:
+            item: nested structure of arrays.
+            priority: priority of the item. Defaults to 1.0.
+            timeout: maximum time in seconds to wait for space in a full
+                queue. Defaults to None, i.e. no limit.
+
+        Returns:
+            the key of the new item.
+        """
+        with self._condition:
+            if self._storage is None:
+                self._storage = tree.map_structure(
+                    lambda x: np.zeros(
+                        (self._max_size, *np.shape(x)), dtype=np.asarray(x).dtype
+                    ),
+                    item,
+                )
+
+            def check_shape(buffer: np.ndarray, value: Any) -> None:
+                if np.shape(value) != buffer.shape[1:]:
+                    raise ValueError(
+                        f"Items of table {self.name} must have fixed shapes, got "
+                        f"{np.shape(value)} instead of {buffer.shape[1:]}."
+                    )
+
+            tree.map_structure(check_shape, self._storage, item)
+
+            if self._sampler == ReplaySampler.queue:
+                self._wait_for(lambda: self._size < self._max_size, timeout)
+                slot = (self._head + self._size) % self._max_size
+            else:
+                slot = self._head
+                self._head = (self._head + 1) % self._max_size
+                if self._occupied[slot]:
+                    # Overwrite the oldest item.
+                    self._free(np.array([slot]))
+
+            def write(buffer: np.ndarray, value: Any) -> None:
+                buffer[slot] = value
+
+            tree.map_structure(write, self._storage, item)
+
+            key = next(self._key_counter)
+            self._keys[slot] = key
+            self._priorities[slot] = priority
+            self._times_sampled[slot] = 0
+            self._occupied[slot] = True
+            self._slots[key] = slot
+            self._size += 1
+            self._num_inserts += 1
+            self._condition.notify_all()
+            return key
+
+    def _select(self, num_samples: int) -> Any:
+        """Select the slots to sample and their sampling probabilities."""
+        if self._sampler == ReplaySampler.queue:
+            slots = (self._head + np.arange(num_samples)) % self._max_size
+            self._head = (self._head + num_samples) % self._max_size
+            return slots, np.ones(num_samples)
+
+        occupied = np.flatnonzero(self._occupied)
+        probabilities = None
+        if self._sampler == ReplaySampler.prioritised:
+            weights = self._priorities[occupied] ** self._priority_exponent
+            if weights.sum() > 0:
+                probabilities = weights / weights.sum()
+        if probabilities is None:
+            probabilities = np.full(len(occupied), 1.0 / len(occupied))
+
+        selected = self._rng.choice(len(occupied), size=num_samples, p=probabilities)
+        return occupied[selected], probabilities[selected]
+
+    def sample(
+        self, num_samples: int = 1, timeout: Optional[float] = None
+    ) -> reverb.ReplaySample:
+        """Sample a batch of items.
+
+        Args:
+            num_samples: number of items to sample. Defaults to 1.
+            timeout: maximum time in seconds to wait for enough items.
+                Defaults to None, i.e. no limit.
+
+        Returns:
+            a sample whose data leaves have a leading batch dimension.
+        """
+        min_size = self._min_size_to_sample
+        if self._sampler == ReplaySampler.queue:
+            min_size = max(min_size, num_samples)
+
+        with self._condition:
+            self._wait_for(lambda: self._size >= min_size, timeout)
+            table_size = self._size
+            slots, probabilities = self._select(num_samples)
+
+            self._times_sampled[slots] += 1
+            info = reverb.SampleInfo(
+                key=self._keys[slots],
+                probability=probabilities,
+                table_size=np.full(num_samples, table_size, dtype=np.int64),
+                priority=self._priorities[slots],
+                times_sampled=self._times_sampled[slots],
+            )
+            data = tree.map_structure(lambda buffer: buffer[slots], self._storage)
+
+            if self._max_times_sampled > 0:
+                unique_slots = np.unique(slots)
+                self._free(
+                    unique_slots[
+                        self._times_sampled[unique_slots] >= self._max_times_sampled
+                    ]
+                )
+            self._num_samples += num_samples
+            self._condition.notify_all()
+        return reverb.ReplaySample(info=info, data=data)
+
+    def mutate_priorities(
+        self,
+        updates: Optional[Mapping[int, float]] = None,
+        deletes: Optional[Iterable[int]] = None,
+    ) -> None:
+        """Update the priorities of items or remove them.
+
+        Keys of items that are no longer in the table are ignored.
+
+        Args:
+            updates: new priorities by item key. Defaults to None.
+            deletes: keys of items to remove. Defaults to None.
+        """
+        with self._condition:
+            for key, priority in (updates or {}).items():
+                slot = self._slots.get(int(key))
+                if slot is not None:
+                    self._priorities[slot] = priority
+            delete_slots = [
+                self._slots[int(key)]
+                for key in deletes or ()
+                if int(key) in self._slots
+            ]
+            if delete_slots:
+                if self._sampler == ReplaySampler.queue:
+                    raise ValueError("Items can not be deleted from a queue.")
+                self._free(np.array(delete_slots))
+                self._condition.notify_all()
+
+
+class TrajectoryColumn:
+    """Column of history data used to build the items of a trajectory writer."""
+
+    def __init__(self, values: Sequence[Any], squeeze: bool = False) -> None:
+        """Initialise the column.
+
+        Args:
+            values: the referenced values of each step.
+            squeeze: whether the column holds a single value without a step
+                dimension. Defaults to False.
+        """
+        if squeeze and len(values) != 1:
+            raise ValueError("Squeezed columns must contain exactly one value.")
+        if any(value is None for value in values):
+            raise ValueError("Trajectory columns can not contain missing values.")
+        self._values = tuple(values)
+        self.is_squeezed = squeeze
+
+    def __len__(self) -> int:
+        """Number of values in the column."""
+        return len(self._values)
+
+    def __getitem__(self, key: Union[int, slice, List[int]]) -> "TrajectoryColumn":
+        """Select values of the column."""
+        if isinstance(key, int):
+            return TrajectoryColumn([self._values[key]], squeeze=True)
+        if isinstance(key, list):
+            return TrajectoryColumn([self._values[k] for k in key])
+        return TrajectoryColumn(self._values[key])
+
+    def numpy(self) -> np.ndarray:
+        """Stack the values of the column.
+
+        Returns:
+            the stacked values, or the single value of a squeezed column.
+        """
+        if self.is_squeezed:
+            return self._values[0]
+        return np.stack(self._values)
+
+
+class _ColumnHistory:
+    """History of the values of one field, indexed by step."""
+
+    def __init__(self, num_keep_alive_refs: int, num_steps: int) -> None:
+        """Initialise the history, with missing values for the past steps.
+
+        Args:
+            num_keep_alive_refs: number of recent values kept.
+            num_steps: number of steps before the field was first seen.
+        """
+        self._num_keep_alive_refs = num_keep_alive_refs
+        self._values: List[Any] = []
+        self._offset = num_steps
+
+    def __len__(self) -> int:
+        """Number of steps in the history."""
+        return self._offset + len(self._values)
+
+    def append(self, value: Any) -> None:
+        """Add the value of a new step."""
+        self._values.append(value)
+        if len(self._values) > self._num_keep_alive_refs:
+            self._values.pop(0)
+            self._offset += 1
+
+    @property
+    def can_set_last(self) -> bool:
+        """Whether the value of the last step is missing."""
+        return bool(self._values) and self._values[-1] is None
+
+    def set_last(self, value: Any) -> None:
+        """Set the missing value of the last step."""
+        if not self.can_set_last:
+            raise ValueError("The field was already set in the active step.")
+        self._values[-1] = value
+
+    def reset(self) -> None:
+        """Remove all steps."""
+        self._values = []
+        self._offset = 0
+
+    def _get(self, index: int) -> Any:
+        """Value of a step, None if it is no longer kept."""
+        return self._values[index - self._offset] if index >= self._offset else None
+
+    def __getitem__(self, key: Union[int, slice, List[int]]) -> TrajectoryColumn:
+        """Select steps of the history, with list indexing semantics."""
+        steps = range(len(self))
+        if isinstance(key, int):
+            return TrajectoryColumn([self._get(steps[key])], squeeze=True)
+        if isinstance(key, list):
+            return TrajectoryColumn([self._get(steps[k]) for k in key])
+        return TrajectoryColumn([self._get(index) for index in steps[key]])
+
+
+def _merge_structures(structure: Any, other: Any) -> Any:
+    """Union of the keys of two (nested) dictionary structures."""
+    if isinstance(structure, Mapping) and isinstance(other, Mapping):
+        merged = dict(structure)
+        for key, value in other.items():
+            merged[key] = (
+                _merge_structures(structure[key], value) if key in structure else value
+            )
+        return merged
+    return structure
+
+
+class ReplayTrajectoryWriter:
+    """Trajectory writer for in-process replay tables.
+
+    Implements the parts of `reverb.TrajectoryWriter` used by the Mava adders:
+    steps are appended column by column, items are created from the history
+    columns and are inserted into the tables straight away.
+    """
+
+    def __init__(self, replay_buffer: "ReplayBuffer", num_keep_alive_refs: int):
+        """Initialise the writer.
+
+        Args:
+            replay_buffer: replay buffer that items are inserted into.
+            num_keep_alive_refs: number of recent steps kept in the history.
+        """
+        self._replay_buffer = replay_buffer
+        self._num_keep_alive_refs = num_keep_alive_refs
+        self._structure: Any = None
+        self._columns: Dict[Any, _ColumnHistory] = {}
+        self._num_steps = 0
+        self._last_step_is_open = False
+        self._episode_steps = 0
+
+    @property
+    def history(self) -> Any:
+        """History columns, structured like the appended data."""
+        if self._structure is None:
+            raise RuntimeError("history can not be accessed before append is called.")
+        paths = [path for path, _ in tree.flatten_with_path(self._structure)]
+        return tree.unflatten_as(
+            self._structure, [self._columns[path] for path in paths]
+        )
+
+    @property
+    def episode_steps(self) -> int:
+        """Number of completed steps since the last `end_episode` call."""
+        return self._episode_steps
+
+    def configure(
+        self,
+        path: Tuple[Any, ...],
+        *,
+        num_keep_alive_refs: int,
+        max_chunk_length: Optional[int],
+    ) -> None:
+        """Set the chunking options of a column.
+
+        Values are kept as they are, without chunks, so the options are accepted
+        for compatibility with `reverb.TrajectoryWriter` and unused.
+
+        Args:
+            path: path of the column.
+            num_keep_alive_refs: number of recent steps kept by the column.
+            max_chunk_length: chunk length of the column.
+        """
+
+    def append(self, data: Any, *, partial_step: bool = False) -> None:
+        """Append the data of a step, or part of it if `partial_step` is set.
+
+        Args:
+            data: nested structure of arrays. Values are copied.
+            partial_step: whether more data of this step follows. Defaults to
+                False.
+        """
+        flat_data = {
+            path: np.array(value) for path, value in tree.flatten_with_path(data)
+        }
+        structure = tree.map_structure(lambda _: None, data)
+        self._structure = (
+            structure
+            if self._structure is None
+            else _merge_structures(self._structure, structure)
+        )
+        for path in flat_data:
+            if path not in self._columns:
+                if self._last_step_is_open:
+                    # New field of the open step.
+                    column = _ColumnHistory(
+                        self._num_keep_alive_refs, self._num_steps - 1
+                    )
+                    column.append(None)
+                else:
+                    column = _ColumnHistory(self._num_keep_alive_refs, self._num_steps)
+                self._columns[path] = column
+
+        for path, column in self._columns.items():
+            value = flat_data.get(path)
+            if not self._last_step_is_open:
+                column.append(value)
+            elif value is not None:
+                column.set_last(value)
+
+        if not self._last_step_is_open:
+            self._num_steps += 1
+        if not partial_step:
+            self._episode_steps += 1
+        self._last_step_is_open = partial_step
+
+    def create_item(self, table: str, priority: float, trajectory: Any) -> None:
+        """Insert an item built from history columns.
+
+        Args:
+            table: name of the table.
+            priority: priority of the item.
+            trajectory: nested structure of columns taken from `history`.
+        """
+        item = tree.map_structure(lambda column: column.numpy(), trajectory)
+        self._replay_buffer.insert(table, item, priority)
+
+    def flush(
+        self, block_until_num_items: int = 0, timeout_ms: Optional[int] = None
+    ) -> None:
+        """Items are inserted when they are created, so there is nothing to flush."""
+
+    def end_episode(
+        self, clear_buffers: bool = True, timeout_ms: Optional[int] = None
+    ) -> None:
+        """Start a new episode.
+
+        Args:
+            clear_buffers: whether to clear the history. Defaults to True.
+            timeout_ms: unused, items are already inserted. Defaults to None.
+        """
+        if clear_buffers:
+            for column in self._columns.values():
+                column.reset()
+            self._num_steps = 0
+            self._last_step_is_open = False
+        self._episode_steps = 0
+
+    def close(self) -> None:
+        """Close the writer."""
+
+
+class ReplayBuffer:
+    """In-process data server and client for a set of ring buffer tables.
+
+    Provides the parts of the `reverb.Client` interface used by Mava systems,
+    so executors and trainers in a single process can share experience
+    without a reverb server or serialisation.
+    """
+
+    def __init__(self, tables: Sequence[RingBufferTable]) -> None:
+        """Initialise the replay buffer.
+
+        Args:
+            tables: replay tables.
+        """
+        self._tables = {table.name: table for table in tables}
+
+    def table(self, name: str) -> RingBufferTable:
+        """Get a table by name.
+
+        Args:
+            name: name of the table.
+
+        Returns:
+            the table.
+        """
+        return self._tables[name]
+
+    def server_info(self, timeout: Optional[int] = None) -> Dict[str, TableInfo]:
+        """Information about all tables.
+
+        Args:
+            timeout: unused, kept for compatibility with `reverb.Client`.
+                Defaults to None.
+
+        Returns:
+            table information by table name.
+        """
+        return {name: table.info() for name, table in self._tables.items()}
+
+    def insert(self, table: str, item: Any, priority: float = 1.0) -> int:
+        """Insert an item into a table.
+
+        Args:
+            table: name of the table.
+            item: nested structure of arrays.
+            priority: priority of the item. Defaults to 1.0.
+
+        Returns:
+            the key of the new item.
+        """
+        return self._tables[table].insert(item, priority)
+
+    def sample(
+        self, table: str, num_samples: int = 1, timeout: Optional[float] = None
+    ) -> reverb.ReplaySample:
+        """Sample a batch of items from a table.
+
+        Args:
+            table: name of the table.
+            num_samples: number of items to sample. Defaults to 1.
+            timeout: maximum time in seconds to wait for enough items.
+                Defaults to None, i.e. no limit.
+
+        Returns:
+            a sample whose data leaves have a leading batch dimension.
+        """
+        return self._tables[table].sample(num_samples, timeout=timeout)
+
+    def mutate_priorities(
+        self,
+        table: str,
+        updates: Optional[Mapping[int, float]] = None,
+        deletes: Optional[Iterable[int]] = None,
+    ) -> None:
+        """Update the priorities of items in a table or remove them.
+
+        Args:
+            table: name of the table.
+            updates: new priorities by item key. Defaults to None.
+            deletes: keys of items to remove. Defaults to None.
+        """
+        self._tables[table].mutate_priorities(updates, deletes)
+
+    def trajectory_writer(
+        self, num_keep_alive_refs: int, **kwargs: Any
+    ) -> ReplayTrajectoryWriter:
+        """Create a trajectory writer for the tables.
+
+        Args:
+            num_keep_alive_refs: number of recent steps kept in the history.
+            kwargs: other `reverb.Client.trajectory_writer` arguments, unused.
+
+        Returns:
+            a new trajectory writer.
+        """
+        return ReplayTrajectoryWriter(self, num_keep_alive_refs)
+
+    def as_iterator(self, table: str, batch_size: int) -> Iterator[reverb.ReplaySample]:
+        """Iterate over batches sampled from a table.
+
+        Args:
+            table: name of the table.
+            batch_size: number of items per batch.
+
+        Returns:
+            an endless iterator of batched samples.
+        """
+        while True:
+            yield self.sample(table, batch_size)
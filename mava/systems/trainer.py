@@ -75,5 +75,8 @@ class Trainer(SystemTrainer, TrainerHookMixin):
                 self.step()
             except Exception as e:
                 logging.exception(f"{e} the trainer failed")
+                # Send the counts of the finished steps before stopping.
+                self.store.trainer_parameter_client.flush_adds()
+                self.on_training_end()
                 self.store.trainer_parameter_client.set_and_wait({"terminate": True})
                 break
@@ -0,0 +1,245 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities for feeding datasets to trainers."""
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+import jax
+import jax.dlpack
+import jax.numpy as jnp
+import numpy as np
+import reverb
+import tensorflow as tf
+import tree
+
+
+def device_put_sample(sample: reverb.ReplaySample) -> reverb.ReplaySample:
+    """Transfer the data of a reverb sample to the default device.
+
+    The sample info stays on the host, since its uint64 keys can not be
+    represented on device without 64 bit mode.
+
+    Args:
+        sample: reverb sample with numpy data.
+
+    Returns:
+        the sample with its data on device.
+    """
+    return sample._replace(data=jax.device_put(sample.data))
+
+
+def _shares_buffer(tensor: tf.Tensor, array: jnp.ndarray) -> bool:
+    """Whether a JAX array imported from a tensor uses the tensor's buffer."""
+    if "CPU" not in tensor.device:
+        # DLPack hands over accelerator buffers without copying.
+        return True
+    source = tensor.numpy().__array_interface__["data"][0]
+    return array.unsafe_buffer_pointer() == source
+
+
+def tensor_to_jax(
+    tensor: tf.Tensor, device: Optional[jax.Device] = None
+) -> Tuple[jnp.ndarray, int]:
+    """Hand a TensorFlow tensor to JAX, without a copy where possible.
+
+    The tensor is passed through DLPack when JAX supports its dtype as is.
+    Otherwise, e.g. for booleans or 64 bit types without 64 bit mode, it is
+    copied once to device. JAX also copies DLPack CPU buffers that are not
+    aligned the way it requires, and tensors that DLPack hands over on
+    another device, e.g. reverb's CPU tensors on a GPU trainer, are copied to
+    the target device.
+
+    Args:
+        tensor: TensorFlow tensor.
+        device: device of the array. Defaults to JAX's default device.
+
+    Returns:
+        the JAX array and the number of bytes that were copied.
+    """
+    device = device or jax.devices()[0]
+    dtype = np.dtype(tensor.dtype.as_numpy_dtype)
+    if dtype != np.bool_ and jax.dtypes.canonicalize_dtype(dtype) == dtype:
+        try:
+            array = jax.dlpack.from_dlpack(tf.experimental.dlpack.to_dlpack(tensor))
+        except (tf.errors.OpError, RuntimeError, TypeError):
+            pass
+        else:
+            copied = 0 if _shares_buffer(tensor, array) else array.nbytes
+            if device not in array.devices():
+                array = jax.device_put(array, device)
+                copied += array.nbytes
+            return array, copied
+    array = jax.device_put(tensor.numpy(), device)
+    return array, array.nbytes
+
+
+class DLPackIterator(Iterator[Any]):
+    """Iterator over a TensorFlow dataset that yields JAX arrays.
+
+    Tensors are handed to JAX with `tensor_to_jax` instead of being converted
+    to numpy first, so each batch is copied at most once on its way to the
+    device. The info of reverb samples is converted to numpy and stays on the
+    host.
+
+    The number of bytes copied for the last batch, including the copy to the
+    target device, is available as `bytes_copied`.
+    """
+
+    def __init__(
+        self, dataset: tf.data.Dataset, device: Optional[jax.Device] = None
+    ) -> None:
+        """Initialise the iterator.
+
+        Args:
+            dataset: TensorFlow dataset.
+            device: device of the batches. Defaults to JAX's default device.
+        """
+        self._iterator = iter(dataset)
+        self._device = device or jax.devices()[0]
+        self.bytes_copied = 0
+
+    def _to_jax(self, structure: Any) -> Any:
+        """Convert all tensors of a structure, counting the copied bytes."""
+        arrays, copied = [], 0
+        for tensor in tree.flatten(structure):
+            array, num_bytes = tensor_to_jax(tensor, self._device)
+            arrays.append(array)
+            copied += num_bytes
+        self.bytes_copied += copied
+        return tree.unflatten_as(structure, arrays)
+
+    def __next__(self) -> Any:
+        """Get the next batch of the dataset.
+
+        Returns:
+            the batch with JAX arrays.
+        """
+        element = next(self._iterator)
+        self.bytes_copied = 0
+        if isinstance(element, reverb.ReplaySample):
+            element = reverb.ReplaySample(
+                info=tree.map_structure(lambda t: t.numpy(), element.info),
+                data=self._to_jax(element.data),
+            )
+        else:
+            element = self._to_jax(element)
+        return element
+
+
+class _Raise:
+    """Queue entry for an exception raised by the source iterator."""
+
+    def __init__(self, exception: BaseException) -> None:
+        """Store the exception.
+
+        Args:
+            exception: exception to raise in the consuming thread.
+        """
+        self.exception = exception
+
+
+class PrefetchIterator(Iterator[Any]):
+    """Iterator that fetches the next elements on a background thread.
+
+    A background thread pulls elements from the source iterator, applies an
+    optional transform to them (e.g. a transfer to device) and keeps up to
+    `buffer_size` of them ready. Sampling and host-to-device transfers of the
+    next batches therefore overlap with training on the current one. The
+    thread starts when the first element is requested.
+
+    If the source iterator counts the bytes it copies for each element in
+    `bytes_copied` (see `DLPackIterator`), the count is kept with the
+    prefetched element and is available as `bytes_copied` once that element
+    is returned.
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[Any],
+        buffer_size: int = 2,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        """Initialise the iterator.
+
+        Args:
+            iterable: source of the elements.
+            buffer_size: number of elements to keep ready. Defaults to 2.
+            transform: function applied to each element on the background
+                thread. Defaults to None.
+        """
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be positive, got {buffer_size}.")
+        self.iterator = iter(iterable)
+        self._transform = transform
+        self._buffer: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self._stopped = threading.Event()
+        self._exhausted = False
+        self._thread: Optional[threading.Thread] = None
+        self.bytes_copied: Optional[int] = None
+
+    def _put(self, element: Any) -> bool:
+        """Add an element to the buffer, giving up once the iterator is closed."""
+        while not self._stopped.is_set():
+            try:
+                self._buffer.put(element, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _prefetch(self) -> None:
+        """Fill the buffer from the source iterator."""
+        while not self._stopped.is_set():
+            try:
+                element = next(self.iterator)
+                if self._transform is not None:
+                    element = self._transform(element)
+            except BaseException as e:
+                # Includes StopIteration, which ends the iteration.
+                self._put(_Raise(e))
+                return
+            if not self._put((element, getattr(self.iterator, "bytes_copied", None))):
+                return
+
+    @property
+    def num_ready(self) -> int:
+        """Number of elements that are ready to be returned without waiting."""
+        return self._buffer.qsize()
+
+    def __next__(self) -> Any:
+        """Get the next element, waiting for it if it is not ready yet.
+
+        Returns:
+            the next element of the source iterator.
+        """
+        if self._exhausted:
+            raise StopIteration
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._prefetch, daemon=True)
+            self._thread.start()
+        entry = self._buffer.get()
+        if isinstance(entry, _Raise):
+            self._exhausted = True
+            raise entry.exception
+        element, self.bytes_copied = entry
+        return element
+
+    def close(self) -> None:
+        """Stop prefetching."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
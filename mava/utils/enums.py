@@ -44,3 +44,37 @@ class NetworkSampler(Enum):
     select policies from this sets for each agent at the start of a
     episode. This sampling is done with replacement so the same policy
     can be selected for more than one agent for a given episode."""
+
+
+class ReplaySampler(Enum):
+    queue = 1
+    """Sample items in insertion order, each item exactly once."""
+    uniform = 2
+    """Sample items uniformly at random."""
+    prioritised = 3
+    """Sample items with probability proportional to their priority raised
+    to the priority exponent."""
+
+
+class ParameterPrecision(Enum):
+    full = 1
+    """Send floating point parameters with their own dtype."""
+    float16 = 2
+    """Send floating point parameters as float16."""
+    bfloat16 = 3
+    """Send floating point parameters as bfloat16."""
+    int8 = 4
+    """Send floating point parameters as int8, with one float32 scale per
+    array."""
+
+
+class Compression(Enum):
+    none = 1
+    """Send parameter buffers uncompressed."""
+    zlib = 2
+    """Compress parameter buffers with zlib."""
+    lz4 = 3
+    """Compress parameter buffers with lz4, which requires the lz4 package."""
+    zstd = 4
+    """Compress parameter buffers with zstd, which requires the zstandard
+    package."""
@@ -95,6 +95,7 @@ def make_environment(
     concat_agent_id: bool = False,
     random_seed: Optional[int] = None,
     stack_frames: int = 1,
+    use_observation_arena: bool = False,
     **kwargs: Any,
 ) -> Tuple[dm_env.Environment, Dict[str, str]]:
     """Wraps an Pettingzoo environment.
@@ -103,12 +104,16 @@ def make_environment(
         env_class: str, class of the environment, e.g. MPE or Atari.
         env_name: str, name of environment, .e.g simple_spread or Pong.
         evaluation: bool, to change the behaviour during evaluation.
+        use_observation_arena: bool, write observations in place into a
+            preallocated observation arena. Ignored when stacking frames, since
+            the stacked frames keep the observations of earlier steps.
 
     Returns:
         A Pettingzoo environment wrapped as a DeepMind environment.
     """
 
     environment: Any
+    use_observation_arena = use_observation_arena and stack_frames == 1
 
     if _has_petting_zoo:
         del evaluation
@@ -119,7 +124,10 @@ def make_environment(
                 env = StarCraft2PZEnv.parallel_env(map_name=env_name)
                 # wrap parallel environment
                 environment = PettingZooParallelEnvWrapper(
-                    env, env_preprocess_wrappers=[], return_state_info=True
+                    env,
+                    env_preprocess_wrappers=[],
+                    return_state_info=True,
+                    use_observation_arena=use_observation_arena,
                 )
             else:
                 raise Exception("Smac is not installed.")
@@ -130,7 +138,9 @@ def make_environment(
                 env = atari_preprocessing(env)
             # wrap parallel environment
             environment = PettingZooParallelEnvWrapper(
-                env, env_preprocess_wrappers=env_preprocess_wrappers
+                env,
+                env_preprocess_wrappers=env_preprocess_wrappers,
+                use_observation_arena=use_observation_arena,
             )
 
         if random_seed and hasattr(environment, "seed"):
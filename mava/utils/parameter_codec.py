@@ -0,0 +1,249 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Codec for sending parameters between the parameter server and clients."""
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import jax.numpy as jnp
+import numpy as np
+import tree
+
+from mava.utils.enums import Compression, ParameterPrecision
+
+try:
+    import lz4.frame
+except ModuleNotFoundError:
+    pass
+
+try:
+    import zstandard
+except ModuleNotFoundError:
+    pass
+
+_PRECISION_DTYPES = {
+    ParameterPrecision.float16: np.dtype(np.float16),
+    ParameterPrecision.bfloat16: np.dtype(jnp.bfloat16),
+    ParameterPrecision.int8: np.dtype(np.int8),
+}
+
+# Packages required by the optional compression schemes.
+_COMPRESSION_PACKAGES = {
+    Compression.lz4: "lz4",
+    Compression.zstd: "zstandard",
+}
+
+
+@dataclass(frozen=True)
+class ParameterEncoding:
+    """How a parameter is encoded for transport."""
+
+    precision: ParameterPrecision = ParameterPrecision.full
+    compression: Compression = Compression.none
+
+
+class EncodedParameter(NamedTuple):
+    """A parameter whose floating point arrays share one contiguous buffer."""
+
+    structure: Any
+    shapes: List[Tuple[int, ...]]
+    dtypes: List[np.dtype]
+    buffer: bytes
+    encoding: ParameterEncoding
+    scales: Optional[np.ndarray]
+    # Leaves that are not floating point arrays, by leaf index.
+    other_leaves: Dict[int, Any]
+
+
+def _is_float_array(leaf: Any) -> bool:
+    """Whether a leaf is a floating point array."""
+    return isinstance(leaf, (np.ndarray, jnp.ndarray)) and jnp.issubdtype(
+        leaf.dtype, jnp.floating
+    )
+
+
+def _compress(data: bytes, compression: Compression) -> bytes:
+    """Compress a buffer."""
+    if compression == Compression.zlib:
+        return zlib.compress(data, 1)
+    if compression == Compression.lz4:
+        return lz4.frame.compress(data)
+    if compression == Compression.zstd:
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def _decompress(data: bytes, compression: Compression) -> bytes:
+    """Decompress a buffer."""
+    if compression == Compression.zlib:
+        return zlib.decompress(data)
+    if compression == Compression.lz4:
+        return lz4.frame.decompress(data)
+    if compression == Compression.zstd:
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+@dataclass(frozen=True)
+class ParameterCodec:
+    """Encodes parameters into compact buffers and decodes them again.
+
+    The floating point arrays of each encoded parameter are flattened into one
+    contiguous buffer, which is optionally quantised and compressed. Other
+    leaves, e.g. step counts, are sent as they are. Reduced precision is lossy,
+    so it should only be used for parameters that are read, e.g. by executors,
+    and never for parameters that are written back.
+
+    Encodings are looked up by parameter name, then by the part of the name
+    before the first "-" (e.g. "policy_network" or "policy_opt_state"), and
+    default to `default`.
+    """
+
+    default: ParameterEncoding = ParameterEncoding()
+    encodings: Dict[str, ParameterEncoding] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Check that the modules of the compression schemes are installed."""
+        for encoding in [self.default, *self.encodings.values()]:
+            package = _COMPRESSION_PACKAGES.get(encoding.compression)
+            if package is not None:
+                try:
+                    __import__(package)
+                except ModuleNotFoundError:
+                    raise ModuleNotFoundError(
+                        f"{encoding.compression} compression requires the "
+                        f"{package} package. Install it with pip install {package}."
+                    )
+
+    def encoding(self, name: str) -> ParameterEncoding:
+        """Get the encoding of a parameter.
+
+        Args:
+            name: name of the parameter.
+
+        Returns:
+            the encoding used for the parameter.
+        """
+        if name in self.encodings:
+            return self.encodings[name]
+        return self.encodings.get(name.split("-")[0], self.default)
+
+    def encode_parameter(self, value: Any, encoding: ParameterEncoding) -> Any:
+        """Encode a parameter.
+
+        Args:
+            value: nested structure of arrays.
+            encoding: how to encode the floating point arrays.
+
+        Returns:
+            the encoded parameter, or the value itself if it has no floating
+            point arrays.
+        """
+        leaves = tree.flatten(value)
+        float_indices = [i for i, leaf in enumerate(leaves) if _is_float_array(leaf)]
+        if not float_indices:
+            return value
+
+        arrays = [np.asarray(leaves[i]) for i in float_indices]
+        dtypes = [array.dtype for array in arrays]
+        scales = None
+        if encoding.precision == ParameterPrecision.int8:
+            scales = np.array(
+                [np.max(np.abs(array), initial=0.0) / 127.0 for array in arrays],
+                dtype=np.float32,
+            )
+            scales[scales == 0.0] = 1.0
+            arrays = [
+                np.clip(np.rint(array / scale), -127, 127)
+                for array, scale in zip(arrays, scales)
+            ]
+        dtype = _PRECISION_DTYPES.get(encoding.precision)
+        if dtype is not None:
+            arrays = [array.astype(dtype) for array in arrays]
+
+        buffer = b"".join(np.ascontiguousarray(array).tobytes() for array in arrays)
+        return EncodedParameter(
+            structure=tree.map_structure(lambda _: None, value),
+            shapes=[array.shape for array in arrays],
+            dtypes=dtypes,
+            buffer=_compress(buffer, encoding.compression),
+            encoding=encoding,
+            scales=scales,
+            other_leaves={
+                i: leaf for i, leaf in enumerate(leaves) if not _is_float_array(leaf)
+            },
+        )
+
+    def encode(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode parameters with their configured encodings.
+
+        Args:
+            parameters: dictionary {parameter name: value}.
+
+        Returns:
+            dictionary {parameter name: encoded value}.
+        """
+        return {
+            name: self.encode_parameter(value, self.encoding(name))
+            for name, value in parameters.items()
+        }
+
+    @staticmethod
+    def decode_parameter(value: Any) -> Any:
+        """Decode a parameter.
+
+        Args:
+            value: an encoded parameter, or any other value.
+
+        Returns:
+            the parameter with numpy arrays of the original dtypes, or the value
+            itself if it was not encoded.
+        """
+        if not isinstance(value, EncodedParameter):
+            return value
+
+        buffer = _decompress(value.buffer, value.encoding.compression)
+        float_leaves = []
+        offset = 0
+        for i, (shape, dtype) in enumerate(zip(value.shapes, value.dtypes)):
+            sent_dtype = _PRECISION_DTYPES.get(value.encoding.precision, dtype)
+            size = int(np.prod(shape))
+            array = np.frombuffer(buffer, dtype=sent_dtype, count=size, offset=offset)
+            offset += size * sent_dtype.itemsize
+            if value.scales is not None:
+                array = array * value.scales[i]
+            float_leaves.append(array.astype(dtype).reshape(shape))
+
+        num_leaves = len(float_leaves) + len(value.other_leaves)
+        float_iter = iter(float_leaves)
+        leaves = [
+            value.other_leaves[i] if i in value.other_leaves else next(float_iter)
+            for i in range(num_leaves)
+        ]
+        return tree.unflatten_as(value.structure, leaves)
+
+    def decode(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode parameters.
+
+        Args:
+            parameters: dictionary {parameter name: encoded value}.
+
+        Returns:
+            dictionary {parameter name: value}.
+        """
+        return {
+            name: self.decode_parameter(value) for name, value in parameters.items()
+        }
@@ -0,0 +1,151 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities for updating the priorities of replay items."""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class AsyncPriorityUpdater:
+    """Writes the priorities of sampled items to a data server table.
+
+    Updates are written by a background thread, so the trainer never waits
+    for the data server, nor for the device to finish computing the
+    priorities. All the updates that are pending when the thread becomes free
+    are merged into a single `mutate_priorities` call. Once
+    `max_pending_updates` updates are pending, they are merged into a single
+    key to priority mapping, where newer priorities of an item supersede
+    older ones, so the queue stays bounded without losing any items.
+    """
+
+    def __init__(self, client: Any, table: str, max_pending_updates: int = 8):
+        """Initialise the updater.
+
+        Args:
+            client: reverb client, or in-process replay buffer, of the table.
+            table: name of the table.
+            max_pending_updates: number of updates waiting to be written
+                before they are merged. Defaults to 8.
+        """
+        if max_pending_updates < 1:
+            raise ValueError(
+                f"max_pending_updates must be positive, got {max_pending_updates}."
+            )
+        self._client = client
+        self._table = table
+        self._max_pending_updates = max_pending_updates
+        self._pending: List[Tuple[Any, Any]] = []
+        self._merged: Dict[int, float] = {}
+        self._condition = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self._exception: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        self.num_merges = 0
+        self.num_writes = 0
+
+    def update(self, keys: Any, priorities: Any) -> None:
+        """Queue new priorities for items.
+
+        Args:
+            keys: keys of the items, e.g. the `info.key` of a sample.
+            priorities: new priorities of the items, possibly still being
+                computed on device.
+        """
+        with self._condition:
+            self._raise_exception()
+            if self._closed:
+                raise RuntimeError("The priority updater is closed.")
+            if len(self._pending) == self._max_pending_updates:
+                _merge_updates(self._merged, self._pending)
+                self._pending = []
+                self.num_merges += 1
+            self._pending.append((keys, priorities))
+            self._condition.notify_all()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write, name="priority_updater", daemon=True
+            )
+            self._thread.start()
+
+    def _has_updates(self) -> bool:
+        """Whether there are updates waiting to be written."""
+        return bool(self._pending or self._merged)
+
+    def _raise_exception(self) -> None:
+        """Raise the exception of a failed write in the calling thread."""
+        if self._exception is not None:
+            raise self._exception
+
+    def _write(self) -> None:
+        """Write the pending updates until the updater is closed."""
+        while True:
+            with self._condition:
+                while not self._has_updates() and not self._closed:
+                    self._condition.wait()
+                if not self._has_updates():
+                    return
+                updates, pending = self._merged, self._pending
+                self._merged, self._pending = {}, []
+                self._writing = True
+
+            try:
+                _merge_updates(updates, pending)
+                self._client.mutate_priorities(self._table, updates=updates)
+            except BaseException as e:
+                with self._condition:
+                    self._exception = e
+                    self._writing = False
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._writing = False
+                self.num_writes += 1
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Wait until the queued updates are written."""
+        with self._condition:
+            while (self._has_updates() or self._writing) and self._exception is None:
+                self._condition.wait()
+            self._raise_exception()
+
+    def close(self) -> None:
+        """Write the queued updates and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self._raise_exception()
+
+
+def _merge_updates(updates: Dict[int, float], pending: List[Tuple[Any, Any]]) -> None:
+    """Merge updates into a key to priority mapping, newest last.
+
+    Args:
+        updates: mapping from item keys to priorities, updated in place.
+        pending: updates as (keys, priorities) pairs, oldest first.
+    """
+    for keys, priorities in pending:
+        updates.update(
+            zip(
+                np.ravel(np.asarray(keys)).tolist(),
+                np.ravel(np.asarray(priorities, np.float64)).tolist(),
+            )
+        )
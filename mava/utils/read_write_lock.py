@@ -0,0 +1,74 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reader-writer lock."""
+import contextlib
+import threading
+from typing import Iterator
+
+
+class ReadWriteLock:
+    """A lock held either by any number of readers or by a single writer.
+
+    Writers are preferred: once a writer is waiting, new readers wait until it
+    released the lock, so a steady stream of reads does not starve writes. The
+    lock is not reentrant.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the lock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._num_readers = 0
+        self._num_waiting_writers = 0
+        self._writing = False
+
+    @contextlib.contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock for reading.
+
+        Yields:
+            None, once no writer holds or waits for the lock.
+        """
+        with self._condition:
+            while self._writing or self._num_waiting_writers:
+                self._condition.wait()
+            self._num_readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._num_readers -= 1
+                if not self._num_readers:
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock for writing.
+
+        Yields:
+            None, once no reader or other writer holds the lock.
+        """
+        with self._condition:
+            self._num_waiting_writers += 1
+            while self._writing or self._num_readers:
+                self._condition.wait()
+            self._num_waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
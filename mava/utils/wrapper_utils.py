@@ -1,8 +1,9 @@
 import collections
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import dm_env
 import numpy as np
+import tree
 from dm_env import specs
 
 try:
@@ -16,12 +17,202 @@ except ModuleNotFoundError:
 from mava import types
 
 
+class ObservationArena:
+    """Preallocated observations laid out from an environment observation spec.
+
+    Every field of the agents' observations (e.g. the observation, legal actions
+    and terminal of an OLT) gets one contiguous block that holds the values of
+    all the agents, and `observations` are views into these blocks. Wrappers
+    write observations in place instead of allocating new arrays every step, so
+    the observations returned by a step are overwritten by the next one. The
+    arena can be backed by an external buffer, e.g. shared memory, to pass
+    observations between processes.
+    """
+
+    # Alignment of every agent field in bytes.
+    _alignment = 8
+
+    def __init__(self, observation_spec: Dict[str, Any], buffer: Any = None):
+        """Lay out the arena.
+
+        Args:
+            observation_spec: observation spec per agent.
+            buffer: writable buffer of at least `ObservationArena.nbytes` bytes
+                to hold the arena. Defaults to None, in which case a new buffer
+                is allocated.
+        """
+        self._observation_spec = observation_spec
+        layout, nbytes = self._layout(observation_spec)
+
+        if buffer is None:
+            buffer = np.zeros(max(nbytes, 1), dtype=np.uint8)
+        elif memoryview(buffer).nbytes < nbytes:
+            raise ValueError(
+                f"Observation arena needs {nbytes} bytes, the buffer only has "
+                f"{memoryview(buffer).nbytes}."
+            )
+        self._buffer = buffer
+
+        self._leaves: Dict[str, List[np.ndarray]] = {
+            agent: [] for agent in observation_spec
+        }
+        for agent, spec, offset in layout:
+            self._leaves[agent].append(
+                np.ndarray(spec.shape, dtype=spec.dtype, buffer=buffer, offset=offset)
+            )
+        self._observations = {
+            agent: tree.unflatten_as(observation_spec[agent], leaves)
+            for agent, leaves in self._leaves.items()
+        }
+
+    @classmethod
+    def _layout(
+        cls, observation_spec: Dict[str, Any]
+    ) -> Tuple[List[Tuple[str, Any, int]], int]:
+        """Offsets of every agent field, grouped by field.
+
+        Args:
+            observation_spec: observation spec per agent.
+
+        Returns:
+            (agent, spec, offset) per agent field, in agent leaf order, and the
+            total size in bytes.
+        """
+        agent_leaf_specs = {
+            agent: tree.flatten(spec) for agent, spec in observation_spec.items()
+        }
+        num_fields = max(
+            (len(leaves) for leaves in agent_leaf_specs.values()), default=0
+        )
+
+        offsets: Dict[Tuple[str, int], int] = {}
+        nbytes = 0
+        for field in range(num_fields):
+            for agent, leaf_specs in agent_leaf_specs.items():
+                if field < len(leaf_specs):
+                    spec = leaf_specs[field]
+                    offsets[(agent, field)] = nbytes
+                    size = int(np.prod(spec.shape)) * np.dtype(spec.dtype).itemsize
+                    nbytes += -(-size // cls._alignment) * cls._alignment
+
+        layout = [
+            (agent, spec, offsets[(agent, field)])
+            for agent, leaf_specs in agent_leaf_specs.items()
+            for field, spec in enumerate(leaf_specs)
+        ]
+        return layout, nbytes
+
+    @classmethod
+    def nbytes(cls, observation_spec: Dict[str, Any]) -> int:
+        """Size of the arena for an observation spec.
+
+        Args:
+            observation_spec: observation spec per agent.
+
+        Returns:
+            the number of bytes an external buffer needs.
+        """
+        return cls._layout(observation_spec)[1]
+
+    @property
+    def observation_spec(self) -> Dict[str, Any]:
+        """Observation spec the arena is laid out from."""
+        return self._observation_spec
+
+    @property
+    def observations(self) -> Dict[str, Any]:
+        """Observations per agent, as views into the arena."""
+        return self._observations
+
+    def write(self, observations: Dict[str, Any]) -> bool:
+        """Copy observations into the arena.
+
+        Args:
+            observations: observations per agent matching the observation spec.
+
+        Returns:
+            whether the observations were written. Observations that do not match
+            the observation spec are not written.
+        """
+        if observations is self._observations:
+            return True
+        try:
+            tree.assert_same_structure(self._observation_spec, observations)
+        except (TypeError, ValueError):
+            return False
+        agent_leaves = {
+            agent: tree.flatten(observations[agent]) for agent in self._leaves
+        }
+        for agent, leaves in agent_leaves.items():
+            for leaf, view in zip(leaves, self._leaves[agent]):
+                if np.shape(leaf) != view.shape:
+                    return False
+        for agent, leaves in agent_leaves.items():
+            for leaf, view in zip(leaves, self._leaves[agent]):
+                np.copyto(view, leaf, casting="unsafe")
+        return True
+
+    def copy(self) -> Dict[str, Any]:
+        """Copy the observations out of the arena.
+
+        Returns:
+            observations per agent that are not overwritten by later writes.
+        """
+        return tree.map_structure(np.copy, self._observations)
+
+    def release(self) -> None:
+        """Drop the views into the buffer, e.g. before closing shared memory."""
+        self._leaves = {}
+        self._observations = {}
+        self._buffer = None
+
+
+def _write_dm_compatible_observations(
+    observes: Dict,
+    dones: Dict[str, bool],
+    env_done: bool,
+    possible_agents: List,
+    arena: ObservationArena,
+) -> Dict[str, types.OLT]:
+    """Write Parallel observations in place into an observation arena."""
+    observations = arena.observations
+    for agent in possible_agents:
+        agent_observation = observations[agent]
+
+        # If we have a valid observation for this agent.
+        if agent in observes:
+            observation = observes[agent]
+            if isinstance(observation, dict) and "action_mask" in observation:
+                np.copyto(
+                    agent_observation.legal_actions,
+                    observation["action_mask"],
+                    casting="unsafe",
+                )
+                observation = observation["observation"]
+            else:
+                agent_observation.legal_actions.fill(1)
+            tree.map_structure(
+                lambda view, value: np.copyto(view, value, casting="unsafe"),
+                agent_observation.observation,
+                observation,
+            )
+
+        # If we have no observation, we need to use the default.
+        else:
+            tree.map_structure(lambda view: view.fill(0), agent_observation.observation)
+            agent_observation.legal_actions.fill(1)
+
+        agent_observation.terminal[:] = dones[agent] if agent in dones else env_done
+    return observations
+
+
 def convert_dm_compatible_observations(
     observes: Dict,
     dones: Dict[str, bool],
     observation_spec: Dict[str, types.OLT],
     env_done: bool,
     possible_agents: List,
+    arena: Optional[ObservationArena] = None,
 ) -> Dict[str, types.OLT]:
     """Convert Parallel observation so it's dm_env compatible.
 
@@ -31,10 +222,18 @@ def convert_dm_compatible_observations(
         observation_spec : env observation spec.
         env_done : is env done.
         possible_agents : possible agents in env.
+        arena : optional observation arena to write the observations into,
+            instead of allocating new arrays. The returned observations are
+            views into the arena.
 
     Returns:
         a dm compatible observation.
     """
+    if arena is not None:
+        return _write_dm_compatible_observations(
+            observes, dones, env_done, possible_agents, arena
+        )
+
     observations: Dict[str, types.OLT] = {}
     for agent in possible_agents:
 
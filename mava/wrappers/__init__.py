@@ -36,6 +36,7 @@ except ModuleNotFoundError:
     pass
 
 from mava.wrappers.saveable import SaveableWrapper
+from mava.wrappers.subprocess_env import SubprocessEnvWrapper
 from mava.wrappers.system_trainer_statistics import (
     DetailedTrainerStatistics,
     ScaledDetailedTrainerStatistics,
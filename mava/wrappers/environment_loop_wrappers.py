@@ -131,7 +131,9 @@ class DetailedEpisodeStatistics(EnvironmentLoopStatisticsBase):
             self._executor.store.executor_parameter_client.add_async(
                 {f"{loop_type}_episodes": 1, f"{loop_type}_steps": episode_steps}
             )
-            counts = self._executor.store.executor_counts
+            counts = self._executor.store.executor_parameter_client.local_counts(
+                self._executor.store.executor_counts
+            )
         else:
             counts = self._counter.increment(episodes=1, steps=episode_steps)
 
@@ -249,7 +251,9 @@ class DetailedPerAgentStatistics(DetailedEpisodeStatistics):
             self._executor.store.executor_parameter_client.add_async(
                 {f"{loop_type}_episodes": 1, f"{loop_type}_steps": episode_steps}
             )
-            counts = self._executor.store.executor_counts
+            counts = self._executor.store.executor_parameter_client.local_counts(
+                self._executor.store.executor_counts
+            )
         else:
             counts = self._counter.increment(episodes=1, steps=episode_steps)
         self._episode_length_stats.push(episode_steps)
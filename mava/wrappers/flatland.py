@@ -16,7 +16,7 @@
 """Wraps a Flatland MARL environment to be used as a dm_env environment."""
 import types as tp
 from functools import partial
-from typing import Any, Callable, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import dm_env
 import numpy as np
@@ -39,6 +39,7 @@ from gym.spaces.box import Box
 from mava.types import OLT, Observation
 from mava.utils.sort_utils import sort_str_num
 from mava.utils.wrapper_utils import (
+    ObservationArena,
     convert_dm_compatible_observations,
     convert_np_type,
     parameterized_restart,
@@ -79,6 +80,7 @@ class FlatlandEnvWrapper(ParallelEnvWrapper):
             [Any], Union[np.ndarray, Tuple[np.ndarray], Dict[str, np.ndarray]]
         ] = None,
         agent_info: bool = False,
+        use_observation_arena: bool = False,
     ):
         """Wrap Flatland environment.
 
@@ -86,8 +88,13 @@ class FlatlandEnvWrapper(ParallelEnvWrapper):
             environment: underlying RailEnv
             preprocessor: optional preprocessor. Defaults to None.
             agent_info: include agent info. Defaults to True.
+            use_observation_arena: write observations in place into a
+                preallocated ObservationArena instead of allocating new arrays
+                every step. Observations are then overwritten by the next step.
         """
         self._environment = environment
+        self._use_observation_arena = use_observation_arena
+        self._observation_arena: Optional[ObservationArena] = None
         decorate_step_method(self._environment)
 
         self._agents = [get_agent_id(i) for i in range(self.num_agents)]
@@ -277,12 +284,17 @@ class FlatlandEnvWrapper(ParallelEnvWrapper):
         dones: Dict[str, bool],
     ) -> Observation:
         """Convert observation"""
+        if self._use_observation_arena and self._observation_arena is None:
+            self._observation_arena = ObservationArena(self.observation_spec())
         return convert_dm_compatible_observations(
             observes,
             dones,
-            self.observation_spec(),
+            self._observation_arena.observation_spec
+            if self._observation_arena
+            else self.observation_spec(),
             self.env_done(),
             self.possible_agents,
+            arena=self._observation_arena,
         )
 
     # collate agent info and observation into a tuple,
@@ -32,6 +32,7 @@ except ModuleNotFoundError:
 
 from mava import types
 from mava.utils.wrapper_utils import (
+    ObservationArena,
     apply_env_wrapper_preprocessors,
     convert_dm_compatible_observations,
     convert_np_type,
@@ -48,6 +49,7 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
         environment: "ParallelEnv",
         return_state_info: bool = False,
         env_preprocess_wrappers: Optional[List] = None,
+        use_observation_arena: bool = False,
     ):
         """Constructor for parallel PZ wrapper.
 
@@ -58,10 +60,15 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
             env_preprocess_wrappers (Optional[List], optional): Wrappers
                 that preprocess envs.
                 Format (env_preprocessor, dict_with_preprocessor_params).
+            use_observation_arena: write observations in place into a
+                preallocated ObservationArena instead of allocating new arrays
+                every step. Observations are then overwritten by the next step.
         """
         self._environment = environment
         self._reset_next_step = True
         self._return_state_info = return_state_info
+        self._use_observation_arena = use_observation_arena
+        self._observation_arena: Optional[ObservationArena] = None
 
         if env_preprocess_wrappers:
             self._environment = apply_env_wrapper_preprocessors(
@@ -226,12 +233,17 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
         Returns:
             types.Observation: dm compatible observations.
         """
+        if self._use_observation_arena and self._observation_arena is None:
+            self._observation_arena = ObservationArena(self.observation_spec())
         return convert_dm_compatible_observations(
             observes,
             dones,
-            self.observation_spec(),
+            self._observation_arena.observation_spec
+            if self._observation_arena
+            else self.observation_spec(),
             self.env_done(),
             self.possible_agents,
+            arena=self._observation_arena,
         )
 
     def observation_spec(self) -> Dict[str, types.OLT]:
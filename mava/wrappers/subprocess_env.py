@@ -0,0 +1,383 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wrapper that runs an environment in its own subprocess."""
+import multiprocessing
+import traceback
+from multiprocessing import connection as mp_connection
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import dm_env
+import numpy as np
+
+from mava.utils.wrapper_utils import ObservationArena
+from mava.wrappers.env_wrappers import ParallelEnvWrapper
+
+# Worker reply for attributes of the environment that are methods.
+_REMOTE_CALLABLE = "__remote_callable__"
+
+
+class _SharedObservationArena:
+    """An observation arena backed by a shared memory block.
+
+    The environment process writes observations into the arena and the main
+    process reads them, so observations are not pickled through the pipe.
+    """
+
+    def __init__(self, observation_spec: Dict[str, Any], name: Optional[str] = None):
+        """Create a new shared memory block or attach to an existing one.
+
+        Args:
+            observation_spec: observation spec of the environment.
+            name: name of the shared memory block to attach to. Defaults to None,
+                in which case a new block is created.
+        """
+        self._owner = name is None
+        self._memory = shared_memory.SharedMemory(
+            name=name,
+            create=self._owner,
+            size=max(ObservationArena.nbytes(observation_spec), 1),
+        )
+        if not self._owner:
+            # Only the creating process may free the block, otherwise the
+            # resource tracker of this process unlinks it when it exits.
+            resource_tracker.unregister(
+                self._memory._name, "shared_memory"  # type: ignore
+            )
+        self.arena = ObservationArena(observation_spec, buffer=self._memory.buf)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._memory.name
+
+    def close(self) -> None:
+        """Release the arena. The process that created it also frees it."""
+        # Views must be released before the memory can be closed.
+        self.arena.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+def _pack_timestep(
+    result: Union[dm_env.TimeStep, Tuple[dm_env.TimeStep, Dict]],
+    observation_arena: Optional[ObservationArena],
+) -> Tuple[dm_env.TimeStep, Optional[Dict], bool, bool]:
+    """Move the observation of a reset or step result into the shared arena."""
+    returns_extras = isinstance(result, tuple) and not isinstance(
+        result, dm_env.TimeStep
+    )
+    timestep, extras = result if returns_extras else (result, None)
+
+    in_arena = observation_arena is not None and observation_arena.write(
+        timestep.observation
+    )
+    if in_arena:
+        timestep = timestep._replace(observation=None)
+    return timestep, extras, returns_extras, in_arena
+
+
+def _worker(
+    worker_connection: mp_connection.Connection,
+    environment_factory: Callable[[], dm_env.Environment],
+) -> None:
+    """Create an environment and serve requests from the main process.
+
+    Args:
+        worker_connection: worker end of the pipe.
+        environment_factory: function that creates the environment.
+    """
+    environment = None
+    shared_arena = None
+    try:
+        try:
+            environment = environment_factory()
+            worker_connection.send(
+                (
+                    "ok",
+                    {
+                        "observation_spec": environment.observation_spec(),
+                        "action_spec": environment.action_spec(),
+                        "reward_spec": environment.reward_spec(),
+                        "discount_spec": environment.discount_spec(),
+                    },
+                )
+            )
+        except Exception:
+            worker_connection.send(("error", (False, traceback.format_exc())))
+            return
+
+        while True:
+            command, data = worker_connection.recv()
+            if command == "close":
+                break
+            try:
+                if command == "attach":
+                    shared_arena = _SharedObservationArena(
+                        environment.observation_spec(), name=data
+                    )
+                    result = None
+                elif command == "reset":
+                    result = _pack_timestep(environment.reset(), shared_arena.arena)
+                elif command == "step":
+                    result = _pack_timestep(environment.step(data), shared_arena.arena)
+                elif command == "getattr":
+                    result = getattr(environment, data)
+                    if callable(result):
+                        result = _REMOTE_CALLABLE
+                elif command == "call":
+                    name, args, kwargs = data
+                    result = getattr(environment, name)(*args, **kwargs)
+                else:
+                    raise ValueError(f"Unknown command {command}.")
+                worker_connection.send(("ok", result))
+            except Exception as e:
+                worker_connection.send(
+                    ("error", (isinstance(e, AttributeError), traceback.format_exc()))
+                )
+    except (EOFError, KeyboardInterrupt):
+        # The main process went away.
+        pass
+    finally:
+        if shared_arena is not None:
+            shared_arena.close()
+        if environment is not None and hasattr(environment, "close"):
+            environment.close()
+        worker_connection.close()
+
+
+class SubprocessEnvWrapper(ParallelEnvWrapper):
+    """Runs an environment in its own subprocess.
+
+    The main process talks to the environment over a pipe with a step/reset
+    protocol, while observations are passed through an `ObservationArena` in
+    shared memory. Steps can be dispatched with `step_async`
+    and collected with `step_wait`, so several slow simulators (e.g. SMAC or
+    Flatland) can step at the same time. Other attributes of the environment
+    are forwarded to the subprocess.
+    """
+
+    def __init__(
+        self,
+        environment_factory: Callable[[], dm_env.Environment],
+        start_method: Optional[str] = None,
+    ):
+        """Start the environment subprocess.
+
+        Args:
+            environment_factory: function that creates the environment in the
+                subprocess. It must be picklable when the start method is not
+                fork.
+            start_method: multiprocessing start method. Defaults to None, in
+                which case the platform default is used.
+        """
+        context = multiprocessing.get_context(start_method)
+        self._connection, worker_connection = context.Pipe()
+        self._process = context.Process(
+            target=_worker,
+            args=(worker_connection, environment_factory),
+            daemon=True,
+        )
+        self._process.start()
+        worker_connection.close()
+
+        self._step_in_flight = False
+        self._closed = False
+        self._specs = self._receive()
+        self._shared_arena = _SharedObservationArena(self._specs["observation_spec"])
+        self._request("attach", self._shared_arena.name)
+
+    @property
+    def connection(self) -> mp_connection.Connection:
+        """Main process end of the pipe, readable when a step result is ready."""
+        return self._connection
+
+    def _receive(self) -> Any:
+        """Receive the reply of the subprocess, raising its errors."""
+        status, result = self._connection.recv()
+        if status == "error":
+            is_attribute_error, message = result
+            if is_attribute_error:
+                raise AttributeError(message)
+            raise RuntimeError(f"Environment subprocess failed:\n{message}")
+        return result
+
+    def _request(self, command: str, data: Any = None) -> Any:
+        """Send a command to the subprocess and wait for its reply."""
+        if self._step_in_flight:
+            raise RuntimeError(
+                "Environment is still stepping, call step_wait before sending "
+                "other requests."
+            )
+        self._connection.send((command, data))
+        return self._receive()
+
+    def _unpack_timestep(
+        self, result: Tuple[dm_env.TimeStep, Optional[Dict], bool, bool]
+    ) -> Union[dm_env.TimeStep, Tuple[dm_env.TimeStep, Dict]]:
+        """Rebuild a reset or step result sent by the subprocess.
+
+        Like the observations of the in-process arena wrappers, the observations
+        are views into the arena and are not copied. They stay valid until the
+        next `step_async` or `reset`, callers that keep them longer (e.g. by
+        stacking them into a batch) copy them once.
+        """
+        timestep, extras, returns_extras, in_arena = result
+        if in_arena:
+            timestep = timestep._replace(
+                observation=self._shared_arena.arena.observations
+            )
+        return (timestep, extras) if returns_extras else timestep
+
+    def reset(self) -> Union[dm_env.TimeStep, Tuple[dm_env.TimeStep, Dict]]:
+        """Reset the environment.
+
+        Returns:
+            the first timestep, with extras if the environment returns them.
+        """
+        return self._unpack_timestep(self._request("reset"))
+
+    def step_async(self, actions: Dict[str, np.ndarray]) -> None:
+        """Start stepping the environment without waiting for the result.
+
+        Args:
+            actions: actions per agent.
+        """
+        if self._step_in_flight:
+            raise RuntimeError("Environment is already stepping.")
+        self._connection.send(("step", actions))
+        self._step_in_flight = True
+
+    def step_wait(self) -> Union[dm_env.TimeStep, Tuple[dm_env.TimeStep, Dict]]:
+        """Wait for the step started by `step_async`.
+
+        Returns:
+            the next timestep, with extras if the environment returns them.
+        """
+        if not self._step_in_flight:
+            raise RuntimeError("No step in flight, call step_async first.")
+        self._step_in_flight = False
+        return self._unpack_timestep(self._receive())
+
+    def step(
+        self, actions: Dict[str, np.ndarray]
+    ) -> Union[dm_env.TimeStep, Tuple[dm_env.TimeStep, Dict]]:
+        """Step the environment and wait for the result.
+
+        Args:
+            actions: actions per agent.
+
+        Returns:
+            the next timestep, with extras if the environment returns them.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def observation_spec(self) -> Dict[str, Any]:
+        """Observation spec of the environment."""
+        return self._specs["observation_spec"]
+
+    def action_spec(self) -> Dict[str, Any]:
+        """Action spec of the environment."""
+        return self._specs["action_spec"]
+
+    def reward_spec(self) -> Dict[str, Any]:
+        """Reward spec of the environment."""
+        return self._specs["reward_spec"]
+
+    def discount_spec(self) -> Dict[str, Any]:
+        """Discount spec of the environment."""
+        return self._specs["discount_spec"]
+
+    def env_done(self) -> bool:
+        """Returns a bool indicating if env is done"""
+        return self._request("call", ("env_done", (), {}))
+
+    @property
+    def agents(self) -> List:
+        """Returns the active agents in the env."""
+        return self._request("getattr", "agents")
+
+    @property
+    def possible_agents(self) -> List:
+        """Returns all the possible agents in the env."""
+        return self._request("getattr", "possible_agents")
+
+    @property
+    def death_masked_agents(self) -> List:
+        """Returns all death masked agents"""
+        return self._request("getattr", "death_masked_agents")
+
+    @property
+    def obs_normalisation_start_index(self) -> int:
+        """Returns an interger to indicate which features should not be normalised"""
+        return self._request("getattr", "obs_normalisation_start_index")
+
+    def close(self) -> None:
+        """Stop the subprocess and free the shared observation arena."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._step_in_flight:
+                self.step_wait()
+            self._connection.send(("close", None))
+        except (BrokenPipeError, EOFError, RuntimeError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._connection.close()
+        self._shared_arena.close()
+
+    def __getattr__(self, name: str) -> Any:
+        """Expose attributes of the environment in the subprocess.
+
+        Args:
+            name: attribute name.
+
+        Returns:
+            the attribute value, or a function that calls the method remotely.
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = self._request("getattr", name)
+        if isinstance(value, str) and value == _REMOTE_CALLABLE:
+
+            def remote_call(*args: Any, **kwargs: Any) -> Any:
+                return self._request("call", (name, args, kwargs))
+
+            return remote_call
+        return value
+
+
+def wait_for_environments(
+    environments: Sequence[SubprocessEnvWrapper],
+    timeout: Optional[float] = None,
+) -> List[int]:
+    """Wait until at least one of the given environments finished its step.
+
+    Args:
+        environments: environments with a step in flight.
+        timeout: maximum time to wait in seconds. Defaults to None, i.e. no limit.
+
+    Returns:
+        indices of the environments whose step result is ready.
+    """
+    connections = [environment.connection for environment in environments]
+    ready = mp_connection.wait(connections, timeout=timeout)
+    return [index for index, conn in enumerate(connections) if conn in ready]
@@ -73,6 +73,8 @@ record_episode_requirements = ["array2gif", "pyglet"]
 
 flatland_requirements = ["flatland-rl==3.0.1"]
 
+compression_requirements = ["lz4", "zstandard"]
+
 long_description = """Mava is a library for building multi-agent reinforcement
 learning (MARL) systems. Mava builds off of Acme and in a similar way strives
 to expose simple, efficient, and readable components, as well as examples that
@@ -123,6 +125,7 @@ setup(
         "sc2": smac_requirements,
         "envs": pettingzoo_requirements + smac_requirements,
         "jax": jax_requirements,
+        "compression": compression_requirements,
     },
     classifiers=[
         "Development Status :: 3 - Alpha",
@@ -15,13 +15,20 @@
 
 """Sequence adder unit test"""
 
-from typing import Dict, Tuple, Union
+from types import SimpleNamespace
+from typing import Any, Dict, Tuple, Union
 
 import dm_env
+import numpy as np
 from absl.testing import parameterized
+from acme import specs
 from acme.adders.reverb.sequence import EndBehavior
 
 from mava.adders import reverb as reverb_adders
+from mava.adders.reverb.base import unstack_agents
+from mava.adders.reverb.utils import stack_agent_specs
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
+from mava.utils.enums import ReplaySampler
 from tests.adders.adders_utils import MultiAgentAdderTestMixin
 from tests.adders.sequence_adders_test_data import TEST_CASES
 
@@ -79,3 +86,221 @@ class SequenceAdderTest(MultiAgentAdderTestMixin, parameterized.TestCase):
             end_behavior=end_behavior,
             agents=agents,
         )
+
+
+def test_table_network_config() -> None:
+    """Test that agents are routed to the tables of their networks"""
+    replay_buffer = ReplayBuffer(
+        [
+            RingBufferTable(table, max_size=10, sampler=ReplaySampler.queue)
+            for table in ["trainer_0", "trainer_1"]
+        ]
+    )
+    adder = reverb_adders.ParallelSequenceAdder(
+        replay_buffer,
+        sequence_length=2,
+        period=2,
+        net_ids_to_keys=["network_agent", "network_other"],
+        table_network_config={
+            "trainer_0": ["network_agent"],
+            "trainer_1": ["network_agent", "network_other"],
+        },
+        priority_fns={"trainer_0": None, "trainer_1": None},
+    )
+    agents = ["agent_0", "agent_1", "agent_2"]
+    extras = {
+        "network_int_keys": {
+            "agent_0": np.array(0, dtype=np.int32),
+            "agent_1": np.array(1, dtype=np.int32),
+            "agent_2": np.array(0, dtype=np.int32),
+        }
+    }
+
+    def observations(step: int) -> Dict[str, np.ndarray]:
+        """Observations that identify the agent and the step"""
+        return {agent: np.float32(10 * i + step) for i, agent in enumerate(agents)}
+
+    adder.add_first(dm_env.restart(observations(0)), extras)
+    for step in range(1, 3):
+        actions = {agent: np.int32(step) for agent in agents}
+        rewards = {agent: np.float32(0.0) for agent in agents}
+        discounts = {agent: np.float32(1.0) for agent in agents}
+        timestep = dm_env.transition(rewards, observations(step), discounts)
+        adder.add(actions, timestep, extras)
+
+    # The routing plan is computed once, for the agents and networks of the episode.
+    assert list(adder._routing_plans) == [(tuple(agents), (0, 1, 0))]
+
+    # Agents using network_agent each get an item on trainer_0.
+    sample = replay_buffer.sample("trainer_0", 2)
+    assert list(sample.data.observations) == ["agent_0"]
+    np.testing.assert_array_equal(
+        sample.data.observations["agent_0"], [[0.0, 1.0], [20.0, 21.0]]
+    )
+    np.testing.assert_array_equal(
+        sample.data.extras["network_int_keys"]["agent_0"], [[0, 0], [0, 0]]
+    )
+
+    # Only one group of agents uses both networks of trainer_1.
+    assert replay_buffer.server_info()["trainer_1"].current_size == 1
+    sample = replay_buffer.sample("trainer_1", 1)
+    assert list(sample.data.observations) == ["agent_0", "agent_1"]
+    np.testing.assert_array_equal(sample.data.observations["agent_1"], [[10.0, 11.0]])
+    np.testing.assert_array_equal(sample.data.start_of_episode, [[True, False]])
+
+
+def test_routing_plans_depend_on_agents() -> None:
+    """Test that trajectories of other agents with the same networks get own plans"""
+    replay_buffer = ReplayBuffer([RingBufferTable(name="trainer_0", max_size=10)])
+    adder = reverb_adders.ParallelSequenceAdder(
+        replay_buffer,
+        sequence_length=2,
+        period=2,
+        net_ids_to_keys=["network_agent"],
+        table_network_config={"trainer_0": ["network_agent"]},
+        priority_fns={"trainer_0": None},
+    )
+    trajectory = SimpleNamespace(actions={"agent_0": None, "agent_1": None})
+    other_trajectory = SimpleNamespace(actions={"agent_0": None, "agent_2": None})
+
+    plan = adder._routing_plan(trajectory, (0, 0))
+    other_plan = adder._routing_plan(other_trajectory, (0, 0))
+
+    assert plan == [
+        ("trainer_0", [("agent_0", "agent_0")]),
+        ("trainer_0", [("agent_0", "agent_1")]),
+    ]
+    assert other_plan == [
+        ("trainer_0", [("agent_0", "agent_0")]),
+        ("trainer_0", [("agent_0", "agent_2")]),
+    ]
+    assert adder._routing_plan(trajectory, (0, 0)) is plan
+
+
+def test_stacked_agents() -> None:
+    """Test writing the agents of each network as one stacked tensor"""
+    replay_buffer = ReplayBuffer(
+        [
+            RingBufferTable(table, max_size=10, sampler=ReplaySampler.queue)
+            for table in ["trainer_0", "trainer_1"]
+        ]
+    )
+    agent_net_keys = {
+        "agent_0": "network_agent",
+        "agent_1": "network_other",
+        "agent_2": "network_agent",
+    }
+    adder = reverb_adders.ParallelSequenceAdder(
+        replay_buffer,
+        sequence_length=2,
+        period=2,
+        net_ids_to_keys=["network_agent", "network_other"],
+        table_network_config={
+            "trainer_0": ["network_agent", "network_agent"],
+            "trainer_1": ["network_other"],
+        },
+        priority_fns={"trainer_0": None, "trainer_1": None},
+        stacked_agent_net_keys=agent_net_keys,
+    )
+    agents = list(agent_net_keys)
+    extras = {
+        "network_int_keys": {
+            agent: np.array(int(net_key == "network_other"), dtype=np.int32)
+            for agent, net_key in agent_net_keys.items()
+        }
+    }
+
+    def observations(step: int) -> Dict[str, np.ndarray]:
+        """Observations that identify the agent and the step"""
+        return {
+            agent: np.full(3, 10 * i + step, dtype=np.float32)
+            for i, agent in enumerate(agents)
+        }
+
+    adder.add_first(dm_env.restart(observations(0)), extras)
+    for step in range(1, 3):
+        actions = {agent: np.int32(step) for agent in agents}
+        rewards = {agent: np.float32(step) for agent in agents}
+        discounts = {agent: np.float32(1.0) for agent in agents}
+        timestep = dm_env.transition(rewards, observations(step), discounts)
+        adder.add(actions, timestep, extras)
+
+    # The shape of the stacked observations is [batch, time, agents, ...].
+    sample = replay_buffer.sample("trainer_0", 1)
+    assert list(sample.data.observations) == ["network_agent"]
+    observations_0 = sample.data.observations["network_agent"]
+    assert observations_0.shape == (1, 2, 2, 3)
+    np.testing.assert_array_equal(observations_0[0, :, :, 0], [[0, 20], [1, 21]])
+    assert sample.data.extras["network_int_keys"]["network_agent"].shape == (1, 2, 2)
+
+    sample = replay_buffer.sample("trainer_1", 1)
+    assert list(sample.data.actions) == ["network_other"]
+    assert sample.data.rewards["network_other"].shape == (1, 2, 1)
+
+    # The trainer splits the stacked agents again.
+    trainer_agent_net_keys = {"agent_0": "network_other"}
+    observations_1 = unstack_agents(
+        sample.data.observations, trainer_agent_net_keys, axis=2
+    )
+    np.testing.assert_array_equal(
+        observations_1["agent_0"][0, :, 0], observations(0)["agent_1"][0] + [0, 1]
+    )
+
+
+def test_stack_agent_specs() -> None:
+    """Test that per agent specs are stacked by network"""
+    agent_net_keys = {"agent_0": "network_0", "agent_1": "network_0"}
+    spec = specs.Array(shape=(4,), dtype=np.float32, name="observation")
+    stacked = stack_agent_specs(
+        {"policy_info": {"agent_0": spec, "agent_1": spec}, "s_t": spec},
+        agent_net_keys,
+    )
+    assert stacked["s_t"] == spec
+    assert stacked["policy_info"]["network_0"].shape == (2, 4)
+    assert stacked["policy_info"]["network_0"].dtype == np.float32
+
+
+def test_chunk_lengths() -> None:
+    """Test that columns are configured with per field and auto tuned chunks"""
+    replay_buffer = ReplayBuffer(
+        [RingBufferTable(reverb_adders.DEFAULT_PRIORITY_TABLE, max_size=10)]
+    )
+    adder = reverb_adders.ParallelSequenceAdder(
+        replay_buffer,
+        sequence_length=4,
+        period=4,
+        chunk_lengths={"observations": 8, "extras/policy_info": None},
+        auto_chunk_length=True,
+    )
+    chunk_lengths: Dict[Tuple, Any] = {}
+
+    def configure(path: Tuple, **kwargs: Any) -> None:
+        """Record the chunk length of each configured column"""
+        assert kwargs["num_keep_alive_refs"] == 5
+        chunk_lengths[path] = kwargs["max_chunk_length"]
+
+    adder._writer.configure = configure
+
+    extras = {
+        "policy_info": {"agent_0": np.float32(0.0)},
+        "image": {"agent_0": np.zeros(100_000, dtype=np.float32)},
+    }
+    adder.add_first(dm_env.restart({"agent_0": np.zeros(2, np.float32)}), extras)
+    timestep = dm_env.transition(
+        {"agent_0": np.float32(0.0)},
+        {"agent_0": np.zeros(2, np.float32)},
+        {"agent_0": np.float32(1.0)},
+    )
+    adder.add({"agent_0": np.int32(0)}, timestep, extras)
+    adder.add({"agent_0": np.int32(0)}, timestep, extras)
+
+    assert chunk_lengths == {
+        # Explicit chunk lengths are at most the number of steps kept.
+        ("observations", "agent_0"): 5,
+        # Auto tuned chunks span a period, or 1 MiB for large values.
+        ("extras", "image", "agent_0"): 2,
+        ("start_of_episode",): 4,
+        ("actions", "agent_0"): 4,
+        ("rewards", "agent_0"): 4,
+        ("discounts", "agent_0"): 4,
+    }
@@ -0,0 +1,203 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared trajectory writer unit test"""
+
+from collections import Counter
+from typing import Any, Dict, Iterator, List
+
+import dm_env
+import numpy as np
+import pytest
+import reverb
+import tree
+from acme.adders.reverb.sequence import EndBehavior
+from acme.utils import tree_utils
+
+from mava.adders import reverb as reverb_adders
+from mava.adders.reverb.shared_writer import SharedTrajectoryWriter
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
+from mava.utils.enums import ReplaySampler
+from tests.adders.sequence_adders_test_data import TEST_CASES
+
+
+def item_key(item: Any) -> bytes:
+    """Comparable representation of an item"""
+    return b"".join(
+        np.asarray(leaf, dtype=np.float64).round(5).tobytes()
+        for leaf in tree.flatten(item)
+    )
+
+
+def episode_calls(test_case: Dict[str, Any]) -> Iterator[tuple]:
+    """The adder calls of all the episodes of a test case"""
+    for _ in range(test_case.get("repeat_episode_times", 1)):
+        first = test_case["first"]
+        yield ("add_first", first if type(first) == tuple else (first,))
+        for step in test_case["steps"]:
+            yield ("add", step)
+
+
+@pytest.mark.parametrize(
+    "test_case", TEST_CASES, ids=[case["testcase_name"] for case in TEST_CASES]
+)
+def test_streams_write_the_same_items(test_case: Dict[str, Any]) -> None:
+    """Test that interleaved streams write the items of separate adders"""
+    expected_items = test_case["expected_sequences"]
+    if len({len(item) for item in expected_items}) > 1:
+        pytest.skip("Truncated sequences can not be stored in preallocated storage.")
+
+    table = reverb_adders.DEFAULT_PRIORITY_TABLE
+    replay_buffer = ReplayBuffer(
+        [RingBufferTable(table, max_size=100, sampler=ReplaySampler.queue)]
+    )
+    shared_writer = SharedTrajectoryWriter(replay_buffer, num_streams=2)
+    adders = [
+        reverb_adders.ParallelSequenceAdder(
+            shared_writer.stream_client(),
+            sequence_length=test_case["sequence_length"],
+            period=test_case["period"],
+            end_of_episode_behavior=test_case.get("end_behavior", EndBehavior.ZERO_PAD),
+        )
+        for _ in range(2)
+    ]
+
+    # The second stream starts a step later, so the episodes of the streams end
+    # at different steps of the shared writer.
+    calls: List[List[tuple]] = [list(episode_calls(test_case)) for _ in adders]
+    calls[1].insert(0, ("skip", ()))
+    for step_calls in zip(*calls):
+        for adder, (method, args) in zip(adders, step_calls):
+            if method != "skip":
+                getattr(adder, method)(*args)
+    adders[1].add(*calls[1][-1][1])
+    for adder in adders:
+        adder.__del__()
+    # Rows that wait for the other stream are completed when the writer closes.
+    shared_writer.close()
+
+    num_items = replay_buffer.server_info()[table].current_size
+    assert num_items == 2 * len(expected_items)
+    sample = replay_buffer.sample(table, num_items)
+    observed = Counter(
+        item_key(tree.map_structure(lambda x: x[i], sample.data))
+        for i in range(num_items)
+    )
+    expected = Counter(
+        item_key(tree_utils.stack_sequence_fields(item)) for item in expected_items
+    )
+    assert observed == expected + expected
+
+
+def test_reverb_streams() -> None:
+    """Test that streams share one reverb trajectory writer"""
+    table = reverb_adders.DEFAULT_PRIORITY_TABLE
+    server = reverb.Server([reverb.Table.queue(table, 10)])
+    client = reverb.Client(f"localhost:{server.port}")
+    shared_writer = SharedTrajectoryWriter(client, num_streams=2)
+    adders = [
+        reverb_adders.ParallelSequenceAdder(
+            shared_writer.stream_client(), sequence_length=2, period=2
+        )
+        for _ in range(2)
+    ]
+    assert adders[0]._writer._shared_writer._writer is not None
+    assert adders[0]._writer is not adders[1]._writer
+
+    def timestep(value: float, first: bool = False) -> dm_env.TimeStep:
+        """Timestep whose observation is value"""
+        observation = {"agent_0": np.full(2, value, dtype=np.float32)}
+        if first:
+            return dm_env.restart(observation)
+        return dm_env.transition(
+            {"agent_0": np.float32(value)}, observation, {"agent_0": np.float32(1.0)}
+        )
+
+    for i, adder in enumerate(adders):
+        adder.add_first(timestep(10 * i, first=True))
+    for step in range(1, 3):
+        for i, adder in enumerate(adders):
+            adder.add({"agent_0": np.int32(i)}, timestep(10 * i + step))
+    # The last row waits for the first stream until the writer is closed.
+    shared_writer.close()
+
+    # Tables without signature return the flat leaves of the items, starting
+    # with the observations.
+    samples = client.sample(table, num_samples=2, emit_timesteps=False)
+    observations = sorted(sample.data[0][:, 0].tolist() for sample in samples)
+    assert observations == [[0.0, 1.0], [10.0, 11.0]]
+    server.stop()
+
+
+def test_reverb_streams_past_keep_alive_window() -> None:
+    """Test that streams write the items of separate adders over many episodes"""
+    table = reverb_adders.DEFAULT_PRIORITY_TABLE
+    server = reverb.Server([reverb.Table.queue(table, 1000)])
+    client = reverb.Client(f"localhost:{server.port}")
+    shared_writer = SharedTrajectoryWriter(client, num_streams=3, max_lag_factor=1)
+    replay_buffer = ReplayBuffer(
+        [RingBufferTable(table, max_size=1000, sampler=ReplaySampler.queue)]
+    )
+
+    def adder(adder_client: Any) -> reverb_adders.ParallelSequenceAdder:
+        """Adder of a stream"""
+        return reverb_adders.ParallelSequenceAdder(
+            adder_client,
+            sequence_length=3,
+            period=2,
+            end_of_episode_behavior=EndBehavior.ZERO_PAD,
+        )
+
+    shared_adders = [adder(shared_writer.stream_client()) for _ in range(3)]
+    separate_adders = [adder(replay_buffer) for _ in range(3)]
+
+    # Streams have episodes of different lengths, and the last stream only
+    # steps every other iteration, so rows are also completed without it.
+    episode_lengths = [4, 7, 5]
+    episode_steps = [0, 0, 0]
+    for iteration in range(120):
+        for stream, length in enumerate(episode_lengths):
+            if stream == 2 and iteration % 2:
+                continue
+            value = np.float32(1000 * stream + iteration)
+            observation = {"agent_0": np.full(2, value, dtype=np.float32)}
+            for adders in (shared_adders, separate_adders):
+                if episode_steps[stream] == 0:
+                    adders[stream].add_first(dm_env.restart(observation))
+                elif episode_steps[stream] == length:
+                    adders[stream].add(
+                        {"agent_0": np.int32(stream)},
+                        dm_env.termination({"agent_0": value}, observation),
+                    )
+                else:
+                    adders[stream].add(
+                        {"agent_0": np.int32(stream)},
+                        dm_env.transition({"agent_0": value}, observation),
+                    )
+            episode_steps[stream] = (episode_steps[stream] + 1) % (length + 1)
+    shared_writer.close()
+    assert shared_writer._num_rows > 10 * shared_adders[0]._max_sequence_length
+
+    num_items = replay_buffer.server_info()[table].current_size
+    assert client.server_info()[table].current_size == num_items
+    expected = replay_buffer.sample(table, num_items)
+    assert Counter(
+        item_key(sample.data)
+        for sample in client.sample(table, num_samples=num_items, emit_timesteps=False)
+    ) == Counter(
+        item_key(tree.map_structure(lambda x: x[i], expected.data))
+        for i in range(num_items)
+    )
+    server.stop()
@@ -172,6 +172,15 @@ def test_parallel_sequence_adder(
         mock_builder.store.adder._table_network_config
         == mock_builder.store.table_network_config
     )
+
+    # The adder factory creates new adders on the given client
+    other_adder = mock_builder.store.adder_factory("other_client")
+    assert type(other_adder) == reverb_adders.ParallelSequenceAdder
+    assert other_adder is not mock_builder.store.adder
+    assert other_adder._client == "other_client"
+    assert (
+        other_adder._sequence_length == parallel_sequence_adder.config.sequence_length
+    )
     assert parallel_sequence_adder.name() == "executor_adder"
 
 
@@ -68,6 +68,7 @@ def parameter_server() -> ParameterServer:
         networks={"agent_0": MockNetwork()},
         policy_opt_states={"agent_0": {"opt_state": [1, 2, 3]}},
         critic_opt_states={"agent_0": {"opt_state": [1, 2, 3]}},
+        parameter_server_shard=0,
     )
     return MockParameterServer(store)
 
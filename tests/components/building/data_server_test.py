@@ -23,9 +23,15 @@ import reverb
 
 from mava.adders import reverb as reverb_adders
 from mava.callbacks.base import Callback
-from mava.components.building.data_server import OffPolicyDataServer, OnPolicyDataServer
+from mava.components.building.data_server import (
+    InProcessDataServer,
+    InProcessDataServerConfig,
+    OffPolicyDataServer,
+    OnPolicyDataServer,
+)
 from mava.components.building.environments import EnvironmentSpec, EnvironmentSpecConfig
 from mava.systems.builder import Builder
+from mava.systems.replay_buffer import RingBufferTable
 from mava.utils import enums
 from tests.mocks import make_fake_environment_factory
 
@@ -172,3 +178,73 @@ def test_on_policy_data_server_with_sequence_length(
     assert table.info.max_size == 1000
     assert table.info.name == "trainer_0"
     assert type(table.info.signature).__name__ == "Step"
+
+
+def test_on_policy_data_server_stacked_agents(
+    mock_builder: Builder,
+) -> None:
+    """Tests that the agents of a network are stacked in the table signature"""
+
+    mock_builder.store.adder_signature_fn = lambda env_specs, seq_length, extras_specs: reverb_adders.ParallelSequenceAdder.signature(  # noqa: E501
+        env_specs, seq_length, extras_specs
+    )
+
+    mock_builder.store.global_config = SimpleNamespace(
+        sequence_length=20,
+        stack_agents=True,
+        network_sampling_setup=enums.NetworkSampler.fixed_agent_networks,
+    )
+
+    data_server = OnPolicyDataServer()
+    data_server.on_building_data_server(mock_builder)
+
+    signature = mock_builder.store.data_tables[0].info.signature
+    assert list(signature.observations) == ["network_agent"]
+    observation_shape = signature.observations["network_agent"].observation.shape
+    assert observation_shape[:2] == (20, 3)
+    assert signature.rewards["network_agent"].shape == (20, 3)
+
+    # Stacked agents can not be split between tables.
+    mock_builder.store.table_network_config = {"trainer_0": ["network_agent"]}
+    with pytest.raises(ValueError, match="all the agents"):
+        data_server.on_building_data_server(mock_builder)
+
+
+def test_in_process_data_server(
+    mock_builder: Builder,
+) -> None:
+    """Tests in-process data server with a sequence adder"""
+
+    mock_builder.store.adder_signature_fn = lambda env_specs, seq_length, extras_specs: reverb_adders.ParallelSequenceAdder.signature(  # noqa: E501
+        env_specs, seq_length, extras_specs
+    )
+
+    mock_builder.store.global_config = SimpleNamespace(
+        sequence_length=20, multi_process=False
+    )
+
+    data_server = InProcessDataServer(
+        InProcessDataServerConfig(max_size=500, sampler=enums.ReplaySampler.prioritised)
+    )
+    data_server.on_building_data_server(mock_builder)
+
+    table = mock_builder.store.data_tables[0]
+
+    assert isinstance(table, RingBufferTable)
+    info = table.info()
+    assert info.max_size == 500
+    assert info.name == "trainer_0"
+    assert info.sampler == enums.ReplaySampler.prioritised
+    assert info.current_size == 0
+    assert type(info.signature).__name__ == "Step"
+
+
+def test_in_process_data_server_multi_process(
+    mock_builder: Builder,
+) -> None:
+    """Tests that the in-process data server requires a single process"""
+
+    mock_builder.store.global_config = SimpleNamespace(multi_process=True)
+
+    with pytest.raises(ValueError):
+        InProcessDataServer().on_building_data_server(mock_builder)
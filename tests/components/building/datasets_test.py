@@ -18,6 +18,8 @@
 from types import SimpleNamespace
 from typing import Any, Callable, Dict
 
+import jax.numpy as jnp
+import numpy as np
 import pytest
 import reverb
 from tensorflow.python.framework import dtypes, ops
@@ -31,6 +33,8 @@ from mava.components.building.datasets import (
     TransitionDatasetConfig,
 )
 from mava.systems.builder import Builder
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
+from mava.utils.dataset_utils import DLPackIterator, PrefetchIterator
 from tests.mocks import make_fake_env_specs
 
 env_spec = make_fake_env_specs()
@@ -261,6 +265,9 @@ def test_on_building_trainer_dataset_trajectory_dataset(
     # to check the parameters i.e. obtain the dataset from the numpy \
     # dataset iterator
 
+    # Prefetching and the DLPack handoff are opt-in.
+    assert not isinstance(mock_builder.store.dataset_iterator, PrefetchIterator)
+    assert not isinstance(mock_builder.store.dataset_iterator, DLPackIterator)
     dataset = mock_builder.store.dataset_iterator._iterator._dataset
     assert (
         dataset._input_dataset._server_address
@@ -283,3 +290,44 @@ def test_on_building_trainer_dataset_trajectory_dataset(
         dataset._input_dataset._rate_limiter_timeout_ms
         == trajectory_dataset.config.rate_limiter_timeout_ms
     )
+
+
+def test_on_building_trainer_dataset_trajectory_dataset_prefetch(
+    mock_builder: MockBuilder,
+) -> None:
+    """Test that TrajectoryDataset can prefetch and hand batches over with DLPack
+
+    Args:
+        mock_builder: Builder
+    """
+    trajectory_dataset = TrajectoryDataset(
+        TrajectoryDatasetConfig(prefetch_buffer_size=2, dlpack_handoff=True)
+    )
+    trajectory_dataset.on_building_trainer_dataset(builder=mock_builder)
+
+    assert isinstance(mock_builder.store.dataset_iterator, PrefetchIterator)
+    assert isinstance(mock_builder.store.dataset_iterator.iterator, DLPackIterator)
+    dataset = mock_builder.store.dataset_iterator.iterator._iterator._dataset
+    assert dataset._input_dataset._table == mock_builder.store.trainer_id
+
+
+def test_on_building_trainer_dataset_trajectory_dataset_in_process() -> None:
+    """Test that TrajectoryDataset samples in-process tables directly"""
+    replay_buffer = ReplayBuffer([RingBufferTable(name="table_0", max_size=10)])
+    for i in range(3):
+        replay_buffer.insert("table_0", {"observations": np.full(2, i)})
+    builder = SimpleNamespace(
+        store=SimpleNamespace(data_server_client=replay_buffer, trainer_id="table_0")
+    )
+
+    trajectory_dataset = TrajectoryDataset(
+        TrajectoryDatasetConfig(epoch_batch_size=4, prefetch_buffer_size=2)
+    )
+    trajectory_dataset.on_building_trainer_dataset(builder=builder)
+
+    assert builder.store.epoch_batch_size == 4
+    assert isinstance(builder.store.dataset_iterator, PrefetchIterator)
+    sample = next(builder.store.dataset_iterator)
+    builder.store.dataset_iterator.close()
+    assert isinstance(sample.data["observations"], jnp.ndarray)
+    assert sample.data["observations"].shape == (4, 2)
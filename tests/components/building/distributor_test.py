@@ -24,7 +24,7 @@ from reverb import client as reverb_client
 from reverb import item_selectors, rate_limiters
 from reverb import server as reverb_server
 
-from mava.components.building.distributor import Distributor
+from mava.components.building.distributor import Distributor, DistributorConfig
 from mava.systems.builder import Builder
 from mava.systems.launcher import Launcher
 
@@ -68,8 +68,10 @@ class MockBuilder(Builder):
             )
         ]
 
-    def parameter_server(self) -> str:
+    def parameter_server(self, shard_id: int = 0, num_shards: int = 1) -> str:
         """parameter_server to test on_building_program_nodes"""
+        if num_shards > 1:
+            return f"Parameter Server Shard {shard_id} of {num_shards}"
         return "Parameter Server Test"
 
     def executor(
@@ -251,6 +253,31 @@ def test_on_building_program_nodes(
     assert trainer == "Trainer Test"
 
 
+def test_on_building_program_nodes_sharded_parameter_server(
+    mock_builder: MockBuilder,
+) -> None:
+    """Test on_building_program_nodes with a sharded parameter server"""
+    distributor = Distributor(DistributorConfig(num_parameter_servers=2))
+    distributor.on_building_program_nodes(builder=mock_builder)
+
+    shards = mock_builder.store.program._program._groups["parameter_server"]
+    assert len(shards) == 2
+    assert [shard._constructor(*shard._args) for shard in shards] == [
+        "Parameter Server Shard 0 of 2",
+        "Parameter Server Shard 1 of 2",
+    ]
+
+    # Executors and trainers get the list of shards.
+    executor = mock_builder.store.program._program._groups["executor"][-1]
+    assert len(executor._args[2]) == 2
+
+
+def test_sharded_parameter_server_single_process() -> None:
+    """Test that a sharded parameter server requires multi process"""
+    with pytest.raises(ValueError):
+        Distributor(DistributorConfig(num_parameter_servers=2, multi_process=False))
+
+
 def test_on_building_program_nodes_no_evaluator(
     mock_builder: MockBuilder, distributor: Distributor
 ) -> None:
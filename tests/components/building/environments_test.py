@@ -18,17 +18,21 @@
 import functools
 from types import SimpleNamespace
 from typing import Any, Dict, Tuple
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 
 from mava import MAEnvironmentSpec, specs
+from mava.adders.reverb.shared_writer import StreamClient
 from mava.components.building.environments import (
     EnvironmentSpec,
     EnvironmentSpecConfig,
     ExecutorEnvironmentLoop,
     ExecutorEnvironmentLoopConfig,
     ParallelExecutorEnvironmentLoop,
+    VectorisedExecutorEnvironmentLoopConfig,
+    VectorisedParallelExecutorEnvironmentLoop,
 )
 from mava.core_jax import SystemBuilder
 from mava.systems import Builder
@@ -242,3 +246,127 @@ class TestParallelExecutorEnvironmentLoop:
             executor_environment_loop._should_update
             == test_parallel_executor_environment_loop.config.should_update
         )
+
+
+class TestVectorisedParallelExecutorEnvironmentLoop:
+    """Tests for VectorisedParallelExecutorEnvironmentLoop"""
+
+    def test_on_building_executor_start(self, test_builder: SystemBuilder) -> None:
+        """Test that only executors use several environments"""
+        environment_loop = VectorisedParallelExecutorEnvironmentLoop(
+            config=VectorisedExecutorEnvironmentLoopConfig(num_executor_environments=3)
+        )
+
+        environment_loop.on_building_executor_start(test_builder)
+        assert test_builder.store.num_executor_environments == 1
+
+        test_builder.store.is_evaluator = False
+        environment_loop.on_building_executor_start(test_builder)
+        assert test_builder.store.num_executor_environments == 3
+
+    def test_on_building_executor_environment(
+        self, test_builder: SystemBuilder
+    ) -> None:
+        """Test that one environment is made per environment stream"""
+        environment_loop = VectorisedParallelExecutorEnvironmentLoop(
+            config=VectorisedExecutorEnvironmentLoopConfig(num_executor_environments=3)
+        )
+        test_builder.store.is_evaluator = False
+        environment_loop.on_building_executor_start(test_builder)
+        environment_loop.on_building_executor_environment(test_builder)
+
+        assert (
+            test_builder.store.executor_environments == ["environment_eval_false"] * 3
+        )
+        assert test_builder.store.executor_environment == "environment_eval_false"
+
+    def test_on_building_executor_environment_subprocess(
+        self, test_builder: SystemBuilder
+    ) -> None:
+        """Test that executor environments can run in subprocesses"""
+        environment_loop = VectorisedParallelExecutorEnvironmentLoop(
+            config=VectorisedExecutorEnvironmentLoopConfig(
+                num_executor_environments=3, subprocess_environments=True
+            )
+        )
+        test_builder.store.is_evaluator = False
+        environment_loop.on_building_executor_start(test_builder)
+        with patch(
+            "mava.components.building.environments.SubprocessEnvWrapper",
+            side_effect=lambda environment_factory: environment_factory(),
+        ) as subprocess_env_wrapper:
+            environment_loop.on_building_executor_environment(test_builder)
+
+        assert subprocess_env_wrapper.call_count == 3
+        assert (
+            test_builder.store.executor_environments == ["environment_eval_false"] * 3
+        )
+
+        # The evaluator environment stays in the main process.
+        test_builder.store.is_evaluator = True
+        environment_loop.on_building_executor_start(test_builder)
+        with patch(
+            "mava.components.building.environments.SubprocessEnvWrapper"
+        ) as subprocess_env_wrapper:
+            environment_loop.on_building_executor_environment(test_builder)
+
+        subprocess_env_wrapper.assert_not_called()
+        assert test_builder.store.executor_environments == ["environment_eval_true"]
+
+    def test_on_building_executor_environment_loop_evaluator(
+        self, test_builder: SystemBuilder
+    ) -> None:
+        """Test that the evaluator keeps a single environment loop"""
+        environment_loop = VectorisedParallelExecutorEnvironmentLoop(
+            config=VectorisedExecutorEnvironmentLoopConfig(
+                executor_stats_wrapper_class=None
+            )
+        )
+        environment_loop.on_building_executor_start(test_builder)
+        environment_loop.on_building_executor_environment_loop(test_builder)
+
+        assert not hasattr(test_builder.store, "executor_logger")
+        executor_environment_loop = test_builder.store.system_executor
+        assert executor_environment_loop._environment == "environment"
+        assert executor_environment_loop._executor == "executor"
+
+    def test_on_building_executor_environment_loop_shared_writer(
+        self, test_builder: SystemBuilder
+    ) -> None:
+        """Test that the adders of the environments can share a trajectory writer"""
+        environment_loop = VectorisedParallelExecutorEnvironmentLoop(
+            config=VectorisedExecutorEnvironmentLoopConfig(
+                num_executor_environments=3,
+                shared_trajectory_writer=True,
+                executor_stats_wrapper_class=None,
+            )
+        )
+        test_builder.store.is_evaluator = False
+        test_builder.store.executor_environments = ["environment"] * 3
+        test_builder.store.data_server_client = "data_server_client"
+
+        def adder_factory(client: Any) -> SimpleNamespace:
+            """Record the client the adder is created with"""
+            return SimpleNamespace(client=client)
+
+        environment_loop.on_building_executor_start(test_builder)
+        shared_writer = test_builder.store.shared_trajectory_writer
+        assert test_builder.store.data_server_client._shared_writer is shared_writer
+
+        # The adder component builds the executor's adder on the first stream.
+        test_builder.store.adder_factory = adder_factory
+        test_builder.store.adder = adder_factory(test_builder.store.data_server_client)
+        with patch(
+            "mava.components.building.environments.VectorisedParallelEnvironmentLoop"
+        ) as vectorised_loop:
+            environment_loop.on_building_executor_environment_loop(test_builder)
+
+        adders = vectorised_loop.call_args.kwargs["adders"]
+        assert len(adders) == 3
+        assert test_builder.store.adder is adders[0]
+        assert shared_writer._client == "data_server_client"
+        assert vectorised_loop.call_args.kwargs["shared_writer"] is shared_writer
+        clients = [adder.client for adder in adders]
+        assert all(isinstance(client, StreamClient) for client in clients)
+        assert {id(client._shared_writer) for client in clients} == {id(shared_writer)}
+        assert len({id(client) for client in clients}) == 3
@@ -18,11 +18,18 @@
 from types import SimpleNamespace
 from typing import Any
 
+import jax
+import jax.numpy as jnp
 import numpy as np
 import pytest
 from optax import EmptyState
 
 from mava import constants
+from mava.callbacks import Callback
+from mava.components.building.best_checkpointer import (
+    BestCheckpointer,
+    BestCheckpointerConfig,
+)
 from mava.components.building.parameter_client import (
     BaseParameterClient,
     ExecutorParameterClient,
@@ -30,6 +37,9 @@ from mava.components.building.parameter_client import (
     TrainerParameterClient,
     TrainerParameterClientConfig,
 )
+from mava.components.executing.action_selection import FeedforwardExecutorSelectAction
+from mava.components.training.base import TrainingState, TrainingStateHolder
+from mava.core_jax import SystemParameterServer
 from mava.systems.builder import Builder
 from mava.systems.parameter_server import ParameterServer
 
@@ -48,6 +58,14 @@ class MockBaseParameterClient(BaseParameterClient):
         return "dummy_base_parameter_client_name"
 
 
+class MockTrainerStepsParameterServer(Callback):
+    """Mock parameter server component that returns the trainer steps"""
+
+    def on_parameter_server_get_parameters(self, server: SystemParameterServer) -> None:
+        """Return the trainer steps for every request"""
+        server.request.get_parameters = {"trainer_steps": np.array(0, dtype=np.int32)}
+
+
 # Data for checking that the components have been initialized correctly
 expected_count_keys = {
     "evaluator_episodes",
@@ -80,6 +98,9 @@ expected_network_keys = {
     "critic_opt_state-network_agent_0",
     "critic_opt_state-network_agent_1",
     "critic_opt_state-network_agent_2",
+    "policy_trainer_steps-network_agent_0",
+    "policy_trainer_steps-network_agent_1",
+    "policy_trainer_steps-network_agent_2",
 }
 
 normalisation_keys = {"norm_params"}
@@ -122,14 +143,22 @@ initial_parameters_trainer = {
     "evaluator_episodes": np.array(0, dtype=np.int32),
     "executor_episodes": np.array(0, dtype=np.int32),
     "executor_steps": np.array(0, dtype=np.int32),
+    "policy_trainer_steps-network_agent_0": np.array(0, dtype=np.int32),
+    "policy_trainer_steps-network_agent_1": np.array(0, dtype=np.int32),
+    "policy_trainer_steps-network_agent_2": np.array(0, dtype=np.int32),
     "norm_params": norm_params,
 }
 
 # Executor parameter client prameters does not include opt states
-initial_parameters_executor = {
+all_parameters_executor = {
     k: v for k, v in initial_parameters_trainer.items() if "opt_state" not in k
 }
 
+# Executors only act with the policy networks
+initial_parameters_executor = {
+    k: v for k, v in all_parameters_executor.items() if "critic_network" not in k
+}
+
 
 @pytest.fixture
 def mock_builder_with_parameter_client() -> Builder:
@@ -139,7 +168,7 @@ def mock_builder_with_parameter_client() -> Builder:
     networks components.
     """
 
-    builder = Builder(components=[])
+    builder = Builder(components=[FeedforwardExecutorSelectAction()])
 
     builder.store.networks = {
         "network_agent_0": SimpleNamespace(
@@ -190,11 +219,26 @@ def mock_builder_with_parameter_client() -> Builder:
             count=np.array([1e-4]),
         )
 
+    builder.store.training_state = TrainingStateHolder(
+        TrainingState(
+            policy_params={
+                net_key: network.policy_params
+                for net_key, network in builder.store.networks.items()
+            },
+            critic_params={
+                net_key: network.critic_params
+                for net_key, network in builder.store.networks.items()
+            },
+            policy_opt_states=builder.store.policy_opt_states,
+            critic_opt_states=builder.store.critic_opt_states,
+            random_key=None,
+            target_value_stats=builder.store.norm_params[values_norm_key],
+            observation_stats=builder.store.norm_params[obs_norm_key],
+        )
+    )
+
     builder.store.parameter_server_client = ParameterServer(
-        store=SimpleNamespace(
-            get_parameters={"trainer_steps": np.array(0, dtype=np.int32)}
-        ),
-        components=[],
+        store=SimpleNamespace(), components=[MockTrainerStepsParameterServer()]
     )
     builder.store.is_evaluator = False
     builder.store.checkpoint_best_perf = False
@@ -258,12 +302,21 @@ def test_executor_parameter_client_no_evaluator_with_parameter_client(
     assert mock_builder.store.executor_parameter_client._set_keys == []
     assert (
         mock_builder.store.executor_parameter_client._parameters
-        == initial_parameters_executor
+        == all_parameters_executor
+    )
+    # The store holds the trainer steps of the policies the client updates.
+    assert (
+        mock_builder.store.policy_trainer_steps["network_agent_1"]
+        is mock_builder.store.executor_parameter_client._parameters[
+            "policy_trainer_steps-network_agent_1"
+        ]
     )
     assert mock_builder.store.executor_parameter_client._get_call_counter == 0
     assert mock_builder.store.executor_parameter_client._set_call_counter == 0
     assert mock_builder.store.executor_parameter_client._set_get_call_counter == 0
     assert mock_builder.store.executor_parameter_client._update_period == 500
+    # Versioned gets are opt-in.
+    assert not mock_builder.store.executor_parameter_client._versioned_get
     assert isinstance(
         mock_builder.store.executor_parameter_client._server, ParameterServer
     )
@@ -314,7 +367,7 @@ def test_executor_parameter_client_evaluator_with_parameter_client(
     assert mock_builder.store.executor_parameter_client._set_keys == []
     assert (
         mock_builder.store.executor_parameter_client._parameters
-        == initial_parameters_executor
+        == all_parameters_executor
     )
     assert mock_builder.store.executor_parameter_client._get_call_counter == 0
     assert mock_builder.store.executor_parameter_client._set_call_counter == 0
@@ -327,6 +380,74 @@ def test_executor_parameter_client_evaluator_with_parameter_client(
     assert mock_builder.store.executor_counts == initial_count_parameters
 
 
+@pytest.mark.parametrize(
+    "used_networks_only, components, is_evaluator",
+    [
+        (False, [FeedforwardExecutorSelectAction()], False),
+        (
+            True,
+            [
+                FeedforwardExecutorSelectAction(),
+                BestCheckpointer(BestCheckpointerConfig(checkpoint_best_perf=True)),
+            ],
+            True,
+        ),
+    ],
+)
+def test_executor_parameter_client_fetches_critics(
+    mock_builder_with_parameter_client: Builder,
+    used_networks_only: bool,
+    components: Any,
+    is_evaluator: bool,
+) -> None:
+    """Test that critics are fetched when needed by a component or configured.
+
+    Args:
+        mock_builder_with_parameter_client: mava builder object
+        used_networks_only: only fetch the networks used by components
+        components: components of the system
+        is_evaluator: whether the client is built for the evaluator
+    """
+    mock_builder = mock_builder_with_parameter_client
+    mock_builder.callbacks = components
+    mock_builder.store.is_evaluator = is_evaluator
+    mock_builder.store.global_config.checkpoint_best_perf = False
+    exec_param_client = ExecutorParameterClient(
+        config=ExecutorParameterClientConfig(
+            executor_used_networks_only=used_networks_only
+        )
+    )
+    exec_param_client.on_building_executor_parameter_client(builder=mock_builder)
+
+    parameter_client = mock_builder.store.executor_parameter_client
+    assert parameter_client._parameters == all_parameters_executor
+    assert "critic_network-network_agent_1" in parameter_client._get_keys
+
+
+def test_executor_parameter_client_without_best_checkpoint_critics(
+    mock_builder_with_parameter_client: Builder,
+) -> None:
+    """Test that executors do not fetch critics for the best checkpointer.
+
+    Args:
+        mock_builder_with_parameter_client: mava builder object
+    """
+    mock_builder = mock_builder_with_parameter_client
+    mock_builder.callbacks = [
+        FeedforwardExecutorSelectAction(),
+        BestCheckpointer(BestCheckpointerConfig(checkpoint_best_perf=True)),
+    ]
+    mock_builder.store.is_evaluator = False
+    exec_param_client = ExecutorParameterClient(
+        config=ExecutorParameterClientConfig(executor_used_networks_only=True)
+    )
+    exec_param_client.on_building_executor_parameter_client(builder=mock_builder)
+
+    parameter_client = mock_builder.store.executor_parameter_client
+    assert parameter_client._parameters == initial_parameters_executor
+    assert not any("critic" in key for key in parameter_client._get_keys)
+
+
 def test_executor_parameter_client_with_no_parameter_client(
     mock_builder_with_parameter_client: Builder,
 ) -> None:
@@ -395,6 +516,14 @@ def test_trainer_parameter_client(
         "policy_opt_state-network_agent_2",
         "critic_opt_state-network_agent_2",
         "norm_params",
+        "policy_trainer_steps-network_agent_0",
+        "policy_trainer_steps-network_agent_1",
+        "policy_trainer_steps-network_agent_2",
+    ]
+    assert mock_builder.store.trainer_policy_trainer_steps == [
+        "policy_trainer_steps-network_agent_0",
+        "policy_trainer_steps-network_agent_1",
+        "policy_trainer_steps-network_agent_2",
     ]
     assert (
         mock_builder.store.trainer_parameter_client._parameters
@@ -424,3 +553,96 @@ def test_trainer_parameter_client_with_no_parameter_client(
     trainer_param_client.on_building_trainer_parameter_client(mock_builder)
 
     assert mock_builder.store.trainer_parameter_client is None
+
+
+def test_trainer_parameter_client_reads_training_state(
+    mock_builder_with_parameter_client: Builder,
+) -> None:
+    """Test that the trainer parameter client follows the training state.
+
+    Args:
+        mock_builder_with_parameter_client: mava builder object
+    """
+    mock_builder = mock_builder_with_parameter_client
+    trainer_param_client = TrainerParameterClient(config=TrainerParameterClientConfig())
+    trainer_param_client.on_building_trainer_parameter_client(mock_builder)
+    parameters = mock_builder.store.trainer_parameter_client._parameters
+
+    training_state = mock_builder.store.training_state
+    state = training_state.state
+    training_state.swap(
+        state._replace(
+            policy_params={
+                **state.policy_params,
+                "network_agent_1": {"weights": 10, "biases": 10},
+            }
+        )
+    )
+
+    assert parameters["policy_network-network_agent_1"] == {
+        "weights": 10,
+        "biases": 10,
+    }
+    assert parameters["policy_network-network_agent_0"] == {
+        "weights": 0,
+        "biases": 0,
+    }
+
+    # Writing a state parameter swaps in a new training state.
+    parameters["critic_network-network_agent_2"] = {"weights": 5, "biases": 5}
+    assert training_state.state.critic_params["network_agent_2"] == {
+        "weights": 5,
+        "biases": 5,
+    }
+    assert training_state.state.policy_params["network_agent_1"] == {
+        "weights": 10,
+        "biases": 10,
+    }
+
+    # Counts are shared with the trainer.
+    assert (
+        parameters["trainer_steps"]
+        is mock_builder.store.trainer_counts["trainer_steps"]
+    )
+
+    # Only parameters that are not part of the training state can be removed.
+    with pytest.raises(TypeError, match="part of the training state"):
+        del parameters["policy_network-network_agent_0"]
+    num_parameters = len(parameters)
+    del parameters["trainer_steps"]
+    assert "trainer_steps" not in parameters
+    assert len(parameters) == num_parameters - 1
+
+
+def test_trainer_parameter_client_donated_training_state(
+    mock_builder_with_parameter_client: Builder,
+) -> None:
+    """Test that published parameters are host copies of a donated state.
+
+    Args:
+        mock_builder_with_parameter_client: mava builder object
+    """
+    mock_builder = mock_builder_with_parameter_client
+    mock_builder.store.trainer_networks = {"trainer_0": ["network_agent_0"]}
+    trainer_param_client = TrainerParameterClient(config=TrainerParameterClientConfig())
+    trainer_param_client.on_building_trainer_parameter_client(mock_builder)
+    parameters = mock_builder.store.trainer_parameter_client._parameters
+
+    training_state = mock_builder.store.training_state
+    training_state.swap(jax.tree_util.tree_map(jnp.array, training_state.state))
+    training_state.donated = True
+
+    # Parameters of this trainer are published, so they are copied.
+    published = parameters["policy_network-network_agent_0"]
+    assert isinstance(published["weights"], np.ndarray)
+    assert (
+        published["weights"]
+        is not training_state.state.policy_params["network_agent_0"]["weights"]
+    )
+    assert isinstance(
+        parameters["norm_params"][obs_norm_key]["agent_0"]["mean"], np.ndarray
+    )
+
+    # Parameters of other trainers are fetched into the training state.
+    fetched = parameters["policy_network-network_agent_1"]
+    assert fetched is training_state.state.policy_params["network_agent_1"]
@@ -27,8 +27,10 @@ from acme.jax import networks as networks_lib
 
 from mava import constants
 from mava.components.executing.action_selection import (
+    ExecutorSelectActionConfig,
     FeedforwardExecutorSelectAction,
     RecurrentExecutorSelectAction,
+    vmap_over_environments,
 )
 from mava.components.normalisation.observation_normalisation import (
     ObservationNormalisation,
@@ -311,6 +313,99 @@ def test_on_execution_select_actions_ff(
         )
 
 
+class DeterministicNetwork:
+    """Network with a deterministic, jittable get_action used to compare modes."""
+
+    def get_action(
+        self,
+        observations: networks_lib.Observation,
+        params: Dict[str, jnp.ndarray],
+        base_key: networks_lib.PRNGKey,
+        mask: chex.Array = None,
+    ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray]]:
+        """Pick the largest legal weighted observation entry."""
+        action = jnp.squeeze(jnp.argmax(observations * mask * params["w"], axis=-1))
+        log_prob = jnp.squeeze(jnp.sum(observations * params["w"], axis=-1))
+        return action, {"log_prob": log_prob}
+
+
+def shared_networks_executor(
+    select_action: Any, network: Any, vectorise: bool
+) -> Tuple[SimpleNamespace, Dict[str, OLT], Dict[str, Dict[str, jnp.ndarray]]]:
+    """Executor whose agents share networks, with its select actions function.
+
+    Args:
+        select_action: select action component class.
+        network: network used for both network keys.
+        vectorise: whether to use the vectorised select actions function.
+
+    Returns:
+        the executor, the observations of its agents and the network params.
+    """
+    agent_net_keys = {
+        "agent_0": "network_0",
+        "agent_1": "network_0",
+        "agent_2": "network_1",
+    }
+    observations = {
+        "agent_0": OLT(
+            observation=jnp.array([0.1, 0.5, 0.7]),
+            legal_actions=jnp.array([1.0, 1.0, 0.0]),
+            terminal=jnp.array(0.0),
+        ),
+        "agent_1": OLT(
+            observation=jnp.array([0.8, 0.3, 0.7]),
+            legal_actions=jnp.array([1.0, 1.0, 1.0]),
+            terminal=jnp.array(0.0),
+        ),
+        "agent_2": OLT(
+            observation=jnp.array([0.9, 0.9, 0.8]),
+            legal_actions=jnp.array([0.0, 0.0, 1.0]),
+            terminal=jnp.array(0.0),
+        ),
+    }
+    params = {
+        "network_0": {"w": jnp.array([1.0, 1.0, 1.0])},
+        "network_1": {"w": jnp.array([2.0, 2.0, 2.0])},
+    }
+    executor = SimpleNamespace(
+        store=SimpleNamespace(
+            networks={"network_0": network, "network_1": network},
+            agent_net_keys=agent_net_keys,
+        )
+    )
+
+    select_action_component = select_action(
+        config=ExecutorSelectActionConfig(vectorise_agent_action_selection=vectorise)
+    )
+    select_action_component.on_execution_init_end(executor)
+    return executor, observations, params
+
+
+@pytest.mark.parametrize("vectorise", [False, True])
+def test_on_execution_init_end_ff_shared_networks(vectorise: bool) -> None:
+    """Test that vectorised action selection matches the per agent loop.
+
+    Args:
+        vectorise: whether to use the vectorised select actions function.
+    """
+    executor, observations, params = shared_networks_executor(
+        FeedforwardExecutorSelectAction, DeterministicNetwork(), vectorise
+    )
+
+    actions_info, policies_info, _ = executor.store.select_actions_fn(
+        observations, params, jax.random.PRNGKey(5)
+    )
+
+    assert actions_info.keys() == observations.keys()
+    assert actions_info["agent_0"] == 1
+    assert actions_info["agent_1"] == 0
+    assert actions_info["agent_2"] == 2
+    assert jnp.isclose(policies_info["agent_0"]["log_prob"], 1.3)
+    assert jnp.isclose(policies_info["agent_1"]["log_prob"], 1.8)
+    assert jnp.isclose(policies_info["agent_2"]["log_prob"], 5.2)
+
+
 #######################
 # Recurrent executors  #
 #######################
@@ -488,3 +583,75 @@ def test_on_execution_select_actions_recurrent(  # type: ignore # noqa: E501
             mock_recurrent_executor.store.policies_info[agent] == "policy_info_" + agent
         )
         assert mock_recurrent_executor.store.policy_states[agent] == agent
+
+
+class DeterministicRecurrentNetwork:
+    """Recurrent network with a deterministic, jittable get_action."""
+
+    def get_action(
+        self,
+        observations: networks_lib.Observation,
+        params: Dict[str, jnp.ndarray],
+        policy_state: NestedArray,
+        base_key: networks_lib.PRNGKey,
+        mask: chex.Array = None,
+    ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray], NestedArray]:
+        """Accumulate observations into the state and act on the result."""
+        new_state = [policy_state[0] + observations * params["w"]]
+        action = jnp.squeeze(jnp.argmax(new_state[0] * mask, axis=-1))
+        log_prob = jnp.squeeze(jnp.sum(new_state[0], axis=-1))
+        return action, {"log_prob": log_prob}, new_state
+
+
+@pytest.mark.parametrize("vectorise", [False, True])
+def test_on_execution_init_end_recurrent_shared_networks(vectorise: bool) -> None:
+    """Test that vectorised recurrent action selection matches the per agent loop.
+
+    Args:
+        vectorise: whether to use the vectorised select actions function.
+    """
+    executor, observations, params = shared_networks_executor(
+        RecurrentExecutorSelectAction, DeterministicRecurrentNetwork(), vectorise
+    )
+    policy_states = {
+        "agent_0": [jnp.zeros((1, 3))],
+        "agent_1": [jnp.ones((1, 3))],
+        "agent_2": [jnp.zeros((1, 3))],
+    }
+
+    (
+        actions_info,
+        policies_info,
+        new_policy_states,
+        _,
+    ) = executor.store.select_actions_fn(
+        observations, params, policy_states, jax.random.PRNGKey(5)
+    )
+
+    assert actions_info["agent_0"] == 1
+    assert actions_info["agent_1"] == 0
+    assert actions_info["agent_2"] == 2
+    assert jnp.isclose(policies_info["agent_0"]["log_prob"], 1.3)
+    assert jnp.isclose(policies_info["agent_1"]["log_prob"], 4.8)
+    assert jnp.isclose(policies_info["agent_2"]["log_prob"], 5.2)
+    for agent in observations.keys():
+        assert new_policy_states[agent][0].shape == (1, 3)
+    assert jnp.allclose(new_policy_states["agent_1"][0], jnp.array([[1.8, 1.3, 1.7]]))
+
+
+def test_vmap_over_environments_any_number_of_environments() -> None:
+    """Test that the environment axis can change size between calls"""
+
+    def select_actions(
+        observations: jnp.ndarray, params: jnp.ndarray, key: chex.PRNGKey
+    ) -> Tuple[jnp.ndarray, chex.PRNGKey]:
+        """Add the parameters to the observations"""
+        return observations + params, key
+
+    batched_select_actions = jax.jit(vmap_over_environments(select_actions))
+    for num_environments in [3, 2]:
+        actions, key = batched_select_actions(
+            jnp.arange(num_environments), jnp.array(10), jax.random.PRNGKey(0)
+        )
+        assert jnp.array_equal(actions, jnp.arange(num_environments) + 10)
+        assert key.shape == jax.random.PRNGKey(0).shape
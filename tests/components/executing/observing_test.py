@@ -20,6 +20,7 @@ from types import SimpleNamespace
 from typing import Any, Dict
 
 import jax.numpy as jnp
+import numpy as np
 import pytest
 from dm_env import StepType, TimeStep
 
@@ -178,6 +179,11 @@ class MockExecutor(Executor):
             actions_info=actions_info,
             policies_info=policies_info,
             executor_parameter_client=executor_parameter_client,
+            policy_trainer_steps={
+                "network_agent_0": np.array(3, dtype=np.int32),
+                "network_agent_1": np.array(4, dtype=np.int32),
+                "network_agent_2": np.array(5, dtype=np.int32),
+            },
         )
         self.store = store
 
@@ -344,6 +350,12 @@ def test_on_execution_observe(
             agent
         ] == "policy_info_" + str(agent)
 
+    # The policies are tagged with copies of the trainer steps that produced them.
+    policy_trainer_steps = mock_executor.store.next_extras["policy_trainer_steps"]
+    assert policy_trainer_steps == {"agent_0": 3, "agent_1": 4, "agent_2": 5}
+    mock_executor.store.policy_trainer_steps["network_agent_0"] += 1
+    assert policy_trainer_steps["agent_0"] == 3
+
     assert (
         mock_executor.store.next_extras["network_int_keys"]
         == mock_executor.store.network_int_keys_extras
@@ -520,6 +532,12 @@ def test_on_execution_observe_recurrent(
             agent
         ] == "policy_info_" + str(agent)
 
+    # The policies are tagged with copies of the trainer steps that produced them.
+    policy_trainer_steps = mock_executor.store.next_extras["policy_trainer_steps"]
+    assert policy_trainer_steps == {"agent_0": 3, "agent_1": 4, "agent_2": 5}
+    mock_executor.store.policy_trainer_steps["network_agent_0"] += 1
+    assert policy_trainer_steps["agent_0"] == 3
+
     assert (
         mock_executor.store.next_extras["network_int_keys"]
         == mock_executor.store.network_int_keys_extras
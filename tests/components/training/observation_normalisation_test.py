@@ -4,7 +4,6 @@ import numpy as np
 import pytest
 import tree
 
-from mava import constants
 from mava.components.normalisation.observation_normalisation import (
     ObservationNormalisation,
 )
@@ -24,9 +23,9 @@ def trainer() -> MockCoreComponent:
     """Creates a mock trainer"""
     store = SimpleNamespace(
         obs_normalisation_start=0,
-        norm_params={
-            constants.OBS_NORM_STATE_DICT_KEY: {"params": {"mean": np.zeros(1)}}
-        },
+        training_state=SimpleNamespace(
+            state=SimpleNamespace(observation_stats={"params": {"mean": np.zeros(1)}})
+        ),
     )
     return MockCoreComponent(store)
 
@@ -43,7 +42,12 @@ def builder() -> MockCoreComponent:
 @pytest.fixture
 def server() -> MockCoreComponent:
     """Creates a mock server"""
-    store = SimpleNamespace(parameters={})
+    store = SimpleNamespace(
+        parameters={},
+        agents_net_keys=["network_agent"],
+        num_parameter_servers=1,
+        parameter_server_shard=0,
+    )
     return MockCoreComponent(store)
 
 
@@ -101,3 +105,16 @@ def test_on_parameter_server_init(
     assert server.store.parameters["norm_params"] == norm_params
     # make sure we don't overwrite parameters
     assert server.store.parameters["test"] == 1
+
+
+def test_on_parameter_server_init_network_shard(
+    obs_normaliser: ObservationNormalisation, server: MockCoreComponent
+) -> None:
+    """Test that shards without the counts do not hold the normalisation parameters"""
+    server.store.norm_params = {"params": [1, 2, 3, 4]}
+    server.store.num_parameter_servers = 2
+    server.store.parameter_server_shard = 1
+
+    obs_normaliser.on_parameter_server_init(server)  # type: ignore
+
+    assert "norm_params" not in server.store.parameters
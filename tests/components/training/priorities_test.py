@@ -0,0 +1,87 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Trainer priorities unit test"""
+from types import SimpleNamespace
+
+import jax.numpy as jnp
+import numpy as np
+
+from mava.components.training import MAPGWithTrustRegionStep
+from mava.components.training.priorities import (
+    TrainerPriorities,
+    TrainerPrioritiesConfig,
+)
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
+from mava.utils.enums import ReplaySampler
+from mava.utils.priority_utils import AsyncPriorityUpdater
+from tests.components.training.step_test import MockTrainer
+from tests.components.training.step_test_data import dummy_sample
+
+
+def test_priority_fn() -> None:
+    """Test that priorities mix the maximum and mean absolute advantages"""
+    trainer = SimpleNamespace(store=SimpleNamespace())
+    TrainerPriorities(
+        TrainerPrioritiesConfig(priority_max_weight=0.5, min_priority=0.1)
+    ).on_training_utility_fns(trainer)
+
+    advantages = {
+        "agent_0": jnp.array([[1.0, -3.0], [0.0, 0.0]]),
+        "agent_1": jnp.array([[0.0, 0.0], [0.0, 0.0]]),
+    }
+    priorities = trainer.store.priority_fn(advantages)
+    np.testing.assert_allclose(priorities, [0.5 * 3.0 + 0.5 * 1.0, 0.1])
+
+
+def test_priority_updates() -> None:
+    """Test that the step priorities are written to the trainer's table"""
+    replay_buffer = ReplayBuffer(
+        [RingBufferTable("trainer_0", max_size=4, sampler=ReplaySampler.prioritised)]
+    )
+    keys = [
+        replay_buffer.insert("trainer_0", {"step": np.int32(i)}, priority=1.0)
+        for i in range(2)
+    ]
+    sample = dummy_sample._replace(
+        info=dummy_sample.info._replace(key=np.array(keys, dtype=np.uint64))
+    )
+
+    priorities = TrainerPriorities()
+    trainer = MockTrainer()
+    trainer.callbacks = [priorities]
+    trainer.store.trainer_id = "trainer_0"
+    trainer.store.data_server_client = replay_buffer
+    del trainer.store.step_fn
+
+    priorities.on_training_utility_fns(trainer)
+    MAPGWithTrustRegionStep().on_training_step_fn(trainer)
+    priorities.on_training_init_end(trainer)
+    assert isinstance(trainer.store.priority_updater, AsyncPriorityUpdater)
+
+    trainer.store.step_fn(sample)
+    sample_keys, sample_priorities = trainer.store.sample_priorities
+    np.testing.assert_array_equal(sample_keys, keys)
+    assert sample_priorities.shape == (2,)
+    assert np.all(sample_priorities > 0)
+
+    priorities.on_training_step_end(trainer)
+    assert trainer.store.sample_priorities is None
+    priorities.on_training_end(trainer)
+
+    table_priorities = replay_buffer.sample("trainer_0", 50).info.priority
+    np.testing.assert_allclose(
+        np.unique(table_priorities), np.unique(sample_priorities), rtol=1e-6
+    )
@@ -23,15 +23,23 @@ import jax.numpy as jnp
 import numpy as np
 import pytest
 import rlax
+import tensorflow as tf
 
 from mava import constants
+from mava.adders.reverb.base import stack_agents
 from mava.components.normalisation.observation_normalisation import (
     ObservationNormalisation,
 )
 from mava.components.normalisation.value_normalisation import ValueNormalisation
-from mava.components.training.step import DefaultTrainerStep, MAPGWithTrustRegionStep
+from mava.components.training.base import TrainingState, TrainingStateHolder
+from mava.components.training.step import (
+    DefaultTrainerStep,
+    MAPGWithTrustRegionStep,
+    MAPGWithTrustRegionStepConfig,
+)
 from mava.systems.trainer import Trainer
-from tests.components.training.step_test_data import dummy_sample
+from mava.utils.dataset_utils import DLPackIterator, PrefetchIterator
+from tests.components.training.step_test_data import MockStep, dummy_sample
 
 
 def step_fn(sample: int) -> Dict[str, int]:
@@ -116,6 +124,14 @@ class MockParameterClient:
         """Mock set_and_get_async method."""
         self.call_set_and_get_async = True
 
+    def local_counts(self, names: Any) -> Dict[str, Any]:
+        """Mock local_counts method."""
+        return dict(names)
+
+    def set_local(self, params: Dict[str, Any]) -> None:
+        """Mock set_local method."""
+        self.local_params = params
+
 
 class MockTrainer(Trainer):
     """Mock of Trainer"""
@@ -179,7 +195,8 @@ class MockTrainer(Trainer):
             step_fn=step_fn,
             timestamp=1657703548.5225394,  # time.time() format
             trainer_parameter_client=MockParameterClient(),
-            trainer_counts={"next_sample": 2},
+            trainer_counts={"next_sample": 2, "trainer_steps": 7},
+            trainer_policy_trainer_steps=["policy_trainer_steps-network_agent_0"],
             trainer_logger=MockTrainerLogger(),
             trainer_agent_net_keys=trainer_agent_net_keys,
             agents=["agent_0", "agent_1", "agent_2"],
@@ -199,6 +216,23 @@ class MockTrainer(Trainer):
                 normalise_target_values=False,
             ),
         )
+        store.training_state = TrainingStateHolder(
+            TrainingState(
+                policy_params={
+                    net_key: network.policy_params
+                    for net_key, network in networks.items()
+                },
+                critic_params={
+                    net_key: network.critic_params
+                    for net_key, network in networks.items()
+                },
+                policy_opt_states=store.policy_opt_states,
+                critic_opt_states=store.critic_opt_states,
+                random_key=store.base_key,
+                target_value_stats=norm_params[constants.VALUES_NORM_STATE_DICT_KEY],
+                observation_stats=norm_params[constants.OBS_NORM_STATE_DICT_KEY],
+            )
+        )
         self.store = store
         self.callbacks = [ObservationNormalisation, ValueNormalisation]
 
@@ -239,7 +273,15 @@ def test_on_training_step_with_timestamp(
 
     assert mock_trainer.store.trainer_parameter_client.call_set_and_get_async is True
 
-    assert mock_trainer.store.trainer_logger.written == {"next_sample": 2, "sample": 1}
+    assert mock_trainer.store.trainer_parameter_client.local_params == {
+        "policy_trainer_steps-network_agent_0": 7
+    }
+
+    assert mock_trainer.store.trainer_logger.written == {
+        "next_sample": 2,
+        "trainer_steps": 7,
+        "sample": 1,
+    }
 
 
 def test_on_training_step_without_timestamp(
@@ -264,13 +306,65 @@ def test_on_training_step_without_timestamp(
 
     assert mock_trainer.store.trainer_parameter_client.call_set_and_get_async is True
 
-    assert mock_trainer.store.trainer_logger.written == {"next_sample": 2, "sample": 1}
+    assert mock_trainer.store.trainer_parameter_client.local_params == {
+        "policy_trainer_steps-network_agent_0": 7
+    }
+
+    assert mock_trainer.store.trainer_logger.written == {
+        "next_sample": 2,
+        "trainer_steps": 7,
+        "sample": 1,
+    }
+
+
+def test_policy_lag() -> None:
+    """Test the policy lag statistics of tagged experience"""
+    sample = SimpleNamespace(
+        data=SimpleNamespace(
+            extras={
+                "policy_trainer_steps": {
+                    "agent_0": np.array([[8, 9, 0]], dtype=np.int32),
+                    "agent_1": np.array([[10, 10, 0]], dtype=np.int32),
+                }
+            }
+        )
+    )
+    # Zero padding is left out.
+    assert DefaultTrainerStep._policy_lag(sample, np.array(10)) == {
+        "policy_lag_mean": 0.75,
+        "policy_lag_min": 0.0,
+        "policy_lag_max": 2.0,
+    }
+
+    # Experience without tags has no policy lag.
+    assert DefaultTrainerStep._policy_lag(1, np.array(10)) == {}
+
+
+def test_on_training_step_logs_dataset_bytes_copied(mock_trainer: Trainer) -> None:
+    """Test that the bytes copied by a prefetched DLPack dataset are logged"""
+    # Booleans can not be handed over with DLPack, so each batch is copied.
+    dones = np.array([True, False, True])
+    dataset = tf.data.Dataset.from_tensors({"dones": dones}).repeat(3)
+    mock_trainer.store.dataset_iterator = PrefetchIterator(
+        DLPackIterator(dataset), buffer_size=1
+    )
+    trainer_step = DefaultTrainerStep()
+
+    logged = []
+    for _ in range(2):
+        trainer_step.on_training_step(trainer=mock_trainer)
+        logged.append(mock_trainer.store.trainer_logger.written["dataset_bytes_copied"])
+
+    # Each step logs the bytes of its own batch, not of the prefetched ones.
+    assert logged == [dones.nbytes, dones.nbytes]
+    mock_trainer.store.dataset_iterator.close()
 
 
 def test_mapg_with_trust_region_step_initiator() -> None:
     """Test constructor of MAPGWITHTrustRegionStep component"""
     mapg_with_trust_region_step = MAPGWithTrustRegionStep()
     assert mapg_with_trust_region_step.config.discount == 0.99
+    assert mapg_with_trust_region_step.config.donate_training_state
 
 
 def test_on_training_init_start(
@@ -308,7 +402,7 @@ def test_step(mock_trainer: Trainer) -> None:
     del mock_trainer.store.step_fn
 
     mapg_with_trust_region_step.on_training_step_fn(trainer=mock_trainer)
-    old_key = mock_trainer.store.base_key
+    old_state = mock_trainer.store.training_state.state
 
     # Step without policy states
     metrics = mock_trainer.store.step_fn(dummy_sample)
@@ -354,8 +448,10 @@ def test_step(mock_trainer: Trainer) -> None:
     assert round(float(sorted_reward_std[1]), 3) == 0.070
     assert round(float(sorted_reward_std[2]), 3) == 0.077
 
-    # check that trainer random key has been updated
-    assert list(mock_trainer.store.base_key) != list(old_key)
+    # check that the training state was swapped and its random key updated
+    new_state = mock_trainer.store.training_state.state
+    assert new_state is not old_state
+    assert list(new_state.random_key) != list(old_state.random_key)
     num_expected_update_steps = (
         2
         * mock_trainer.store.global_config.num_epochs
@@ -366,7 +462,7 @@ def test_step(mock_trainer: Trainer) -> None:
     # number of times
     for i, net_key in enumerate(mock_trainer.store.networks):
         assert jnp.array_equal(
-            mock_trainer.store.networks[net_key].policy_params["key"],
+            new_state.policy_params[net_key]["key"],
             jnp.array(
                 [
                     i + num_expected_update_steps,
@@ -377,7 +473,7 @@ def test_step(mock_trainer: Trainer) -> None:
         )
 
         assert jnp.array_equal(
-            mock_trainer.store.networks[net_key].critic_params["key"],
+            new_state.critic_params[net_key]["key"],
             jnp.array(
                 [
                     i + num_expected_update_steps,
@@ -387,7 +483,7 @@ def test_step(mock_trainer: Trainer) -> None:
             ),
         )
 
-    assert mock_trainer.store.policy_opt_states == {
+    assert new_state.policy_opt_states == {
         "network_agent_0": {
             constants.OPT_STATE_DICT_KEY: 0 + num_expected_update_steps
         },
@@ -399,7 +495,7 @@ def test_step(mock_trainer: Trainer) -> None:
         },
     }
 
-    assert mock_trainer.store.critic_opt_states == {
+    assert new_state.critic_opt_states == {
         "network_agent_0": {
             constants.OPT_STATE_DICT_KEY: 0 + num_expected_update_steps
         },
@@ -410,3 +506,84 @@ def test_step(mock_trainer: Trainer) -> None:
             constants.OPT_STATE_DICT_KEY: 2 + num_expected_update_steps
         },
     }
+
+
+@pytest.mark.parametrize("donate_training_state", [True, False])
+def test_step_donate_training_state(
+    mock_trainer: Trainer, donate_training_state: bool
+) -> None:
+    """Test that steps with and without donation compute the same state"""
+    mapg_with_trust_region_step = MAPGWithTrustRegionStep(
+        MAPGWithTrustRegionStepConfig(donate_training_state=donate_training_state)
+    )
+    del mock_trainer.store.step_fn
+    network_params = mock_trainer.store.training_state.state.policy_params
+
+    mapg_with_trust_region_step.on_training_step_fn(trainer=mock_trainer)
+    training_state = mock_trainer.store.training_state
+    assert training_state.donated == donate_training_state
+
+    mock_trainer.store.step_fn(dummy_sample)
+    mock_trainer.store.step_fn(dummy_sample)
+
+    num_expected_update_steps = (
+        2
+        * mock_trainer.store.global_config.num_epochs
+        * mock_trainer.store.global_config.num_minibatches
+    )
+    for i, net_key in enumerate(mock_trainer.store.networks):
+        assert jnp.array_equal(
+            training_state.state.policy_params[net_key]["key"],
+            jnp.full(3, i + num_expected_update_steps),
+        )
+        # The buffers shared with the networks are never donated.
+        assert jnp.array_equal(network_params[net_key]["key"], jnp.array([i, i, i]))
+
+
+def test_step_stacked_agents() -> None:
+    """Test that a sample with agents stacked by network gives the same step"""
+    data = dummy_sample.data
+    extras = {
+        key: value for key, value in data.extras.items() if key != "policy_states"
+    }
+    sample = dummy_sample._replace(
+        data=MockStep(
+            data.observations,
+            data.actions,
+            data.rewards,
+            data.discounts,
+            data.start_of_episode,
+            extras,
+        )
+    )
+
+    trainer = MockTrainer()
+    net_keys = trainer.store.trainer_agent_net_keys
+
+    def stack(value: Dict[str, Any]) -> Dict[str, Any]:
+        """Stack agents after the batch and time axes"""
+        return stack_agents(
+            value, net_keys, stack_fn=lambda leaves: jnp.stack(leaves, axis=2)
+        )
+
+    stacked_sample = sample._replace(
+        data=MockStep(
+            stack(data.observations),
+            stack(data.actions),
+            stack(data.rewards),
+            stack(data.discounts),
+            data.start_of_episode,
+            {key: stack(value) for key, value in extras.items()},
+        )
+    )
+    trainer.store.global_config.stack_agents = True
+    del trainer.store.step_fn
+    MAPGWithTrustRegionStep().on_training_step_fn(trainer=trainer)
+    stacked_metrics = trainer.store.step_fn(stacked_sample)
+
+    trainer = MockTrainer()
+    del trainer.store.step_fn
+    MAPGWithTrustRegionStep().on_training_step_fn(trainer=trainer)
+    metrics = trainer.store.step_fn(sample)
+
+    jax.tree_util.tree_map(np.testing.assert_allclose, stacked_metrics, metrics)
@@ -617,6 +617,55 @@ def test_custom_trainer_init_shared_weights_fixed_sampling(
     check_opt_states(builder)
 
 
+################################
+# ON_BUILDING_TRAINER_START TESTS
+################################
+
+
+def test_on_building_trainer_start_training_state(
+    mock_builder_no_shared_weights_fixed_sampling: Builder,
+    single_trainer_init: SingleTrainerInit,
+) -> None:
+    """Tests that on_building_trainer_start creates the training state holder"""
+
+    builder = mock_builder_no_shared_weights_fixed_sampling
+    single_trainer_init.on_building_init_end(builder)
+    builder.store.base_key = jax.random.PRNGKey(5)
+    builder.store.norm_params = {
+        constants.OBS_NORM_STATE_DICT_KEY: {"agent_0": {"mean": np.zeros(1)}},
+        constants.VALUES_NORM_STATE_DICT_KEY: {"agent_0": {"mean": np.zeros(1)}},
+    }
+
+    networks = builder.store.networks
+    initial_params = {
+        net_key: (network.policy_params, network.critic_params)
+        for net_key, network in networks.items()
+    }
+    policy_opt_states = builder.store.policy_opt_states
+    critic_opt_states = builder.store.critic_opt_states
+    base_key = builder.store.base_key
+    norm_params = builder.store.norm_params
+
+    single_trainer_init.on_building_trainer_start(builder)
+
+    state = builder.store.training_state.state
+    for net_key, (policy_params, critic_params) in initial_params.items():
+        assert state.policy_params[net_key] is policy_params
+        assert state.critic_params[net_key] is critic_params
+    assert state.policy_opt_states is policy_opt_states
+    assert state.critic_opt_states is critic_opt_states
+    assert (state.random_key == base_key).all()
+    assert state.observation_stats is norm_params[constants.OBS_NORM_STATE_DICT_KEY]
+    assert state.target_value_stats is norm_params[constants.VALUES_NORM_STATE_DICT_KEY]
+
+    # The initial values are removed, since training steps do not update them.
+    for network in networks.values():
+        assert not hasattr(network, "policy_params")
+        assert not hasattr(network, "critic_params")
+    for name in ["policy_opt_states", "critic_opt_states", "norm_params", "base_key"]:
+        assert not hasattr(builder.store, name)
+
+
 #################################
 # ON_TRAINING_UTILITY_FNS TESTS
 #################################
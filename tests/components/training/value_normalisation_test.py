@@ -41,7 +41,12 @@ def builder() -> MockCoreComponent:
 @pytest.fixture
 def server() -> MockCoreComponent:
     """Creates a mock server"""
-    store = SimpleNamespace(parameters={})
+    store = SimpleNamespace(
+        parameters={},
+        agents_net_keys=["network_agent"],
+        num_parameter_servers=1,
+        parameter_server_shard=0,
+    )
     return MockCoreComponent(store)
 
 
@@ -99,3 +104,16 @@ def test_on_parameter_server_init(
     assert server.store.parameters["norm_params"] == norm_params
     # make sure we don't overwrite parameters
     assert server.store.parameters["test"] == 1
+
+
+def test_on_parameter_server_init_network_shard(
+    value_normaliser: ValueNormalisation, server: MockCoreComponent
+) -> None:
+    """Test that shards without the counts do not hold the normalisation parameters"""
+    server.store.norm_params = {"params": [1, 2, 3, 4]}
+    server.store.num_parameter_servers = 2
+    server.store.parameter_server_shard = 1
+
+    value_normaliser.on_parameter_server_init(server)  # type: ignore
+
+    assert "norm_params" not in server.store.parameters
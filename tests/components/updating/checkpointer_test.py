@@ -17,8 +17,9 @@
 
 import os
 import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
 import numpy as np
@@ -28,6 +29,7 @@ from acme.jax import savers as acme_savers
 from mava.components.updating import Checkpointer
 from mava.components.updating.checkpointer import CheckpointerConfig
 from mava.core_jax import SystemParameterServer
+from mava.utils.read_write_lock import ReadWriteLock
 
 
 @dataclass
@@ -36,6 +38,8 @@ class MockParameterStore:
 
     parameters: Optional[Dict[str, Any]] = None
     experiment_path: Optional[str] = None
+    parameter_server_shard: int = 0
+    num_parameter_servers: int = 1
 
 
 @dataclass
@@ -43,6 +47,7 @@ class MockParameterServer:
     """Mock for the parameter server"""
 
     store: Optional[MockParameterStore] = None
+    parameters_lock: ReadWriteLock = field(default_factory=ReadWriteLock)
 
 
 @pytest.fixture
@@ -172,3 +177,90 @@ def test_checkpointer(
     assert mock_parameter_server.store.last_checkpoint_time < time.time()
     assert mock_parameter_server.store.system_checkpointer._last_saved != 0
     assert mock_parameter_server.store.system_checkpointer._last_saved < time.time()
+
+
+def test_checkpointer_does_not_block_requests(
+    mock_parameter_server: SystemParameterServer,
+    checkpointer: Checkpointer,
+) -> None:
+    """Test that parameters can be set while a checkpoint is saved.
+
+    Args:
+        mock_parameter_server: Fixture SystemParameterServer.
+        checkpointer: Fixture Checkpointer.
+
+    Returns:
+        None
+    """
+    checkpointer.on_parameter_server_init(server=mock_parameter_server)
+    store = mock_parameter_server.store
+    save = store.system_checkpointer.save
+    saved_states = []
+
+    def save_while_setting() -> None:
+        """Save after a concurrent write of the parameters"""
+        set_done = threading.Event()
+
+        def set_parameters() -> None:
+            """Set a parameter"""
+            with mock_parameter_server.parameters_lock.write():
+                store.parameters["trainer_steps"] = np.array([100], dtype=np.int32)
+            set_done.set()
+
+        threading.Thread(target=set_parameters).start()
+        assert set_done.wait(timeout=5)
+        saved_states.append(store.checkpoint_saveable.state)
+        save()
+
+    store.system_checkpointer.save = save_while_setting
+    time.sleep(checkpointer.config.checkpoint_minute_interval * 60 + 2)
+    checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+
+    # The snapshot taken before the write is saved.
+    assert saved_states[0]["trainer_steps"] == 0
+    assert store.checkpoint_saveable.state is store.parameters
+
+
+def test_checkpointer_in_background(
+    mock_parameter_server: SystemParameterServer,
+) -> None:
+    """Test that checkpoints are written from a snapshot in a background thread.
+
+    Args:
+        mock_parameter_server: Fixture SystemParameterServer.
+
+    Returns:
+        None
+    """
+    checkpointer = Checkpointer(
+        config=CheckpointerConfig(
+            checkpoint_minute_interval=1 / 60,  # type: ignore
+            checkpoint_in_background=True,
+        ),
+    )
+    checkpointer.on_parameter_server_init(server=mock_parameter_server)
+    store = mock_parameter_server.store
+    system_checkpointer = store.system_checkpointer
+
+    # A checkpoint is not started while the previous one is being written.
+    writing = threading.Event()
+    store.checkpoint_thread = threading.Thread(target=writing.wait)
+    store.checkpoint_thread.start()
+    checkpoint_init_time = store.last_checkpoint_time
+    time.sleep(checkpointer.config.checkpoint_minute_interval * 60 + 2)
+    checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+    assert store.last_checkpoint_time == checkpoint_init_time
+    writing.set()
+    store.checkpoint_thread.join()
+
+    store.parameters["trainer_steps"] = np.array([50], dtype=np.int32)
+    checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+    assert store.last_checkpoint_time > checkpoint_init_time
+    # Changes after the snapshot are not part of the checkpoint.
+    store.parameters["trainer_steps"] = np.array([100], dtype=np.int32)
+    store.checkpoint_thread.join()
+
+    assert "checkpoint" in os.listdir(system_checkpointer._checkpoint_dir)
+    assert store.checkpoint_saveable.state is store.parameters
+    system_checkpointer.restore()
+    assert store.parameters["trainer_steps"] == 50
@@ -16,7 +16,7 @@
 """Parameter server unit test"""
 
 from types import SimpleNamespace
-from typing import Any, Dict, Sequence, Union
+from typing import Any, Dict, Sequence, Set, Union
 
 import numpy as np
 import pytest
@@ -28,6 +28,7 @@ from mava.components.updating.parameter_server import (
     ParameterServerConfig,
 )
 from mava.core_jax import SystemParameterServer
+from mava.systems.parameter_server import NOT_MODIFIED
 
 
 class MockSystemParameterServer(SystemParameterServer):
@@ -107,10 +108,13 @@ def mock_system_parameter_server() -> SystemParameterServer:
         "terminate": False,
         "num_executor_failed": 0,
     }
+    mock_system_parameter_server.store.parameter_versions = {}
 
     mock_system_parameter_server.store.checkpointing_metric = ["mean_episode_return"]
 
     mock_system_parameter_server.store.num_executors = 2
+    mock_system_parameter_server.store.parameter_server_shard = 0
+    mock_system_parameter_server.store.num_parameter_servers = 1
 
     mock_system_parameter_server.store.checkpoint_best_perf = True
 
@@ -185,6 +189,12 @@ def test_on_parameter_server_init_start_parameter_creation(
         mock_system_parameter_server.store.parameters["critic_network-agent_net_2"]
         == "net_1_2_params"
     )
+    assert (
+        mock_system_parameter_server.store.parameters[
+            "policy_trainer_steps-agent_net_1"
+        ]
+        == 0
+    )
     assert not mock_system_parameter_server.store.parameters["terminate"]
     assert mock_system_parameter_server.store.parameters["num_executor_failed"] == 0
 
@@ -195,13 +205,13 @@ def test_on_parameter_server_get_parameters_single(
 ) -> None:
     """Test get_parameters when only a single parameter is requested"""
 
-    mock_system_parameter_server.store._param_names = "param2"
+    mock_system_parameter_server.request.param_names = "param2"
 
     default_parameter_server.on_parameter_server_get_parameters(
         mock_system_parameter_server
     )
 
-    assert mock_system_parameter_server.store.get_parameters == "param2_value"
+    assert mock_system_parameter_server.request.get_parameters == "param2_value"
 
 
 def test_on_parameter_server_get_parameters_list(
@@ -210,15 +220,19 @@ def test_on_parameter_server_get_parameters_list(
 ) -> None:
     """Test get_parameters when a list of parameters are requested"""
 
-    mock_system_parameter_server.store._param_names = ["param1", "param3"]
+    mock_system_parameter_server.request.param_names = ["param1", "param3"]
 
     default_parameter_server.on_parameter_server_get_parameters(
         mock_system_parameter_server
     )
 
-    assert mock_system_parameter_server.store.get_parameters["param1"] == "param1_value"
-    assert mock_system_parameter_server.store.get_parameters["param3"] == "param3_value"
-    assert "param2" not in mock_system_parameter_server.store.get_parameters.keys()
+    assert (
+        mock_system_parameter_server.request.get_parameters["param1"] == "param1_value"
+    )
+    assert (
+        mock_system_parameter_server.request.get_parameters["param3"] == "param3_value"
+    )
+    assert "param2" not in mock_system_parameter_server.request.get_parameters.keys()
 
 
 def test_on_mock_system_parameter_server_set_parameters(
@@ -227,7 +241,7 @@ def test_on_mock_system_parameter_server_set_parameters(
 ) -> None:
     """Test setting parameters"""
 
-    mock_system_parameter_server.store._set_params = {
+    mock_system_parameter_server.request.set_params = {
         "param1": "param1_new_value",
         "param3": "param3_new_value",
     }
@@ -248,7 +262,7 @@ def test_on_parameter_server_add_to_parameters(
     """Test addition on parameters"""
 
     mock_system_parameter_server.store.parameters["param3"] = 4
-    mock_system_parameter_server.store._add_to_params = {
+    mock_system_parameter_server.request.add_to_params = {
         "param1": "_param1_add",
         "param3": 2,
     }
@@ -264,10 +278,132 @@ def test_on_parameter_server_add_to_parameters(
     assert mock_system_parameter_server.store.parameters["param2"] == "param2_value"
     assert mock_system_parameter_server.store.parameters["param3"] == 6
 
+    # Arrays are added to by replacing them, not in place.
+    count = np.array([1], dtype=np.int32)
+    mock_system_parameter_server.store.parameters["param3"] = count
+    mock_system_parameter_server.request.add_to_params = {"param3": 2}
+    default_parameter_server.on_parameter_server_add_to_parameters(
+        mock_system_parameter_server
+    )
+    assert mock_system_parameter_server.store.parameters["param3"] == 3
+    assert count == 1
+
     # Test that the number of num_executor_failed got incremneted
-    mock_system_parameter_server.store._add_to_params = {"num_executor_failed": 1}
+    mock_system_parameter_server.request.add_to_params = {"num_executor_failed": 1}
 
     default_parameter_server.on_parameter_server_add_to_parameters(
         mock_system_parameter_server
     )
     assert mock_system_parameter_server.store.parameters["num_executor_failed"] == 1
+
+
+def test_on_parameter_server_parameter_versions(
+    default_parameter_server: DefaultParameterServer,
+    mock_system_parameter_server: SystemParameterServer,
+) -> None:
+    """Test that set and add increment the versions of the parameters"""
+
+    mock_system_parameter_server.store.parameters["param3"] = 4
+    mock_system_parameter_server.request.set_params = {"param1": "param1_new_value"}
+    default_parameter_server.on_parameter_server_set_parameters(
+        mock_system_parameter_server
+    )
+    mock_system_parameter_server.request.add_to_params = {"param3": 2}
+    default_parameter_server.on_parameter_server_add_to_parameters(
+        mock_system_parameter_server
+    )
+    default_parameter_server.on_parameter_server_add_to_parameters(
+        mock_system_parameter_server
+    )
+
+    assert mock_system_parameter_server.store.parameter_versions == {
+        "param1": 1,
+        "param3": 2,
+    }
+
+
+def test_on_parameter_server_get_parameters_if_newer(
+    default_parameter_server: DefaultParameterServer,
+    mock_system_parameter_server: SystemParameterServer,
+) -> None:
+    """Test that parameters with known versions are not sent again"""
+
+    mock_system_parameter_server.store.parameter_versions = {"param1": 3}
+    mock_system_parameter_server.request.param_names = ["param1", "param2", "param3"]
+    mock_system_parameter_server.request.param_versions = {"param1": 2, "param2": 0}
+
+    default_parameter_server.on_parameter_server_get_parameters(
+        mock_system_parameter_server
+    )
+
+    assert mock_system_parameter_server.request.get_parameters == {
+        "param1": "param1_value",
+        "param2": NOT_MODIFIED,
+        "param3": "param3_value",
+    }
+    assert mock_system_parameter_server.request.get_parameter_versions == {
+        "param1": 3,
+        "param2": 0,
+        "param3": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "shard_id, expected_keys",
+    [
+        (
+            0,
+            {
+                "policy_network-agent_net_1",
+                "critic_network-agent_net_1",
+                "policy_opt_state-agent_net_1",
+                "critic_opt_state-agent_net_1",
+                "policy_trainer_steps-agent_net_1",
+                "trainer_steps",
+                "trainer_walltime",
+                "evaluator_steps",
+                "evaluator_episodes",
+                "executor_episodes",
+                "executor_steps",
+                "terminate",
+                "num_executor_failed",
+            },
+        ),
+        (
+            1,
+            {
+                "policy_network-agent_net_2",
+                "critic_network-agent_net_2",
+                "policy_opt_state-agent_net_2",
+                "critic_opt_state-agent_net_2",
+                "policy_trainer_steps-agent_net_2",
+            },
+        ),
+    ],
+)
+def test_on_parameter_server_init_start_shard(
+    default_parameter_server: DefaultParameterServer,
+    mock_system_parameter_server: SystemParameterServer,
+    shard_id: int,
+    expected_keys: Set[str],
+) -> None:
+    """Test that each shard only holds its networks and shard 0 the counts"""
+    mock_system_parameter_server.store.parameter_server_shard = shard_id
+    mock_system_parameter_server.store.num_parameter_servers = 2
+
+    default_parameter_server.on_parameter_server_init_start(
+        mock_system_parameter_server
+    )
+    assert set(mock_system_parameter_server.store.parameters.keys()) == expected_keys
+
+    if shard_id == 1:
+        # Shards without the termination flags do not check them.
+        mock_system_parameter_server.request.param_names = [
+            "policy_network-agent_net_2"
+        ]
+        default_parameter_server.on_parameter_server_get_parameters(
+            mock_system_parameter_server
+        )
+        assert mock_system_parameter_server.request.get_parameters == {
+            "policy_network-agent_net_2": "net_1_2_params"
+        }
@@ -16,7 +16,7 @@
 """Terminator component unit tests"""
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, Optional, Tuple, Type
 
 import numpy as np
 import pytest
@@ -40,6 +40,9 @@ class MockParameterStore:
 
     parameters: Optional[Dict[str, Any]] = None
     stopped: bool = False
+    agents_net_keys: Tuple[str, ...] = ("network_agent",)
+    num_parameter_servers: int = 1
+    parameter_server_shard: int = 0
 
 
 @dataclass
@@ -132,6 +135,32 @@ def test_count_condition_terminator_not_terminated(
     assert test_parameter_server.store.stopped is False
 
 
+@pytest.mark.parametrize("condition", count_condition_terminator_data())
+def test_count_condition_terminator_network_shard(
+    condition: Dict, mock_parameter_server: SystemParameterServer
+) -> None:
+    """Test that shards without the counts do not check the count condition"""
+    test_parameter_server = mock_parameter_server
+    test_parameter_server.store.num_parameter_servers = 2
+    test_parameter_server.store.parameter_server_shard = 1
+    test_parameter_server.store.parameters = {
+        "policy_network-network_agent": np.zeros(1)
+    }
+
+    def _set_stopped(parameter_server: MockParameterServer) -> None:
+        """Stop flag"""
+        test_parameter_server.store.stopped = True  # pragma: no cover
+
+    test_terminator = CountConditionTerminator(
+        config=CountConditionTerminatorConfig(  # type: ignore
+            termination_condition=condition, termination_function=_set_stopped
+        )
+    )
+    test_terminator.on_parameter_server_run_loop_termination(test_parameter_server)
+
+    assert test_parameter_server.store.stopped is False
+
+
 @pytest.mark.parametrize(
     "fail_condition,failure", count_condition_terminator_failure_cases()
 )
@@ -15,11 +15,14 @@
 
 """Tests for launcher class for Jax-based Mava systems"""
 
+from typing import Any, List
+
 import launchpad as lp
 import pytest
 from reverb import Client, pybind
 
 from mava.systems.launcher import Launcher, NodeType
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
 from tests.components.building.distributor_test import MockBuilder
 
 
@@ -221,6 +224,33 @@ def test_add_non_multi_process_reverb_node(mock_builder: MockBuilder) -> None:
     assert launcher._node_dict["data_server"]._signature_cache == {}
 
 
+class InProcessMockBuilder(MockBuilder):
+    """Mock builder with an in-process data server"""
+
+    def data_server(self) -> List[Any]:
+        """Data server with in-process tables
+
+        Returns:
+            tables: in-process ring buffer tables
+        """
+        return [RingBufferTable(name="trainer_0", max_size=10)]
+
+
+def test_add_non_multi_process_in_process_node() -> None:
+    """Test that in-process tables are used without a reverb server"""
+    launcher = Launcher(multi_process=False)
+    data_server = launcher.add(
+        InProcessMockBuilder().data_server,
+        node_type=NodeType.reverb,
+        name="data_server",
+    )
+
+    assert not hasattr(launcher, "_replay_server")
+    assert isinstance(data_server, ReplayBuffer)
+    assert launcher._node_dict["data_server"] == data_server
+    assert data_server.server_info()["trainer_0"].max_size == 10
+
+
 def test_add_non_multi_process_courier_node(mock_builder: MockBuilder) -> None:
     """Test the add method for the case of one process and for node_type courier
 
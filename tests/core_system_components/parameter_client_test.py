@@ -16,6 +16,10 @@
 """Tests for parameter client class for Jax-based Mava systems"""
 
 import copy
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 from typing import Any, Dict, List, Sequence, Set, Union
 
@@ -24,8 +28,20 @@ import numpy as np
 import pytest
 
 from mava.callbacks.base import Callback
-from mava.systems.parameter_client import ParameterClient
-from mava.systems.parameter_server import ParameterServer
+from mava.components.updating.parameter_server import DefaultParameterServer
+from mava.systems.parameter_client import (
+    FlatParameter,
+    ParameterClient,
+    ShardedParameterServer,
+)
+from mava.systems.parameter_server import NOT_MODIFIED, ParameterServer
+from mava.utils.done_future import DoneFuture
+from mava.utils.enums import ParameterPrecision
+from mava.utils.parameter_codec import (
+    EncodedParameter,
+    ParameterCodec,
+    ParameterEncoding,
+)
 
 
 class MockParameterServer(ParameterServer):
@@ -36,7 +52,7 @@ class MockParameterServer(ParameterServer):
         set_parameter_keys: Union[str, Sequence[str]],
     ) -> None:
         """Initialize mock parameter server."""
-        self.store = store
+        super().__init__(store, [])
         self.callbacks = components
         self.set_parameter_keys = set_parameter_keys
 
@@ -53,21 +69,21 @@ class MockParameterServer(ParameterServer):
 
     def get_parameters(self, names: Union[str, Sequence[str]]) -> Any:
         """Dummy method for returning get parameters"""
-        self.store._param_names = names
+        request = self.new_request(param_names=names)
 
         # Manually increment all parameters except the set parameters
         # and add them to store to simulate parameters that have changed.
         get_names = set(names) - set(self.set_parameter_keys)
         self._increment_get_parameters(names=get_names)
         get_params = {name: self.store.parameters[name] for name in names}
-        self.store.get_parameters = get_params
+        request.get_parameters = get_params
 
-        return self.store.get_parameters
+        return request.get_parameters
 
     def set_parameters(self, set_params: Dict[str, Any]) -> None:
         """Overwrite set parameters method"""
 
-        self.store._set_params = set_params
+        self.new_request(set_params=set_params)
 
         for key in set_params:
             self.store.parameters[key] = copy.deepcopy(set_params[key])
@@ -160,7 +176,7 @@ def test_add_and_wait(parameter_client: ParameterClient) -> None:
     """Test add and wait method."""
     parameter_client.add_and_wait(params={"new_key": "new_value"})
 
-    assert parameter_client._server.store._add_to_params == {"new_key": "new_value"}
+    assert parameter_client._server.request.add_to_params == {"new_key": "new_value"}
 
 
 def test_get_and_wait(parameter_client: ParameterClient) -> None:
@@ -206,7 +222,7 @@ def test_set_and_wait(parameter_client: ParameterClient) -> None:
 
     parameter_client.set_and_wait()
 
-    assert parameter_client._server.store._set_params == {
+    assert parameter_client._server.request.set_params == {
         "key_0": np.array(1, dtype=np.int32),
         "key_2": np.array(3, dtype=np.int32),
     }
@@ -266,7 +282,7 @@ def test_set_async(parameter_client: ParameterClient) -> None:
 
     parameter_client.set_async()
 
-    assert parameter_client._server.store._set_params == {
+    assert parameter_client._server.request.set_params == {
         "key_0": np.array(1, dtype=np.int32),
         "key_2": np.array(3, dtype=np.int32),
     }
@@ -318,7 +334,7 @@ def test_add_async(parameter_client: ParameterClient) -> None:
 
     parameter_client.add_async(params={"new_key": "new_value"})
     assert parameter_client._add_future is not None
-    assert parameter_client._server.store._add_to_params == {"new_key": "new_value"}
+    assert parameter_client._server.request.add_to_params == {"new_key": "new_value"}
     assert parameter_client._async_add_buffer == {}
     assert parameter_client._add_future.done()
 
@@ -339,6 +355,66 @@ def test_add_async(parameter_client: ParameterClient) -> None:
     assert parameter_client._async_add_buffer == {"new_key_2": 1}
 
 
+def test_add_async_batches_increments(
+    mock_parameter_server: ParameterServer,
+) -> None:
+    """Test that increments are sent in batches and read locally"""
+    parameters = {"key_0": np.array(0, dtype=np.int32)}
+    client = ParameterClient(
+        server=mock_parameter_server,
+        parameters=parameters,
+        multi_process=False,
+        get_keys=["key_0"],
+        add_flush_count=3,
+        add_flush_seconds=60.0,
+    )
+    sent = []
+    client._async_add = lambda params: DoneFuture(sent.append(params))
+
+    client.add_async({"key_0": 1, "key_1": 0.5})
+    client.add_async({"key_0": 2})
+    assert sent == []
+    assert client.local_counts(["key_0"]) == {"key_0": 3}
+
+    client.add_async({"key_0": 1})
+    assert sent == [{"key_0": 4, "key_1": 0.5}]
+    assert client.local_counts(["key_0"]) == {"key_0": 0}
+
+    # Increments are also sent once the time threshold passed.
+    client._last_add_time -= 60.0
+    client.add_async({"key_0": 1})
+    assert sent[-1] == {"key_0": 1}
+
+
+def test_flush_adds(mock_parameter_server: ParameterServer) -> None:
+    """Test that pending increments are sent when flushed or deleted"""
+    parameters = {"key_0": np.array(0, dtype=np.int32)}
+    client = ParameterClient(
+        server=mock_parameter_server,
+        parameters=parameters,
+        multi_process=False,
+        get_keys=["key_0"],
+        add_flush_count=3,
+        add_flush_seconds=60.0,
+    )
+    sent = []
+    client._add = sent.append
+
+    client.add_async({"key_0": 1})
+    client.flush_adds()
+    assert sent == [{"key_0": 1}]
+    assert client.local_counts(["key_0"]) == {"key_0": 0}
+
+    # Nothing is sent without pending increments.
+    client.flush_adds()
+    assert len(sent) == 1
+
+    client.add_async({"key_0": 2})
+    del client
+    gc.collect()
+    assert sent == [{"key_0": 1}, {"key_0": 2}]
+
+
 def test__copy(parameter_client: ParameterClient) -> None:
     """Test _copy method with different kinds of new parameters"""
     parameter_client._copy(
@@ -419,3 +495,453 @@ def test_copy_tuple_with_device(parameter_client: ParameterClient) -> None:
         jax.numpy.array([11]),
         jax.numpy.array([22]),
     ]
+
+
+class VersionedMockParameterServer(ParameterServer):
+    def __init__(
+        self, parameters: Dict[str, Any], shard_id: int = 0, num_shards: int = 1
+    ) -> None:
+        """Parameter server with the default component and no init hooks."""
+        store = SimpleNamespace(
+            parameters=parameters, parameter_versions={}, num_executors=1
+        )
+        super().__init__(store, [], shard_id, num_shards)
+        self.callbacks = [DefaultParameterServer()]
+        # Asynchronous requests, which are done when they are made.
+        self.futures = SimpleNamespace(
+            get_parameters_if_newer=lambda *args, **kwargs: DoneFuture(
+                self.get_parameters_if_newer(*args, **kwargs)
+            ),
+            set_parameters=lambda params: DoneFuture(self.set_parameters(params)),
+            add_to_parameters=lambda params: DoneFuture(self.add_to_parameters(params)),
+            # Subscription requests wait for changes, so they run in a thread.
+            get_parameters_when_newer=lambda *args, **kwargs: ThreadPoolExecutor(
+                max_workers=1
+            ).submit(self.get_parameters_when_newer, *args, **kwargs),
+        )
+
+
+def test_versioned_get() -> None:
+    """Test that a versioned client only copies parameters that changed"""
+    server = VersionedMockParameterServer(
+        parameters={
+            "key_0": np.array(1, dtype=np.int32),
+            "policy_network-network_key_0": {"layer_0": {"weights": 1}},
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    client_params = {
+        "key_0": np.array(0, dtype=np.int32),
+        "policy_network-network_key_0": {"layer_0": {"weights": 0}},
+    }
+    client = ParameterClient(
+        server=server,
+        parameters=client_params,
+        multi_process=False,
+        get_keys=["key_0", "policy_network-network_key_0"],
+        versioned_get=True,
+    )
+
+    client.get_and_wait()
+    assert client_params["key_0"] == 1
+    assert client_params["policy_network-network_key_0"]["layer_0"]["weights"] == 1
+    assert client._versions == {"key_0": 0, "policy_network-network_key_0": 0}
+
+    # Nothing changed, so nothing is sent.
+    client.get_and_wait()
+    assert all(
+        value is NOT_MODIFIED for value in server.request.get_parameters.values()
+    )
+
+    server.set_parameters({"policy_network-network_key_0": {"layer_0": {"weights": 2}}})
+    server.add_to_parameters({"key_0": np.array(3, dtype=np.int32)})
+    client.get_async()
+    assert client_params["key_0"] == 4
+    assert client_params["policy_network-network_key_0"]["layer_0"]["weights"] == 2
+    assert client._versions == {"key_0": 1, "policy_network-network_key_0": 1}
+
+
+def test_versioned_set_and_get_async() -> None:
+    """Test that periodic set and get requests only fetch changed parameters"""
+    server = VersionedMockParameterServer(
+        parameters={
+            "key_0": np.array(1, dtype=np.int32),
+            "key_1": np.array(0, dtype=np.int32),
+            "policy_network-network_key_0": {"layer_0": {"weights": 1}},
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    client_params = {
+        "key_0": np.array(0, dtype=np.int32),
+        "key_1": np.array(5, dtype=np.int32),
+        "policy_network-network_key_0": {"layer_0": {"weights": 0}},
+    }
+    client = ParameterClient(
+        server=server,
+        parameters=client_params,
+        multi_process=True,
+        get_keys=["key_0", "key_1", "policy_network-network_key_0"],
+        set_keys=["key_1"],
+        update_period=1,
+        versioned_get=True,
+    )
+
+    client.set_and_get_async()
+    assert server.store.parameters["key_1"] == 5
+    assert client_params["key_0"] == 1
+    assert client_params["policy_network-network_key_0"]["layer_0"]["weights"] == 1
+    # The set parameters are not fetched back.
+    assert client._versions == {"key_0": 0, "policy_network-network_key_0": 0}
+
+    # Nothing changed, so nothing is sent.
+    client.set_and_get_async()
+    client.set_and_get_async()
+    assert set(server.request.get_parameters) == {
+        "key_0",
+        "policy_network-network_key_0",
+    }
+    assert all(
+        value is NOT_MODIFIED for value in server.request.get_parameters.values()
+    )
+
+    server.set_parameters({"policy_network-network_key_0": {"layer_0": {"weights": 2}}})
+    client.set_and_get_async()
+    client.set_and_get_async()
+    assert server.request.get_parameters["key_0"] is NOT_MODIFIED
+    assert client_params["policy_network-network_key_0"]["layer_0"]["weights"] == 2
+    assert client._versions == {"key_0": 0, "policy_network-network_key_0": 1}
+
+
+def test_get_parameters_when_newer() -> None:
+    """Test that the server answers waiting requests once parameters are set"""
+    server = VersionedMockParameterServer(
+        parameters={
+            "policy_network-network_key_0": {"layer_0": {"weights": 1}},
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    names = ["policy_network-network_key_0"]
+
+    # Parameters that changed since the given versions are returned at once.
+    parameters, versions = server.get_parameters_when_newer(names, {}, timeout=60)
+    assert parameters == {names[0]: {"layer_0": {"weights": 1}}}
+    assert versions == {names[0]: 0}
+
+    # Without changes, the request is answered after the timeout.
+    parameters, versions = server.get_parameters_when_newer(
+        names, versions, timeout=0.01
+    )
+    assert parameters == {names[0]: NOT_MODIFIED}
+
+    response: List[Any] = []
+    request = threading.Thread(
+        target=lambda: response.append(
+            server.get_parameters_when_newer(names, versions, timeout=60)
+        )
+    )
+    request.start()
+    request.join(timeout=0.1)
+    assert not response
+
+    server.set_parameters({names[0]: {"layer_0": {"weights": 2}}})
+    request.join(timeout=5)
+    assert response == [({names[0]: {"layer_0": {"weights": 2}}}, {names[0]: 1})]
+
+
+def test_subscribed_get() -> None:
+    """Test that a subscribed client copies parameters as soon as they are set"""
+    server = VersionedMockParameterServer(
+        parameters={
+            "policy_network-network_key_0": {"layer_0": {"weights": 1}},
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    client_params = {"policy_network-network_key_0": {"layer_0": {"weights": 0}}}
+    client = ParameterClient(
+        server=server,
+        parameters=client_params,
+        multi_process=True,
+        get_keys=["policy_network-network_key_0"],
+        update_period=1000,
+        versioned_get=True,
+        subscribe=True,
+    )
+    client.get_and_wait()
+
+    # The open request is not answered while the parameters do not change.
+    client.get_async()
+    future = client._get_future
+    assert future is not None and not future.done()
+
+    server.set_parameters({"policy_network-network_key_0": {"layer_0": {"weights": 2}}})
+    future.result(timeout=5)
+    client.get_async()
+    assert client_params["policy_network-network_key_0"]["layer_0"]["weights"] == 2
+    # A new request is opened for the next change.
+    assert client._get_future is not None and client._get_future is not future
+
+    server.set_parameters({"policy_network-network_key_0": {"layer_0": {"weights": 3}}})
+    client._get_future.result(timeout=5)
+
+
+def test_subscribed_get_watches_networks() -> None:
+    """Test that subscriptions are answered by network changes, not by counts"""
+    server = VersionedMockParameterServer(
+        parameters={
+            "policy_network-network_key_0": {"layer_0": {"weights": 1}},
+            "executor_steps": np.array(0, dtype=np.int32),
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    client_params = {
+        "policy_network-network_key_0": {"layer_0": {"weights": 0}},
+        "executor_steps": np.array(0, dtype=np.int32),
+    }
+    client = ParameterClient(
+        server=server,
+        parameters=client_params,
+        multi_process=True,
+        get_keys=["policy_network-network_key_0", "executor_steps"],
+        versioned_get=True,
+        subscribe=True,
+        subscribe_keys=["policy_network-network_key_0"],
+    )
+    client.get_and_wait()
+
+    # Counts change with every episode, but do not answer the open request.
+    client.get_async()
+    future = client._get_future
+    server.add_to_parameters({"executor_steps": np.array(5, dtype=np.int32)})
+    server.set_parameters({"executor_steps": np.array(6, dtype=np.int32)})
+    time.sleep(0.1)
+    assert future is not None and not future.done()
+
+    # The counts are returned along with the new network parameters.
+    server.set_parameters({"policy_network-network_key_0": {"layer_0": {"weights": 2}}})
+    future.result(timeout=5)
+    client.get_async()
+    assert client_params["policy_network-network_key_0"]["layer_0"]["weights"] == 2
+    assert client_params["executor_steps"] == 6
+
+    server.set_parameters({"policy_network-network_key_0": {"layer_0": {"weights": 3}}})
+    client._get_future.result(timeout=5)
+
+
+def test_subscribe_requires_versioned_get() -> None:
+    """Test that subscriptions are only created with versioned gets"""
+    with pytest.raises(ValueError, match="versioned_get"):
+        ParameterClient(
+            server=VersionedMockParameterServer(parameters={}),
+            parameters={},
+            multi_process=True,
+            subscribe=True,
+        )
+
+
+def test_get_with_codec() -> None:
+    """Test that a client decodes the parameters encoded by the server"""
+    weights = np.linspace(-1.0, 1.0, 6, dtype=np.float32)
+    server = VersionedMockParameterServer(
+        parameters={
+            "key_0": np.array(1, dtype=np.int32),
+            "policy_network-network_key_0": {"layer_0": {"weights": weights}},
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    codec = ParameterCodec(
+        default=ParameterEncoding(precision=ParameterPrecision.float16)
+    )
+    client_params = {
+        "key_0": np.array(0, dtype=np.int32),
+        "policy_network-network_key_0": {"layer_0": {"weights": np.zeros(6)}},
+    }
+    client = ParameterClient(
+        server=server,
+        parameters=client_params,
+        multi_process=False,
+        get_keys=["key_0", "policy_network-network_key_0"],
+        versioned_get=True,
+        codec=codec,
+    )
+
+    encoded, _ = server.get_parameters_if_newer(client._get_keys, {}, codec=codec)
+    assert isinstance(encoded["policy_network-network_key_0"], EncodedParameter)
+
+    client.get_and_wait()
+    assert client_params["key_0"] == 1
+    received = client_params["policy_network-network_key_0"]["layer_0"]["weights"]
+    assert received.dtype == np.float32
+    np.testing.assert_allclose(received, weights, atol=1e-3)
+
+
+def test_set_and_get_async_with_codec() -> None:
+    """Test that periodic set and get requests fetch encoded parameters"""
+    weights = np.linspace(-1.0, 1.0, 6, dtype=np.float32)
+    server = VersionedMockParameterServer(
+        parameters={
+            "key_0": np.array(1, dtype=np.int32),
+            "policy_network-network_key_0": {"layer_0": {"weights": weights}},
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    responses: List[Any] = []
+
+    def get_parameters_if_newer(*args: Any, **kwargs: Any) -> DoneFuture:
+        """Record the encoded responses of the server"""
+        responses.append(server.get_parameters_if_newer(*args, **kwargs))
+        return DoneFuture(responses[-1])
+
+    server.futures.get_parameters_if_newer = get_parameters_if_newer
+    codec = ParameterCodec(default=ParameterEncoding(precision=ParameterPrecision.int8))
+    client_params = {
+        "key_0": np.array(0, dtype=np.int32),
+        "policy_network-network_key_0": {"layer_0": {"weights": np.zeros(6)}},
+    }
+    client = ParameterClient(
+        server=server,
+        parameters=client_params,
+        multi_process=True,
+        get_keys=["key_0", "policy_network-network_key_0"],
+        update_period=1,
+        versioned_get=True,
+        codec=codec,
+    )
+
+    client.set_and_get_async()
+    encoded, _ = responses[-1]
+    assert isinstance(encoded["policy_network-network_key_0"], EncodedParameter)
+    assert client_params["key_0"] == 1
+    received = client_params["policy_network-network_key_0"]["layer_0"]["weights"]
+    assert received.dtype == np.float32
+    np.testing.assert_allclose(received, weights, atol=1.0 / 127)
+
+
+def test_flat_parameter() -> None:
+    """Test that the leaves of a flat parameter are views into its buffer"""
+    weights = jax.numpy.arange(6, dtype=np.float32).reshape(2, 3)
+    value = {"layer_0": {"w": weights, "b": np.zeros(3, dtype=np.float32)}}
+    layer = value["layer_0"]
+
+    assert FlatParameter.is_supported(value)
+    assert not FlatParameter.is_supported({"w": np.zeros(2), "count": np.zeros(1, int)})
+    assert not FlatParameter.is_supported({"w": "weights"})
+    assert not FlatParameter.is_supported(np.zeros(2))
+
+    flat = FlatParameter(value)
+    assert flat.buffer.shape == (9,)
+    np.testing.assert_array_equal(layer["w"], weights)
+    assert np.shares_memory(layer["w"], flat.buffer)
+    assert np.shares_memory(layer["b"], flat.buffer)
+
+    w, b = layer["w"], layer["b"]
+    flat.copy_from({"layer_0": {"w": np.ones((2, 3)), "b": np.full(3, 2.0)}})
+    # The same leaves hold the new values.
+    assert value["layer_0"]["w"] is w and value["layer_0"]["b"] is b
+    np.testing.assert_array_equal(w, np.ones((2, 3)))
+    np.testing.assert_array_equal(b, np.full(3, 2.0))
+
+    with pytest.raises(ValueError):
+        flat.copy_from({"layer_0": {"w": np.ones((2, 3))}})
+
+
+def test_get_with_flat_layout() -> None:
+    """Test that fetched networks are copied into the existing leaves"""
+    server = VersionedMockParameterServer(
+        parameters={
+            "policy_network-network_key_0": {
+                "layer_0": {"w": np.full(4, 3.0, dtype=np.float32)}
+            },
+            "key_0": np.array(5, dtype=np.int32),
+            "terminate": False,
+            "num_executor_failed": 0,
+        }
+    )
+    network = {"layer_0": {"w": np.zeros(4, dtype=np.float32)}}
+    count = np.array(0, dtype=np.int32)
+    client = ParameterClient(
+        server=server,
+        parameters={"policy_network-network_key_0": network, "key_0": count},
+        multi_process=False,
+        get_keys=["policy_network-network_key_0", "key_0"],
+        flat_layout=True,
+    )
+    assert list(client._flat_parameters) == ["policy_network-network_key_0"]
+    weights = network["layer_0"]["w"]
+
+    client.get_and_wait()
+    assert network["layer_0"]["w"] is weights
+    np.testing.assert_array_equal(weights, np.full(4, 3.0))
+    assert count == 5
+
+
+def test_sharded_parameter_server() -> None:
+    """Test that requests are routed to the shards holding the parameters"""
+    shards = [
+        VersionedMockParameterServer(
+            parameters={
+                "trainer_steps": np.array(1, dtype=np.int32),
+                "policy_network-network_agent_0": {"layer_0": {"weights": 1}},
+                "terminate": False,
+                "num_executor_failed": 0,
+            },
+            shard_id=0,
+            num_shards=2,
+        ),
+        VersionedMockParameterServer(
+            parameters={"policy_network-network_agent_1": {"layer_0": {"weights": 2}}},
+            shard_id=1,
+            num_shards=2,
+        ),
+    ]
+    client_params = {
+        "trainer_steps": np.array(0, dtype=np.int32),
+        "policy_network-network_agent_0": {"layer_0": {"weights": 0}},
+        "policy_network-network_agent_1": {"layer_0": {"weights": 0}},
+    }
+    client = ParameterClient(
+        server=shards,
+        parameters=client_params,
+        multi_process=True,
+        get_keys=list(client_params.keys()),
+        versioned_get=True,
+        network_keys=["network_agent_0", "network_agent_1"],
+    )
+    assert isinstance(client._server, ShardedParameterServer)
+    assert client._server.split(client_params.keys()) == {
+        0: ["trainer_steps", "policy_network-network_agent_0"],
+        1: ["policy_network-network_agent_1"],
+    }
+
+    client.get_async()
+    assert client_params["trainer_steps"] == 1
+    assert client_params["policy_network-network_agent_0"]["layer_0"]["weights"] == 1
+    assert client_params["policy_network-network_agent_1"]["layer_0"]["weights"] == 2
+    assert client._versions == {
+        "trainer_steps": 0,
+        "policy_network-network_agent_0": 0,
+        "policy_network-network_agent_1": 0,
+    }
+
+    # Counts are only held, and added to, by the counter shard.
+    client.add_async({"trainer_steps": np.array(2, dtype=np.int32)})
+    assert shards[0].store.parameters["trainer_steps"] == 3
+
+    client.set_and_wait({"policy_network-network_agent_1": {"layer_0": {"weights": 5}}})
+    assert shards[1].store.parameters["policy_network-network_agent_1"] == {
+        "layer_0": {"weights": 5}
+    }
+    client.get_and_wait()
+    assert client_params["policy_network-network_agent_1"]["layer_0"]["weights"] == 5
+    assert client_params["trainer_steps"] == 3
+    # Unchanged parameters are not sent again.
+    assert (
+        shards[0].request.get_parameters["policy_network-network_agent_0"]
+        is NOT_MODIFIED
+    )
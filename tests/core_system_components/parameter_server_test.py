@@ -15,6 +15,7 @@
 
 """Tests for parameter server class for Jax-based Mava systems"""
 
+import threading
 import time
 from types import SimpleNamespace
 from typing import List
@@ -47,7 +48,6 @@ def test_parameter_server() -> ParameterServer:
         store=SimpleNamespace(
             store_key="expected_value",
             global_config=SimpleNamespace(non_blocking_sleep_seconds=1),
-            get_parameters="parameter_list",
         ),
         components=[],
     )
@@ -59,23 +59,78 @@ def test_store_loaded(test_parameter_server: TestParameterServer) -> None:
 
 
 def test_get_parameters_store(test_parameter_server: TestParameterServer) -> None:
-    """Test that store is handled properly in get_parameters"""
-    assert test_parameter_server.get_parameters("parameter_names") == "parameter_list"
-    assert test_parameter_server.store._param_names == "parameter_names"
+    """Test that the request is handled properly in get_parameters"""
+    # No component sets the requested parameters.
+    assert test_parameter_server.get_parameters("parameter_names") is None
+    assert test_parameter_server.request.param_names == "parameter_names"
+    assert not hasattr(test_parameter_server.store, "param_names")
+
+
+def test_get_parameters_if_newer_store(
+    test_parameter_server: TestParameterServer,
+) -> None:
+    """Test that the request is handled properly in get_parameters_if_newer"""
+    versions = {"parameter_name": 1}
+    assert test_parameter_server.get_parameters_if_newer(
+        ["parameter_name"], versions
+    ) == (None, {})
+    assert test_parameter_server.request.param_names == ["parameter_name"]
+    assert test_parameter_server.request.param_versions == versions
+
+    # Every request starts with a new request state.
+    test_parameter_server.get_parameters("parameter_names")
+    assert not hasattr(test_parameter_server.request, "param_versions")
 
 
 def test_set_parameters_store(test_parameter_server: TestParameterServer) -> None:
-    """Test that store is handled properly in set_parameters"""
+    """Test that the request is handled properly in set_parameters"""
     set_params = {"parameter_name": "value"}
     test_parameter_server.set_parameters(set_params)
-    assert test_parameter_server.store._set_params["parameter_name"] == "value"
+    assert test_parameter_server.request.set_params["parameter_name"] == "value"
 
 
 def test_add_to_parameters_store(test_parameter_server: TestParameterServer) -> None:
-    """Test that store is handled properly in add_to_parameters"""
+    """Test that the request is handled properly in add_to_parameters"""
     add_to_params = {"parameter_name": "value"}
     test_parameter_server.add_to_parameters(add_to_params)
-    assert test_parameter_server.store._add_to_params["parameter_name"] == "value"
+    assert test_parameter_server.request.add_to_params["parameter_name"] == "value"
+
+
+def test_request_thread_local(test_parameter_server: TestParameterServer) -> None:
+    """Test that requests handled by different threads do not share state"""
+    test_parameter_server.get_parameters("main_thread")
+
+    def request() -> None:
+        test_parameter_server.set_parameters({"parameter_name": "value"})
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    thread.join()
+
+    assert test_parameter_server.request.param_names == "main_thread"
+    assert not hasattr(test_parameter_server.request, "set_params")
+
+
+def test_set_parameters_waits_for_readers(
+    test_parameter_server: TestParameterServer,
+) -> None:
+    """Test that writes wait until concurrent reads are done"""
+    set_done = threading.Event()
+
+    def request() -> None:
+        test_parameter_server.set_parameters({})
+        set_done.set()
+
+    with test_parameter_server.parameters_lock.read():
+        # Reads do not wait for each other.
+        test_parameter_server.get_parameters("parameter_names")
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        assert not set_done.wait(timeout=0.1)
+
+    assert set_done.wait(timeout=5)
+    thread.join()
 
 
 def test_step_sleep(test_parameter_server: TestParameterServer) -> None:
@@ -141,3 +196,31 @@ def test_step_hook_order(test_parameter_server: TestParameterServer) -> None:
         "on_parameter_server_run_loop_termination",
         "on_parameter_server_run_loop_end",
     ]
+
+
+def test_step_checkpoint_does_not_block_requests() -> None:
+    """Test that requests are handled while the run loop saves a checkpoint"""
+    set_done = threading.Event()
+
+    class SlowCheckpointer(Callback):
+        def on_parameter_server_run_loop_checkpoint(
+            self, server: ParameterServer
+        ) -> None:
+            """Wait for a concurrent request that takes the write lock"""
+
+            def set_parameters() -> None:
+                with server.parameters_lock.write():
+                    set_done.set()
+
+            thread = threading.Thread(target=set_parameters)
+            thread.start()
+            thread.join(timeout=5)
+
+    server = ParameterServer(
+        store=SimpleNamespace(
+            global_config=SimpleNamespace(non_blocking_sleep_seconds=0)
+        ),
+        components=[SlowCheckpointer()],
+    )
+    server.step()
+    assert set_done.is_set()
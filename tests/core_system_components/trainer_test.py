@@ -31,6 +31,9 @@ class MockParameterClient(ParameterClient):
         """Initialise the parameter client"""
         self.parameters = {"terminate": False}
 
+    def flush_adds(self) -> None:
+        """Mock for flush_adds method"""
+
     def set_and_wait(self, params: Dict[str, Any] = None) -> None:
         """Mock for set_and_wait method"""
         if params is None:
@@ -124,3 +127,4 @@ def test_error_step(mock_trainer_with_error: TestTrainerError) -> None:
     assert mock_trainer_with_error.store.trainer_parameter_client.parameters == {
         "terminate": True
     }
+    assert mock_trainer_with_error.hook_list[-1] == "on_training_end"
@@ -15,8 +15,23 @@
 
 """Environment loop unit test"""
 
+from types import SimpleNamespace
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import dm_env
+import jax
+import numpy as np
 import pytest
 
+from mava import specs as mava_specs
+from mava.environment_loop import (
+    ParallelEnvironmentLoop,
+    VectorisedParallelEnvironmentLoop,
+)
+from mava.types import NestedArray
+from mava.utils.environments import debugging_utils
+from mava.wrappers.subprocess_env import SubprocessEnvWrapper
 from tests.conftest import EnvSpec, Helpers, MockedEnvironments
 from tests.mocks import MockedSystem
 
@@ -74,3 +89,184 @@ class TestEnvironmentLoop:
         result = env_loop.run_episode()
 
         helpers.assert_valid_episode(result)
+
+
+class RecordingAdder:
+    """Adder that records the number of timesteps it is given."""
+
+    def __init__(self) -> None:
+        """Initialise the counts."""
+        self.num_add_first = 0
+        self.num_add = 0
+
+    def add_first(self, timestep: dm_env.TimeStep, extras: Dict = {}) -> None:
+        """Record a first timestep."""
+        self.num_add_first += 1
+
+    def add(self, actions: Dict, timestep: dm_env.TimeStep, extras: Dict = {}) -> None:
+        """Record a timestep."""
+        self.num_add += 1
+
+
+class BatchedExecutor:
+    """Executor acting on observations with a leading environment axis."""
+
+    def __init__(self, specs: Dict[str, Any]) -> None:
+        """Initialise the executor."""
+        self._specs = specs
+        self._evaluator = False
+        self.store = SimpleNamespace(adder=None)
+        self.batch_sizes: List[int] = []
+        self.num_updates = 0
+
+    def select_actions(self, observations: Dict[str, NestedArray]) -> Any:
+        """Select the same action for every agent in every environment."""
+        actions_info, policies_info = {}, {}
+        for agent, observation in observations.items():
+            num_environments = jax.tree_util.tree_leaves(observation)[0].shape[0]
+            self.batch_sizes.append(num_environments)
+            action_spec = self._specs[agent].actions
+            actions_info[agent] = np.zeros(num_environments, dtype=action_spec.dtype)
+            policies_info[agent] = np.zeros(num_environments, dtype=np.float32)
+        return actions_info, policies_info
+
+    def observe_first(self, timestep: dm_env.TimeStep, extras: Dict = {}) -> None:
+        """Pass the first timestep to the current adder."""
+        self.store.adder.add_first(timestep, extras)
+
+    def observe(
+        self, actions: Any, next_timestep: dm_env.TimeStep, next_extras: Dict = {}
+    ) -> None:
+        """Pass the timestep to the current adder."""
+        self.store.adder.add(actions, next_timestep, next_extras)
+
+    def update(self, wait: bool = False) -> None:
+        """No parameters to update, only count the calls."""
+        self.num_updates += 1
+
+
+def test_vectorised_environment_loop(helpers: Helpers) -> None:
+    """Test that all environments are stepped together with their own adders."""
+    env_spec = EnvSpec(MockedEnvironments.Mocked_Dicrete)
+    environments = []
+    for _ in range(2):
+        wrapped_env, specs = helpers.get_wrapped_env(env_spec)
+        environments.append(wrapped_env)
+
+    executor = BatchedExecutor(specs)
+    adders = [RecordingAdder(), RecordingAdder()]
+    env_loop = VectorisedParallelEnvironmentLoop(
+        environments=environments,
+        executor=executor,  # type: ignore
+        adders=adders,
+    )
+
+    # Both mocked environments end their episode on the same step.
+    first_result = env_loop.run_episode()
+    num_steps = len(executor.batch_sizes)
+    second_result = env_loop.run_episode()
+
+    helpers.assert_valid_episode(first_result)
+    assert second_result["episodes"] == 2
+    assert first_result["episode_length"] == second_result["episode_length"]
+    # The second episode was already finished, so no extra steps were taken.
+    assert len(executor.batch_sizes) == num_steps
+    assert set(executor.batch_sizes) == {2}
+
+    episode_length = first_result["episode_length"]
+    for adder in adders:
+        # The finished environments have been reset already.
+        assert adder.num_add_first == 2
+        assert adder.num_add == episode_length
+    # The executor is updated once per environment step.
+    assert executor.num_updates == 2 * episode_length
+
+
+def test_vectorised_environment_loop_adders_check(helpers: Helpers) -> None:
+    """Test that the loop requires one adder per environment."""
+    wrapped_env, specs = helpers.get_wrapped_env(
+        EnvSpec(MockedEnvironments.Mocked_Dicrete)
+    )
+    with pytest.raises(ValueError):
+        VectorisedParallelEnvironmentLoop(
+            environments=[wrapped_env, wrapped_env],
+            executor=BatchedExecutor(specs),  # type: ignore
+            adders=[RecordingAdder()],
+        )
+
+
+class ClosingWriter:
+    """Shared writer that records whether it was closed."""
+
+    def __init__(self) -> None:
+        """Start open."""
+        self.closed = False
+
+    def close(self) -> None:
+        """Record the close."""
+        self.closed = True
+
+
+def test_vectorised_environment_loop_closes_shared_writer(helpers: Helpers) -> None:
+    """Test that the loop closes its shared writer when it stops running."""
+    wrapped_env, specs = helpers.get_wrapped_env(
+        EnvSpec(MockedEnvironments.Mocked_Dicrete)
+    )
+    shared_writer = ClosingWriter()
+    env_loop = VectorisedParallelEnvironmentLoop(
+        environments=[wrapped_env, wrapped_env],
+        executor=BatchedExecutor(specs),  # type: ignore
+        adders=[RecordingAdder(), RecordingAdder()],
+        shared_writer=shared_writer,
+    )
+
+    with patch.object(ParallelEnvironmentLoop, "run", side_effect=RuntimeError):
+        with pytest.raises(RuntimeError):
+            env_loop.run()
+    assert shared_writer.closed
+
+
+def make_debugging_environment() -> dm_env.Environment:
+    """Creates a seeded debugging environment."""
+    return debugging_utils.make_environment(random_seed=42)[0]
+
+
+def test_vectorised_environment_loop_subprocess_environments() -> None:
+    """Test that subprocess environments are stepped like local environments."""
+    specs = mava_specs.MAEnvironmentSpec(
+        make_debugging_environment()
+    ).get_agent_environment_specs()
+
+    results = []
+    for make_environment in [
+        make_debugging_environment,
+        lambda: SubprocessEnvWrapper(make_debugging_environment),
+    ]:
+        environments = [make_environment() for _ in range(2)]
+        adders = [RecordingAdder(), RecordingAdder()]
+        env_loop = VectorisedParallelEnvironmentLoop(
+            environments=environments,
+            executor=BatchedExecutor(specs),  # type: ignore
+            adders=adders,
+        )
+        result = env_loop.run_episode()
+        results.append(
+            (
+                result["episode_length"],
+                result["mean_episode_return"],
+                [(adder.num_add_first, adder.num_add) for adder in adders],
+            )
+        )
+        for environment in environments:
+            if isinstance(environment, SubprocessEnvWrapper):
+                environment.close()
+
+    (local_length, local_return, local_adds), (
+        subprocess_length,
+        subprocess_return,
+        subprocess_adds,
+    ) = results
+    assert subprocess_length == local_length
+    np.testing.assert_allclose(subprocess_return, local_return)
+    # Steps of the other environment may still be in flight, so it can lag.
+    assert subprocess_adds[0] == local_adds[0] or subprocess_adds[1] == local_adds[1]
@@ -287,6 +287,10 @@ class HookOrderTracking:
         """[summary]"""
         self.hook_list.append("on_training_step_end")
 
+    def on_training_end(self) -> None:
+        """[summary]"""
+        self.hook_list.append("on_training_end")
+
     ###############################
     # system parameter server hooks
     ###############################
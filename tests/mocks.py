@@ -415,6 +415,7 @@ class MockAdder(Component):
 
     def on_building_executor_adder(self, builder: SystemBuilder) -> None:
         """_summary_"""
+        builder.store.adder_factory = lambda client: MockAdderClass()
         builder.store.adder = MockAdderClass()
 
     @staticmethod
@@ -0,0 +1,230 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process replay buffer unit test"""
+
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+import reverb
+import tree
+from acme.adders.reverb.sequence import EndBehavior
+from acme.utils import tree_utils
+
+from mava.adders import reverb as reverb_adders
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
+from mava.utils.enums import ReplaySampler
+from tests.adders.sequence_adders_test_data import TEST_CASES
+
+
+def make_item(value: float) -> Dict[str, Any]:
+    """Nested item whose leaves are filled with value"""
+    return {"observations": np.full((2, 3), value), "step": np.int32(value)}
+
+
+def test_queue_table() -> None:
+    """Test that a queue samples items once, in insertion order"""
+    table = RingBufferTable("table_0", max_size=3, sampler=ReplaySampler.queue)
+    for i in range(3):
+        table.insert(make_item(i))
+
+    # Inserting into a full queue blocks.
+    with pytest.raises(TimeoutError):
+        table.insert(make_item(3), timeout=0.01)
+
+    sample = table.sample(2)
+    assert isinstance(sample, reverb.ReplaySample)
+    np.testing.assert_array_equal(sample.data["step"], [0, 1])
+    assert sample.data["observations"].shape == (2, 2, 3)
+    np.testing.assert_array_equal(sample.info.key, [1, 2])
+    np.testing.assert_array_equal(sample.info.table_size, [3, 3])
+
+    # The ring buffer wraps around.
+    table.insert(make_item(3))
+    np.testing.assert_array_equal(table.sample(2).data["step"], [2, 3])
+    assert table.info().current_size == 0
+    assert table.info().num_inserts == 4
+    assert table.info().num_samples == 4
+
+    # A queue waits for a full batch.
+    table.insert(make_item(4))
+    with pytest.raises(TimeoutError):
+        table.sample(2, timeout=0.01)
+
+
+def test_uniform_table() -> None:
+    """Test that a uniform table overwrites its oldest items"""
+    table = RingBufferTable(
+        "table_0", max_size=3, sampler=ReplaySampler.uniform, seed=0
+    )
+    for i in range(5):
+        table.insert(make_item(i))
+
+    assert table.info().current_size == 3
+    steps = table.sample(100).data["step"]
+    assert set(steps) == {2, 3, 4}
+    np.testing.assert_array_equal(table.sample(1).info.probability, [1 / 3])
+
+
+def test_max_times_sampled() -> None:
+    """Test that items are removed after max_times_sampled samples"""
+    table = RingBufferTable(
+        "table_0", max_size=4, sampler=ReplaySampler.uniform, max_times_sampled=1
+    )
+    table.insert(make_item(0))
+
+    sample = table.sample(1)
+    assert sample.info.times_sampled[0] == 1
+    assert table.info().current_size == 0
+    with pytest.raises(TimeoutError):
+        table.sample(1, timeout=0.01)
+
+
+def test_prioritised_table() -> None:
+    """Test sampling in proportion to the priorities and updating them"""
+    table = RingBufferTable(
+        "table_0",
+        max_size=4,
+        sampler=ReplaySampler.prioritised,
+        priority_exponent=2.0,
+        seed=0,
+    )
+    keys = [table.insert(make_item(i), priority=float(i)) for i in range(3)]
+
+    sample = table.sample(100)
+    assert 0 not in sample.data["step"]
+    np.testing.assert_array_almost_equal(
+        sample.info.probability, sample.info.priority**2 / 5.0
+    )
+
+    table.mutate_priorities(updates={keys[0]: 1.0}, deletes=[keys[2]])
+    sample = table.sample(100)
+    assert set(sample.data["step"]) == {0, 1}
+    assert table.info().current_size == 2
+
+
+def test_replay_buffer() -> None:
+    """Test the client interface of the replay buffer"""
+    replay_buffer = ReplayBuffer(
+        [
+            RingBufferTable("trainer_0", max_size=10, sampler=ReplaySampler.queue),
+            RingBufferTable("trainer_1", max_size=5),
+        ]
+    )
+    replay_buffer.insert("trainer_0", make_item(1.0))
+    replay_buffer.insert("trainer_0", make_item(2.0))
+
+    info = replay_buffer.server_info()
+    assert info["trainer_0"].max_size == 10
+    assert info["trainer_0"].current_size == 2
+    assert info["trainer_1"].current_size == 0
+
+    sample = next(replay_buffer.as_iterator("trainer_0", batch_size=2))
+    np.testing.assert_array_equal(sample.data["step"], [1, 2])
+
+
+def test_trajectory_writer() -> None:
+    """Test building items from partial steps and history columns"""
+    replay_buffer = ReplayBuffer([RingBufferTable("table_0", max_size=10)])
+    writer = replay_buffer.trajectory_writer(num_keep_alive_refs=2)
+
+    writer.append({"observation": np.float32(0.0)}, partial_step=True)
+    writer.append({"action": np.int32(0)})
+    writer.append({"observation": np.float32(1.0), "action": np.int32(1)})
+    writer.append({"observation": np.float32(2.0)}, partial_step=True)
+    assert writer.episode_steps == 2
+
+    history = writer.history
+    # Only the last two steps are kept alive.
+    with pytest.raises(ValueError):
+        history["action"][:].numpy()
+    np.testing.assert_array_equal(history["observation"][-2:].numpy(), [1.0, 2.0])
+    with pytest.raises(ValueError):
+        history["action"][-1].numpy()
+
+    writer.create_item(
+        "table_0",
+        priority=1.0,
+        trajectory={
+            "observation": history["observation"][-2:],
+            "action": history["action"][-2],
+        },
+    )
+    sample = replay_buffer.sample("table_0")
+    np.testing.assert_array_equal(sample.data["observation"], [[1.0, 2.0]])
+    np.testing.assert_array_equal(sample.data["action"], [1])
+
+    writer.end_episode()
+    assert writer.episode_steps == 0
+    writer.append({"observation": np.float32(3.0), "action": np.int32(3)})
+    assert len(writer.history["observation"][:]) == 1
+
+
+@pytest.mark.parametrize(
+    "test_case", TEST_CASES, ids=[case["testcase_name"] for case in TEST_CASES]
+)
+def test_sequence_adder(test_case: Dict[str, Any]) -> None:
+    """Test that the sequence adder writes the same items as with reverb"""
+    replay_buffer = ReplayBuffer(
+        [
+            RingBufferTable(
+                reverb_adders.DEFAULT_PRIORITY_TABLE,
+                max_size=100,
+                sampler=ReplaySampler.queue,
+            )
+        ]
+    )
+    end_behavior = test_case.get("end_behavior", EndBehavior.ZERO_PAD)
+    adder = reverb_adders.ParallelSequenceAdder(
+        replay_buffer,
+        sequence_length=test_case["sequence_length"],
+        period=test_case["period"],
+        end_of_episode_behavior=end_behavior,
+    )
+
+    def run_episodes() -> None:
+        """Add the steps of all the episodes to the replay buffer"""
+        for _ in range(test_case.get("repeat_episode_times", 1)):
+            first = test_case["first"]
+            if type(first) == tuple:
+                adder.add_first(*first)
+            else:
+                adder.add_first(first)
+            for step in test_case["steps"]:
+                adder.add(*step)
+        adder.__del__()
+
+    expected_items = test_case["expected_sequences"]
+    if len({len(item) for item in expected_items}) > 1:
+        # Truncated sequences can not be stored in preallocated storage.
+        with pytest.raises(ValueError, match="fixed shapes"):
+            run_episodes()
+        return
+    run_episodes()
+
+    num_items = replay_buffer.server_info()[
+        reverb_adders.DEFAULT_PRIORITY_TABLE
+    ].current_size
+    assert num_items == len(expected_items)
+
+    sample = replay_buffer.sample(reverb_adders.DEFAULT_PRIORITY_TABLE, num_items)
+    for i, expected_item in enumerate(expected_items):
+        observed_item = tree.map_structure(lambda x: x[i], sample.data)
+        tree.map_structure(
+            np.testing.assert_array_almost_equal,
+            tree.flatten(tree_utils.stack_sequence_fields(expected_item)),
+            tree.flatten(observed_item),
+        )
@@ -0,0 +1,177 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dataset util functions unit test"""
+import threading
+from typing import Any, Iterator
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+import reverb
+import tensorflow as tf
+
+from mava.utils.dataset_utils import (
+    DLPackIterator,
+    PrefetchIterator,
+    device_put_sample,
+    tensor_to_jax,
+)
+
+
+def make_sample_info(size: int) -> reverb.SampleInfo:
+    """Sample info with uint64 keys"""
+    return reverb.SampleInfo(
+        key=np.full(size, 2**40, dtype=np.uint64),
+        probability=np.ones(size),
+        table_size=np.ones(size, dtype=np.int64),
+        priority=np.ones(size),
+        times_sampled=np.ones(size, dtype=np.int32),
+    )
+
+
+def test_prefetch_iterator_order() -> None:
+    """Test that all elements are returned in order, then StopIteration"""
+    iterator = PrefetchIterator(range(10), buffer_size=2, transform=lambda x: 2 * x)
+
+    assert list(iterator) == [2 * i for i in range(10)]
+    with pytest.raises(StopIteration):
+        next(iterator)
+
+
+def test_prefetch_iterator_buffer_size() -> None:
+    """Test that the background thread fetches ahead up to the buffer size"""
+    fetched = []
+    all_fetched = threading.Event()
+
+    def source() -> Iterator[int]:
+        for i in range(10):
+            fetched.append(i)
+            if i == 3:
+                all_fetched.set()
+            yield i
+
+    iterator = PrefetchIterator(source(), buffer_size=2)
+    assert fetched == []
+
+    assert next(iterator) == 0
+    # One element returned, two buffered and one waiting to be buffered.
+    assert all_fetched.wait(timeout=5)
+    iterator.close()
+    assert fetched == [0, 1, 2, 3]
+    assert iterator.num_ready == 2
+
+    with pytest.raises(ValueError):
+        PrefetchIterator(range(2), buffer_size=0)
+
+
+def test_prefetch_iterator_errors() -> None:
+    """Test that errors of the source iterator are raised by next"""
+
+    def source() -> Iterator[int]:
+        yield 1
+        raise RuntimeError("sampling failed")
+
+    iterator = PrefetchIterator(source())
+    assert next(iterator) == 1
+    with pytest.raises(RuntimeError, match="sampling failed"):
+        next(iterator)
+
+
+def test_device_put_sample() -> None:
+    """Test that only the sample data is moved to device"""
+    info = make_sample_info(1)
+    sample = reverb.ReplaySample(info=info, data={"observations": np.ones((2, 3))})
+
+    device_sample = device_put_sample(sample)
+
+    assert isinstance(device_sample.data["observations"], jnp.ndarray)
+    np.testing.assert_array_equal(device_sample.data["observations"], np.ones((2, 3)))
+    assert device_sample.info is info
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        np.arange(12, dtype=np.float32).reshape(3, 4),
+        np.array([1, 0, 1], dtype=np.int8),
+        # Converted without DLPack.
+        np.array([True, False]),
+        np.arange(3, dtype=np.int64),
+    ],
+)
+def test_tensor_to_jax(value: np.ndarray) -> None:
+    """Test that tensors are converted to JAX arrays with the right values"""
+    array, bytes_copied = tensor_to_jax(tf.constant(value))
+
+    assert isinstance(array, jnp.ndarray)
+    assert array.dtype == jnp.asarray(value).dtype
+    np.testing.assert_array_equal(array, value)
+    assert bytes_copied in (0, array.nbytes)
+
+
+def test_tensor_to_jax_fallback_copies() -> None:
+    """Test that tensors that can not use DLPack are copied once"""
+    array, bytes_copied = tensor_to_jax(tf.constant([True, False, True]))
+    assert array.dtype == jnp.bool_
+    assert bytes_copied == array.nbytes
+
+
+def test_dlpack_iterator() -> None:
+    """Test iterating over reverb samples of a TensorFlow dataset"""
+    observations = np.arange(24, dtype=np.float32).reshape(2, 3, 4)
+    dones = np.array([[True, False, False], [False, False, True]])
+    sample = reverb.ReplaySample(
+        info=make_sample_info(2),
+        data={"observations": observations, "dones": dones},
+    )
+    dataset = tf.data.Dataset.from_tensors(sample).repeat(2)
+
+    iterator = DLPackIterator(dataset)
+    batches = list(iterator)
+
+    assert len(batches) == 2
+    for batch in batches:
+        assert isinstance(batch, reverb.ReplaySample)
+        assert isinstance(batch.data["observations"], jnp.ndarray)
+        np.testing.assert_array_equal(batch.data["observations"], observations)
+        np.testing.assert_array_equal(batch.data["dones"], dones)
+        # The info stays on the host, with 64 bit keys.
+        assert isinstance(batch.info.key, np.ndarray)
+        assert batch.info.key.dtype == np.uint64
+        assert batch.info.key[0] == 2**40
+
+    # The booleans are always copied, the observations only if unaligned.
+    assert dones.nbytes <= iterator.bytes_copied <= dones.nbytes + observations.nbytes
+
+
+def test_tensor_to_jax_other_device(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that arrays handed over on another device are copied to the device"""
+    device = object()
+    device_puts = []
+
+    def device_put(array: jnp.ndarray, target: Any = None) -> jnp.ndarray:
+        """Record the transfers"""
+        device_puts.append(target)
+        return jnp.asarray(array)
+
+    monkeypatch.setattr(jax, "device_put", device_put)
+    value = np.arange(12, dtype=np.float32).reshape(3, 4)
+    array, bytes_copied = tensor_to_jax(tf.constant(value), device)
+
+    assert device_puts == [device]
+    np.testing.assert_array_equal(array, value)
+    assert bytes_copied in (array.nbytes, 2 * array.nbytes)
@@ -0,0 +1,109 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parameter codec unit test"""
+import pickle
+from typing import Any, Dict
+
+import jax.numpy as jnp
+import numpy as np
+import optax
+import pytest
+
+from mava.utils.enums import Compression, ParameterPrecision
+from mava.utils.parameter_codec import (
+    EncodedParameter,
+    ParameterCodec,
+    ParameterEncoding,
+)
+
+
+def make_parameters() -> Dict[str, Any]:
+    """Parameters with networks, optimiser states and counts"""
+    weights = np.linspace(-1.0, 1.0, 12, dtype=np.float32).reshape(3, 4)
+    network = {"layer_0": {"w": weights, "b": jnp.ones(4)}}
+    return {
+        "policy_network-agent": network,
+        "policy_opt_state-agent": optax.adam(1e-3).init(network),
+        "trainer_steps": np.array(3, dtype=np.int32),
+        "terminate": False,
+    }
+
+
+@pytest.mark.parametrize(
+    "precision, tolerance",
+    [
+        (ParameterPrecision.full, 0.0),
+        (ParameterPrecision.float16, 1e-3),
+        (ParameterPrecision.bfloat16, 1e-2),
+        (ParameterPrecision.int8, 1.0 / 127),
+    ],
+)
+@pytest.mark.parametrize("compression", [Compression.none, Compression.zlib])
+def test_encode_decode(
+    precision: ParameterPrecision, tolerance: float, compression: Compression
+) -> None:
+    """Test that decoded parameters match the original ones"""
+    parameters = make_parameters()
+    codec = ParameterCodec(default=ParameterEncoding(precision, compression))
+
+    encoded = pickle.loads(pickle.dumps(codec.encode(parameters)))
+    assert isinstance(encoded["policy_network-agent"], EncodedParameter)
+    # Values without floating point arrays are sent as they are.
+    assert encoded["trainer_steps"] == 3
+    assert encoded["terminate"] is False
+
+    decoded = codec.decode(encoded)
+    layer = decoded["policy_network-agent"]["layer_0"]
+    assert layer["w"].dtype == np.float32
+    np.testing.assert_allclose(
+        layer["w"], parameters["policy_network-agent"]["layer_0"]["w"], atol=tolerance
+    )
+    np.testing.assert_allclose(layer["b"], np.ones(4), atol=tolerance)
+
+    # The optimiser state keeps its structure and its integer count.
+    opt_state = decoded["policy_opt_state-agent"]
+    assert isinstance(opt_state[0], type(parameters["policy_opt_state-agent"][0]))
+    assert opt_state[0].count == 0
+    assert decoded["trainer_steps"] == 3
+
+
+def test_encoding_per_parameter() -> None:
+    """Test that encodings are selected by name, then by name prefix"""
+    int8 = ParameterEncoding(precision=ParameterPrecision.int8)
+    full = ParameterEncoding()
+    codec = ParameterCodec(
+        default=int8,
+        encodings={"policy_opt_state": full, "critic_network-agent_1": full},
+    )
+
+    assert codec.encoding("policy_network-agent_0") == int8
+    assert codec.encoding("policy_opt_state-agent_0") == full
+    assert codec.encoding("critic_network-agent_1") == full
+    assert codec.encoding("critic_network-agent_0") == int8
+
+    encoded = codec.encode(make_parameters())
+    assert encoded["policy_network-agent"].encoding == int8
+    assert encoded["policy_opt_state-agent"].encoding == full
+
+
+def test_int8_buffer_size() -> None:
+    """Test that int8 parameters are sent with one byte per value"""
+    codec = ParameterCodec(default=ParameterEncoding(precision=ParameterPrecision.int8))
+    encoded = codec.encode_parameter(
+        {"w": np.ones((10, 10), dtype=np.float32)}, codec.default
+    )
+    assert len(encoded.buffer) == 100
+    np.testing.assert_array_equal(codec.decode_parameter(encoded)["w"], 1.0)
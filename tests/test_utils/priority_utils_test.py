@@ -0,0 +1,111 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Priority utils unit test"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from mava.systems.replay_buffer import ReplayBuffer, RingBufferTable
+from mava.utils.enums import ReplaySampler
+from mava.utils.priority_utils import AsyncPriorityUpdater
+
+
+class MockClient:
+    """Data server client whose writes wait until they are released"""
+
+    def __init__(self) -> None:
+        """Initialise the client"""
+        self.updates: List[Dict[int, float]] = []
+        self.release = threading.Event()
+        self.error: Optional[Exception] = None
+
+    def mutate_priorities(self, table: str, updates: Dict[int, float]) -> None:
+        """Record the updates once the write is released"""
+        self.release.wait()
+        if self.error is not None:
+            raise self.error
+        self.updates.append(updates)
+
+
+def test_update_replay_buffer() -> None:
+    """Test that priorities are written to the table of the sampled items"""
+    replay_buffer = ReplayBuffer(
+        [RingBufferTable("trainer_0", max_size=4, sampler=ReplaySampler.prioritised)]
+    )
+    keys = [
+        replay_buffer.insert("trainer_0", {"step": np.int32(i)}, priority=1.0)
+        for i in range(2)
+    ]
+
+    updater = AsyncPriorityUpdater(replay_buffer, "trainer_0")
+    updater.update(np.array(keys, dtype=np.uint64), jnp.array([0.0, 1.0]))
+    updater.close()
+
+    sample = replay_buffer.sample("trainer_0", 20)
+    assert set(sample.data["step"]) == {1}
+    assert updater.num_writes == 1
+
+
+def test_updates_are_merged() -> None:
+    """Test that pending updates are merged without losing any items"""
+    client = MockClient()
+    updater = AsyncPriorityUpdater(client, "trainer_0", max_pending_updates=2)
+    updater.update(np.array([1], dtype=np.uint64), np.array([1.0]))
+    # The first update is being written while the others are queued.
+    while updater._pending:
+        time.sleep(0.001)
+    updater.update(np.array([2, 3], dtype=np.uint64), np.array([0.0, 1.0]))
+    updater.update(np.array([4], dtype=np.uint64), np.array([4.0]))
+    # The queue is full, so the queued updates are merged.
+    updater.update(np.array([2], dtype=np.uint64), np.array([7.0]))
+    assert updater.num_merges == 1
+
+    client.release.set()
+    updater.flush()
+    assert client.updates == [{1: 1.0}, {2: 7.0, 3: 1.0, 4: 4.0}]
+    updater.close()
+
+
+def test_write_error() -> None:
+    """Test that errors of the background writes are raised by the updater"""
+    client = MockClient()
+    client.error = ValueError("Unknown table.")
+    client.release.set()
+    updater = AsyncPriorityUpdater(client, "trainer_0")
+    updater.update(np.array([1], dtype=np.uint64), np.array([1.0]))
+
+    with pytest.raises(ValueError, match="Unknown table."):
+        updater.flush()
+    with pytest.raises(ValueError, match="Unknown table."):
+        updater.update(np.array([1], dtype=np.uint64), np.array([1.0]))
+
+
+def test_max_pending_updates() -> None:
+    """Test that at least one update must be allowed to be pending"""
+    with pytest.raises(ValueError):
+        AsyncPriorityUpdater(MockClient(), "trainer_0", max_pending_updates=0)
+
+
+def test_update_closed() -> None:
+    """Test that a closed updater does not accept updates"""
+    updater = AsyncPriorityUpdater(MockClient(), "trainer_0")
+    updater.close()
+    with pytest.raises(RuntimeError):
+        updater.update(np.array([1], dtype=np.uint64), np.array([1.0]))
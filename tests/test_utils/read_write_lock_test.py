@@ -0,0 +1,82 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reader-writer lock unit test"""
+import threading
+from typing import Callable, ContextManager
+
+from mava.utils.read_write_lock import ReadWriteLock
+
+
+def start_holding(
+    hold: Callable[[], ContextManager], release: threading.Event
+) -> threading.Event:
+    """Hold the lock in a new thread until release is set"""
+    acquired = threading.Event()
+
+    def run() -> None:
+        with hold():
+            acquired.set()
+            release.wait()
+
+    threading.Thread(target=run, daemon=True).start()
+    return acquired
+
+
+def test_concurrent_readers() -> None:
+    """Test that readers hold the lock together"""
+    lock = ReadWriteLock()
+    release = threading.Event()
+    assert start_holding(lock.read, release).wait(timeout=5)
+    assert start_holding(lock.read, release).wait(timeout=5)
+    release.set()
+
+
+def test_writer_excludes_readers() -> None:
+    """Test that readers wait for a writer and a writer waits for readers"""
+    lock = ReadWriteLock()
+    release_writer = threading.Event()
+    assert start_holding(lock.write, release_writer).wait(timeout=5)
+
+    release_reader = threading.Event()
+    reader_acquired = start_holding(lock.read, release_reader)
+    assert not reader_acquired.wait(timeout=0.1)
+    release_writer.set()
+    assert reader_acquired.wait(timeout=5)
+
+    writer_acquired = start_holding(lock.write, threading.Event())
+    assert not writer_acquired.wait(timeout=0.1)
+    release_reader.set()
+    assert writer_acquired.wait(timeout=5)
+
+
+def test_waiting_writer_is_preferred() -> None:
+    """Test that new readers wait while a writer waits for the lock"""
+    lock = ReadWriteLock()
+    release_reader = threading.Event()
+    assert start_holding(lock.read, release_reader).wait(timeout=5)
+
+    release_writer = threading.Event()
+    writer_acquired = start_holding(lock.write, release_writer)
+    assert not writer_acquired.wait(timeout=0.1)
+
+    reader_acquired = start_holding(lock.read, threading.Event())
+    assert not reader_acquired.wait(timeout=0.1)
+
+    release_reader.set()
+    assert writer_acquired.wait(timeout=5)
+    assert not reader_acquired.is_set()
+    release_writer.set()
+    assert reader_acquired.wait(timeout=5)
@@ -0,0 +1,205 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wrapper util functions unit test"""
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+import tree
+from dm_env import specs
+
+from mava.types import OLT
+from mava.utils.wrapper_utils import (
+    ObservationArena,
+    convert_dm_compatible_observations,
+)
+
+AGENTS = ["agent_0", "agent_1", "agent_2"]
+
+
+@pytest.fixture
+def observation_spec() -> Dict[str, OLT]:
+    """Observation spec of three agents with two actions"""
+    return {
+        agent: OLT(
+            observation=specs.Array((3,), np.float32),
+            legal_actions=specs.BoundedArray((2,), np.int64, 0, 1),
+            terminal=specs.Array((1,), np.float32),
+        )
+        for agent in AGENTS
+    }
+
+
+@pytest.fixture
+def tuple_observation_spec() -> Dict[str, OLT]:
+    """Observation spec with tuple observations, as used by Flatland"""
+    return {
+        agent: OLT(
+            observation=(
+                specs.Array((3,), np.float32),
+                specs.Array((2,), np.float32),
+            ),
+            legal_actions=np.ones(2, dtype=np.int64),
+            terminal=specs.Array((1,), np.float32),
+        )
+        for agent in AGENTS
+    }
+
+
+def assert_observations_equal(observations: Any, expected: Any) -> None:
+    """Check that observations have the same structure, values and dtypes"""
+    tree.assert_same_structure(observations, expected)
+    for value, expected_value in zip(
+        tree.flatten(observations), tree.flatten(expected)
+    ):
+        assert np.asarray(value).dtype == np.asarray(expected_value).dtype
+        np.testing.assert_array_equal(value, expected_value)
+
+
+def test_arena_layout(observation_spec: Dict[str, OLT]) -> None:
+    """Test that every agent field is laid out contiguously, field by field"""
+    arena = ObservationArena(observation_spec)
+
+    # 3 agents * (3 * 4 + 2 * 8 + 1 * 4 rounded up to 8) bytes.
+    assert ObservationArena.nbytes(observation_spec) == 3 * (16 + 16 + 8)
+
+    observations = arena.observations
+    addresses = {
+        agent: [
+            leaf.__array_interface__["data"][0]
+            for leaf in tree.flatten(observations[agent])
+        ]
+        for agent in AGENTS
+    }
+    start = addresses["agent_0"][0]
+    assert [address - start for address in addresses["agent_0"]] == [0, 48, 96]
+    assert [address - start for address in addresses["agent_1"]] == [16, 64, 104]
+    assert [address - start for address in addresses["agent_2"]] == [32, 80, 112]
+
+    for agent in AGENTS:
+        assert observations[agent].observation.dtype == np.float32
+        assert observations[agent].legal_actions.dtype == np.int64
+
+
+def test_arena_external_buffer(observation_spec: Dict[str, OLT]) -> None:
+    """Test that arenas on the same buffer share observations"""
+    buffer = bytearray(ObservationArena.nbytes(observation_spec))
+    writer = ObservationArena(observation_spec, buffer=buffer)
+    reader = ObservationArena(observation_spec, buffer=buffer)
+
+    writer.observations["agent_1"].observation[:] = [1.0, 2.0, 3.0]
+    np.testing.assert_array_equal(
+        reader.observations["agent_1"].observation, [1.0, 2.0, 3.0]
+    )
+
+    with pytest.raises(ValueError):
+        ObservationArena(observation_spec, buffer=bytearray(8))
+
+
+def test_arena_write_and_copy(observation_spec: Dict[str, OLT]) -> None:
+    """Test copying observations in and out of the arena"""
+    arena = ObservationArena(observation_spec)
+    observations = {
+        agent: OLT(
+            observation=np.full(3, index, dtype=np.float32),
+            legal_actions=np.array([1, 0]),
+            terminal=np.zeros(1, dtype=np.float32),
+        )
+        for index, agent in enumerate(AGENTS)
+    }
+
+    assert arena.write(observations)
+    copied = arena.copy()
+    assert_observations_equal(copied, observations)
+
+    # Copies are not changed by later writes.
+    arena.observations["agent_0"].observation[:] = 5.0
+    np.testing.assert_array_equal(copied["agent_0"].observation, np.zeros(3))
+
+    # Observations that do not match the spec are not written.
+    wrong_shape = dict(observations)
+    wrong_shape["agent_2"] = observations["agent_2"]._replace(
+        observation=np.zeros(4, dtype=np.float32)
+    )
+    assert not arena.write(wrong_shape)
+    assert not arena.write({"agent_0": observations["agent_0"]})
+    np.testing.assert_array_equal(arena.observations["agent_2"].observation, [2.0] * 3)
+
+
+@pytest.mark.parametrize(
+    "observes",
+    [
+        # All agents observe.
+        {agent: np.arange(3, dtype=np.float64) + i for i, agent in enumerate(AGENTS)},
+        # Observations with action masks, one agent without an observation.
+        {
+            "agent_0": {
+                "observation": np.ones(3),
+                "action_mask": np.array([0, 1], dtype=np.int8),
+            },
+            "agent_2": {
+                "observation": np.full(3, 2.0),
+                "action_mask": np.array([1, 0], dtype=np.int8),
+            },
+        },
+    ],
+)
+def test_convert_dm_compatible_observations_arena(
+    observation_spec: Dict[str, OLT], observes: Dict[str, Any]
+) -> None:
+    """Test that writing into an arena matches allocating new observations"""
+    arena = ObservationArena(observation_spec)
+    dones = {"agent_1": True}
+
+    expected = convert_dm_compatible_observations(
+        observes, dones, observation_spec, False, AGENTS
+    )
+    observations = convert_dm_compatible_observations(
+        observes, dones, observation_spec, False, AGENTS, arena=arena
+    )
+
+    assert observations is arena.observations
+    tree.map_structure(
+        np.testing.assert_array_equal,
+        observations,
+        expected,
+    )
+    for agent in AGENTS:
+        # Arena values keep the dtypes of the spec.
+        assert observations[agent].terminal.dtype == np.float32
+        assert observations[agent].observation.dtype == np.float32
+
+
+def test_convert_dm_compatible_observations_arena_tuple_observations(
+    tuple_observation_spec: Dict[str, OLT]
+) -> None:
+    """Test writing tuple observations into an arena"""
+    arena = ObservationArena(tuple_observation_spec)
+    observes = {
+        "agent_0": (np.ones(3), np.full(2, 2.0)),
+        "agent_1": (np.full(3, 3.0), np.full(2, 4.0)),
+    }
+
+    observations = convert_dm_compatible_observations(
+        observes, {}, tuple_observation_spec, True, AGENTS, arena=arena
+    )
+
+    np.testing.assert_array_equal(observations["agent_1"].observation[0], [3.0] * 3)
+    np.testing.assert_array_equal(observations["agent_1"].observation[1], [4.0] * 2)
+    # Agents without observations get zeros.
+    np.testing.assert_array_equal(observations["agent_2"].observation[0], [0.0] * 3)
+    np.testing.assert_array_equal(observations["agent_2"].legal_actions, [1, 1])
+    np.testing.assert_array_equal(observations["agent_2"].terminal, [1.0])
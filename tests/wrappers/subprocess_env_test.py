@@ -0,0 +1,143 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the subprocess environment wrapper"""
+import functools
+from typing import Any, Dict
+
+import dm_env
+import numpy as np
+import pytest
+import tree
+
+from mava.utils.environments import debugging_utils
+from mava.wrappers.subprocess_env import SubprocessEnvWrapper, wait_for_environments
+
+
+def make_debugging_environment(random_seed: int = 42) -> dm_env.Environment:
+    """Creates a seeded debugging environment."""
+    return debugging_utils.make_environment(random_seed=random_seed)[0]
+
+
+def actions_for(environment: Any) -> Dict[str, np.ndarray]:
+    """Returns a fixed action for every agent."""
+    return {
+        agent: np.array(1, dtype=spec.dtype)
+        for agent, spec in environment.action_spec().items()
+    }
+
+
+def assert_timesteps_equal(timestep: Any, expected: Any) -> None:
+    """Checks that two (timestep, extras) results are equal."""
+    if isinstance(timestep, tuple) and not isinstance(timestep, dm_env.TimeStep):
+        timestep, _ = timestep
+        expected, _ = expected
+    assert timestep.step_type == expected.step_type
+    tree.map_structure(np.testing.assert_allclose, timestep.reward, expected.reward)
+    tree.map_structure(
+        np.testing.assert_allclose, timestep.observation, expected.observation
+    )
+
+
+@pytest.fixture
+def subprocess_environment() -> SubprocessEnvWrapper:
+    """Subprocess debugging environment"""
+    environment = SubprocessEnvWrapper(make_debugging_environment)
+    yield environment
+    environment.close()
+
+
+def test_specs_and_attributes(subprocess_environment: SubprocessEnvWrapper) -> None:
+    """Test that the specs and attributes of the environment are forwarded"""
+    environment = make_debugging_environment()
+
+    assert subprocess_environment.action_spec() == environment.action_spec()
+    assert subprocess_environment.possible_agents == environment.possible_agents
+    assert (
+        subprocess_environment.obs_normalisation_start_index
+        == environment.obs_normalisation_start_index
+    )
+    # Methods are called in the subprocess.
+    assert subprocess_environment.extras_spec() == environment.extras_spec()
+    with pytest.raises(AttributeError):
+        subprocess_environment.not_an_attribute
+
+
+def test_reset_and_step_match_environment(
+    subprocess_environment: SubprocessEnvWrapper,
+) -> None:
+    """Test that the subprocess environment steps like the environment"""
+    environment = make_debugging_environment()
+
+    assert_timesteps_equal(subprocess_environment.reset(), environment.reset())
+    for _ in range(3):
+        actions = actions_for(environment)
+        assert_timesteps_equal(
+            subprocess_environment.step(actions), environment.step(actions)
+        )
+
+
+def test_step_async(subprocess_environment: SubprocessEnvWrapper) -> None:
+    """Test dispatching a step and waiting for it"""
+    environment = make_debugging_environment()
+    subprocess_environment.reset()
+    environment.reset()
+
+    actions = actions_for(environment)
+    subprocess_environment.step_async(actions)
+
+    # No other requests while the step is in flight.
+    with pytest.raises(RuntimeError):
+        subprocess_environment.step_async(actions)
+    with pytest.raises(RuntimeError):
+        subprocess_environment.possible_agents
+
+    assert wait_for_environments([subprocess_environment]) == [0]
+    assert_timesteps_equal(
+        subprocess_environment.step_wait(), environment.step(actions)
+    )
+
+    with pytest.raises(RuntimeError):
+        subprocess_environment.step_wait()
+
+
+def test_observations_are_arena_views(
+    subprocess_environment: SubprocessEnvWrapper,
+) -> None:
+    """Test that observations are not copied out of the shared arena"""
+    timestep = subprocess_environment.reset()
+    if isinstance(timestep, tuple) and not isinstance(timestep, dm_env.TimeStep):
+        timestep, _ = timestep
+    next_timestep = subprocess_environment.step(actions_for(subprocess_environment))
+    if isinstance(next_timestep, tuple) and not isinstance(
+        next_timestep, dm_env.TimeStep
+    ):
+        next_timestep, _ = next_timestep
+
+    # Both timesteps share the arena, which holds the latest observations.
+    for observation, next_observation in zip(
+        tree.flatten(timestep.observation), tree.flatten(next_timestep.observation)
+    ):
+        assert np.shares_memory(observation, next_observation)
+
+
+def test_environment_factory_errors() -> None:
+    """Test that errors in the subprocess are raised in the main process"""
+    with pytest.raises(RuntimeError, match="not_an_environment not found"):
+        SubprocessEnvWrapper(
+            functools.partial(
+                debugging_utils.make_environment, env_name="not_an_environment"
+            )
+        )